@@ -0,0 +1,118 @@
+"""Convert tasks table to the configured storage layout
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+Rebuilds ``tasks`` in the compact layout (16-byte BLOB ids, epoch
+microsecond timestamps, small-int enums, optionally WITHOUT ROWID) when
+``TICK_TASK_COMPACT_STORAGE`` is enabled, and leaves it untouched otherwise.
+Downgrading always restores the text layout. Rows are copied in batches.
+A database already past this revision is converted with
+``python -m tick_task.storage_layout`` instead.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.column_types import EpochMicros, SmallIntEnum, UUIDBlob
+from tick_task.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+STATUSES = ("todo", "doing", "blocked", "done", "archived")
+PRIORITIES = ("low", "medium", "high", "urgent")
+CONTEXTS = ("personal", "professional", "mixed")
+INDEXED_COLUMNS = (
+    "status",
+    "context",
+    "priority",
+    "due_at",
+    "updated_at",
+    "created_at",
+)
+
+
+def _tasks_table(name: str, compact: bool, without_rowid: bool = False) -> sa.Table:
+    """Describe the tasks table in the text or compact layout."""
+    if compact:
+        id_type: sa.types.TypeEngine = UUIDBlob()
+        timestamp: sa.types.TypeEngine = EpochMicros()
+
+        def enum(values: tuple[str, ...], enum_name: str) -> sa.types.TypeEngine:
+            return SmallIntEnum(values)
+
+    else:
+        id_type = sa.String(36)
+        timestamp = sa.DateTime()
+
+        def enum(values: tuple[str, ...], enum_name: str) -> sa.types.TypeEngine:
+            return sa.Enum(*values, name=enum_name)
+
+    table_kwargs = {"sqlite_with_rowid": False} if compact and without_rowid else {}
+    return sa.Table(
+        name,
+        sa.MetaData(),
+        sa.Column("id", id_type, nullable=False),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", enum(STATUSES, "task_status"), nullable=False),
+        sa.Column("priority", enum(PRIORITIES, "task_priority"), nullable=False),
+        sa.Column("due_at", timestamp, nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("context", enum(CONTEXTS, "task_context"), nullable=False),
+        sa.Column("workspace", sa.String(100), nullable=True),
+        sa.Column("created_at", timestamp, nullable=False),
+        sa.Column("updated_at", timestamp, nullable=False),
+        sa.Column("completed_at", timestamp, nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        **table_kwargs,
+    )
+
+
+def _is_compact(bind: sa.engine.Connection) -> bool:
+    """Return True if the existing tasks table uses BLOB ids."""
+    columns = {
+        column["name"]: column for column in sa.inspect(bind).get_columns("tasks")
+    }
+    return isinstance(columns["id"]["type"], sa.LargeBinary)
+
+
+def _convert(compact: bool, without_rowid: bool = False) -> None:
+    """Rebuild the tasks table in the requested layout, copying all rows."""
+    bind = op.get_bind()
+    if _is_compact(bind) == compact:
+        return
+
+    source = _tasks_table("tasks", not compact)
+    target = _tasks_table("tasks_converted", compact, without_rowid)
+    target.create(bind)
+
+    rows = bind.execution_options(stream_results=True).execute(sa.select(source))
+    for batch in rows.partitions(BATCH_SIZE):
+        bind.execute(sa.insert(target), [dict(row._mapping) for row in batch])
+
+    op.drop_table("tasks")
+    op.rename_table("tasks_converted", "tasks")
+    for column in INDEXED_COLUMNS:
+        op.create_index(f"ix_tasks_{column}", "tasks", [column])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if settings.compact_storage:
+        _convert(compact=True, without_rowid=settings.compact_without_rowid)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _convert(compact=False)
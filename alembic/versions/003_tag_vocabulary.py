@@ -0,0 +1,115 @@
+"""Intern tag names into a tags table
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 12:00:00.000000
+
+Creates the ``tags`` vocabulary, replaces the ``tasks.tags`` JSON array of
+names with ``tasks.tag_ids`` (a JSON array of tag ids) and installs the
+triggers that keep ``tags.usage_count`` current. Existing rows are converted
+with a chunked data migration. Downgrading writes the names back.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.data_migrations import (
+    DataMigration,
+    progress_table,
+    run_in_alembic,
+)
+from tick_task.models import ID_TYPE, TAG_USAGE_TRIGGERS
+from tick_task.tags import resolve_tags
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL = "003_tag_vocabulary"
+TRIGGERS = (
+    "tasks_tag_usage_insert",
+    "tasks_tag_usage_update",
+    "tasks_tag_usage_delete",
+)
+
+tasks = sa.table(
+    "tasks",
+    sa.column("id", ID_TYPE),
+    sa.column("tags", sa.JSON()),
+    sa.column("tag_ids", sa.JSON()),
+)
+
+
+def intern_chunk(connection: sa.engine.Connection, rows: Sequence) -> None:
+    """Store the interned ids of each row's tag names."""
+    resolved = resolve_tags(
+        connection, (name for row in rows for name in row.tags or ())
+    )
+    updates = []
+    for row in rows:
+        ids = list(dict.fromkeys(resolved[name][0] for name in row.tags or ()))
+        updates.append({"task_id": row.id, "tag_ids": ids})
+    connection.execute(
+        tasks.update().where(tasks.c.id == sa.bindparam("task_id")),
+        updates,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(50), nullable=False),
+        sa.Column("usage_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("merged_into", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["merged_into"], ["tags.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("tag_ids", sa.JSON(), nullable=False, server_default="[]"),
+    )
+
+    run_in_alembic(
+        DataMigration(
+            BACKFILL,
+            tasks,
+            tasks.c.id,
+            intern_chunk,
+            columns=[tasks.c.id, tasks.c.tags],
+        )
+    )
+
+    op.drop_column("tasks", "tags")
+    op.execute(
+        "UPDATE tags SET usage_count = ("
+        " SELECT count(*) FROM tasks, json_each(tasks.tag_ids) AS j"
+        " WHERE j.value = tags.id)"
+    )
+    for trigger in TAG_USAGE_TRIGGERS:
+        op.execute(trigger)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.add_column("tasks", sa.Column("tags", sa.JSON(), nullable=True))
+    op.execute(
+        "UPDATE tasks SET tags = ("
+        " SELECT json_group_array(coalesce(c.name, t.name))"
+        " FROM json_each(tasks.tag_ids) AS j JOIN tags AS t ON t.id = j.value"
+        " LEFT JOIN tags AS c ON c.id = t.merged_into)"
+    )
+    op.drop_column("tasks", "tag_ids")
+    op.drop_table("tags")
+    # Let a later upgrade run the backfill again
+    if sa.inspect(op.get_bind()).has_table(progress_table.name):
+        op.execute(sa.delete(progress_table).where(progress_table.c.name == BACKFILL))
@@ -0,0 +1,76 @@
+"""Add daily analytics rollup tables
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 14:00:00.000000
+
+Creates ``analytics_transitions`` and ``analytics_status`` and fills them
+from the existing tasks with a chunked data migration. Only the current
+state of each task is known, so its history is reconstructed (see
+``tick_task.rollups.backfill_tasks``); from here on the application keeps
+the rollups current.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.data_migrations import DataMigration, progress_table, run_in_alembic
+from tick_task.models import Task
+from tick_task.rollups import FIELDS, backfill_tasks
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL = "004_analytics_rollups"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "analytics_transitions",
+        sa.Column("day", sa.String(10), nullable=False),
+        sa.Column("context", sa.String(20), nullable=False),
+        sa.Column("workspace", sa.String(100), nullable=False),
+        sa.Column("from_status", sa.String(20), nullable=False),
+        sa.Column("to_status", sa.String(20), nullable=False),
+        sa.Column("tasks", sa.Integer(), nullable=False),
+        sa.Column("cycle_seconds", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "day", "context", "workspace", "from_status", "to_status"
+        ),
+    )
+    op.create_table(
+        "analytics_status",
+        sa.Column("context", sa.String(20), nullable=False),
+        sa.Column("workspace", sa.String(100), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("due_day", sa.String(10), nullable=False),
+        sa.Column("tasks", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("context", "workspace", "status", "due_day"),
+    )
+
+    tasks = Task.__table__
+    run_in_alembic(
+        DataMigration(
+            BACKFILL,
+            tasks,
+            tasks.c.id,
+            backfill_tasks,
+            columns=[tasks.c[key] for key in FIELDS],
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("analytics_status")
+    op.drop_table("analytics_transitions")
+    # Let a later upgrade run the backfill again
+    if sa.inspect(op.get_bind()).has_table(progress_table.name):
+        op.execute(sa.delete(progress_table).where(progress_table.c.name == BACKFILL))
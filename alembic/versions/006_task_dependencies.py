@@ -0,0 +1,56 @@
+"""Add task dependencies
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 17:00:00.000000
+
+Creates the ``task_dependencies`` edge table and adds the ``open_blockers``
+count and ``topo_order`` position to tasks. Existing tasks have no
+dependencies, so the count starts at zero and the position empty.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.models import ID_TYPE
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("open_blockers", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column("tasks", sa.Column("topo_order", sa.Integer(), nullable=True))
+    op.create_index("ix_tasks_open_blockers", "tasks", ["open_blockers"])
+    op.create_index("ix_tasks_topo_order", "tasks", ["topo_order"])
+    op.create_table(
+        "task_dependencies",
+        sa.Column("task_id", ID_TYPE, nullable=False),
+        sa.Column("blocker_id", ID_TYPE, nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["blocker_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "blocker_id"),
+    )
+    op.create_index(
+        "ix_task_dependencies_blocker_id", "task_dependencies", ["blocker_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_dependencies_blocker_id", table_name="task_dependencies")
+    op.drop_table("task_dependencies")
+    op.drop_index("ix_tasks_topo_order", table_name="tasks")
+    op.drop_index("ix_tasks_open_blockers", table_name="tasks")
+    op.drop_column("tasks", "topo_order")
+    op.drop_column("tasks", "open_blockers")
@@ -0,0 +1,63 @@
+"""Add subtask hierarchy
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 19:00:00.000000
+
+Adds the ``parent_id`` column to tasks and creates the ``task_closure``
+table. Existing tasks have no parent, so each only gets its own depth-0
+row.
+
+On SQLite the batch operations rebuild ``tasks``, which keeps its columns,
+indexes and WITHOUT ROWID layout but drops its triggers, so the tag usage
+triggers are installed again afterwards.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.models import ID_TYPE, TAG_USAGE_TRIGGERS
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.add_column(sa.Column("parent_id", ID_TYPE, nullable=True))
+        batch_op.create_foreign_key(
+            "fk_tasks_parent_id", "tasks", ["parent_id"], ["id"], ondelete="SET NULL"
+        )
+        batch_op.create_index("ix_tasks_parent_id", ["parent_id"])
+    for trigger in TAG_USAGE_TRIGGERS:
+        op.execute(trigger)
+    op.create_table(
+        "task_closure",
+        sa.Column("ancestor_id", ID_TYPE, nullable=False),
+        sa.Column("descendant_id", ID_TYPE, nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index("ix_task_closure_descendant_id", "task_closure", ["descendant_id"])
+    op.execute("INSERT INTO task_closure SELECT id, id, 0 FROM tasks")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_closure_descendant_id", table_name="task_closure")
+    op.drop_table("task_closure")
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_index("ix_tasks_parent_id")
+        batch_op.drop_constraint("fk_tasks_parent_id", type_="foreignkey")
+        batch_op.drop_column("parent_id")
+    for trigger in TAG_USAGE_TRIGGERS:
+        op.execute(trigger)
@@ -0,0 +1,55 @@
+"""Add task history
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 21:00:00.000000
+
+Creates the ``task_events`` change log and the ``task_snapshots`` table its
+older events are compacted into. History starts with the next change to
+each task; existing tasks get no ``created`` event.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.models import ID_TYPE, TIMESTAMP_TYPE
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("task_id", ID_TYPE, nullable=False),
+        sa.Column("at", TIMESTAMP_TYPE, nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("changes", sa.JSON(), nullable=False),
+        sa.Column("undoes", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_task_events_task_id_id", "task_events", ["task_id", "id"])
+    op.create_table(
+        "task_snapshots",
+        sa.Column("task_id", ID_TYPE, nullable=False),
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("at", TIMESTAMP_TYPE, nullable=False),
+        sa.Column("state", sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_snapshots")
+    op.drop_index("ix_task_events_task_id_id", table_name="task_events")
+    op.drop_table("task_events")
@@ -0,0 +1,60 @@
+"""Add title buckets for near-duplicate detection
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 22:00:00.000000
+
+Creates ``title_buckets`` and fills it from the existing task titles with a
+chunked data migration (see ``tick_task.duplicates.index_titles``); from
+here on the application keeps it current.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.data_migrations import DataMigration, progress_table, run_in_alembic
+from tick_task.duplicates import index_titles
+from tick_task.models import ID_TYPE, Task
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL = "009_title_buckets"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "title_buckets",
+        sa.Column("bucket", sa.Integer(), nullable=False),
+        sa.Column("task_id", ID_TYPE, nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("bucket", "task_id"),
+    )
+    op.create_index("ix_title_buckets_task_id", "title_buckets", ["task_id"])
+
+    tasks = Task.__table__
+    run_in_alembic(
+        DataMigration(
+            BACKFILL,
+            tasks,
+            tasks.c.id,
+            index_titles,
+            columns=[tasks.c.id, tasks.c.title],
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_title_buckets_task_id", table_name="title_buckets")
+    op.drop_table("title_buckets")
+    # Let a later upgrade run the backfill again
+    if sa.inspect(op.get_bind()).has_table(progress_table.name):
+        op.execute(sa.delete(progress_table).where(progress_table.c.name == BACKFILL))
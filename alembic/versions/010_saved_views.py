@@ -0,0 +1,40 @@
+"""Add saved views
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 23:00:00.000000
+
+Creates ``saved_views``, the named task list filters served by
+``/api/v1/views``.
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+from tick_task.models import ID_TYPE, TIMESTAMP_TYPE
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "saved_views",
+        sa.Column("id", ID_TYPE, nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("filters", sa.JSON(), nullable=False),
+        sa.Column("created_at", TIMESTAMP_TYPE, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("saved_views")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Analytics rollup benchmark
+
+Compares answering the two dashboard questions (daily created/completed
+counts with cycle time over 30 days, and per-context status, WIP and
+overdue counts) by aggregating the ``tasks`` table with the same answers
+read from the rollup tables, and reports what maintaining the rollups adds
+to each task write.
+
+Usage:
+    python benchmarks/bench_analytics.py [--tasks 100000] [--writes 2000]
+        [--repeat 20]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.orm import Session
+
+from tick_task import models
+from tick_task.data_migrations import DataMigration
+from tick_task.database import create_sync_database_engine
+from tick_task.models import Base, Task
+from tick_task.rollups import FIELDS, activity, backfill_tasks, status_counts
+
+TODAY = date(2026, 3, 31)
+
+SCAN_ACTIVITY = text(
+    "SELECT day, sum(created), sum(completed), sum(cycle) FROM ("
+    " SELECT date(created_at) AS day, 1 AS created, 0 AS completed, 0 AS cycle"
+    " FROM tasks WHERE date(created_at) BETWEEN :since AND :until"
+    " UNION ALL"
+    " SELECT date(completed_at), 0, 1,"
+    " (julianday(completed_at) - julianday(created_at)) * 86400"
+    " FROM tasks WHERE status = 'done'"
+    " AND date(completed_at) BETWEEN :since AND :until"
+    ") GROUP BY day"
+)
+SCAN_STATUS = text("SELECT context, status, count(*) FROM tasks GROUP BY 1, 2")
+SCAN_OVERDUE = text(
+    "SELECT context, count(*) FROM tasks WHERE status NOT IN ('done', 'archived')"
+    " AND due_at IS NOT NULL AND date(due_at) < :today GROUP BY 1"
+)
+
+
+def seed(path: Path, count: int) -> None:
+    """Insert ``count`` tasks spread over 90 days and backfill the rollups."""
+    rng = random.Random(5)
+    start = datetime(2026, 1, 1)
+    rows = []
+    for i in range(count):
+        created = start + timedelta(minutes=rng.randrange(90 * 24 * 60))
+        status = rng.choice(("todo", "doing", "blocked", "done", "done", "archived"))
+        completed = created + timedelta(hours=rng.randrange(1, 200))
+        rows.append(
+            {
+                "id": f"{i:08d}",
+                "title": f"Task {i}",
+                "status": status,
+                "priority": "medium",
+                "context": rng.choice(models.TASK_CONTEXTS),
+                "workspace": None,
+                "due_at": created + timedelta(days=rng.randrange(1, 30)),
+                "tag_ids": [],
+                "created_at": created,
+                "updated_at": completed,
+                "completed_at": completed if status == "done" else None,
+            }
+        )
+    engine = create_sync_database_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Task.__table__), rows)
+    tasks = Task.__table__
+    DataMigration(
+        "bench",
+        tasks,
+        tasks.c.id,
+        backfill_tasks,
+        columns=[tasks.c[key] for key in FIELDS],
+        chunk_size=10_000,
+        duty_cycle=1,
+    ).run(engine)
+    engine.dispose()
+
+
+def best_ms(fn, repeat: int) -> float:
+    """Best-of-``repeat`` milliseconds for one call of ``fn``."""
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - began)
+    return min(timings) * 1000
+
+
+def write_us(engine, writes: int) -> float:
+    """Microseconds per create-then-complete of a task through the ORM."""
+    began = time.perf_counter()
+    with Session(engine) as session:
+        for i in range(writes):
+            task = Task(title=f"Write {i}", due_at=datetime(2026, 4, 1))
+            session.add(task)
+            session.commit()
+            task.status = "done"
+            task.completed_at = datetime.utcnow()
+            session.commit()
+    return (time.perf_counter() - began) / writes * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--writes", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    since = TODAY - timedelta(days=29)
+    window = {"since": since.isoformat(), "until": TODAY.isoformat()}
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "analytics.db"
+        seed(path, args.tasks)
+        engine = create_sync_database_engine(f"sqlite:///{path}")
+        with engine.connect() as connection:
+            scanned = {
+                day: (created, completed)
+                for day, created, completed, _ in connection.execute(
+                    SCAN_ACTIVITY, window
+                )
+            }
+            rolled = {
+                day: (created, completed)
+                for day, (created, completed, _) in activity(
+                    connection, since, TODAY
+                ).items()
+            }
+            assert scanned == rolled, "rollups disagree with the tasks table"
+
+            def scan() -> None:
+                connection.execute(SCAN_ACTIVITY, window).all()
+                connection.execute(SCAN_STATUS).all()
+                connection.execute(SCAN_OVERDUE, {"today": TODAY.isoformat()}).all()
+
+            def rollups() -> None:
+                activity(connection, since, TODAY)
+                status_counts(connection, TODAY)
+
+            print(f"dashboard over {args.tasks} tasks (best of {args.repeat})")
+            print(f"  scan tasks   {best_ms(scan, args.repeat):8.2f} ms")
+            print(f"  rollups      {best_ms(rollups, args.repeat):8.2f} ms")
+
+        with_rollups = write_us(engine, args.writes)
+        event.remove(Session, "before_flush", models._record_task_changes)
+        without = write_us(engine, args.writes)
+        print(f"create + complete, {args.writes} tasks")
+        print(f"  with rollups    {with_rollups:8.1f} us/task")
+        print(f"  without rollups {without:8.1f} us/task")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
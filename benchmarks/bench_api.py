@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+API benchmark suite
+
+Seeds a database with synthetic tasks (``benchmarks/synthetic.py``), drives
+every route of the task API, plus saved views and analytics, through the
+FastAPI app in-process (an ASGI client, no server or sockets), and reports
+p50, p95 and p99 latency and throughput per route. Results are written as
+JSON (to stdout, or ``--output``; progress goes to stderr) with the commit
+they were measured at, and ``--compare`` prints the change from an earlier
+result file, so two commits can be compared:
+
+    git checkout main && python benchmarks/bench_api.py --output main.json
+    git checkout topic && python benchmarks/bench_api.py --compare main.json
+
+The reminder stream (``GET /reminders``) never ends, so it is left to
+``benchmarks/bench_reminders.py``. Seeding a million tasks takes minutes;
+with ``--cache-dir`` each seeded database is kept and copied for later runs.
+
+Usage:
+    python benchmarks/bench_api.py [--tasks 10k|100k|1M] [--requests 500]
+        [--warmup 50] [--concurrency 1] [--seed 50] [--routes get_task,...]
+        [--cache-dir .bench-cache] [--output results.json]
+        [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+import httpx
+import sqlalchemy
+import synthetic
+from fastapi import Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import (
+    READ_ONLY_METHODS,
+    create_database_engine,
+    create_sync_database_engine,
+    get_db,
+)
+from tick_task.main import app
+from tick_task.models import CLOSED_STATUSES, Task
+
+API = "/api/v1"
+FORMAT = 1
+
+
+class Call(NamedTuple):
+    """One request: method, path and ``httpx`` keyword arguments."""
+
+    method: str
+    path: str
+    options: dict[str, Any] = {}
+
+
+class Fixtures:
+    """Task ids to aim requests at, and the state routes leave for others.
+
+    Ids are the first tasks by id, which, ids being random, is a random
+    sample that does not change between runs. Routes that change a task
+    (update, delete, dependencies) each take their own open tasks, once.
+    """
+
+    def __init__(self, tasks: list[Any], open_tasks: list[Any], per_route: int):
+        self.ids = [task.id for task in tasks]
+        self.parents = sorted({task.parent_id for task in tasks if task.parent_id})
+        open_ids = [task.id for task in open_tasks]
+        self._open = iter(open_ids)
+        self.to_update = self.take(per_route)
+        self.to_delete = self.take(per_route)
+        self.to_link = self.take(2 * per_route)
+        self.updated: list[str] = []
+        self.linked: list[tuple[str, str]] = []
+        self.views: list[str] = []
+        self.renamed = False
+
+    def take(self, count: int) -> Iterator[str]:
+        """The next ``count`` open tasks no other route takes."""
+        return iter([task_id for _, task_id in zip(range(count), self._open)])
+
+
+def _list_filters(rng: random.Random) -> dict[str, Any]:
+    """The task list queries a client makes, most common first."""
+    due = (synthetic.NOW + timedelta(days=rng.choice([1, 7, 30]))).isoformat()
+    return rng.choice(
+        [
+            {},
+            {"status": ["todo", "doing"]},
+            {"status": ["todo", "doing"], "sort": "due_at", "order": "asc"},
+            {"workspace": rng.choice(synthetic.WORKSPACES)},
+            {"context": rng.choice(list(synthetic.CONTEXTS)), "priority": "high"},
+            {"status": ["todo"], "due_before": due, "sort": "due_at", "order": "asc"},
+            {"ready": "true", "sort": "priority"},
+        ]
+    )
+
+
+def _new_task(rng: random.Random) -> dict[str, Any]:
+    return {
+        "title": f"{rng.choice(synthetic.VERBS)} {rng.choice(synthetic.OBJECTS)}"
+        f" #{rng.randrange(1_000_000)}",
+        "priority": rng.choice(list(synthetic.PRIORITIES)),
+        "context": rng.choice(list(synthetic.CONTEXTS)),
+        "workspace": rng.choice(synthetic.WORKSPACES),
+        "tags": rng.sample(synthetic.TAGS[:12], rng.randint(0, 3)),
+        "due_at": (synthetic.NOW + timedelta(days=rng.randint(1, 60))).isoformat(),
+    }
+
+
+def _create_view(fixtures: Fixtures, rng: random.Random) -> Call:
+    return Call(
+        "POST",
+        "/views",
+        {
+            "json": {
+                "name": f"View {len(fixtures.views)}",
+                "filters": _list_filters(rng),
+            }
+        },
+    )
+
+
+def _update_task(fixtures: Fixtures, rng: random.Random) -> Call:
+    task_id = next(fixtures.to_update)
+    fixtures.updated.append(task_id)
+    return Call(
+        "PUT",
+        f"/tasks/{task_id}",
+        {
+            "json": {
+                "priority": rng.choice(list(synthetic.PRIORITIES)),
+                # Always a change, so there is one to undo
+                "description": f"{rng.choice(synthetic.SENTENCES)} ({task_id})",
+            }
+        },
+    )
+
+
+def _undo(fixtures: Fixtures, rng: random.Random) -> Call:
+    return Call("POST", f"/tasks/{fixtures.updated.pop()}/undo")
+
+
+def _add_dependency(fixtures: Fixtures, rng: random.Random) -> Call:
+    # Disjoint pairs: no chains to walk and never a cycle
+    task_id, blocker_id = next(fixtures.to_link), next(fixtures.to_link)
+    fixtures.linked.append((task_id, blocker_id))
+    return Call(
+        "POST", f"/tasks/{task_id}/dependencies", {"json": {"blocker_id": blocker_id}}
+    )
+
+
+def _remove_dependency(fixtures: Fixtures, rng: random.Random) -> Call:
+    task_id, blocker_id = fixtures.linked.pop()
+    return Call("DELETE", f"/tasks/{task_id}/dependencies/{blocker_id}")
+
+
+def _rename_tag(fixtures: Fixtures, rng: random.Random) -> Call:
+    # Back and forth, so the vocabulary ends as it began
+    names = ["waiting", "on-hold"]
+    if fixtures.renamed:
+        names.reverse()
+    fixtures.renamed = not fixtures.renamed
+    return Call(
+        "POST", "/tags/rename", {"json": dict(zip(["name", "new_name"], names))}
+    )
+
+
+class Route(NamedTuple):
+    """A benchmarked route: its name, path template and request maker.
+
+    ``after`` names the route whose writes its requests are aimed at.
+    """
+
+    name: str
+    method: str
+    path: str
+    call: Callable[[Fixtures, random.Random], Call]
+    expected: int = 200
+    after: Optional[str] = None
+
+
+# In run order: reads first, then writes, each write route leaving the tasks
+# the routes after it need (updated tasks to undo, dependencies to remove)
+ROUTES = [
+    Route("health", "GET", "/health", lambda f, r: Call("GET", "/health")),
+    Route(
+        "get_task",
+        "GET",
+        "/tasks/{task_id}",
+        lambda f, r: Call("GET", f"/tasks/{r.choice(f.ids)}"),
+    ),
+    Route(
+        "get_task_subtree",
+        "GET",
+        "/tasks/{task_id}?include=subtree,progress",
+        lambda f, r: Call(
+            "GET",
+            f"/tasks/{r.choice(f.parents)}",
+            {"params": {"include": "subtree,progress"}},
+        ),
+    ),
+    Route(
+        "list_tasks",
+        "GET",
+        "/tasks",
+        lambda f, r: Call("GET", "/tasks", {"params": _list_filters(r)}),
+    ),
+    Route(
+        "list_tasks_ndjson",
+        "GET",
+        "/tasks (NDJSON)",
+        lambda f, r: Call(
+            "GET",
+            "/tasks",
+            {
+                "params": {**_list_filters(r), "limit": 1000},
+                "headers": {"Accept": "application/x-ndjson"},
+            },
+        ),
+    ),
+    Route(
+        "list_tags",
+        "GET",
+        "/tags?prefix=",
+        lambda f, r: Call(
+            "GET", "/tags", {"params": {"prefix": r.choice(synthetic.TAGS)[:2]}}
+        ),
+    ),
+    Route(
+        "analytics_activity",
+        "GET",
+        "/analytics/activity",
+        lambda f, r: Call(
+            "GET",
+            "/analytics/activity",
+            {"params": {"since": (synthetic.NOW - timedelta(days=90)).date()}},
+        ),
+    ),
+    Route(
+        "analytics_status",
+        "GET",
+        "/analytics/status",
+        lambda f, r: Call("GET", "/analytics/status"),
+    ),
+    Route("create_view", "POST", "/views", _create_view, 201),
+    # Clients reopen a handful of views, mostly between writes
+    Route(
+        "open_view",
+        "GET",
+        "/views/{view_id}/tasks",
+        lambda f, r: Call("GET", f"/views/{r.choice(f.views[:10])}/tasks"),
+        after="create_view",
+    ),
+    Route(
+        "create_task",
+        "POST",
+        "/tasks",
+        lambda f, r: Call("POST", "/tasks", {"json": _new_task(r)}),
+        201,
+    ),
+    Route(
+        "create_tasks_batch",
+        "POST",
+        "/tasks/batch (50 tasks)",
+        lambda f, r: Call(
+            "POST", "/tasks/batch", {"json": [_new_task(r) for _ in range(50)]}
+        ),
+        201,
+    ),
+    Route("update_task", "PUT", "/tasks/{task_id}", _update_task),
+    Route(
+        "task_history",
+        "GET",
+        "/tasks/{task_id}/history",
+        lambda f, r: Call("GET", f"/tasks/{r.choice(f.updated)}/history"),
+        after="update_task",
+    ),
+    Route("undo_task", "POST", "/tasks/{task_id}/undo", _undo, after="update_task"),
+    Route(
+        "add_dependency",
+        "POST",
+        "/tasks/{task_id}/dependencies",
+        _add_dependency,
+        201,
+    ),
+    Route(
+        "list_dependencies",
+        "GET",
+        "/tasks/{task_id}/dependencies",
+        lambda f, r: Call("GET", f"/tasks/{r.choice(f.linked)[0]}/dependencies"),
+        after="add_dependency",
+    ),
+    Route(
+        "remove_dependency",
+        "DELETE",
+        "/tasks/{task_id}/dependencies/{blocker_id}",
+        _remove_dependency,
+        after="add_dependency",
+    ),
+    Route("rename_tag", "POST", "/tags/rename", _rename_tag),
+    Route(
+        "delete_task",
+        "DELETE",
+        "/tasks/{task_id}",
+        lambda f, r: Call("DELETE", f"/tasks/{next(f.to_delete)}"),
+    ),
+]
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(route: Route, latencies: list[float], errors: int, elapsed: float):
+    """The JSON result of one route."""
+    ordered = sorted(latencies)
+    return {
+        "method": route.method,
+        "path": route.path,
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "throughput_rps": round(len(ordered) / elapsed, 1),
+    }
+
+
+async def run_route(
+    client: httpx.AsyncClient,
+    route: Route,
+    fixtures: Fixtures,
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    """Warm ``route`` up, then time ``args.requests`` requests to it."""
+    rng = random.Random(f"{args.seed}-{route.name}")
+    errors: list[str] = []
+
+    async def send(call: Call) -> float:
+        start = time.perf_counter()
+        response = await client.request(call.method, API + call.path, **call.options)
+        latency = time.perf_counter() - start
+        if response.status_code != route.expected:
+            errors.append(f"{response.status_code} {response.text[:200]}")
+        elif route.name == "create_view":
+            fixtures.views.append(response.json()["id"])
+        return latency
+
+    for _ in range(args.warmup):
+        await send(route.call(fixtures, rng))
+    warmup_errors = len(errors)
+
+    # Requests are made up front (in order), so workers only send them
+    calls = iter([route.call(fixtures, rng) for _ in range(args.requests)])
+    latencies: list[float] = []
+
+    async def worker() -> None:
+        for call in calls:
+            latencies.append(await send(call))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if errors:
+        print(
+            f"{route.name}: {len(errors)} unexpected responses, e.g. {errors[0]}",
+            file=sys.stderr,
+        )
+    return summarize(route, latencies, len(errors) - warmup_errors, elapsed)
+
+
+def fixtures_for(path: Path, per_route: int) -> Fixtures:
+    """Sample the seeded database for the ids routes are aimed at."""
+    engine = create_sync_database_engine(f"sqlite:///{path}")
+    columns = (Task.id, Task.status, Task.parent_id)
+    with engine.connect() as connection:
+        tasks = connection.execute(
+            select(*columns).order_by(Task.id).limit(max(5_000, per_route))
+        ).all()
+        open_tasks = connection.execute(
+            select(*columns)
+            .where(Task.status.not_in(CLOSED_STATUSES))
+            .order_by(Task.id)
+            .limit(4 * per_route)
+        ).all()
+    engine.dispose()
+    if len(open_tasks) < 4 * per_route:
+        raise SystemExit(
+            f"{len(open_tasks)} open tasks; write routes need {4 * per_route}, "
+            "use fewer requests or more tasks"
+        )
+    return Fixtures(tasks, open_tasks, per_route)
+
+
+async def run(path: Path, routes: list[Route], args: argparse.Namespace) -> dict:
+    """Drive ``routes`` against the database at ``path``."""
+    fixtures = fixtures_for(path, args.warmup + args.requests)
+    url = f"sqlite+aiosqlite:///{path}"
+    pragmas = SQLITE_PROFILES["balanced"]
+    write_engine = create_database_engine(url, pragmas, pool_size=1, max_overflow=0)
+    read_engine = create_database_engine(
+        url,
+        {**pragmas, "query_only": True},
+        pool_size=args.concurrency,
+        max_overflow=0,
+    )
+    read_factory = sessionmaker(
+        bind=read_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    write_factory = sessionmaker(
+        bind=write_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db(request: Request):
+        factory = read_factory if request.method in READ_ONLY_METHODS else write_factory
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for route in routes:
+                results[route.name] = await run_route(client, route, fixtures, args)
+                print(_row(route.name, results[route.name]), file=sys.stderr)
+    finally:
+        app.dependency_overrides.clear()
+        await read_engine.dispose()
+        await write_engine.dispose()
+    return results
+
+
+def _git(*command: str) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", *command],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def metadata(args: argparse.Namespace, seed_seconds: float) -> dict[str, Any]:
+    """What the results were measured on."""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "format": FORMAT,
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "measured_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "tasks": args.tasks,
+        "seed": args.seed,
+        "generator_version": synthetic.VERSION,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "seed_seconds": round(seed_seconds, 1),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+
+def _row(name: str, result: dict[str, Any]) -> str:
+    return (
+        f"{name:<20}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+        f"{result['p99_ms']:>10.2f}{result['throughput_rps']:>10.0f}"
+        f"{result['errors']:>8}"
+    )
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before:+.1%}"
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> None:
+    """Print the change of every route from ``baseline``, to stderr."""
+    before, after = baseline["meta"], current["meta"]
+    for key in ("tasks", "seed", "generator_version", "concurrency"):
+        if before.get(key) != after.get(key):
+            print(
+                f"warning: {key} differs ({before.get(key)} vs {after.get(key)})",
+                file=sys.stderr,
+            )
+    print(
+        f"\nchange from {(before.get('commit') or '?')[:12]} "
+        f"to {(after.get('commit') or '?')[:12]}",
+        file=sys.stderr,
+    )
+    print(
+        f"{'route':<20}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>10}",
+        file=sys.stderr,
+    )
+    for name, result in current["routes"].items():
+        base = baseline["routes"].get(name)
+        if base is None:
+            print(f"{name:<20}{'new':>10}", file=sys.stderr)
+            continue
+        print(
+            f"{name:<20}"
+            + "".join(
+                f"{_change(base[key], result[key]):>10}"
+                for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+            ),
+            file=sys.stderr,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=synthetic.parse_count, default="10k")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=50)
+    parser.add_argument(
+        "--routes", help="Comma-separated route names (default: all)", default=None
+    )
+    parser.add_argument("--cache-dir", type=Path, default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    args = parser.parse_args()
+
+    routes = ROUTES
+    if args.routes:
+        names = args.routes.split(",")
+        unknown = set(names) - {route.name for route in ROUTES}
+        if unknown:
+            parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+        # With the routes whose writes they are aimed at
+        wanted = set(names)
+        wanted.update(route.after for route in ROUTES if route.name in wanted)
+        routes = [route for route in ROUTES if route.name in wanted]
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tasks.db"
+        began = time.perf_counter()
+        if args.cache_dir is not None:
+            shutil.copy(synthetic.cached(args.cache_dir, args.tasks, args.seed), path)
+        else:
+            synthetic.create(path, args.tasks, args.seed)
+        seed_seconds = time.perf_counter() - began
+        print(f"{args.tasks} tasks seeded in {seed_seconds:.1f} s\n", file=sys.stderr)
+
+        print(
+            f"{'route':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'req/s':>10}{'errors':>8}",
+            file=sys.stderr,
+        )
+        results = {
+            "meta": metadata(args, seed_seconds),
+            "routes": asyncio.run(run(path, routes, args)),
+        }
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nresults written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if baseline is not None:
+        compare(baseline, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Compact storage layout benchmark
+
+Loads the same synthetic tasks into the text layout, the compact layout and
+the compact WITHOUT ROWID layout, then reports database file size, per-table
+and per-index size (via ``dbstat``) and list/get query latency.
+
+Each layout runs in a subprocess because the model's column types are fixed
+by ``TICK_TASK_COMPACT_STORAGE`` at import time.
+
+Usage:
+    python benchmarks/bench_compact_storage.py [--tasks 1000000] [--queries 50]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+LAYOUTS = {
+    "text": {},
+    "compact": {"TICK_TASK_COMPACT_STORAGE": "true"},
+    "compact-norowid": {
+        "TICK_TASK_COMPACT_STORAGE": "true",
+        "TICK_TASK_COMPACT_WITHOUT_ROWID": "true",
+    },
+}
+
+
+def measure(path: Path, count: int, queries: int) -> dict:
+    """Load ``count`` tasks into ``path`` and measure it (runs in a subprocess)."""
+    import random
+    from datetime import datetime, timedelta
+    from uuid import uuid4
+
+    from sqlalchemy import create_engine, insert, select, text
+    from sqlalchemy.orm import Session
+
+    from tick_task.models import Base, Task
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1)
+    ids = []
+
+    with engine.begin() as conn:
+        for offset in range(0, count, 10_000):
+            rows = []
+            for _ in range(min(10_000, count - offset)):
+                created = start + timedelta(minutes=rng.randrange(525_600))
+                task_id = str(uuid4())
+                ids.append(task_id)
+                rows.append(
+                    {
+                        "id": task_id,
+                        "title": f"Task {rng.randrange(10**6)}",
+                        "description": None,
+                        "status": rng.choice(["todo", "doing", "blocked", "done"]),
+                        "priority": rng.choice(["low", "medium", "high", "urgent"]),
+                        "due_at": created + timedelta(days=rng.randrange(60)),
+                        "tag_ids": [],
+                        "context": rng.choice(["personal", "professional", "mixed"]),
+                        "workspace": None,
+                        "created_at": created,
+                        "updated_at": created + timedelta(hours=rng.randrange(48)),
+                        "completed_at": None,
+                    }
+                )
+            conn.execute(insert(Task.__table__), rows)
+        conn.execute(text("ANALYZE"))
+
+    with engine.connect() as conn:
+        sizes = dict(
+            conn.execute(
+                text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+            ).all()
+        )
+
+    list_query = (
+        select(Task)
+        .where(Task.status.in_(["todo", "doing"]))
+        .order_by(Task.updated_at.desc())
+        .limit(100)
+    )
+    list_times, get_times = [], []
+    with Session(engine) as session:
+        for _ in range(queries):
+            began = time.perf_counter()
+            session.execute(list_query).scalars().all()
+            list_times.append(time.perf_counter() - began)
+            session.expunge_all()
+
+            began = time.perf_counter()
+            session.get(Task, rng.choice(ids))
+            get_times.append(time.perf_counter() - began)
+            session.expunge_all()
+
+    engine.dispose()
+    table_bytes = sizes.pop("tasks", 0)
+    return {
+        "file_bytes": path.stat().st_size,
+        "table_bytes": table_bytes,
+        "index_bytes": sum(
+            v
+            for k, v in sizes.items()
+            if k.startswith(("ix_", "sqlite_autoindex_tasks"))
+        ),
+        "list_ms_p50": statistics.median(list_times) * 1000,
+        "get_ms_p50": statistics.median(get_times) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    parser.add_argument("--measure", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, args.tasks, args.queries)))
+        return
+
+    print(
+        f"{'layout':<17}{'file MB':>9}{'table MB':>10}{'index MB':>10}"
+        f"{'list ms':>9}{'get ms':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in args.layouts:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--tasks",
+                    str(args.tasks),
+                    "--queries",
+                    str(args.queries),
+                    "--measure",
+                    str(Path(tmp) / f"{layout}.db"),
+                ],
+                env={**os.environ, **LAYOUTS[layout]},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            mb = 1024 * 1024
+            print(
+                f"{layout:<17}{result['file_bytes'] / mb:>9.1f}"
+                f"{result['table_bytes'] / mb:>10.1f}"
+                f"{result['index_bytes'] / mb:>10.1f}"
+                f"{result['list_ms_p50']:>9.2f}{result['get_ms_p50']:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
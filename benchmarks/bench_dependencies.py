@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Task dependency benchmark
+
+Builds a layered plan (each task blocked by a few tasks of the layer before
+it), then adds more dependencies between random tasks of the plan, some of
+them backwards (cycles to refuse). Compares checking each new edge with the
+incremental topological order kept by ``tick_task.dependencies`` against a
+recursive query over everything the task reaches, and the ready filter on
+the ``open_blockers`` count against finding unblocked tasks through the
+edge table.
+
+Usage:
+    python benchmarks/bench_dependencies.py [--tasks 5000] [--layer 50]
+        [--blockers 3] [--edges 1000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.engine import Connection
+
+from tick_task.database import create_sync_database_engine
+from tick_task.dependencies import DependencyCycle, _place
+from tick_task.models import CLOSED_STATUSES, Base, Task, TaskDependency
+
+REACHES = text(
+    "WITH RECURSIVE reach(id) AS ("
+    " SELECT :task"
+    " UNION SELECT d.task_id FROM task_dependencies d JOIN reach r"
+    " ON d.blocker_id = r.id)"
+    " SELECT 1 FROM reach WHERE id = :blocker"
+)
+
+tasks = Task.__table__
+edges = TaskDependency.__table__
+
+
+def incremental(connection: Connection, task_id: str, blocker_id: str) -> bool:
+    """Check with the topological order; True if the edge was added."""
+    try:
+        _place(connection, blocker_id, task_id)
+    except DependencyCycle:
+        return False
+    connection.execute(insert(edges), {"task_id": task_id, "blocker_id": blocker_id})
+    return True
+
+
+def recursive(connection: Connection, task_id: str, blocker_id: str) -> bool:
+    """Check by walking everything ``task_id`` blocks."""
+    params = {"task": task_id, "blocker": blocker_id}
+    if connection.execute(REACHES, params).first() is not None:
+        return False
+    connection.execute(insert(edges), {"task_id": task_id, "blocker_id": blocker_id})
+    return True
+
+
+def timed(
+    connection: Connection,
+    check: Callable[[Connection, str, str], bool],
+    pairs: list[tuple[str, str]],
+) -> tuple[float, int]:
+    """Microseconds per edge and edges refused; the edges are rolled back."""
+    savepoint = connection.begin_nested()
+    began = time.perf_counter()
+    refused = sum(not check(connection, *pair) for pair in pairs)
+    elapsed = (time.perf_counter() - began) / len(pairs) * 1e6
+    savepoint.rollback()
+    return elapsed, refused
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--layer", type=int, default=50)
+    parser.add_argument("--blockers", type=int, default=3)
+    parser.add_argument("--edges", type=int, default=1_000)
+    args = parser.parse_args()
+    rng = random.Random(11)
+    ids = [f"{i:08d}" for i in range(args.tasks)]
+    now = datetime(2026, 3, 2)
+
+    plan = {
+        (ids[index], ids[index - index % args.layer - 1 - rng.randrange(args.layer)])
+        for index in range(args.layer, args.tasks)
+        for _ in range(args.blockers)
+    }
+    extra = []
+    while len(extra) < args.edges:
+        task, blocker = sorted(rng.sample(range(args.tasks), 2), reverse=True)
+        if task // args.layer == blocker // args.layer:
+            continue
+        # One in ten backwards: the blocker comes later in the plan
+        pair = (ids[task], ids[blocker])
+        extra.append(pair[::-1] if rng.random() < 0.1 else pair)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sync_database_engine(f"sqlite:///{directory}/tasks.db")
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(tasks),
+                [
+                    {
+                        "id": task_id,
+                        "title": "Task",
+                        "status": "todo",
+                        "priority": "medium",
+                        "context": "personal",
+                        "tag_ids": [],
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for task_id in ids
+                ],
+            )
+            began = time.perf_counter()
+            for task_id, blocker_id in sorted(plan):
+                incremental(connection, task_id, blocker_id)
+            build_s = time.perf_counter() - began
+
+            incremental_us, refused = timed(connection, incremental, extra)
+            recursive_us, recursive_refused = timed(connection, recursive, extra)
+            assert refused == recursive_refused
+
+            # Finish half the tasks; count what add_dependency would keep
+            connection.execute(
+                update(tasks)
+                .where(tasks.c.id.in_(rng.sample(ids, args.tasks // 2)))
+                .values(status="done")
+            )
+            blocker = tasks.alias("blocker")
+            open_count = (
+                select(func.count())
+                .select_from(edges.join(blocker, blocker.c.id == edges.c.blocker_id))
+                .where(
+                    edges.c.task_id == tasks.c.id,
+                    blocker.c.status.not_in(CLOSED_STATUSES),
+                )
+                .scalar_subquery()
+            )
+            connection.execute(update(tasks).values(open_blockers=open_count))
+
+            open_task = tasks.c.status.not_in(CLOSED_STATUSES)
+            repeat = 50
+            began = time.perf_counter()
+            for _ in range(repeat):
+                ready = connection.execute(
+                    select(func.count()).where(open_task, tasks.c.open_blockers == 0)
+                ).scalar()
+            indexed_ms = (time.perf_counter() - began) / repeat * 1000
+
+            blocked = (
+                select(edges.c.task_id)
+                .join(blocker, blocker.c.id == edges.c.blocker_id)
+                .where(blocker.c.status.not_in(CLOSED_STATUSES))
+            )
+            began = time.perf_counter()
+            for _ in range(repeat):
+                joined = connection.execute(
+                    select(func.count()).where(open_task, tasks.c.id.not_in(blocked))
+                ).scalar()
+            joined_ms = (time.perf_counter() - began) / repeat * 1000
+        engine.dispose()
+
+    print(f"{args.tasks} tasks, {len(plan)} planned dependencies")
+    print(f"  build plan          {build_s:8.2f} s")
+    print(f"{len(extra)} dependencies added to the plan, {refused} cycles refused")
+    print(f"  check (incremental) {incremental_us:8.1f} us/edge")
+    print(f"  check (recursive)   {recursive_us:8.1f} us/edge")
+    print(f"  ready (count index) {indexed_ms:8.2f} ms ({ready} tasks)")
+    print(f"  ready (edge join)   {joined_ms:8.2f} ms ({joined} tasks)")
+
+
+if __name__ == "__main__":
+    main()
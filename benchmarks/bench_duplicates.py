@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Duplicate detection benchmark
+
+Fills a database with tasks through the ORM, so that ``title_buckets`` is
+kept by ``tick_task.duplicates``, then compares finding the near-duplicates
+of a new title through the banded buckets against comparing it with every
+open task's title. Also reports how many planted duplicates each finds.
+
+Usage:
+    python benchmarks/bench_duplicates.py [--tasks 20000] [--words 5000]
+        [--repeat 100]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from tick_task.config import settings
+from tick_task.database import create_sync_database_engine
+from tick_task.duplicates import find_duplicates, shingles, similarity
+from tick_task.models import CLOSED_STATUSES, Base, Task
+
+
+def vocabulary(rng: random.Random, size: int) -> list[str]:
+    """``size`` made-up words of three to nine letters."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(3, 9)))
+        for _ in range(size)
+    ]
+
+
+def title(rng: random.Random, words: list[str]) -> str:
+    """A random title of three to seven words."""
+    return " ".join(rng.choice(words) for _ in range(rng.randint(3, 7)))
+
+
+def variant(rng: random.Random, text: str) -> str:
+    """``text`` as retyped: other case, punctuation and spacing."""
+    text = text.capitalize() if rng.random() < 0.5 else text.upper()
+    return text.replace(" ", rng.choice([" ", "  ", " - "])) + rng.choice("!. ")
+
+
+def scan(session: Session, task: Task, threshold: float) -> list[str]:
+    """Near-duplicates of ``task`` found by comparing every open title."""
+    own = shingles(task.title)
+    rows = session.execute(
+        select(Task.id, Task.title).where(
+            Task.status.not_in(CLOSED_STATUSES), Task.workspace.is_(None)
+        )
+    )
+    return [row.id for row in rows if similarity(own, shingles(row.title)) >= threshold]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--words", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    rng = random.Random(48)
+    threshold = settings.duplicate_threshold
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sync_database_engine(f"sqlite:///{directory}/tasks.db")
+        Base.metadata.create_all(engine)
+        with Session(engine, expire_on_commit=False) as session:
+            words = vocabulary(rng, args.words)
+            titles = [title(rng, words) for _ in range(args.tasks)]
+            began = time.perf_counter()
+            for start in range(0, args.tasks, 1_000):
+                session.add_all(
+                    Task(title=text) for text in titles[start : start + 1_000]
+                )
+                session.commit()
+            write_us = (time.perf_counter() - began) / args.tasks * 1e6
+
+            probes = [
+                Task(title=variant(rng, rng.choice(titles))) for _ in range(args.repeat)
+            ]
+            timings = {}
+            found = {}
+            for name, check in (
+                (
+                    "banded buckets",
+                    lambda task: find_duplicates(session, [task], threshold),
+                ),
+                ("full scan", lambda task: scan(session, task, threshold)),
+            ):
+                began = time.perf_counter()
+                found[name] = sum(bool(check(task)) for task in probes)
+                timings[name] = (time.perf_counter() - began) / args.repeat * 1000
+        engine.dispose()
+
+    print(f"{args.tasks} tasks, {args.repeat} retyped titles looked up")
+    print(f"  write (task + buckets)  {write_us:8.1f} us/task")
+    for name, elapsed in timings.items():
+        print(f"  {name:22}  {elapsed:8.3f} ms ({found[name]} found)")
+
+
+if __name__ == "__main__":
+    main()
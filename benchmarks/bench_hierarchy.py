@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Subtask hierarchy benchmark
+
+Builds a forest of task trees through the ORM, so that the closure table is
+filled by ``tick_task.hierarchy``, then compares fetching subtrees and their
+progress through the closure table against a recursive query that follows
+``parent_id`` down from the root. Also times moving subtrees.
+
+Usage:
+    python benchmarks/bench_hierarchy.py [--trees 20] [--fanout 6] [--depth 4]
+        [--repeat 200]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.orm import Session
+
+from tick_task.database import create_sync_database_engine
+from tick_task.hierarchy import _PROGRESS, subtree
+from tick_task.models import Base, Task
+
+tasks = Task.__table__
+
+
+def recursive_tree(task_id: str):
+    """The recursive CTE seeded with ``task_id``."""
+    seed = select(tasks.c.id, literal(0).label("depth")).where(tasks.c.id == task_id)
+    tree = seed.cte("tree", recursive=True)
+    return tree.union_all(
+        select(tasks.c.id, tree.c.depth + 1).join(tree, tasks.c.parent_id == tree.c.id)
+    )
+
+
+def recursive_subtree_statement(task_id: str):
+    """Subtasks of ``task_id`` found by following ``parent_id``."""
+    tree = recursive_tree(task_id)
+    return (
+        select(Task)
+        .join(tree, tree.c.id == Task.id)
+        .where(tree.c.depth > 0)
+        .order_by(tree.c.depth, Task.created_at)
+    )
+
+
+def recursive_progress_statement(task_id: str):
+    """Done and total subtasks of ``task_id`` found by following ``parent_id``."""
+    tree = recursive_tree(task_id)
+    return (
+        select(func.sum(case((tasks.c.status == "done", 1), else_=0)), func.count())
+        .select_from(tasks.join(tree, tree.c.id == tasks.c.id))
+        .where(tree.c.depth > 0, tasks.c.status != "archived")
+    )
+
+
+def build(session: Session, trees: int, fanout: int, depth: int) -> list[Task]:
+    """Add the forest level by level; return the roots."""
+    roots = [Task(title="Root") for _ in range(trees)]
+    session.add_all(roots)
+    level = roots
+    for _ in range(depth):
+        level = [
+            Task(title="Task", parent_id=parent.id)
+            for parent in level
+            for _ in range(fanout)
+        ]
+        session.add_all(level)
+    session.commit()
+    return roots
+
+
+def per_call(repeat: int, call) -> float:
+    """Milliseconds per call."""
+    began = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - began) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--fanout", type=int, default=6)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sync_database_engine(f"sqlite:///{directory}/tasks.db")
+        Base.metadata.create_all(engine)
+        with Session(engine, expire_on_commit=False) as session:
+            began = time.perf_counter()
+            roots = build(session, args.trees, args.fanout, args.depth)
+            build_s = time.perf_counter() - began
+            connection = session.connection()
+
+            def closure_subtree() -> int:
+                return len(subtree(session, rng.choice(roots)))
+
+            def recursive_subtree() -> int:
+                statement = recursive_subtree_statement(rng.choice(roots).id)
+                return len(session.execute(statement).scalars().all())
+
+            def closure_progress() -> tuple:
+                params = {"task_id": rng.choice(roots).id}
+                return tuple(connection.execute(_PROGRESS, params).one())
+
+            def recursive_progress() -> tuple:
+                statement = recursive_progress_statement(rng.choice(roots).id)
+                return tuple(connection.execute(statement).one())
+
+            size = closure_subtree()
+            assert size == recursive_subtree()
+            timings = {
+                "subtree (closure)": per_call(args.repeat, closure_subtree),
+                "subtree (recursive)": per_call(args.repeat, recursive_subtree),
+                "progress (closure)": per_call(args.repeat, closure_progress),
+                "progress (recursive)": per_call(args.repeat, recursive_progress),
+            }
+
+            # Move a task one level below the roots, with its subtree
+            movable = session.scalars(
+                select(Task).where(Task.parent_id.in_([root.id for root in roots]))
+            ).all()
+            moves = min(args.repeat, len(movable))
+            began = time.perf_counter()
+            for task in rng.sample(movable, moves):
+                task.parent_id = rng.choice(roots).id
+                session.flush()
+            timings["move subtree"] = (time.perf_counter() - began) / moves * 1000
+            session.rollback()
+        engine.dispose()
+
+    total = args.trees * sum(args.fanout**level for level in range(args.depth + 1))
+    print(f"{total} tasks in {args.trees} trees, {size} subtasks per tree")
+    print(f"  build                {build_s:8.2f} s")
+    for name, elapsed in timings.items():
+        print(f"  {name:20} {elapsed:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Task history benchmark
+
+Edits a few tasks many times through the ORM, so that every write appends
+its event as ``tick_task.history`` does, then compares reading a task's
+history and rebuilding its latest state from the full event log against
+the same after compaction has folded all but the latest events into a
+snapshot.
+
+Usage:
+    python benchmarks/bench_history.py [--tasks 5] [--edits 2000] [--keep 100]
+        [--repeat 50]
+"""
+
+import argparse
+import tempfile
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from tick_task.database import create_sync_database_engine
+from tick_task.history import compact_history, state_at, task_history
+from tick_task.models import Base, Task, TaskEvent
+
+
+def rebuild_ms(session: Session, task_ids: list[str], repeat: int) -> float:
+    """Milliseconds to read a history and rebuild the latest state."""
+    connection = session.connection()
+    began = time.perf_counter()
+    for index in range(repeat):
+        snapshot, events = task_history(connection, task_ids[index % len(task_ids)])
+        state_at(snapshot, events, events[-1].id)
+    return (time.perf_counter() - began) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5)
+    parser.add_argument("--edits", type=int, default=2_000)
+    parser.add_argument("--keep", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sync_database_engine(f"sqlite:///{directory}/tasks.db")
+        Base.metadata.create_all(engine)
+        with Session(engine, expire_on_commit=False) as session:
+            tasks = [Task(title="Task 0") for _ in range(args.tasks)]
+            session.add_all(tasks)
+            session.commit()
+            began = time.perf_counter()
+            for edit in range(1, args.edits + 1):
+                for task in tasks:
+                    task.title = f"Task {edit}"
+                    task.priority = ("low", "medium", "high")[edit % 3]
+                session.commit()
+            write_us = (time.perf_counter() - began) / args.edits / args.tasks * 1e6
+
+            task_ids = [task.id for task in tasks]
+            count = select(func.count()).select_from(TaskEvent)
+            events_before = session.scalar(count)
+            full_ms = rebuild_ms(session, task_ids, args.repeat)
+
+            began = time.perf_counter()
+            folded = compact_history(session.connection(), args.keep)
+            session.commit()
+            compact_s = time.perf_counter() - began
+            events_after = session.scalar(count)
+            compacted_ms = rebuild_ms(session, task_ids, args.repeat)
+        engine.dispose()
+
+    print(f"{args.tasks} tasks edited {args.edits} times")
+    print(f"  write (task + event)   {write_us:8.1f} us/task")
+    print(f"  rebuild (full log)     {full_ms:8.2f} ms ({events_before} events)")
+    print(f"  compact                {compact_s:8.2f} s ({folded} folded)")
+    print(f"  rebuild (compacted)    {compacted_ms:8.2f} ms ({events_after} events)")
+
+
+if __name__ == "__main__":
+    main()
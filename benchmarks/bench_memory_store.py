@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Memory-first storage engine benchmark
+
+Runs the API's operation mix (get, list, update, create) through the FastAPI
+app twice over the same synthetic tasks: once on the SQLite path and once on
+the memory store (``TICK_TASK_STORAGE_ENGINE=memory``), and reports
+throughput, mean latency per operation, and the memory store's recovery time.
+
+Usage:
+    python benchmarks/bench_memory_store.py [--tasks 20000] [--ops 4000]
+        [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from tick_task import api
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import create_database_engine, get_db
+from tick_task.main import app
+from tick_task.memory_store import MemoryStore
+from tick_task.models import Base, Task
+from tick_task.tags import intern_tags
+
+COLUMNS = [column for column in Task.__table__.columns if column.key != "tag_ids"]
+OPERATION_MIX = {"get": 0.60, "list": 0.20, "update": 0.15, "create": 0.05}
+
+
+def make_tasks(count: int) -> list[Task]:
+    rng = random.Random(11)
+    return [
+        Task(
+            title=f"Seed task {i}",
+            description="Benchmark seed data",
+            status=rng.choice(["todo", "doing", "blocked", "done"]),
+            priority=rng.choice(["low", "medium", "high", "urgent"]),
+            tags=["bench", f"group-{i % 10}"],
+        )
+        for i in range(count)
+    ]
+
+
+async def run_mix(ids: list[str], args: argparse.Namespace) -> dict:
+    """Drive the operation mix through the app; return ops/s and mean latency."""
+    operations = list(OPERATION_MIX)
+    weights = list(OPERATION_MIX.values())
+    latencies: dict[str, list[float]] = {operation: [] for operation in operations}
+
+    async def worker(worker_id: int, count: int) -> None:
+        rng = random.Random(worker_id)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for _ in range(count):
+                operation = rng.choices(operations, weights)[0]
+                start = time.perf_counter()
+                if operation == "get":
+                    response = await client.get(f"/api/v1/tasks/{rng.choice(ids)}")
+                elif operation == "list":
+                    response = await client.get(
+                        "/api/v1/tasks", params={"status": "todo", "limit": 50}
+                    )
+                elif operation == "update":
+                    response = await client.put(
+                        f"/api/v1/tasks/{rng.choice(ids)}",
+                        json={"priority": rng.choice(["low", "high"])},
+                    )
+                else:
+                    response = await client.post(
+                        "/api/v1/tasks", json={"title": "Bench task"}
+                    )
+                latencies[operation].append(time.perf_counter() - start)
+                response.raise_for_status()
+
+    per_worker = args.ops // args.concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i, per_worker) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "ops_per_sec": per_worker * args.concurrency / elapsed,
+        "mean_ms": {
+            operation: statistics.fmean(values) * 1000
+            for operation, values in latencies.items()
+            if values
+        },
+    }
+
+
+async def bench_sqlite(tasks: list[Task], args: argparse.Namespace, workdir: Path):
+    engine = create_database_engine(
+        f"sqlite+aiosqlite:///{workdir / 'bench.db'}", SQLITE_PROFILES["balanced"]
+    )
+
+    def seed(conn) -> None:
+        Base.metadata.create_all(conn)
+        conn.execute(
+            insert(Task.__table__),
+            [
+                {
+                    **{column.key: getattr(task, column.key) for column in COLUMNS},
+                    "tag_ids": intern_tags(conn, task.tags)[0],
+                }
+                for task in tasks
+            ],
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(seed)
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        return await run_mix([task.id for task in tasks], args)
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+
+
+async def bench_memory(tasks: list[Task], args: argparse.Namespace, workdir: Path):
+    store = MemoryStore(workdir / "memory", snapshot_interval=0)
+    await store.open()
+    for offset in range(0, len(tasks), 1000):
+        await asyncio.gather(
+            *(store.save(task) for task in tasks[offset : offset + 1000])
+        )
+    await store.snapshot()
+
+    previous, api.memory_store = api.memory_store, store
+    try:
+        result = await run_mix([task.id for task in tasks], args)
+    finally:
+        api.memory_store = previous
+        await store.close()
+
+    recovered = MemoryStore(workdir / "memory", snapshot_interval=0)
+    started = time.perf_counter()
+    await recovered.open()
+    result["recovery_s"] = time.perf_counter() - started
+    await recovered.close()
+    return result
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        results = {
+            "sqlite": await bench_sqlite(make_tasks(args.tasks), args, workdir),
+            "memory": await bench_memory(make_tasks(args.tasks), args, workdir),
+        }
+
+    operations = list(OPERATION_MIX)
+    header = "".join(f"{operation + ' ms':>12}" for operation in operations)
+    print(f"{'engine':<10}{'ops/s':>10}{header}")
+    for engine, result in results.items():
+        means = "".join(
+            f"{result['mean_ms'].get(operation, float('nan')):>12.2f}"
+            for operation in operations
+        )
+        print(f"{engine:<10}{result['ops_per_sec']:>10.0f}{means}")
+    print(f"memory store recovery: {results['memory']['recovery_s']:.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--ops", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
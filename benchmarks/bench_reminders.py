@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Reminder scheduler benchmark
+
+Loads reminders for a year of due dates into the heap and timer wheel of
+``ReminderScheduler`` and measures what keeping them current costs (one
+``track`` per task write) and what finding the due ones costs per pass,
+against polling the ``due_at`` index of a SQLite table holding the same
+tasks once per pass.
+
+Usage:
+    python benchmarks/bench_reminders.py [--tasks 100000] [--updates 100000]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert, select
+
+from tick_task.database import create_sync_database_engine
+from tick_task.models import Base, Task
+from tick_task.reminders import Reminder, ReminderScheduler
+
+START = datetime(2026, 1, 1)
+YEAR_SECONDS = 365 * 24 * 3600
+
+
+def due_times(count: int, rng: random.Random) -> list[datetime]:
+    """Due times spread uniformly over a year."""
+    return [
+        START + timedelta(seconds=rng.randrange(YEAR_SECONDS)) for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+    ids = [f"{i:08d}" for i in range(args.tasks)]
+    due = due_times(args.tasks, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        scheduler = ReminderScheduler(
+            Path(directory) / "reminders.json", clock=lambda: START
+        )
+        scheduler.read_cursor()
+        began = time.perf_counter()
+        scheduler.load(Reminder(i, "Task", d) for i, d in zip(ids, due))
+        load_ms = (time.perf_counter() - began) * 1000
+
+        moves = due_times(args.updates, rng)
+        tasks = [Task(id=rng.choice(ids), title="Task", due_at=when) for when in moves]
+        began = time.perf_counter()
+        for task in tasks:
+            scheduler.track(task)
+        track_us = (time.perf_counter() - began) / args.updates * 1_000_000
+
+        # One pass a minute for a day: pour buckets, pop what fell due
+        passes = 24 * 60
+        fired = 0
+        began = time.perf_counter()
+        for minute in range(1, passes + 1):
+            fired += len(scheduler.due(START + timedelta(minutes=minute)))
+        pass_us = (time.perf_counter() - began) / passes * 1_000_000
+
+        engine = create_sync_database_engine(f"sqlite:///{directory}/tasks.db")
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                insert(Task.__table__),
+                [
+                    {
+                        "id": i,
+                        "title": "Task",
+                        "status": "todo",
+                        "priority": "medium",
+                        "context": "personal",
+                        "due_at": d,
+                        "tag_ids": [],
+                        "created_at": START,
+                        "updated_at": START,
+                    }
+                    for i, d in zip(ids, due)
+                ],
+            )
+        polled = 0
+        began = time.perf_counter()
+        with engine.connect() as connection:
+            for minute in range(1, passes + 1):
+                query = select(Task.id, Task.title, Task.due_at).where(
+                    Task.due_at > START + timedelta(minutes=minute - 1),
+                    Task.due_at <= START + timedelta(minutes=minute),
+                    Task.status.not_in(("done", "archived")),
+                )
+                polled += len(connection.execute(query).all())
+        poll_us = (time.perf_counter() - began) / passes * 1_000_000
+        engine.dispose()
+
+    print(f"{args.tasks} reminders over a year, {args.updates} due-date changes")
+    print(f"  load              {load_ms:8.1f} ms")
+    print(f"  track             {track_us:8.2f} us/change")
+    print(f"  pass (scheduler)  {pass_us:8.2f} us ({fired} fired in a day)")
+    print(f"  pass (SQL poll)   {poll_us:8.2f} us ({polled} found in a day)")
+
+
+if __name__ == "__main__":
+    main()
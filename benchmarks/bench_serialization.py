@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Task list serialization microbenchmark
+
+Compares the previous response path (``from_orm`` per task, then FastAPI's
+``response_model`` validation, JSON-mode dump and ``json.dumps``) with the
+single-pass path used by the API (``TASK_LIST_ADAPTER`` validation and a
+direct pydantic-core dump through ``ModelJSONResponse``).
+
+Usage:
+    python benchmarks/bench_serialization.py [--sizes 100 1000] [--repeat 50]
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from tick_task.models import Task
+from tick_task.responses import TASK_LIST_ADAPTER, ModelJSONResponse
+from tick_task.schemas import Task as TaskSchema
+from tick_task.schemas import TaskList
+
+TASK_LIST_RESPONSE_ADAPTER = TypeAdapter(TaskList)
+
+
+def make_tasks(count: int) -> list[Task]:
+    """Build transient ORM tasks with realistic field values."""
+    now = datetime(2026, 1, 1, 9, 30)
+    return [
+        Task(
+            title=f"Task {i}: follow up on the quarterly planning notes",
+            description="Collect feedback, update the roadmap and share it. " * 3,
+            status=("todo", "doing", "blocked", "done")[i % 4],
+            priority=("low", "medium", "high", "urgent")[i % 4],
+            due_at=now + timedelta(days=i % 30),
+            tags=["planning", f"team-{i % 7}"],
+            context=("personal", "professional", "mixed")[i % 3],
+            workspace="Project Alpha",
+            created_at=now,
+            updated_at=now + timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def pagination_for(tasks: list[Task]) -> dict:
+    return {"has_more": False, "next_cursor": None, "total_count": len(tasks)}
+
+
+def legacy_path(tasks: list[Task]) -> bytes:
+    """Emulate ``from_orm`` + FastAPI response_model serialization."""
+    page = TaskList(
+        tasks=[TaskSchema.model_validate(task) for task in tasks],
+        pagination=pagination_for(tasks),
+    )
+    validated = TASK_LIST_RESPONSE_ADAPTER.validate_python(page)
+    content = TASK_LIST_RESPONSE_ADAPTER.dump_python(validated, mode="json")
+    return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+def single_pass_path(tasks: list[Task]) -> bytes:
+    """Serialize through the API's single-validation response path."""
+    page = TaskList.model_construct(
+        tasks=TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True),
+        pagination=pagination_for(tasks),
+    )
+    return ModelJSONResponse(page).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'tasks':>6}  {'legacy ms':>10}  {'single-pass ms':>15}  {'speedup':>8}")
+    for size in args.sizes:
+        tasks = make_tasks(size)
+        assert json.loads(legacy_path(tasks)) == json.loads(single_pass_path(tasks))
+
+        legacy = min(
+            timeit.repeat(lambda: legacy_path(tasks), number=1, repeat=args.repeat)
+        )
+        fast = min(
+            timeit.repeat(lambda: single_pass_path(tasks), number=1, repeat=args.repeat)
+        )
+        print(
+            f"{size:>6}  {legacy * 1000:>10.2f}  {fast * 1000:>15.2f}  "
+            f"{legacy / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+SQLite driver mode benchmark
+
+Drives the list and get endpoints through the FastAPI app against the same
+database file with the stock aiosqlite driver and with the thread-pool
+driver (``TICK_TASK_SQLITE_DRIVER=threadpool``), and reports requests per
+second with p50/p99 latency for each.
+
+Usage:
+    python benchmarks/bench_sqlite_driver.py [--tasks 5000] [--requests 2000]
+        [--concurrency 16] [--page-size 100]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import Request
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import (
+    READ_ONLY_METHODS,
+    create_database_engine,
+    create_sync_database_engine,
+    get_db,
+)
+from tick_task.main import app
+from tick_task.models import Base, Task
+from tick_task.sqlite_threadpool import ThreadPoolDriver
+from tick_task.tags import intern_tags
+
+DRIVERS = ("aiosqlite", "threadpool")
+COLUMNS = [column for column in Task.__table__.columns if column.key != "tag_ids"]
+
+
+def seed(path: Path, count: int) -> list[str]:
+    """Create the schema and ``count`` tasks; return their ids."""
+    engine = create_sync_database_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(7)
+    tasks = [
+        Task(
+            title=f"Seed task {i}",
+            description="Benchmark seed data " * rng.randrange(1, 5),
+            status=("todo", "doing", "blocked", "done")[i % 4],
+            priority=("low", "medium", "high", "urgent")[i % 4],
+            tags=["bench", f"group-{i % 10}"],
+        )
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        rows = [
+            {
+                **{column.key: getattr(task, column.key) for column in COLUMNS},
+                "tag_ids": intern_tags(conn, task.tags)[0],
+            }
+            for task in tasks
+        ]
+        conn.execute(insert(Task.__table__), rows)
+    engine.dispose()
+    return [task.id for task in tasks]
+
+
+def session_factories(driver: str, url: str, pool_size: int):
+    """Return ``(read factory, write factory, cleanup)`` for ``driver``."""
+    pragmas = SQLITE_PROFILES["balanced"]
+    read_pragmas = {**pragmas, "query_only": True}
+    if driver == "threadpool":
+        pool = ThreadPoolDriver(
+            create_sync_database_engine(url, pragmas, pool_size=1, max_overflow=0),
+            create_sync_database_engine(
+                url, read_pragmas, pool_size=pool_size, max_overflow=0
+            ),
+            read_pool_size=pool_size,
+        )
+
+        async def cleanup() -> None:
+            pool.dispose()
+
+        return pool.read_session, pool.write_session, cleanup
+
+    write_engine = create_database_engine(url, pragmas, pool_size=1, max_overflow=0)
+    read_engine = create_database_engine(
+        url, read_pragmas, pool_size=pool_size, max_overflow=0
+    )
+
+    async def cleanup() -> None:
+        await read_engine.dispose()
+        await write_engine.dispose()
+
+    return (
+        sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False),
+        sessionmaker(bind=write_engine, class_=AsyncSession, expire_on_commit=False),
+        cleanup,
+    )
+
+
+async def bench_driver(
+    driver: str, operation: str, url: str, ids: list[str], args: argparse.Namespace
+) -> dict:
+    """Run ``args.requests`` requests of one kind against one driver."""
+    read_factory, write_factory, cleanup = session_factories(driver, url, 4)
+
+    async def override_get_db(request: Request):
+        factory = read_factory if request.method in READ_ONLY_METHODS else write_factory
+        async with factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    latencies: list[float] = []
+
+    async def worker(worker_id: int, count: int) -> None:
+        rng = random.Random(worker_id)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for _ in range(count):
+                if operation == "list":
+                    url_path = "/api/v1/tasks"
+                    params = {"limit": args.page_size}
+                else:
+                    url_path = f"/api/v1/tasks/{rng.choice(ids)}"
+                    params = None
+                start = time.perf_counter()
+                response = await client.get(url_path, params=params)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+    per_worker = args.requests // args.concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i, per_worker) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.clear()
+    await cleanup()
+
+    latencies.sort()
+    return {
+        "driver": driver,
+        "operation": operation,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "driver.db"
+        ids = seed(path, args.tasks)
+        url = f"sqlite+aiosqlite:///{path}"
+        results = []
+        for operation in ("list", "get"):
+            for driver in DRIVERS:
+                # Warm the page cache and the code paths before measuring
+                await bench_driver(driver, operation, url, ids, args)
+                results.append(await bench_driver(driver, operation, url, ids, args))
+
+    print(f"{'operation':<11}{'driver':<12}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for result in results:
+        print(
+            f"{result['operation']:<11}{result['driver']:<12}"
+            f"{result['requests_per_sec']:>9.0f}{result['p50_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=100)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
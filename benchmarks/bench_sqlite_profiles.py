@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+SQLite performance profile benchmark
+
+Runs the API's read/write mix (get, list, update, create) through the
+FastAPI app against a file database configured with each SQLite preset
+("durable", "balanced", "throughput") and reports throughput and latency.
+
+Usage:
+    python benchmarks/bench_sqlite_profiles.py [--tasks 5000] [--ops 4000]
+        [--concurrency 8] [--profiles durable balanced throughput]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import create_database_engine, get_db
+from tick_task.main import app
+from tick_task.models import Base, Task
+
+# Share of each operation in the mix; mirrors a polling UI plus agents.
+OPERATION_MIX = {"get": 0.60, "list": 0.20, "update": 0.15, "create": 0.05}
+
+
+async def seed(session_factory: sessionmaker, count: int) -> list[str]:
+    """Insert ``count`` tasks and return their ids."""
+    ids = []
+    async with session_factory() as session:
+        for i in range(count):
+            task = Task(
+                title=f"Seed task {i}",
+                description="Benchmark seed data",
+                status=("todo", "doing", "blocked", "done")[i % 4],
+                priority=("low", "medium", "high", "urgent")[i % 4],
+                tags=["bench", f"group-{i % 10}"],
+            )
+            session.add(task)
+            ids.append(task.id)
+        await session.commit()
+    return ids
+
+
+async def run_operation(
+    client: httpx.AsyncClient, operation: str, ids: list[str], rng: random.Random
+) -> None:
+    if operation == "get":
+        response = await client.get(f"/api/v1/tasks/{rng.choice(ids)}")
+    elif operation == "list":
+        response = await client.get("/api/v1/tasks", params={"limit": 100})
+    elif operation == "update":
+        response = await client.put(
+            f"/api/v1/tasks/{rng.choice(ids)}",
+            json={"priority": rng.choice(["low", "medium", "high", "urgent"])},
+        )
+    else:
+        response = await client.post("/api/v1/tasks", json={"title": "Bench task"})
+    response.raise_for_status()
+
+
+async def bench_profile(profile: str, args: argparse.Namespace, workdir: Path) -> dict:
+    """Benchmark one profile on a fresh database file."""
+    database_url = f"sqlite+aiosqlite:///{workdir / f'{profile}.db'}"
+    engine = create_database_engine(database_url, SQLITE_PROFILES[profile])
+    session_factory = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ids = await seed(session_factory, args.tasks)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    operations = list(OPERATION_MIX)
+    weights = list(OPERATION_MIX.values())
+    latencies: dict[str, list[float]] = {operation: [] for operation in operations}
+
+    async def worker(worker_id: int, count: int) -> None:
+        rng = random.Random(worker_id)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for _ in range(count):
+                operation = rng.choices(operations, weights)[0]
+                start = time.perf_counter()
+                await run_operation(client, operation, ids, rng)
+                latencies[operation].append(time.perf_counter() - start)
+
+    per_worker = args.ops // args.concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i, per_worker) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    return {
+        "profile": profile,
+        "ops_per_sec": per_worker * args.concurrency / elapsed,
+        "mean_ms": {
+            operation: statistics.fmean(values) * 1000
+            for operation, values in latencies.items()
+            if values
+        },
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [
+            await bench_profile(profile, args, Path(tmp)) for profile in args.profiles
+        ]
+
+    operations = list(OPERATION_MIX)
+    header = "".join(f"{operation + ' ms':>12}" for operation in operations)
+    print(f"{'profile':<12}{'ops/s':>10}{header}")
+    for result in results:
+        means = "".join(
+            f"{result['mean_ms'].get(operation, float('nan')):>12.2f}"
+            for operation in operations
+        )
+        print(f"{result['profile']:<12}{result['ops_per_sec']:>10.0f}{means}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--ops", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--profiles", nargs="+", default=list(SQLITE_PROFILES), choices=SQLITE_PROFILES
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tag autocomplete benchmark
+
+Times one autocomplete lookup (the ten most used tags starting with a one-
+to three-letter prefix) three ways: collecting tags from every task, as
+clients did before ``GET /api/v1/tags?prefix=``; a range query on the
+``tags`` vocabulary table; and the in-memory ``TagIndex`` that now serves
+the endpoint.
+
+Usage:
+    python benchmarks/bench_tag_autocomplete.py [--tasks 20000] [--tags 2000]
+        [--lookups 200]
+"""
+
+import argparse
+import random
+import string
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from tick_task.database import create_sync_database_engine
+from tick_task.models import Base, Task
+from tick_task.tags import TagIndex, list_tags
+
+VOCABULARY_QUERY = text(
+    "SELECT name, usage_count FROM tags"
+    " WHERE name >= :prefix AND name < :prefix || char(1114111)"
+    " AND merged_into IS NULL AND usage_count > 0"
+    " ORDER BY usage_count DESC, name LIMIT :limit"
+)
+
+
+def seed(path: Path, tasks: int, tags: int) -> None:
+    """Create ``tasks`` tasks carrying one to four of ``tags`` random names."""
+    rng = random.Random(7)
+    names = list(
+        {
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 12)))
+            for _ in range(tags)
+        }
+    )
+    engine = create_sync_database_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for start in range(0, tasks, 1000):
+            session.add_all(
+                Task(title=f"Task {i}", tags=rng.sample(names, rng.randint(1, 4)))
+                for i in range(start, min(start + 1000, tasks))
+            )
+            session.commit()
+    engine.dispose()
+
+
+def per_lookup_us(lookup, prefixes: list[str]) -> float:
+    """Mean microseconds per call of ``lookup(prefix)``."""
+    began = time.perf_counter()
+    for prefix in prefixes:
+        lookup(prefix)
+    return (time.perf_counter() - began) / len(prefixes) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--tags", type=int, default=2_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    prefixes = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 3)))
+        for _ in range(args.lookups)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tags.db"
+        seed(path, args.tasks, args.tags)
+        engine = create_sync_database_engine(f"sqlite:///{path}")
+        with engine.connect() as connection:
+
+            def scan_tasks(prefix: str) -> list:
+                usage: Counter = Counter()
+                for tags in connection.execute(
+                    select(Task.tags).select_from(Task)
+                ).scalars():
+                    usage.update(tag for tag in tags if tag.startswith(prefix))
+                return sorted(usage.items(), key=lambda item: (-item[1], item[0]))[:10]
+
+            def vocabulary(prefix: str) -> list:
+                return connection.execute(
+                    VOCABULARY_QUERY, {"prefix": prefix, "limit": 10}
+                ).all()
+
+            began = time.perf_counter()
+            index = TagIndex()
+            index.load({tag.name: tag.usage_count for tag in list_tags(connection)})
+            load_ms = (time.perf_counter() - began) * 1000
+
+            # The three must agree before their timings mean anything
+            for prefix in prefixes[:20]:
+                expected = index.suggest(prefix, 10)
+                assert scan_tasks(prefix) == expected
+                assert [tuple(row) for row in vocabulary(prefix)] == expected
+
+            print(f"{len(index.names)} tags in use over {args.tasks} tasks")
+            print(f"index load: {load_ms:.1f} ms")
+            print(f"{'method':<12}{'us/lookup':>12}")
+            scan_prefixes = prefixes[: max(1, args.lookups // 20)]
+            for name, lookup, sample in (
+                ("scan tasks", scan_tasks, scan_prefixes),
+                ("vocabulary", vocabulary, prefixes),
+                ("tag index", lambda prefix: index.suggest(prefix, 10), prefixes),
+            ):
+                print(f"{name:<12}{per_lookup_us(lookup, sample):>12.1f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Request validation microbenchmark
+
+Reports microseconds of validation per task for create, update and batch
+payloads, comparing the previous schemas (regex ``pattern=`` enumerations
+and Python tag validators, batches parsed with ``json.loads`` and validated
+task by task) with the current ones (``Literal`` enumerations, the
+constrained ``Tag`` type and ``TASK_BATCH_ADAPTER.validate_json``).
+
+Usage:
+    python benchmarks/bench_validation.py [--batch-size 500] [--repeat 20]
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from tick_task.schemas import TASK_BATCH_ADAPTER, TaskCreate, TaskUpdate
+
+
+class LegacyTaskCreate(BaseModel):
+    """The create schema before literal enumerations and the Tag type."""
+
+    title: str = Field(..., min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=2000)
+    status: str = Field("todo", pattern=r"^(todo|doing|blocked|done|archived)$")
+    priority: str = Field("medium", pattern=r"^(low|medium|high|urgent)$")
+    due_at: Optional[datetime] = None
+    tags: list[str] = Field(default_factory=list)
+    context: str = Field("personal", pattern=r"^(personal|professional|mixed)$")
+    workspace: Optional[str] = Field(None, max_length=100)
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def validate_tag(cls, v):
+        if isinstance(v, list):
+            validated_tags = []
+            for tag in v:
+                if len(tag) > 50:
+                    raise ValueError("Tag must be 50 characters or less")
+                if not tag.strip():
+                    raise ValueError("Tag cannot be empty or whitespace-only")
+                validated_tags.append(tag.strip().lower())
+            return validated_tags
+        return v
+
+    @field_validator("title")
+    @classmethod
+    def validate_title(cls, v):
+        if not v.strip():
+            raise ValueError("Title cannot be empty or whitespace-only")
+        return v.strip()
+
+
+class LegacyTaskUpdate(BaseModel):
+    """The update schema before literal enumerations and the Tag type."""
+
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=2000)
+    status: Optional[str] = Field(None, pattern=r"^(todo|doing|blocked|done|archived)$")
+    priority: Optional[str] = Field(None, pattern=r"^(low|medium|high|urgent)$")
+    due_at: Optional[datetime] = None
+    tags: Optional[list[str]] = None
+    context: Optional[str] = Field(None, pattern=r"^(personal|professional|mixed)$")
+    workspace: Optional[str] = Field(None, max_length=100)
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def validate_tag(cls, v):
+        if isinstance(v, list):
+            for tag in v:
+                if len(tag) > 50:
+                    raise ValueError("Tag must be 50 characters or less")
+                if not tag.strip():
+                    raise ValueError("Tag cannot be empty or whitespace-only")
+        return v
+
+    @field_validator("title")
+    @classmethod
+    def validate_title(cls, v):
+        if v is not None and not v.strip():
+            raise ValueError("Title cannot be empty or whitespace-only")
+        return v.strip() if v is not None else v
+
+
+def make_payload(i: int) -> dict:
+    """A create payload with every field set."""
+    return {
+        "title": f"Task {i}: follow up on the quarterly planning notes",
+        "description": "Collect feedback, update the roadmap and share it.",
+        "status": ("todo", "doing", "blocked", "done")[i % 4],
+        "priority": ("low", "medium", "high", "urgent")[i % 4],
+        "due_at": "2026-03-01T09:30:00",
+        "tags": ["Planning", f" team-{i % 7} ", "Q1", "roadmap"],
+        "context": ("personal", "professional", "mixed")[i % 3],
+        "workspace": "Project Alpha",
+    }
+
+
+def per_task_us(fn, tasks: int, repeat: int, number: int) -> float:
+    """Best-of-``repeat`` microseconds per task for ``fn``."""
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return best / number / tasks * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    create_body = json.dumps(make_payload(1)).encode("utf-8")
+    update_body = json.dumps(
+        {"status": "done", "priority": "high", "tags": ["Review", " done "]}
+    ).encode("utf-8")
+    batch_body = json.dumps([make_payload(i) for i in range(args.batch_size)]).encode(
+        "utf-8"
+    )
+    assert LegacyTaskCreate.model_validate_json(create_body).model_dump() == (
+        TaskCreate.model_validate_json(create_body).model_dump()
+    )
+
+    def legacy_batch() -> list:
+        return [LegacyTaskCreate(**item) for item in json.loads(batch_body)]
+
+    cases = [
+        (
+            "create",
+            1,
+            lambda: LegacyTaskCreate.model_validate_json(create_body),
+            lambda: TaskCreate.model_validate_json(create_body),
+        ),
+        (
+            "update",
+            1,
+            lambda: LegacyTaskUpdate.model_validate_json(update_body),
+            lambda: TaskUpdate.model_validate_json(update_body),
+        ),
+        (
+            "batch",
+            args.batch_size,
+            legacy_batch,
+            lambda: TASK_BATCH_ADAPTER.validate_json(batch_body),
+        ),
+    ]
+
+    print(f"{'payload':<9}{'legacy us/task':>16}{'current us/task':>17}{'speedup':>9}")
+    for name, tasks, legacy, current in cases:
+        number = max(1, 2000 // tasks)
+        legacy_us = per_task_us(legacy, tasks, args.repeat, number)
+        current_us = per_task_us(current, tasks, args.repeat, number)
+        print(
+            f"{name:<9}{legacy_us:>16.2f}{current_us:>17.2f}"
+            f"{legacy_us / current_us:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Saved view benchmark
+
+Fills a database with tasks, then times the work behind one page of a
+filtered task list three ways: as ``GET /tasks`` does it (build the
+statement, query, validate, serialize), as a saved view with a cached plan
+whose page was invalidated by a write (query, validate, serialize), and as
+a saved view whose cached page is still current (a dictionary lookup).
+
+Usage:
+    python benchmarks/bench_views.py [--tasks 20000] [--limit 100]
+        [--repeat 200]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from tick_task.database import create_sync_database_engine
+from tick_task.models import TASK_PRIORITIES, TASK_STATUSES, Base, Task
+from tick_task.responses import TASK_LIST_ADAPTER
+from tick_task.schemas import TaskList, ViewFilters
+from tick_task.views import ViewCache, ViewPlan, task_statement
+
+
+def render(session: Session, statement, limit: int) -> bytes:
+    """One page of ``statement`` as the list endpoints serialize it."""
+    task_list = session.execute(statement).scalars().all()
+    page = TaskList.model_construct(
+        tasks=TASK_LIST_ADAPTER.validate_python(task_list, from_attributes=True),
+        pagination={"total_count": len(task_list)},
+    )
+    return page.__pydantic_serializer__.to_json(page)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(49)
+    now = datetime.utcnow()
+
+    filters = ViewFilters(
+        status=["todo", "doing"],
+        priority="high",
+        due_before=now + timedelta(days=7),
+        sort="due_at",
+        order="asc",
+        limit=args.limit,
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_sync_database_engine(f"sqlite:///{directory}/tasks.db")
+        Base.metadata.create_all(engine)
+        with Session(engine, expire_on_commit=False) as session:
+            session.add_all(
+                Task(
+                    title=f"Task {index}",
+                    status=rng.choice(TASK_STATUSES),
+                    priority=rng.choice(TASK_PRIORITIES),
+                    due_at=now + timedelta(hours=rng.randint(-500, 2_000)),
+                )
+                for index in range(args.tasks)
+            )
+            session.commit()
+
+            def list_endpoint() -> bytes:
+                statement, _ = task_statement(**filters.model_dump(exclude={"limit"}))
+                return render(session, statement.limit(args.limit), args.limit)
+
+            cache = ViewCache()
+            cache.store_plan("view", ViewPlan.build(filters))
+
+            def view_miss() -> bytes:
+                cache.bump()
+                marker = cache.marker
+                if cache.page("view") is None:
+                    body = render(session, cache.plan("view").statement, args.limit)
+                    cache.store_page("view", marker, body)
+                return body
+
+            def view_hit() -> bytes:
+                return cache.page("view")
+
+            assert list_endpoint() == view_miss() == view_hit()
+            timings = {}
+            for name, call in (
+                ("GET /tasks", list_endpoint),
+                ("view, after a write", view_miss),
+                ("view, cached page", view_hit),
+            ):
+                began = time.perf_counter()
+                for _ in range(args.repeat):
+                    call()
+                timings[name] = (time.perf_counter() - began) / args.repeat * 1000
+        engine.dispose()
+
+    print(f"{args.tasks} tasks, pages of {args.limit}")
+    for name, elapsed in timings.items():
+        print(f"  {name:20} {elapsed:9.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
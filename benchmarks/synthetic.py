@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Synthetic task data
+
+Deterministic generator of realistic task databases for the benchmarks:
+weighted statuses, priorities and contexts, Zipf-distributed workspaces and
+tags, recent-heavy creation times, due dates around them (so open tasks
+fall overdue), subtasks, a few recurring tasks and retyped near-duplicate
+titles. The same seed and count always give the same rows.
+
+Tasks are bulk-inserted through SQLAlchemy Core rather than the ORM, so the
+tables the session hooks maintain (closure, rollups, title buckets) are
+filled with the backfills the migrations use. Tag usage counts are kept by
+the database triggers as usual.
+
+Usage:
+    python benchmarks/synthetic.py [--tasks 10k|100k|1M] [--seed 50]
+        [--output tasks.db]
+"""
+
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import create_sync_database_engine
+from tick_task.duplicates import index_titles
+from tick_task.models import Base, Task, TaskClosure
+from tick_task.rollups import FIELDS, backfill_tasks
+from tick_task.tags import intern_tags
+
+# Bumped whenever the generated rows change, so cached databases are rebuilt
+VERSION = 1
+
+# Fixed "now", so dates (and the queries relative to them) are reproducible
+NOW = datetime(2026, 1, 15, 12, 0, 0)
+
+STATUSES = {"todo": 40, "doing": 12, "blocked": 3, "done": 38, "archived": 7}
+PRIORITIES = {"low": 20, "medium": 50, "high": 22, "urgent": 8}
+CONTEXTS = {"personal": 45, "professional": 45, "mixed": 10}
+WORKSPACES = [
+    "Inbox",
+    "Home",
+    "Q1 Planning",
+    "Platform",
+    "Marketing",
+    "Hiring",
+    "Finance",
+    "Garden",
+    "Trips",
+    "Reading",
+    "Side Project",
+    "Volunteering",
+]
+TAGS = (
+    "work urgent errand call email review meeting follow-up waiting someday "
+    "home health finance admin writing reading research design bug release "
+    "planning travel family shopping car garden fitness learning ops hiring "
+    "docs legal taxes invoice quick deep-work weekend evening backlog"
+).split()
+TAG_COUNTS = {0: 25, 1: 35, 2: 25, 3: 10, 4: 5}
+
+VERBS = (
+    "Review Draft Send Call Plan Fix Update Prepare Book Order Renew Write "
+    "Schedule Cancel Pay Check Clean Organize Research Email Refactor Test"
+).split()
+OBJECTS = [
+    "quarterly report",
+    "budget spreadsheet",
+    "dentist appointment",
+    "car insurance",
+    "team offsite agenda",
+    "release notes",
+    "onboarding checklist",
+    "invoice for March",
+    "flight to Berlin",
+    "garden hose",
+    "login page bug",
+    "API rate limits",
+    "hiring plan",
+    "tax return",
+    "gym membership",
+    "birthday present",
+    "conference talk",
+    "backup strategy",
+    "lease renewal",
+    "project roadmap",
+    "design mockups",
+    "customer feedback",
+    "database migration",
+    "weekly groceries",
+]
+QUALIFIERS = [
+    "",
+    "",
+    "",
+    " for the team",
+    " before Friday",
+    " with Alex",
+    " (again)",
+    " for next week",
+    " and share it",
+]
+SENTENCES = [
+    "Check the notes from the last meeting first.",
+    "Ask for feedback before sending it out.",
+    "Keep it short; one page is enough.",
+    "Links are in the shared folder.",
+    "Blocked on the numbers from finance.",
+    "Remember to attach the receipts.",
+]
+
+CHUNK = 10_000
+
+
+def parse_count(text: str) -> int:
+    """``10k``, ``100k``, ``1M`` or a plain number of tasks."""
+    text = text.strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _zipf(count: int) -> list[float]:
+    return [1 / rank for rank in range(1, count + 1)]
+
+
+def _retyped(rng: random.Random, title: str) -> str:
+    """``title`` as someone would type it again."""
+    title = title.lower() if rng.random() < 0.5 else title
+    return title.replace(" ", rng.choice([" ", "  "])) + rng.choice(["", "!", "."])
+
+
+def generate(count: int, seed: int = 50) -> Iterator[dict[str, Any]]:
+    """``count`` task rows (column values, with tag names under ``tags``)."""
+    rng = random.Random(seed)
+    statuses, status_weights = list(STATUSES), list(STATUSES.values())
+    priorities, priority_weights = list(PRIORITIES), list(PRIORITIES.values())
+    contexts, context_weights = list(CONTEXTS), list(CONTEXTS.values())
+    workspace_weights = [35.0] + [65 * w for w in _zipf(len(WORKSPACES))]
+    workspace_total = sum(workspace_weights[1:]) / 65
+    workspace_weights[1:] = [w / workspace_total for w in workspace_weights[1:]]
+    workspaces: list[Optional[str]] = [None, *WORKSPACES]
+    tag_weights = _zipf(len(TAGS))
+    tag_counts, tag_count_weights = list(TAG_COUNTS), list(TAG_COUNTS.values())
+
+    roots: list[dict[str, Any]] = []
+    titles: list[str] = []
+    for _ in range(count):
+        status = rng.choices(statuses, status_weights)[0]
+        # Recent tasks are the most numerous
+        created_at = NOW - timedelta(days=365 * rng.random() ** 2)
+        updated_at = created_at + (NOW - created_at) * rng.random()
+        due_at = None
+        if rng.random() < 0.65:
+            due_at = created_at + timedelta(days=rng.gauss(14, 10))
+
+        parent = (
+            roots[rng.randrange(len(roots))] if roots and rng.random() < 0.08 else None
+        )
+        if parent is not None:
+            workspace, context = parent["workspace"], parent["context"]
+        else:
+            workspace = rng.choices(workspaces, workspace_weights)[0]
+            context = rng.choices(contexts, context_weights)[0]
+
+        if titles and rng.random() < 0.05:
+            title = _retyped(rng, rng.choice(titles))
+        else:
+            title = (
+                rng.choice(VERBS) + " " + rng.choice(OBJECTS) + rng.choice(QUALIFIERS)
+            )
+            titles.append(title)
+            if len(titles) > 5_000:
+                titles.pop(rng.randrange(len(titles)))
+
+        tags = list(
+            dict.fromkeys(
+                rng.choices(
+                    TAGS, tag_weights, k=rng.choices(tag_counts, tag_count_weights)[0]
+                )
+            )
+        )
+        row = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "title": title,
+            "description": (
+                " ".join(rng.sample(SENTENCES, rng.randint(1, 3)))
+                if rng.random() < 0.4
+                else None
+            ),
+            "status": status,
+            "priority": rng.choices(priorities, priority_weights)[0],
+            "due_at": due_at,
+            "context": context,
+            "workspace": workspace,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "completed_at": updated_at if status == "done" else None,
+            "tags": tags,
+            "recurrence": (
+                "FREQ=WEEKLY"
+                if due_at is not None and status == "todo" and rng.random() < 0.03
+                else None
+            ),
+            "open_blockers": 0,
+            "parent_id": parent["id"] if parent is not None else None,
+        }
+        if parent is None:
+            roots.append(row)
+            if len(roots) > 1_000:
+                roots.pop(rng.randrange(len(roots)))
+        yield row
+
+
+def load(engine: Engine, count: int, seed: int = 50) -> None:
+    """Create the schema in ``engine`` and fill it with ``count`` tasks."""
+    tasks = Task.__table__
+    closure = TaskClosure.__table__
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        tag_ids = dict(zip(TAGS, intern_tags(connection, TAGS)[0]))
+
+    rows = generate(count, seed)
+    while True:
+        chunk = [row for _, row in zip(range(CHUNK), rows)]
+        if not chunk:
+            break
+        ids = [row["id"] for row in chunk]
+        with engine.begin() as connection:
+            for row in chunk:
+                row["tag_ids"] = [tag_ids[name] for name in row.pop("tags")]
+            connection.execute(insert(tasks), chunk)
+            connection.execute(
+                insert(closure),
+                [
+                    {"ancestor_id": row["id"], "descendant_id": row["id"], "depth": 0}
+                    for row in chunk
+                ]
+                + [
+                    {
+                        "ancestor_id": row["parent_id"],
+                        "descendant_id": row["id"],
+                        "depth": 1,
+                    }
+                    for row in chunk
+                    if row["parent_id"] is not None
+                ],
+            )
+            in_chunk = tasks.c.id.in_(ids)
+            backfill_tasks(
+                connection,
+                connection.execute(
+                    select(*[tasks.c[key] for key in FIELDS]).where(in_chunk)
+                ).all(),
+            )
+            index_titles(
+                connection,
+                connection.execute(
+                    select(tasks.c.id, tasks.c.title).where(in_chunk)
+                ).all(),
+            )
+
+
+def create(path: Path, count: int, seed: int = 50) -> None:
+    """Write a database of ``count`` synthetic tasks to ``path``."""
+    engine = create_sync_database_engine(
+        f"sqlite:///{path}", SQLITE_PROFILES["throughput"]
+    )
+    try:
+        load(engine, count, seed)
+    finally:
+        engine.dispose()
+
+
+def cached(directory: Path, count: int, seed: int = 50) -> Path:
+    """The database of ``count`` tasks in ``directory``, created if missing."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"synthetic-v{VERSION}-{count}-{seed}.db"
+    if not path.exists():
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        create(partial, count, seed)
+        partial.rename(path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=parse_count, default="10k")
+    parser.add_argument("--seed", type=int, default=50)
+    parser.add_argument("--output", type=Path, default=Path("synthetic.db"))
+    args = parser.parse_args()
+
+    if args.output.exists():
+        parser.error(f"{args.output} exists")
+    began = time.perf_counter()
+    create(args.output, args.tasks, args.seed)
+    elapsed = time.perf_counter() - began
+    print(f"{args.tasks} tasks written to {args.output} in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Administrative API routes for FIN-tasks."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from tick_task.backup import BackupError, BackupResult, backup_manager, list_snapshots
+from tick_task.database import get_db, pool_statistics, shard_router
+from tick_task.memory_store import memory_store
+from tick_task.schemas import (
+    AnalyzeReport,
+    BackupFile,
+    BackupReport,
+    BackupStatus,
+    ErrorResponse,
+    PoolStatistics,
+    StorageStatistics,
+)
+from tick_task.storage_stats import analyze, storage_statistics
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get(
+    "/pools",
+    response_model=PoolStatistics,
+    summary="Connection pool statistics",
+    description="Returns usage statistics for the read and write connection pools",
+)
+async def get_pool_statistics() -> PoolStatistics:
+    """Report read and write connection pool usage."""
+    return PoolStatistics.model_validate(pool_statistics())
+
+
+def _backup_report(result: BackupResult) -> BackupReport:
+    """Describe a finished backup run."""
+    return BackupReport(
+        snapshot=result.snapshot.name,
+        started_at=result.started_at,
+        duration_seconds=result.duration_seconds,
+        bytes=result.bytes,
+        throughput_bytes_per_second=result.throughput_bytes_per_second,
+        files=[
+            BackupFile(
+                name=str(file.destination.relative_to(result.snapshot)),
+                pages=file.pages,
+                bytes=file.bytes,
+                restarts=file.restarts,
+            )
+            for file in result.files
+        ],
+    )
+
+
+@router.get(
+    "/backups",
+    response_model=BackupStatus,
+    summary="Backup status",
+    description="Lists retained snapshots and the outcome of the last backup",
+)
+async def get_backup_status() -> BackupStatus:
+    """Report retained snapshots and the most recent backup."""
+    last = backup_manager.last_result
+    return BackupStatus(
+        running=backup_manager.running,
+        snapshots=[path.name for path in list_snapshots(backup_manager.directory)],
+        last_backup=_backup_report(last) if last is not None else None,
+        last_error=backup_manager.last_error,
+    )
+
+
+@router.post(
+    "/backups",
+    response_model=BackupReport,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create backup",
+    description=(
+        "Takes an online snapshot of the database while the service keeps "
+        "serving requests, verifies it and applies the retention policy"
+    ),
+    responses={
+        409: {"model": ErrorResponse, "description": "Backup not possible now"},
+    },
+)
+async def create_backup() -> BackupReport:
+    """Take a verified snapshot of the database."""
+    try:
+        result = await backup_manager.run()
+    except BackupError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return _backup_report(result)
+
+
+def _main_connection(session: Session) -> Any:
+    """The session's connection to the main (or, when sharded, default) file."""
+    if shard_router is not None:
+        return session.connection(
+            bind_arguments={"shard_id": shard_router.DEFAULT_SHARD}
+        )
+    return session.connection()
+
+
+@router.get(
+    "/storage",
+    response_model=StorageStatistics,
+    summary="Storage statistics",
+    description=(
+        "Reports table and index sizes, free pages, WAL size, page cache "
+        "hits and misses, the last ANALYZE and task counts by status"
+    ),
+)
+async def get_storage_statistics(
+    db: AsyncSession = Depends(get_db),
+) -> StorageStatistics:
+    """Report where the database's space and cache go."""
+    stats = await db.run_sync(
+        lambda session: storage_statistics.collect(
+            _main_connection(session), count_rows=memory_store is None
+        )
+    )
+    if memory_store is not None:
+        stats["rows_by_status"] = {
+            task_status: len(ids)
+            for task_status, ids in memory_store.by_status.items()
+            if ids
+        }
+    return StorageStatistics.model_validate(stats)
+
+
+@router.post(
+    "/storage/analyze",
+    response_model=AnalyzeReport,
+    summary="Analyze database",
+    description="Runs ANALYZE to refresh the query planner's statistics",
+)
+async def analyze_database(db: AsyncSession = Depends(get_db)) -> AnalyzeReport:
+    """Refresh query planner statistics and record when that happened."""
+    report = await db.run_sync(lambda session: analyze(_main_connection(session)))
+    await db.commit()
+    storage_statistics.invalidate()
+    return AnalyzeReport.model_validate(report)
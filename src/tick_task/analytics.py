@@ -0,0 +1,164 @@
+"""Analytics API routes for FIN-tasks.
+
+Served from the rollup tables maintained by :mod:`tick_task.rollups`, or
+computed from memory with the memory storage engine.
+"""
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from tick_task.database import database_connections, get_db
+from tick_task.memory_store import memory_store
+from tick_task.models import TASK_CONTEXTS
+from tick_task.rollups import (
+    Activity,
+    activity,
+    activity_from_tasks,
+    status_counts,
+    status_from_tasks,
+)
+from tick_task.schemas import (
+    ActivityReport,
+    ContextStatus,
+    DailyActivity,
+    ErrorResponse,
+    StatusReport,
+    TaskContext,
+)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+MAX_ACTIVITY_DAYS = 1000
+
+
+def _hours(seconds: float, tasks: int) -> Optional[float]:
+    return seconds / tasks / 3600 if tasks else None
+
+
+@router.get(
+    "/activity",
+    response_model=ActivityReport,
+    summary="Task throughput",
+    description=(
+        "Tasks created and completed per UTC day, with the mean cycle time "
+        "(creation to completion) of the completed ones. Defaults to the last "
+        "30 days."
+    ),
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid date range"},
+    },
+)
+async def get_activity(
+    since: Optional[date] = Query(None, description="First day (UTC)"),
+    until: Optional[date] = Query(None, description="Last day (UTC), default today"),
+    context: Optional[TaskContext] = Query(None, description="Only this context"),
+    workspace: Optional[str] = Query(None, description="Only this workspace"),
+    db: AsyncSession = Depends(get_db),
+) -> ActivityReport:
+    """Report daily throughput and cycle time."""
+    until = until or datetime.utcnow().date()
+    since = since or until - timedelta(days=29)
+    if since > until or (until - since).days >= MAX_ACTIVITY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "since must be on or before until, "
+                f"at most {MAX_ACTIVITY_DAYS} days apart"
+            ),
+        )
+
+    if memory_store is not None:
+        totals = activity_from_tasks(
+            memory_store.tasks.values(), since, until, context, workspace
+        )
+    else:
+
+        def collect(session: Session) -> Activity:
+            merged: Activity = {}
+            for connection in database_connections(session):
+                for day, row in activity(
+                    connection, since, until, context, workspace
+                ).items():
+                    day_totals = merged.setdefault(day, [0, 0, 0.0])
+                    for i, value in enumerate(row):
+                        day_totals[i] += value or 0
+            return merged
+
+        totals = await db.run_sync(collect)
+
+    days = []
+    for offset in range((until - since).days + 1):
+        day = since + timedelta(days=offset)
+        created, completed, cycle = totals.get(day.isoformat(), (0, 0, 0.0))
+        days.append(
+            DailyActivity(
+                day=day,
+                created=created,
+                completed=completed,
+                cycle_time_hours=_hours(cycle, completed),
+            )
+        )
+    completed = sum(day.completed for day in days)
+    return ActivityReport(
+        since=since,
+        until=until,
+        created=sum(day.created for day in days),
+        completed=completed,
+        cycle_time_hours=_hours(sum(row[2] for row in totals.values()), completed),
+        days=days,
+    )
+
+
+@router.get(
+    "/status",
+    response_model=StatusReport,
+    summary="Current task counts",
+    description=(
+        "Per context: tasks by status, work in progress (doing) and overdue open "
+        "tasks (due on an earlier UTC day)."
+    ),
+)
+async def get_status(
+    workspace: Optional[str] = Query(None, description="Only this workspace"),
+    db: AsyncSession = Depends(get_db),
+) -> StatusReport:
+    """Report work in progress and overdue tasks per context."""
+    today = datetime.utcnow().date()
+    if memory_store is not None:
+        by_status, overdue = status_from_tasks(
+            memory_store.tasks.values(), today, workspace
+        )
+    else:
+
+        def collect(session: Session) -> tuple[Counter, Counter]:
+            by_status: Counter = Counter()
+            overdue: Counter = Counter()
+            for connection in database_connections(session):
+                statuses, late = status_counts(connection, today, workspace)
+                by_status.update(statuses)
+                overdue.update(late)
+            return by_status, overdue
+
+        by_status, overdue = await db.run_sync(collect)
+
+    return StatusReport(
+        today=today,
+        contexts=[
+            ContextStatus(
+                context=context,
+                statuses={
+                    task_status: count
+                    for (task_context, task_status), count in sorted(by_status.items())
+                    if task_context == context
+                },
+                wip=by_status[context, "doing"],
+                overdue=overdue[context],
+            )
+            for context in TASK_CONTEXTS
+        ],
+    )
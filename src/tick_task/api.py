@@ -1,22 +1,204 @@
 """API routes for FIN-tasks."""
 
+import asyncio
+from collections import Counter
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_, select
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
 from tick_task.config import settings
-from tick_task.database import get_db
+from tick_task.database import database_connections, get_db, shard_router
+from tick_task.dependencies import (
+    DependencyCycle,
+    add_dependency,
+    dependencies_of,
+    remove_dependency,
+    task_connection,
+)
+from tick_task.duplicates import find_duplicates
+from tick_task.hierarchy import has_subtasks, in_subtree, subtree, subtree_progress
+from tick_task.history import (
+    CannotUndo,
+    state_at,
+    task_history,
+    undo_last_change,
+)
+from tick_task.memory_store import memory_store
 from tick_task.models import Task
-from tick_task.schemas import ErrorResponse, HealthResponse
+from tick_task.recurrence import next_occurrence
+from tick_task.reminders import event_stream, reminder_scheduler
+from tick_task.responses import (
+    NDJSON_MEDIA_TYPE,
+    TASK_LIST_ADAPTER,
+    ModelJSONResponse,
+    iterate,
+    ndjson_task_lines,
+    task_response,
+)
+from tick_task.schemas import (
+    MAX_BATCH_SIZE,
+    TASK_BATCH_ADAPTER,
+    DependencyCreate,
+    ErrorResponse,
+    HealthResponse,
+    SubtreeProgress,
+    TagList,
+    TagRename,
+    TagSummary,
+)
 from tick_task.schemas import Task as TaskSchema
-from tick_task.schemas import TaskCreate, TaskList, TaskUpdate
+from tick_task.schemas import (
+    TaskBatchResponse,
+    TaskCreate,
+    TaskDependencies,
+    TaskHistory,
+    TaskList,
+    TaskTree,
+    TaskUpdate,
+)
+from tick_task.tags import TagIndex
+from tick_task.tags import list_tags as vocabulary_tags
+from tick_task.tags import rename_tag, tag_index
+from tick_task.views import pagination, task_statement, view_cache
 
 router = APIRouter()
 
+DuplicateMode = Literal["warn", "reject", "ignore"]
+DUPLICATES_QUERY = Query(
+    "warn",
+    description=(
+        "On near-duplicate titles of open tasks: `warn` lists them in the "
+        "`X-Possible-Duplicates` header, `reject` refuses with 409, `ignore` "
+        "skips the check"
+    ),
+)
+
+
+def _new_task(task_data: TaskCreate) -> Task:
+    """Build a task from validated create data."""
+    task = Task(
+        title=task_data.title,
+        description=task_data.description,
+        status=task_data.status,
+        priority=task_data.priority,
+        due_at=task_data.due_at,
+        tags=task_data.tags,
+        context=task_data.context,
+        workspace=task_data.workspace,
+        recurrence=task_data.recurrence,
+        parent_id=str(task_data.parent_id) if task_data.parent_id else None,
+    )
+
+    # Set completion timestamp if status is done
+    if task.status == "done":
+        task.completed_at = datetime.utcnow()
+    return task
+
+
+def _with_next_occurrences(tasks: list[Task]) -> list[Task]:
+    """``tasks`` plus the next occurrence of each completed recurring one."""
+    following = [
+        next_occurrence(task) if task.status == "done" else None for task in tasks
+    ]
+    return tasks + [task for task in following if task is not None]
+
+
+def _track_reminders(tasks: list[Task]) -> None:
+    """Bring the due-date reminders of written tasks up to date."""
+    if reminder_scheduler is not None:
+        for task in tasks:
+            reminder_scheduler.track(task)
+
+
+async def _get_task(db: AsyncSession, task_id: UUID) -> Optional[Task]:
+    """Look a task up in the memory store or the database."""
+    if memory_store is not None:
+        return memory_store.get(str(task_id))
+    return await db.get(Task, str(task_id))
+
+
+def _require_database(feature: str) -> None:
+    """Dependencies, history and title buckets are kept in the database only."""
+    if memory_store is not None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{feature} are not supported by the memory storage engine",
+        )
+
+
+async def _check_duplicates(
+    db: AsyncSession, tasks: list[Task], mode: DuplicateMode
+) -> dict[str, str]:
+    """Refuse ``tasks`` with titles near those of open tasks, or warn of them.
+
+    Returns the response headers listing the possible duplicates.
+    """
+    if mode == "ignore":
+        return {}
+    if memory_store is not None:
+        if mode == "reject":
+            _require_database("Duplicate checks")
+        return {}
+    duplicates = await db.run_sync(find_duplicates, tasks, settings.duplicate_threshold)
+    if not duplicates:
+        return {}
+    headers = {"X-Possible-Duplicates": ", ".join(duplicates)}
+    if mode == "reject":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Possible duplicate of {', '.join(duplicates)}",
+            headers=headers,
+        )
+    return headers
+
+
+async def _check_parent(
+    db: AsyncSession, task: Task, parent_id: str, workspace: Optional[str]
+) -> None:
+    """Refuse a parent that is missing, in another shard or under ``task``.
+
+    ``workspace`` is the one ``task`` is to be stored in.
+    """
+    parent = await _get_task(db, UUID(parent_id))
+    if not parent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parent task not found",
+        )
+
+    if memory_store is not None:
+        ancestor: Optional[Task] = parent
+        while ancestor is not None and ancestor.id != task.id:
+            ancestor = memory_store.get(ancestor.parent_id or "")
+        cycle = ancestor is not None
+    else:
+        if (
+            shard_router is not None
+            and shard_router.shard_for(workspace) != inspect(parent).identity_token
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Subtasks must be in the same shard as their parent",
+            )
+        cycle = inspect(task).persistent and await db.run_sync(
+            lambda session: in_subtree(
+                task_connection(session, task), task.id, parent.id
+            )
+        )
+    if cycle:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Cannot move a task under itself or its subtasks",
+        )
+
 
 @router.get(
     "/health",
@@ -51,36 +233,110 @@ async def health_check(db: AsyncSession = Depends(get_db)) -> HealthResponse:
     description="Create a new task with the provided data",
     responses={
         400: {"model": ErrorResponse, "description": "Validation error"},
+        404: {"model": ErrorResponse, "description": "Parent task not found"},
+        409: {"model": ErrorResponse, "description": "Possible duplicate"},
         500: {"model": ErrorResponse, "description": "Server error"},
     },
 )
 async def create_task(
     task_data: TaskCreate,
+    duplicates: DuplicateMode = DUPLICATES_QUERY,
     db: AsyncSession = Depends(get_db),
-) -> TaskSchema:
+) -> ModelJSONResponse:
     """Create a new task."""
-    # Create task instance
-    task = Task(
-        title=task_data.title,
-        description=task_data.description,
-        status=task_data.status,
-        priority=task_data.priority,
-        due_at=task_data.due_at,
-        tags=task_data.tags,
-        context=task_data.context,
-        workspace=task_data.workspace,
-    )
-
-    # Set completion timestamp if status is done
-    if task.status == "done":
-        task.completed_at = datetime.utcnow()
+    task = _new_task(task_data)
+    if task.parent_id is not None:
+        await _check_parent(db, task, task.parent_id, task.workspace)
+    headers = await _check_duplicates(db, [task], duplicates)
+    new_tasks = _with_next_occurrences([task])
 
     # Add to database
-    db.add(task)
-    await db.commit()
-    await db.refresh(task)
+    if memory_store is not None:
+        await asyncio.gather(*(memory_store.save(new) for new in new_tasks))
+    else:
+        db.add_all(new_tasks)
+        await db.commit()
+        await db.refresh(task)
+    for new in new_tasks:
+        tag_index.adjust(added=new.tags)
+    _track_reminders(new_tasks)
+
+    response = task_response(task, status_code=status.HTTP_201_CREATED)
+    response.headers.update(headers)
+    return response
+
+
+@router.post(
+    "/tasks/batch",
+    response_model=TaskBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create tasks in bulk",
+    description=(
+        f"Create up to {MAX_BATCH_SIZE} tasks in one transaction. The body is a "
+        "JSON array of task objects, as accepted by `POST /tasks`."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/TaskCreate"},
+                        "minItems": 1,
+                        "maxItems": MAX_BATCH_SIZE,
+                    }
+                }
+            },
+        }
+    },
+    responses={
+        404: {"model": ErrorResponse, "description": "Parent task not found"},
+        409: {"model": ErrorResponse, "description": "Possible duplicate"},
+        422: {"description": "Validation error"},
+    },
+)
+async def create_tasks(
+    request: Request,
+    duplicates: DuplicateMode = DUPLICATES_QUERY,
+    db: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """Create several tasks at once."""
+    # Validated straight from the raw bytes by the shared adapter, instead of
+    # parsing to Python objects first and validating those
+    body = await request.body()
+    try:
+        batch = TASK_BATCH_ADAPTER.validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+        )
 
-    return TaskSchema.from_orm(task)
+    tasks = [_new_task(task_data) for task_data in batch]
+    for task in tasks:
+        if task.parent_id is not None:
+            await _check_parent(db, task, task.parent_id, task.workspace)
+    headers = await _check_duplicates(db, tasks, duplicates)
+    new_tasks = _with_next_occurrences(tasks)
+    if memory_store is not None:
+        await asyncio.gather(*(memory_store.save(task) for task in new_tasks))
+    else:
+        db.add_all(new_tasks)
+        await db.commit()
+    for task in new_tasks:
+        tag_index.adjust(added=task.tags)
+    _track_reminders(new_tasks)
+
+    return ModelJSONResponse(
+        TaskBatchResponse.model_construct(
+            tasks=TASK_LIST_ADAPTER.validate_python(tasks, from_attributes=True)
+        ),
+        status_code=status.HTTP_201_CREATED,
+        headers=headers,
+    )
 
 
 @router.get(
@@ -89,23 +345,58 @@ async def create_task(
     summary="Get task",
     description="Retrieve a specific task by ID",
     responses={
+        200: {"model": TaskTree},
         404: {"model": ErrorResponse, "description": "Task not found"},
         400: {"model": ErrorResponse, "description": "Invalid UUID format"},
     },
 )
 async def get_task(
     task_id: UUID,
+    include: Optional[str] = Query(
+        None,
+        description=(
+            "Also return `subtree` (all subtasks, with their progress) or "
+            "`progress` (done and total subtasks), comma-separated"
+        ),
+    ),
     db: AsyncSession = Depends(get_db),
-) -> TaskSchema:
+) -> ModelJSONResponse:
     """Get a specific task by ID."""
-    task = await db.get(Task, str(task_id))
+    task = await _get_task(db, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
 
-    return TaskSchema.from_orm(task)
+    if not include:
+        return task_response(task)
+    parts = {part.strip() for part in include.split(",") if part.strip()}
+    if not parts <= {"subtree", "progress"}:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="include accepts subtree and progress",
+        )
+
+    descendants = None
+    if memory_store is not None:
+        tasks = memory_store.subtree(task.id)
+        if "subtree" in parts:
+            descendants = tasks
+        done = sum(1 for subtask in tasks if subtask.status == "done")
+        total = sum(1 for subtask in tasks if subtask.status != "archived")
+    else:
+        if "subtree" in parts:
+            descendants = await db.run_sync(subtree, task)
+        done, total = await db.run_sync(subtree_progress, task)
+
+    tree = TaskTree.model_validate(task, from_attributes=True)
+    tree.progress = SubtreeProgress(done=done, total=total)
+    if descendants is not None:
+        tree.subtree = TASK_LIST_ADAPTER.validate_python(
+            descendants, from_attributes=True
+        )
+    return ModelJSONResponse(tree)
 
 
 @router.put(
@@ -115,7 +406,14 @@ async def get_task(
     description="Update an existing task with the provided data",
     responses={
         404: {"model": ErrorResponse, "description": "Task not found"},
-        409: {"model": ErrorResponse, "description": "Cannot update archived task"},
+        409: {
+            "model": ErrorResponse,
+            "description": (
+                "Cannot update archived task, move a task under its own "
+                "subtree, or move a task with dependencies or subtasks to "
+                "another shard"
+            ),
+        },
         400: {"model": ErrorResponse, "description": "Validation error"},
     },
 )
@@ -123,9 +421,9 @@ async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
     db: AsyncSession = Depends(get_db),
-) -> TaskSchema:
+) -> ModelJSONResponse:
     """Update an existing task."""
-    task = await db.get(Task, str(task_id))
+    task = await _get_task(db, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,7 +438,17 @@ async def update_task(
         )
 
     # Apply updates
+    old_tags = list(task.tags)
+    was_done = task.status == "done"
     update_data = task_update.dict(exclude_unset=True)
+    if update_data.get("parent_id") is not None:
+        update_data["parent_id"] = str(update_data["parent_id"])
+        await _check_parent(
+            db,
+            task,
+            update_data["parent_id"],
+            update_data.get("workspace", task.workspace),
+        )
     for field, value in update_data.items():
         setattr(task, field, value)
 
@@ -153,14 +461,48 @@ async def update_task(
     # Update timestamp
     task.updated_at = datetime.utcnow()
 
-    await db.commit()
-    await db.refresh(task)
+    # Completing an occurrence of a recurring task creates the next one
+    following = (
+        next_occurrence(task) if task.status == "done" and not was_done else None
+    )
 
-    return TaskSchema.from_orm(task)
+    if memory_store is not None:
+        await memory_store.save(task)
+        if following is not None:
+            await memory_store.save(following)
+    else:
+        # A new workspace may belong to another shard
+        if shard_router is not None:
+            shard_id = inspect(task).identity_token
+            if shard_id != shard_router.shard_for(task.workspace) and (
+                task.parent_id is not None
+                or any(await db.run_sync(dependencies_of, task))
+                or await db.run_sync(has_subtasks, task)
+            ):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=(
+                        "Cannot move a task with dependencies or subtasks to "
+                        "another shard"
+                    ),
+                )
+            task = await shard_router.relocate(db, task)
+        if following is not None:
+            db.add(following)
+
+        await db.commit()
+        await db.refresh(task)
+    tag_index.adjust(old_tags, task.tags)
+    if following is not None:
+        tag_index.adjust(added=following.tags)
+    _track_reminders([task] if following is None else [task, following])
+
+    return task_response(task)
 
 
 @router.delete(
     "/tasks/{task_id}",
+    response_model=TaskSchema,
     status_code=status.HTTP_200_OK,
     summary="Delete task",
     description="Archive a task (soft delete)",
@@ -172,9 +514,9 @@ async def update_task(
 async def delete_task(
     task_id: UUID,
     db: AsyncSession = Depends(get_db),
-) -> TaskSchema:
+) -> ModelJSONResponse:
     """Soft delete (archive) a task."""
-    task = await db.get(Task, str(task_id))
+    task = await _get_task(db, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -191,17 +533,26 @@ async def delete_task(
     task.status = "archived"
     task.updated_at = datetime.utcnow()
 
-    await db.commit()
-    await db.refresh(task)
+    if memory_store is not None:
+        await memory_store.save(task)
+    else:
+        await db.commit()
+        await db.refresh(task)
+    _track_reminders([task])
 
-    return TaskSchema.from_orm(task)
+    return task_response(task)
 
 
 @router.get(
     "/tasks",
     response_model=TaskList,
     summary="List tasks",
-    description="Retrieve a list of tasks with optional filtering, sorting, and pagination",
+    description=(
+        "Retrieve a list of tasks with optional filtering, sorting, and pagination. "
+        f"With `Accept: {NDJSON_MEDIA_TYPE}` tasks are streamed one JSON object "
+        "per line, followed by a final `pagination` line."
+    ),
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
 )
 async def list_tasks(
     # Filtering parameters
@@ -209,6 +560,7 @@ async def list_tasks(
         None, description="Filter by status (can specify multiple)"
     ),
     context: Optional[str] = Query(None, description="Filter by context"),
+    workspace: Optional[str] = Query(None, description="Filter by workspace"),
     tags: Optional[str] = Query(None, description="Filter by tags (comma-separated)"),
     priority: Optional[str] = Query(None, description="Minimum priority level"),
     due_before: Optional[datetime] = Query(None, description="Tasks due before date"),
@@ -216,75 +568,452 @@ async def list_tasks(
     updated_since: Optional[datetime] = Query(
         None, description="Tasks updated since date"
     ),
+    ready: Optional[bool] = Query(
+        None,
+        description="Open tasks without (true) or with (false) unfinished blockers",
+    ),
+    parent: Optional[UUID] = Query(None, description="Subtasks of this task"),
     # Sorting parameters
     sort: str = Query("updated_at", description="Sort field"),
     order: str = Query("desc", description="Sort order (asc/desc)"),
     # Pagination parameters
     limit: int = Query(100, ge=1, le=1000, description="Maximum results"),
     cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    accept: Optional[str] = Header(None, description="Response media type"),
     db: AsyncSession = Depends(get_db),
-) -> TaskList:
+) -> Union[ModelJSONResponse, StreamingResponse]:
     """List tasks with filtering, sorting, and pagination."""
-    # Build query
-    query = select(Task)
-
-    # Apply filters
-    if status:
-        query = query.where(Task.status.in_(status))
-
-    if context:
-        query = query.where(Task.context == context)
-
-    # TODO: Implement proper JSON array filtering for tags
-    # For now, skip tag filtering to avoid SQL errors
-    # if tags:
-    #     # Filter tasks that contain any of the specified tags
-    #     tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
-    #     if tag_list:
-    #         # Use JSON_EXTRACT for SQLite JSON queries
-    #         conditions = []
-    #         for tag in tag_list:
-    #             conditions.append(f"JSON_EXTRACT(tags, '$') LIKE '%\"{tag}\"%'")
-    #         query = query.filter(db.or_(*[db.text(cond) for cond in conditions]))
-
-    if priority:
-        # Map priority to numeric values for comparison
-        priority_order = {"low": 0, "medium": 1, "high": 2, "urgent": 3}
-        min_priority_value = priority_order.get(priority, 0)
-        priority_conditions = [
-            Task.priority == p
-            for p in priority_order
-            if priority_order[p] >= min_priority_value
-        ]
-        query = query.where(or_(*priority_conditions))
-
-    if due_before:
-        query = query.where(Task.due_at < due_before)
-
-    if due_after:
-        query = query.where(Task.due_at > due_after)
-
-    if updated_since:
-        query = query.where(Task.updated_at > updated_since)
-
-    # Apply sorting
-    sort_column = getattr(Task, sort, Task.updated_at)
-    if order == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
+    # Tags are stored trimmed and lowercased
+    tag_list = [
+        tag.strip().lower() for tag in (tags or "").split(",") if tag.strip()
+    ] or None
+    query, sort_column = task_statement(
+        status=status,
+        context=context,
+        workspace=workspace,
+        tags=tag_list,
+        priority=priority,
+        due_before=due_before,
+        due_after=due_after,
+        updated_since=updated_since,
+        ready=ready,
+        parent=parent,
+        sort=sort,
+        order=order,
+    )
+
+    streaming = bool(accept and NDJSON_MEDIA_TYPE in accept)
+
+    task_list = None
+    if memory_store is not None:
+        task_list = memory_store.list_tasks(
+            status=status,
+            context=context or None,
+            workspace=workspace or None,
+            tags=tag_list,
+            min_priority=priority,
+            due_before=due_before,
+            due_after=due_after,
+            updated_since=updated_since,
+            ready=ready,
+            parent=str(parent) if parent else None,
+            sort=sort,
+            descending=order == "desc",
+            limit=limit,
+        )
+    elif shard_router is not None:
+        # Query every shard (or the workspace's one) and merge by sort key
+        task_list = await shard_router.gather(
+            query,
+            limit,
+            sort_column,
+            descending=order == "desc",
+            shard_ids=[shard_router.shard_for(workspace)] if workspace else None,
+        )
+
+    if task_list is not None:
+        if streaming:
+            return StreamingResponse(
+                ndjson_task_lines(
+                    iterate(task_list),
+                    lambda count: {"pagination": pagination(count, limit)},
+                ),
+                media_type=NDJSON_MEDIA_TYPE,
+            )
+        return ModelJSONResponse(
+            TaskList.model_construct(
+                tasks=TASK_LIST_ADAPTER.validate_python(
+                    task_list, from_attributes=True
+                ),
+                pagination=pagination(len(task_list), limit),
+            )
+        )
+
+    # Stream plain rows straight from the cursor: no identity map, no page list
+    if streaming:
+        rows = await db.stream(
+            query.with_only_columns(
+                *Task.__table__.columns, Task.tags.expression.label("tags")
+            ).limit(limit)
+        )
+        return StreamingResponse(
+            ndjson_task_lines(
+                rows, lambda count: {"pagination": pagination(count, limit)}
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
 
     # Execute query
     tasks = await db.execute(query.limit(limit))
     task_list = tasks.scalars().all()
 
-    return TaskList(
-        tasks=[TaskSchema.from_orm(task) for task in task_list],
-        pagination={
-            "has_more": len(task_list) == limit,
-            "next_cursor": f"offset_{len(task_list)}"
-            if len(task_list) == limit
-            else None,
-            "total_count": len(task_list),
-        },
+    # Rows are validated once; model_construct skips re-validating the page
+    return ModelJSONResponse(
+        TaskList.model_construct(
+            tasks=TASK_LIST_ADAPTER.validate_python(task_list, from_attributes=True),
+            pagination=pagination(len(task_list), limit),
+        )
+    )
+
+
+@router.get(
+    "/tasks/{task_id}/dependencies",
+    response_model=TaskDependencies,
+    summary="Get task dependencies",
+    description="Ids of the tasks blocking a task and of the tasks it blocks",
+    responses={
+        404: {"model": ErrorResponse, "description": "Task not found"},
+        501: {"model": ErrorResponse, "description": "Not supported by the engine"},
+    },
+)
+async def get_dependencies(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> TaskDependencies:
+    """List the blockers and dependents of a task."""
+    _require_database("Dependencies")
+    task = await _get_task(db, task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    blockers, dependents = await db.run_sync(dependencies_of, task)
+    return TaskDependencies(blockers=blockers, dependents=dependents)
+
+
+@router.post(
+    "/tasks/{task_id}/dependencies",
+    response_model=TaskSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Add task dependency",
+    description=(
+        "Mark a task as blocked by another one. A `todo` task with an "
+        "unfinished blocker becomes `blocked`, and returns to `todo` once its "
+        "last blocker is done or archived."
+    ),
+    responses={
+        404: {"model": ErrorResponse, "description": "Task or blocker not found"},
+        409: {"model": ErrorResponse, "description": "Dependency would form a cycle"},
+        400: {"model": ErrorResponse, "description": "Tasks are in different shards"},
+        501: {"model": ErrorResponse, "description": "Not supported by the engine"},
+    },
+)
+async def create_dependency(
+    task_id: UUID,
+    dependency: DependencyCreate,
+    db: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """Add a blocker to a task."""
+    _require_database("Dependencies")
+    task = await _get_task(db, task_id)
+    blocker = await _get_task(db, dependency.blocker_id)
+    if not task or not blocker:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found" if not task else "Blocker not found",
+        )
+
+    if (
+        shard_router is not None
+        and inspect(task).identity_token != inspect(blocker).identity_token
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Dependencies must link tasks in the same shard",
+        )
+
+    try:
+        added = await db.run_sync(add_dependency, task, blocker)
+    except DependencyCycle:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Dependency would form a cycle",
+        )
+    if added:
+        task.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(task)
+
+    return task_response(task, status_code=status.HTTP_201_CREATED)
+
+
+@router.delete(
+    "/tasks/{task_id}/dependencies/{blocker_id}",
+    response_model=TaskSchema,
+    summary="Remove task dependency",
+    description="Stop a task being blocked by another one",
+    responses={
+        404: {"model": ErrorResponse, "description": "Dependency not found"},
+        501: {"model": ErrorResponse, "description": "Not supported by the engine"},
+    },
+)
+async def delete_dependency(
+    task_id: UUID,
+    blocker_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """Remove a blocker from a task."""
+    _require_database("Dependencies")
+    task = await _get_task(db, task_id)
+    blocker = await _get_task(db, blocker_id)
+    if (
+        not task
+        or not blocker
+        or not await db.run_sync(remove_dependency, task, blocker)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dependency not found",
+        )
+
+    task.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(task)
+
+    return task_response(task)
+
+
+@router.get(
+    "/tasks/{task_id}/history",
+    response_model=TaskHistory,
+    summary="Get task history",
+    description=(
+        "The changes recorded for a task, oldest first, after the snapshot "
+        "its older changes were compacted into. With `as_of`, also the "
+        "task's fields right after that event."
+    ),
+    responses={
+        404: {"model": ErrorResponse, "description": "Task or event not found"},
+        501: {"model": ErrorResponse, "description": "Not supported by the engine"},
+    },
+)
+async def get_history(
+    task_id: UUID,
+    as_of: Optional[int] = Query(None, description="Event id to rebuild the task at"),
+    db: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """List the recorded changes of a task."""
+    _require_database("Task histories")
+    task = await _get_task(db, task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    snapshot, events = await db.run_sync(
+        lambda session: task_history(task_connection(session, task), task.id)
+    )
+    state = None
+    if as_of is not None:
+        state = state_at(snapshot, events, as_of)
+        if state is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found or compacted",
+            )
+
+    return ModelJSONResponse(
+        TaskHistory.model_validate(
+            {"snapshot": snapshot, "events": events, "state": state},
+            from_attributes=True,
+        )
+    )
+
+
+@router.post(
+    "/tasks/{task_id}/undo",
+    response_model=TaskSchema,
+    summary="Undo last change",
+    description=(
+        "Revert the latest recorded change to a task that is not already "
+        "undone. Repeating it steps further back through the kept history."
+    ),
+    responses={
+        404: {"model": ErrorResponse, "description": "Task not found"},
+        409: {"model": ErrorResponse, "description": "Nothing can be undone"},
+        501: {"model": ErrorResponse, "description": "Not supported by the engine"},
+    },
+)
+async def undo_task_change(
+    task_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """Undo the latest change to a task."""
+    _require_database("Task histories")
+    task = await _get_task(db, task_id)
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    old_tags = list(task.tags)
+    old_parent_id = task.parent_id
+    try:
+        await db.run_sync(undo_last_change, task)
+    except CannotUndo as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    if task.parent_id is not None and task.parent_id != old_parent_id:
+        await _check_parent(db, task, task.parent_id, task.workspace)
+    relocated = shard_router is not None and (
+        shard_router.shard_for(task.workspace) != inspect(task).identity_token
+    )
+    if relocated:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Cannot undo a move to another shard",
+        )
+
+    task.updated_at = datetime.utcnow()
+    await db.commit()
+    await db.refresh(task)
+    tag_index.adjust(old_tags, task.tags)
+    _track_reminders([task])
+
+    return task_response(task)
+
+
+def _tag_usage(session: Session) -> Counter:
+    """Usage count of every tag, summed over all vocabularies."""
+    usage: Counter = Counter()
+    for connection in database_connections(session):
+        for tag in vocabulary_tags(connection):
+            usage[tag.name] += tag.usage_count
+    return usage
+
+
+async def _loaded_tag_index(db: AsyncSession) -> TagIndex:
+    """The tag index, loaded from the vocabulary on first use."""
+    while not tag_index.loaded:
+        generation = tag_index.generation
+        if memory_store is not None:
+            usage = memory_store.tag_counts()
+        else:
+            usage = await db.run_sync(_tag_usage)
+        # A write that landed while the counts were read may be missing from
+        # them (or counted twice once applied), so read again
+        if tag_index.generation == generation:
+            tag_index.load(usage)
+    return tag_index
+
+
+@router.get(
+    "/tags",
+    response_model=TagList,
+    summary="List tags",
+    description=(
+        "List tags with the number of tasks using each, most used first. With "
+        "`prefix`, only tags starting with it (for autocomplete)."
+    ),
+)
+async def list_tags(
+    prefix: str = Query("", max_length=50, description="Tag name prefix"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum results"),
+    db: AsyncSession = Depends(get_db),
+) -> TagList:
+    """List tags by usage, from the in-memory tag index."""
+    index = await _loaded_tag_index(db)
+    # Tags are stored trimmed and lowercased
+    suggestions = index.suggest(prefix.strip().lower(), limit)
+    return TagList(
+        tags=[TagSummary(name=name, usage_count=count) for name, count in suggestions]
+    )
+
+
+@router.post(
+    "/tags/rename",
+    response_model=TagSummary,
+    summary="Rename tag",
+    description=(
+        "Rename a tag on every task that carries it. Renaming onto an existing "
+        "tag's name merges the two. Only the tag vocabulary is updated, so the "
+        "cost does not depend on how many tasks use the tag."
+    ),
+    responses={
+        404: {"model": ErrorResponse, "description": "Tag not found"},
+    },
+)
+async def rename_tag_endpoint(
+    rename: TagRename,
+    db: AsyncSession = Depends(get_db),
+) -> TagSummary:
+    """Rename or merge a tag."""
+    if memory_store is not None:
+        found = await memory_store.rename_tag(rename.name, rename.new_name) > 0
+        usage = memory_store.tag_counts()
+    else:
+
+        def apply(session: Session) -> bool:
+            renamed = [
+                rename_tag(connection, rename.name, rename.new_name)
+                for connection in database_connections(session)
+            ]
+            return any(tag is not None for tag in renamed)
+
+        found = await db.run_sync(apply)
+        await db.commit()
+        usage = await db.run_sync(_tag_usage)
+
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tag not found",
+        )
+    tag_index.rename(rename.name, rename.new_name, usage[rename.new_name])
+    view_cache.bump()
+    return TagSummary(name=rename.new_name, usage_count=usage[rename.new_name])
+
+
+@router.get(
+    "/reminders",
+    summary="Stream due-date reminders",
+    description=(
+        "Server-Sent Events stream with one `reminder` event (task id, title, "
+        "due time) whenever an open task falls due. Send `Last-Event-ID` when "
+        "reconnecting to receive recent events that were missed. Requires "
+        "`TICK_TASK_REMINDERS_ENABLED`."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"text/event-stream": {}}},
+        404: {"model": ErrorResponse, "description": "Reminders are disabled"},
+    },
+)
+async def stream_reminders(
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """Stream reminders as they fire."""
+    if reminder_scheduler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reminders are disabled",
+        )
+    resume = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    return StreamingResponse(
+        event_stream(reminder_scheduler, resume),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
     )
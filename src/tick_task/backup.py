@@ -0,0 +1,290 @@
+"""Online database backups using SQLite's backup API.
+
+Snapshots are copied page-batch by page-batch while the service keeps
+running: between batches the source is unlocked, so writers are never held
+up for longer than one batch. Every snapshot is checked with
+``PRAGMA integrity_check`` before it is published, and old snapshots are
+pruned according to the retention setting.
+"""
+
+import asyncio
+import logging
+import shutil
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Mapping, Optional
+
+from tick_task.config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TIME_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+class BackupError(Exception):
+    """Raised when a backup cannot be taken or fails verification."""
+
+
+class BackupRestarted(Exception):
+    """Raised from the progress callback to abandon a restarting backup."""
+
+
+@dataclass
+class FileBackup:
+    """Outcome of backing up a single database file."""
+
+    source: Path
+    destination: Path
+    pages: int
+    bytes: int
+    restarts: int
+
+
+@dataclass
+class BackupResult:
+    """Outcome of one snapshot run."""
+
+    snapshot: Path
+    started_at: datetime
+    duration_seconds: float
+    files: list[FileBackup] = field(default_factory=list)
+
+    @property
+    def bytes(self) -> int:
+        """Total size of the snapshot."""
+        return sum(file.bytes for file in self.files)
+
+    @property
+    def throughput_bytes_per_second(self) -> float:
+        """Copy rate over the whole run, verification included."""
+        if self.duration_seconds <= 0:
+            return 0.0
+        return self.bytes / self.duration_seconds
+
+
+def backup_file(
+    source: Path,
+    destination: Path,
+    pages_per_step: int = 1024,
+    step_sleep: float = 0.01,
+    max_restarts: int = 3,
+) -> FileBackup:
+    """Copy ``source`` to ``destination`` with the online backup API.
+
+    SQLite restarts a stepped backup whenever another connection writes to
+    the source. After ``max_restarts`` restarts the copy is finished in a
+    single step instead, which holds a read transaction for its duration;
+    in WAL mode that still does not block writers.
+    """
+    state = {"remaining": None, "restarts": 0}
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        previous = state["remaining"]
+        if previous is not None and remaining > previous:
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise BackupRestarted()
+        state["remaining"] = remaining
+        # Give writers a window between batches
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    dst = sqlite3.connect(destination)
+    try:
+        try:
+            src.backup(dst, pages=pages_per_step, progress=progress)
+        except BackupRestarted:
+            logger.info("Backup of %s kept restarting; copying in one step", source)
+            src.backup(dst, pages=-1)
+        pages = dst.execute("PRAGMA page_count").fetchone()[0]
+        page_size = dst.execute("PRAGMA page_size").fetchone()[0]
+    finally:
+        dst.close()
+        src.close()
+
+    return FileBackup(
+        source=source,
+        destination=destination,
+        pages=pages,
+        bytes=pages * page_size,
+        restarts=state["restarts"],
+    )
+
+
+def verify_file(path: Path) -> None:
+    """Run ``PRAGMA integrity_check`` on ``path``; raise if it is not ok."""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        problems = [row[0] for row in connection.execute("PRAGMA integrity_check")]
+    finally:
+        connection.close()
+    if problems != ["ok"]:
+        raise BackupError(f"Integrity check failed for {path}: {problems[:5]}")
+
+
+def list_snapshots(directory: Path) -> list[Path]:
+    """Published snapshots in ``directory``, oldest first."""
+    if not directory.is_dir():
+        return []
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_dir() and not path.name.endswith(".partial")
+    )
+
+
+def apply_retention(directory: Path, keep: int) -> list[Path]:
+    """Delete all but the newest ``keep`` snapshots; return the deleted ones."""
+    snapshots = list_snapshots(directory)
+    expired = snapshots[: max(len(snapshots) - keep, 0)]
+    for snapshot in expired:
+        shutil.rmtree(snapshot)
+    return expired
+
+
+def create_snapshot(
+    sources: Mapping[str, Path],
+    directory: Path,
+    keep: int = 7,
+    pages_per_step: int = 1024,
+    step_sleep: float = 0.01,
+) -> BackupResult:
+    """Back up ``sources`` into a new timestamped snapshot under ``directory``.
+
+    ``sources`` maps each file's path inside the snapshot to the database
+    file to copy. Files are written to a ``.partial`` directory that is
+    renamed only once every copy passed its integrity check, so a published
+    snapshot is always complete.
+    """
+    started_at = datetime.now(timezone.utc)
+    began = time.perf_counter()
+    snapshot = directory / started_at.strftime(SNAPSHOT_TIME_FORMAT)
+    partial = snapshot.with_name(snapshot.name + ".partial")
+    if snapshot.exists() or partial.exists():
+        raise BackupError(f"Snapshot {snapshot.name} already exists")
+    partial.mkdir(parents=True)
+
+    files = []
+    try:
+        for name, source in sources.items():
+            destination = partial / name
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            files.append(backup_file(source, destination, pages_per_step, step_sleep))
+            verify_file(destination)
+        partial.rename(snapshot)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+
+    for file in files:
+        file.destination = snapshot / file.destination.relative_to(partial)
+    apply_retention(directory, keep)
+    return BackupResult(
+        snapshot=snapshot,
+        started_at=started_at,
+        duration_seconds=time.perf_counter() - began,
+        files=files,
+    )
+
+
+def database_files() -> dict[str, Path]:
+    """The configured database file and any shard files, by snapshot path."""
+    if ":memory:" in settings.database_url:
+        raise BackupError("In-memory databases cannot be backed up")
+    files = {settings.database_path.name: settings.database_path}
+    shard_directory = settings.data_dir / "shards"
+    if settings.shard_mode != "off" and shard_directory.is_dir():
+        for path in sorted(shard_directory.glob("*.db")):
+            files[f"shards/{path.name}"] = path
+    return {name: path for name, path in files.items() if path.is_file()}
+
+
+class BackupManager:
+    """Runs snapshots one at a time, on demand and on a schedule."""
+
+    def __init__(
+        self,
+        directory: Path,
+        keep: int = 7,
+        pages_per_step: int = 1024,
+        step_sleep: float = 0.01,
+    ) -> None:
+        self.directory = directory
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.last_result: Optional[BackupResult] = None
+        self.last_error: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a snapshot is being taken right now."""
+        return self._lock.locked()
+
+    async def run(self, sources: Optional[Mapping[str, Path]] = None) -> BackupResult:
+        """Take a snapshot in a worker thread; raise if one is already running."""
+        if self._lock.locked():
+            raise BackupError("A backup is already running")
+        async with self._lock:
+            files = database_files() if sources is None else sources
+            if not files:
+                raise BackupError("No database files to back up")
+            try:
+                result = await asyncio.to_thread(
+                    create_snapshot,
+                    files,
+                    self.directory,
+                    self.keep,
+                    self.pages_per_step,
+                    self.step_sleep,
+                )
+            except Exception as exc:
+                self.last_error = str(exc)
+                raise
+            self.last_result = result
+            self.last_error = None
+            logger.info(
+                "Backup %s: %d bytes in %.2fs (%.1f MB/s)",
+                result.snapshot.name,
+                result.bytes,
+                result.duration_seconds,
+                result.throughput_bytes_per_second / 1_000_000,
+            )
+            return result
+
+    def start(self, interval_seconds: float) -> None:
+        """Take a snapshot every ``interval_seconds`` until :meth:`stop`."""
+
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.run()
+                except Exception:
+                    logger.exception("Scheduled backup failed")
+
+        self._task = asyncio.create_task(loop())
+
+    async def stop(self) -> None:
+        """Cancel the schedule started with :meth:`start`."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+backup_manager = BackupManager(
+    settings.data_dir / "backups",
+    keep=settings.backup_retention,
+    pages_per_step=settings.backup_pages_per_step,
+    step_sleep=settings.backup_step_sleep,
+)
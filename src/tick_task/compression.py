@@ -0,0 +1,247 @@
+"""Negotiated response compression for FIN-tasks.
+
+Compresses buffered responses with the best encoding the client accepts
+(zstd, brotli, gzip). zstd and brotli are only offered when their optional
+libraries are installed. Compressed bodies are kept in an LRU cache bounded
+by their total size and keyed by a digest of the uncompressed payload, so hot
+responses (identical task pages, cached views, static assets) are only
+compressed once.
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # Optional: pip install tick-task[compression]
+    import brotli
+except ImportError:  # pragma: no cover - depends on installed extras
+    brotli = None
+
+try:  # Optional: pip install tick-task[compression]
+    import zstandard
+except ImportError:  # pragma: no cover - depends on installed extras
+    zstandard = None
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _build_compressors() -> dict[str, Callable[[bytes], bytes]]:
+    """Return the available compressors in server preference order."""
+    compressors: dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        compressors["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    if brotli is not None:
+        compressors["br"] = lambda data: brotli.compress(data, quality=4)
+    compressors["gzip"] = _gzip
+    return compressors
+
+
+COMPRESSORS = _build_compressors()
+
+# Content types that are already compressed, or that are streamed to the
+# client incrementally and must not be buffered.
+SKIPPED_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "font/woff",
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/octet-stream",
+    "application/x-ndjson",
+    "text/event-stream",
+)
+
+
+def negotiate_encoding(
+    accept_encoding: str, available: Optional[list[str]] = None
+) -> Optional[str]:
+    """Pick the best content coding for an ``Accept-Encoding`` header.
+
+    The client's quality values win; ties are broken by server preference
+    (the order of ``available``). Returns ``None`` when nothing acceptable
+    is available.
+    """
+    if available is None:
+        available = list(COMPRESSORS)
+
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best: Optional[str] = None
+    best_quality = 0.0
+    for coding in available:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressedPayloadCache:
+    """LRU cache of compressed bodies keyed by payload digest.
+
+    Bounded by the total size of the compressed bytes it holds, so a few
+    large payloads cannot pin more memory than ``max_bytes``.
+    """
+
+    def __init__(
+        self, max_bytes: int = 32 * 1024 * 1024, max_entry_size: int = 4 * 1024 * 1024
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_size = max_entry_size
+        self._entries: OrderedDict[tuple[bytes, str], bytes] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(body: bytes) -> bytes:
+        """Return the cache key digest for an uncompressed body."""
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        """Return ``body`` compressed with ``encoding``, reusing cached bytes."""
+        if self.max_bytes <= 0 or len(body) > self.max_entry_size:
+            return COMPRESSORS[encoding](body)
+
+        key = (self.digest(body), encoding)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        compressed = COMPRESSORS[encoding](body)
+        if len(compressed) > self.max_bytes:
+            return compressed
+
+        self._entries[key] = compressed
+        self.size += len(compressed)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+        return compressed
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._entries.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses complete responses above a threshold.
+
+    Streaming responses (more than one body message), responses that already
+    carry a ``Content-Encoding`` and non-compressible content types are passed
+    through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache: Optional[CompressedPayloadCache] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else CompressedPayloadCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.cache)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request ``send`` wrapper that decides whether to compress."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        minimum_size: int,
+        cache: CompressedPayloadCache,
+    ) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+
+    def _should_skip(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return True
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(SKIPPED_CONTENT_TYPES)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            self.passthrough = self._should_skip(Headers(raw=message["headers"]))
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        # First body message: decide based on the complete payload.
+        self.passthrough = True
+        assert self.start_message is not None
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if message.get("more_body", False) or len(body) < self.minimum_size:
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        compressed = self.cache.get_or_compress(body, self.encoding)
+        if len(compressed) >= len(body):
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
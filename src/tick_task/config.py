@@ -2,10 +2,46 @@
 
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic_settings import BaseSettings
 from pydantic import Field
+from pydantic_settings import BaseSettings
+from sqlalchemy.engine import make_url
+
+# Connection PRAGMAs per SQLite performance preset:
+# - durable: fsync on every commit, modest memory use
+# - balanced: WAL with synchronous=NORMAL (durable across app crashes; a power
+#   loss may drop the last commits), memory-mapped reads
+# - throughput: no fsync, large cache and mmap; for bulk loads and benchmarks
+SQLITE_PROFILES: dict[str, dict[str, object]] = {
+    "durable": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16_000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "foreign_keys": True,
+    },
+    "balanced": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": True,
+    },
+    "throughput": {
+        "busy_timeout": 10_000,
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -256_000,
+        "mmap_size": 1024 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": True,
+    },
+}
 
 
 class Settings(BaseSettings):
@@ -22,18 +58,167 @@ class Settings(BaseSettings):
         description="Database connection URL"
     )
 
+    read_pool_size: int = Field(
+        4, description="Read-only connections in the read pool", ge=1
+    )
+    sqlite_driver: Literal["aiosqlite", "threadpool"] = Field(
+        "aiosqlite",
+        description="Run each session operation as one job on a sqlite3 thread pool",
+    )
+
+    # SQLite tuning: a named preset, optionally overridden per pragma
+    sqlite_profile: Literal["durable", "balanced", "throughput"] = Field(
+        "balanced", description="SQLite performance preset"
+    )
+    sqlite_journal_mode: Optional[str] = Field(
+        None, description="Override PRAGMA journal_mode"
+    )
+    sqlite_synchronous: Optional[str] = Field(
+        None, description="Override PRAGMA synchronous"
+    )
+    sqlite_cache_size: Optional[int] = Field(
+        None, description="Override PRAGMA cache_size (negative = KiB)"
+    )
+    sqlite_mmap_size: Optional[int] = Field(
+        None, description="Override PRAGMA mmap_size in bytes", ge=0
+    )
+    sqlite_temp_store: Optional[str] = Field(
+        None, description="Override PRAGMA temp_store"
+    )
+    sqlite_busy_timeout: Optional[int] = Field(
+        None, description="Override PRAGMA busy_timeout in milliseconds", ge=0
+    )
+    sqlite_foreign_keys: Optional[bool] = Field(
+        None, description="Override PRAGMA foreign_keys"
+    )
+
+    # Compact on-disk encoding (opt-in; apply with `alembic upgrade head`)
+    compact_storage: bool = Field(
+        False, description="Store ids, timestamps and enums in compact binary form"
+    )
+    compact_without_rowid: bool = Field(
+        False, description="Use a WITHOUT ROWID table in the compact layout"
+    )
+
+    # Workspace sharding (one SQLite file per workspace or hash bucket)
+    shard_mode: Literal["off", "workspace", "hash"] = Field(
+        "off", description="Split tasks into per-workspace database files"
+    )
+    shard_buckets: int = Field(
+        16, description="Number of database files in hash shard mode", ge=1
+    )
+
+    # Memory-first storage engine (tasks in RAM, durable append-only log)
+    storage_engine: Literal["sqlite", "memory"] = Field(
+        "sqlite", description="Where tasks are stored and queried"
+    )
+    memory_fsync_interval_ms: float = Field(
+        2.0, description="Window for batching log writes into one fsync", ge=0
+    )
+    memory_snapshot_interval_minutes: float = Field(
+        10.0, description="Minutes between memory store snapshots (0 disables)", ge=0
+    )
+    memory_snapshot_log_records: int = Field(
+        100_000, description="Log records that trigger an early snapshot", ge=1
+    )
+
+    # Online backups into <data_dir>/backups
+    backup_interval_minutes: int = Field(
+        0, description="Minutes between scheduled backups (0 disables)", ge=0
+    )
+    backup_retention: int = Field(7, description="Snapshots to keep", ge=1)
+    backup_pages_per_step: int = Field(
+        1024, description="Database pages copied per backup step", ge=1
+    )
+    backup_step_sleep: float = Field(
+        0.01, description="Seconds to pause between backup steps", ge=0
+    )
+
+    # Due-date reminders (cursor kept in <data_dir>/reminders.json)
+    reminders_enabled: bool = Field(
+        False, description="Fire reminders when open tasks fall due"
+    )
+    reminder_bucket_seconds: float = Field(
+        3600.0,
+        description="Width of the timer-wheel buckets holding later reminders",
+        gt=0,
+    )
+
+    # Task history (task_events), compacted into per-task snapshots
+    history_keep_events: int = Field(
+        100, description="Latest events kept per task; older ones are folded", ge=1
+    )
+    history_compact_interval_minutes: float = Field(
+        60.0, description="Minutes between history compactions (0 disables)", ge=0
+    )
+
+    # Near-duplicate detection on task creation (title_buckets)
+    duplicate_threshold: float = Field(
+        0.7,
+        description="Title shingle similarity from which tasks are duplicates",
+        gt=0,
+        le=1,
+    )
+
+    # Saved views (GET /api/v1/views/{id}/tasks)
+    view_cache_entries: int = Field(
+        256,
+        description="Views whose plan and first page are cached (0 disables)",
+        ge=0,
+    )
+
+    # Chunked data migrations (backfills)
+    data_migration_chunk_size: int = Field(
+        1000, description="Rows per data migration transaction", ge=1
+    )
+    data_migration_duty_cycle: float = Field(
+        0.5,
+        description="Share of wall-clock time a data migration may spend working",
+        gt=0,
+        le=1,
+    )
+
+    # Storage statistics (GET /api/v1/admin/storage)
+    storage_stats_object_ttl_seconds: float = Field(
+        300.0,
+        description="Seconds to reuse the per-table/index dbstat scan (0 rescans)",
+        ge=0,
+    )
+    storage_stats_cache_counters: bool = Field(
+        False,
+        description="Report page cache hits/misses via ctypes (CPython 3.9-3.13)",
+    )
+
     # Application settings
     data_dir: Path = Field(
         Path.home() / ".tick-task",
         description="Data directory path"
     )
 
+    # Built frontend served by the API process (``npm run build`` output)
+    frontend_dist: Optional[Path] = Field(
+        Path("frontend/dist"), description="Built frontend directory to serve"
+    )
+
+    # Response compression settings
+    compression_enabled: bool = Field(True, description="Compress HTTP responses")
+    compression_minimum_size: int = Field(
+        1024, description="Smallest response body (bytes) worth compressing", ge=0
+    )
+    compression_cache_bytes: int = Field(
+        32 * 1024 * 1024,
+        description="Total size (bytes) of compressed payloads kept for reuse "
+        "(0 disables)",
+        ge=0,
+    )
+
     # LAN mode settings (disabled by default)
     lan_mode: bool = Field(False, description="Enable LAN mode")
     lan_token: Optional[str] = Field(None, description="LAN access token")
 
     class Config:
         """Pydantic configuration."""
+
         env_prefix = "TICK_TASK_"
         case_sensitive = False
 
@@ -41,16 +226,23 @@ class Settings(BaseSettings):
     def database_path(self) -> Path:
         """Get the database file path."""
         if self.database_url.startswith("sqlite"):
-            # Extract path from sqlite:///./path or sqlite+aiosqlite:///./path
-            url_parts = self.database_url.split("://")
-            if len(url_parts) == 2:
-                path_part = url_parts[1]
-                if path_part.startswith("./"):
-                    return Path(path_part[2:])
-                elif path_part.startswith("/"):
-                    return Path(path_part)
+            # sqlite+aiosqlite:///./path is relative to the working directory,
+            # sqlite+aiosqlite:////path is absolute
+            database = make_url(self.database_url).database
+            if database and database != ":memory:":
+                return Path(database)
         return self.data_dir / "tick-task.db"
 
+    @property
+    def sqlite_pragmas(self) -> dict[str, object]:
+        """PRAGMA values for new connections: the profile plus any overrides."""
+        pragmas = dict(SQLITE_PROFILES[self.sqlite_profile])
+        for name in pragmas:
+            override = getattr(self, f"sqlite_{name}")
+            if override is not None:
+                pragmas[name] = override
+        return pragmas
+
     def ensure_data_dir(self) -> None:
         """Ensure the data directory exists."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,231 @@
+"""Chunked, resumable data migrations (backfills).
+
+Schema migrations change tables; data migrations rewrite rows. A backfill
+over millions of rows run as a single transaction would hold SQLite's write
+lock for its whole duration, so :class:`DataMigration` instead walks the
+table in primary-key order, one chunk per transaction:
+
+- each chunk is read with keyset pagination (``WHERE key > :last ORDER BY
+  key LIMIT n``), so every chunk costs the same regardless of progress
+- the chunk's changes and the new high-water mark are committed together
+  in ``data_migration_progress``, so an interrupted run resumes where it
+  stopped and never processes a chunk twice
+- after each chunk the migration sleeps long enough to keep its share of
+  wall-clock time at ``duty_cycle``, leaving the write lock to the API
+
+A data migration is normally run from an Alembic revision, after the schema
+change it backfills::
+
+    from tick_task.data_migrations import DataMigration, run_in_alembic
+
+    def fill_title_length(connection, rows):
+        connection.execute(
+            tasks.update().where(tasks.c.id == sa.bindparam("task_id")),
+            [{"task_id": row.id, "title_length": len(row.title)} for row in rows],
+        )
+
+    def upgrade() -> None:
+        op.add_column("tasks", sa.Column("title_length", sa.Integer()))
+        run_in_alembic(
+            DataMigration("003_title_length", tasks, tasks.c.id, fill_title_length)
+        )
+
+It can equally be run against a live database with :meth:`DataMigration.run`
+while the service keeps serving requests.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection, Engine, Row
+
+from tick_task.config import settings
+
+logger = logging.getLogger(__name__)
+
+progress_metadata = sa.MetaData()
+
+progress_table = sa.Table(
+    "data_migration_progress",
+    progress_metadata,
+    sa.Column("name", sa.String(200), primary_key=True),
+    sa.Column("last_key", sa.JSON(), nullable=True),
+    sa.Column("rows_processed", sa.Integer(), nullable=False, default=0),
+    sa.Column("chunks", sa.Integer(), nullable=False, default=0),
+    sa.Column("started_at", sa.DateTime(), nullable=False),
+    sa.Column("updated_at", sa.DateTime(), nullable=False),
+    sa.Column("completed_at", sa.DateTime(), nullable=True),
+)
+
+
+@dataclass
+class DataMigrationReport:
+    """Outcome of one :meth:`DataMigration.run` call."""
+
+    name: str
+    rows: int
+    chunks: int
+    elapsed_seconds: float
+    resumed: bool
+    completed: bool
+
+
+class DataMigration:
+    """A backfill over ``table`` in chunks ordered by ``key_column``.
+
+    ``process(connection, rows)`` is called once per chunk inside the
+    chunk's transaction and should write its changes through
+    ``connection``. ``key_column`` must be unique and its values JSON
+    serializable (string ids or integers), since the last key of each chunk
+    is stored for resuming.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: sa.Table,
+        key_column: sa.Column,
+        process: Callable[[Connection, Sequence[Row]], None],
+        *,
+        columns: Optional[Sequence[sa.Column]] = None,
+        where: Optional[Any] = None,
+        chunk_size: Optional[int] = None,
+        duty_cycle: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if duty_cycle is None:
+            duty_cycle = settings.data_migration_duty_cycle
+        if not 0 < duty_cycle <= 1:
+            raise ValueError("duty_cycle must be in (0, 1]")
+        self.name = name
+        self.table = table
+        self.key_column = key_column
+        self.process = process
+        self.columns = list(columns) if columns is not None else list(table.columns)
+        self.where = where
+        self.chunk_size = chunk_size or settings.data_migration_chunk_size
+        self.duty_cycle = duty_cycle
+        self.sleep = sleep
+
+    def _chunk_query(self, last_key: Any) -> sa.Select:
+        query = (
+            sa.select(*self.columns).order_by(self.key_column).limit(self.chunk_size)
+        )
+        if self.key_column not in self.columns:
+            query = query.add_columns(self.key_column)
+        if self.where is not None:
+            query = query.where(self.where)
+        if last_key is not None:
+            query = query.where(self.key_column > last_key)
+        return query
+
+    def run(
+        self, engine: Engine, max_chunks: Optional[int] = None
+    ) -> DataMigrationReport:
+        """Process remaining chunks, committing each one; resume if interrupted.
+
+        ``max_chunks`` stops after that many chunks, leaving the rest for a
+        later call; by default the migration runs to completion.
+        """
+        progress_metadata.create_all(engine)
+        began = time.perf_counter()
+        rows_processed = chunks = 0
+
+        with engine.begin() as connection:
+            progress = connection.execute(
+                sa.select(progress_table).where(progress_table.c.name == self.name)
+            ).first()
+            if progress is None:
+                now = datetime.utcnow()
+                connection.execute(
+                    progress_table.insert().values(
+                        name=self.name,
+                        last_key=None,
+                        rows_processed=0,
+                        chunks=0,
+                        started_at=now,
+                        updated_at=now,
+                    )
+                )
+                last_key = None
+            elif progress.completed_at is not None:
+                return DataMigrationReport(self.name, 0, 0, 0.0, True, True)
+            else:
+                last_key = progress.last_key
+        resumed = last_key is not None
+        if resumed:
+            logger.info("Resuming data migration %s after %r", self.name, last_key)
+
+        completed = False
+        while max_chunks is None or chunks < max_chunks:
+            chunk_began = time.perf_counter()
+            with engine.begin() as connection:
+                rows = connection.execute(self._chunk_query(last_key)).all()
+                now = datetime.utcnow()
+                if not rows:
+                    connection.execute(
+                        progress_table.update()
+                        .where(progress_table.c.name == self.name)
+                        .values(updated_at=now, completed_at=now)
+                    )
+                    completed = True
+                    break
+
+                self.process(connection, rows)
+                last_key = getattr(rows[-1], self.key_column.key)
+                connection.execute(
+                    progress_table.update()
+                    .where(progress_table.c.name == self.name)
+                    .values(
+                        last_key=last_key,
+                        rows_processed=progress_table.c.rows_processed + len(rows),
+                        chunks=progress_table.c.chunks + 1,
+                        updated_at=now,
+                    )
+                )
+            rows_processed += len(rows)
+            chunks += 1
+
+            # Stay idle long enough to use only duty_cycle of wall-clock time
+            busy = time.perf_counter() - chunk_began
+            if self.duty_cycle < 1:
+                self.sleep(busy * (1 - self.duty_cycle) / self.duty_cycle)
+
+        return DataMigrationReport(
+            name=self.name,
+            rows=rows_processed,
+            chunks=chunks,
+            elapsed_seconds=time.perf_counter() - began,
+            resumed=resumed,
+            completed=completed,
+        )
+
+
+def migration_progress(engine: Engine) -> list[dict]:
+    """Progress of every data migration recorded in the database."""
+    progress_metadata.create_all(engine)
+    with engine.connect() as connection:
+        return [
+            dict(row._mapping)
+            for row in connection.execute(
+                sa.select(progress_table).order_by(progress_table.c.started_at)
+            )
+        ]
+
+
+def run_in_alembic(migration: DataMigration) -> DataMigrationReport:
+    """Run ``migration`` from inside an Alembic revision.
+
+    Alembic's transaction is committed first (via ``autocommit_block``) so
+    the schema change is visible and the write lock is free; the backfill
+    then commits chunk by chunk on its own connections.
+    """
+    from alembic import op
+
+    engine = op.get_bind().engine
+    with op.get_context().autocommit_block():
+        return migration.run(engine)
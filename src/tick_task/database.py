@@ -1,42 +1,526 @@
 """Database configuration and session management."""
 
-from typing import AsyncGenerator
+import asyncio
+import hashlib
+import heapq
+import itertools
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Iterable, Mapping, Optional, Union
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import Column, Engine, Select, create_engine, event, inspect
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import operators, visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
 
 from tick_task.config import settings
+from tick_task.sqlite_threadpool import ThreadPoolDriver
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-)
 
-# Create async session factory
-async_session_factory = sessionmaker(
-    bind=engine,
+def apply_sqlite_pragmas(dbapi_connection: Any, pragmas: Mapping[str, object]) -> None:
+    """Apply PRAGMA settings to a freshly opened SQLite DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if isinstance(value, bool):
+                value = "ON" if value else "OFF"
+            if not str(value).lstrip("-").isalnum():
+                raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def create_database_engine(
+    database_url: str,
+    pragmas: Optional[Mapping[str, object]] = None,
+    **kwargs: Any,
+) -> AsyncEngine:
+    """Create an async engine, tuning every new SQLite connection with ``pragmas``."""
+    new_engine = create_async_engine(
+        database_url,
+        echo=settings.debug,
+        future=True,
+        **kwargs,
+    )
+
+    if pragmas and database_url.startswith("sqlite"):
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return new_engine
+
+
+def create_sync_database_engine(
+    database_url: str,
+    pragmas: Optional[Mapping[str, object]] = None,
+    **kwargs: Any,
+) -> Engine:
+    """Create a plain ``sqlite3`` engine for a SQLite URL of any driver."""
+    url = make_url(database_url).set(drivername="sqlite")
+    new_engine = create_engine(
+        url, echo=settings.debug, connect_args={"check_same_thread": False}, **kwargs
+    )
+
+    if pragmas:
+
+        @event.listens_for(new_engine, "connect")
+        def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    return new_engine
+
+
+def is_memory_database(database_url: str) -> bool:
+    """Return True for SQLite URLs that point at a private in-memory database."""
+    return database_url.startswith("sqlite") and (
+        ":memory:" in database_url
+        or "mode=memory" in database_url
+        or database_url.rstrip("/").endswith(":")
+    )
+
+
+# A single-connection writer engine serializes writes in the pool instead of
+# in SQLite lock retries; readers get their own query_only connections and
+# read concurrent WAL snapshots. An in-memory database exists per connection,
+# so there both roles share one engine.
+if is_memory_database(settings.database_url):
+    write_engine = create_database_engine(
+        settings.database_url, settings.sqlite_pragmas
+    )
+    read_engine = write_engine
+else:
+    write_engine = create_database_engine(
+        settings.database_url,
+        settings.sqlite_pragmas,
+        pool_size=1,
+        max_overflow=0,
+    )
+    read_engine = create_database_engine(
+        settings.database_url,
+        {**settings.sqlite_pragmas, "query_only": True},
+        pool_size=settings.read_pool_size,
+        max_overflow=0,
+    )
+
+# Backwards-compatible alias used for DDL and maintenance work
+engine = write_engine
+
+# Create async session factories
+write_session_factory = sessionmaker(
+    bind=write_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+read_session_factory = sessionmaker(
+    bind=read_engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+async_session_factory = write_session_factory
+
+# Optional thread-pool driver: each session operation is one hop to a plain
+# sqlite3 connection instead of one aiosqlite hop per DBAPI call
+threadpool_driver: Optional[ThreadPoolDriver] = None
+if settings.sqlite_driver == "threadpool":
+    if is_memory_database(settings.database_url):
+        _shared = create_sync_database_engine(
+            settings.database_url, settings.sqlite_pragmas, poolclass=StaticPool
+        )
+        threadpool_driver = ThreadPoolDriver(_shared, _shared, read_pool_size=1)
+    else:
+        threadpool_driver = ThreadPoolDriver(
+            create_sync_database_engine(
+                settings.database_url,
+                settings.sqlite_pragmas,
+                pool_size=1,
+                max_overflow=0,
+            ),
+            create_sync_database_engine(
+                settings.database_url,
+                {**settings.sqlite_pragmas, "query_only": True},
+                pool_size=settings.read_pool_size,
+                max_overflow=0,
+            ),
+            read_pool_size=settings.read_pool_size,
+        )
+
+# HTTP methods routed to the read engine; everything else may write.
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ShardRouter:
+    """Routes tasks to per-workspace SQLite files.
+
+    In ``workspace`` mode every workspace gets its own database file; in
+    ``hash`` mode workspaces are hashed into a fixed number of bucket files.
+    Each shard has its own engine and therefore its own write lock, so writes
+    to different workspaces proceed in parallel. Shard files are created on
+    first use; tasks without a workspace live in the ``default`` shard.
+    """
+
+    DEFAULT_SHARD = "default"
+
+    def __init__(
+        self,
+        directory: Path,
+        mode: str = "workspace",
+        buckets: int = 16,
+        pragmas: Optional[Mapping[str, object]] = None,
+        location_cache_size: int = 100_000,
+    ) -> None:
+        self.directory = directory
+        self.mode = mode
+        self.buckets = buckets
+        self.pragmas = pragmas
+        self.engines: dict[str, AsyncEngine] = {}
+        self._ready: set[str] = set()
+        self._lock = threading.Lock()
+        self._locations: OrderedDict[str, str] = OrderedDict()
+        self._location_cache_size = location_cache_size
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in sorted(self.directory.glob("*.db")):
+            self.engine(path.stem)
+        self.engine(self.shard_for(None))
+
+        self.session_factory = sessionmaker(
+            class_=AsyncSession,
+            sync_session_class=RoutedShardSession,
+            expire_on_commit=False,
+            router=self,
+        )
+
+    @property
+    def shard_ids(self) -> list[str]:
+        """Ids of all known shards."""
+        return list(self.engines)
+
+    def shard_for(self, workspace: Optional[str]) -> str:
+        """Return the id of the shard that stores ``workspace``'s tasks."""
+        if self.mode == "hash":
+            bucket = zlib.crc32((workspace or "").encode("utf-8")) % self.buckets
+            return f"bucket-{bucket:03d}"
+        if workspace is None:
+            return self.DEFAULT_SHARD
+        # Readable but collision-free: slug for humans, digest for uniqueness
+        slug = re.sub(r"[^a-z0-9]+", "-", workspace.lower()).strip("-")[:40]
+        digest = hashlib.blake2b(workspace.encode("utf-8"), digest_size=4).hexdigest()
+        return f"ws-{slug}-{digest}" if slug else f"ws-{digest}"
+
+    def engine(self, shard_id: str) -> AsyncEngine:
+        """Return the engine for ``shard_id``, creating it if needed."""
+        shard_engine = self.engines.get(shard_id)
+        if shard_engine is None:
+            with self._lock:
+                shard_engine = self.engines.get(shard_id)
+                if shard_engine is None:
+                    path = self.directory / f"{shard_id}.db"
+                    shard_engine = create_database_engine(
+                        f"sqlite+aiosqlite:///{path}", self.pragmas
+                    )
+                    self.engines[shard_id] = shard_engine
+        return shard_engine
+
+    def sync_engine(self, shard_id: str) -> Any:
+        """Return the sync side of a shard's engine, creating its tables once.
+
+        Only called from inside a session's greenlet, where blocking calls on
+        the sync engine are allowed.
+        """
+        sync_engine = self.engine(shard_id).sync_engine
+        if shard_id not in self._ready:
+            from tick_task.models import Base
+
+            Base.metadata.create_all(sync_engine)
+            self._ready.add(shard_id)
+        return sync_engine
+
+    async def ensure_tables(self, shard_id: str) -> None:
+        """Create the tables in ``shard_id`` if this process has not yet."""
+        if shard_id in self._ready:
+            return
+        from tick_task.models import Base
+
+        async with self.engine(shard_id).begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self._ready.add(shard_id)
+
+    async def create_tables(self) -> None:
+        """Create the tables in every known shard."""
+        for shard_id in self.shard_ids:
+            await self.ensure_tables(shard_id)
+
+    async def dispose(self) -> None:
+        """Dispose every shard engine."""
+        for shard_engine in self.engines.values():
+            await shard_engine.dispose()
 
+    async def gather(
+        self,
+        statement: Select,
+        limit: int,
+        sort_column: Any,
+        descending: bool,
+        shard_ids: Optional[Iterable[str]] = None,
+    ) -> list[Any]:
+        """Run an ordered ``statement`` on every shard and merge the results.
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session."""
-    async with async_session_factory() as session:
+        Each shard returns at most ``limit`` rows already sorted by
+        ``sort_column``; the pages are queried concurrently and merged by that
+        same key, so only ``shards * limit`` rows are ever held in memory.
+        """
+        shard_ids = list(self.shard_ids if shard_ids is None else shard_ids)
+
+        async def query_shard(shard_id: str) -> list[Any]:
+            await self.ensure_tables(shard_id)
+            async with AsyncSession(
+                self.engine(shard_id), expire_on_commit=False
+            ) as session:
+                result = await session.execute(statement.limit(limit))
+                return list(result.scalars())
+
+        pages = await asyncio.gather(*(query_shard(shard) for shard in shard_ids))
+        key = _sort_key(sort_column)
+        merged = heapq.merge(*pages, key=key, reverse=descending)
+        return list(itertools.islice(merged, limit))
+
+    async def relocate(self, session: AsyncSession, task: Any) -> Any:
+        """Move ``task`` to the shard matching its (possibly changed) workspace.
+
+        Returns the instance to keep using: ``task`` itself when it already
+        lives in the right shard, otherwise a copy pending in the new shard.
+        The flush inserts the copy before deleting the original, so a failure
+        between the two shard commits leaves a duplicate rather than losing the
+        task; the move is not atomic across files.
+        """
+        state = inspect(task)
+        if state.identity_token in (None, self.shard_for(task.workspace)):
+            return task
+
+        # Tag ids belong to the old shard's vocabulary; the copy's tag names
+        # are interned into the new shard's on flush
+        moved = type(task)(
+            **{
+                attr.key: getattr(task, attr.key)
+                for attr in state.mapper.column_attrs
+                if attr.key != "tag_ids"
+            }
+        )
+        await session.delete(task)
+        self.forget(str(task.id))
+        session.add(moved)
+        return moved
+
+    def remember(self, task_id: str, shard_id: str) -> None:
+        """Record which shard holds ``task_id``."""
+        self._locations[task_id] = shard_id
+        self._locations.move_to_end(task_id)
+        if len(self._locations) > self._location_cache_size:
+            self._locations.popitem(last=False)
+
+    def forget(self, task_id: str) -> None:
+        """Drop the cached location of ``task_id``."""
+        self._locations.pop(task_id, None)
+
+    # ShardedSession hooks
+
+    def choose_shard(self, mapper: Any, instance: Any, **kwargs: Any) -> str:
+        """Pick the shard for a new instance from its workspace."""
+        return self.shard_for(getattr(instance, "workspace", None))
+
+    def identity_shards(
+        self, mapper: Any, primary_key: Any, **kwargs: Any
+    ) -> list[str]:
+        """Shards that may hold ``primary_key``: the cached one, else all."""
+        location = self._locations.get(str(primary_key[0]))
+        return [location] if location is not None else self.shard_ids
+
+    def execute_shards(self, orm_context: ORMExecuteState) -> list[str]:
+        """Narrow a statement to one shard when it pins an id or workspace."""
+        for column, value in _equality_criteria(orm_context):
+            if column == "workspace":
+                return [self.shard_for(value)]
+            if column == "id" and str(value) in self._locations:
+                return [self._locations[str(value)]]
+        return self.shard_ids
+
+
+class RoutedShardSession(ShardedSession):
+    """ShardedSession whose shards come from a :class:`ShardRouter`.
+
+    Shards are bound lazily, so a workspace created after the session opened
+    still gets its own file.
+    """
+
+    def __init__(self, router: ShardRouter, **kwargs: Any) -> None:
+        self.router = router
+        super().__init__(
+            shard_chooser=router.choose_shard,
+            identity_chooser=router.identity_shards,
+            execute_chooser=router.execute_shards,
+            **kwargs,
+        )
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        shard_id: Optional[str] = None,
+        instance: Any = None,
+        clause: Any = None,
+        **kwargs: Any,
+    ) -> Any:
+        if shard_id is None:
+            shard_id = self._choose_shard_and_assign(
+                mapper, instance=instance, clause=clause
+            )
+        self.bind_shard(shard_id, self.router.sync_engine(shard_id))
+        return super().get_bind(
+            mapper, shard_id=shard_id, instance=instance, clause=clause, **kwargs
+        )
+
+
+@event.listens_for(RoutedShardSession, "loaded_as_persistent")
+@event.listens_for(RoutedShardSession, "pending_to_persistent")
+def _remember_location(session: RoutedShardSession, instance: Any) -> None:
+    """Cache the shard of every task the session loads or inserts."""
+    token = inspect(instance).identity_token
+    if token is not None:
+        session.router.remember(str(instance.id), token)
+
+
+def _equality_criteria(orm_context: ORMExecuteState) -> Iterable[tuple[str, Any]]:
+    """Yield ``(column name, value)`` for ``column = value`` WHERE criteria."""
+    statement = orm_context.statement
+    where = getattr(statement, "whereclause", None)
+    if where is None:
+        return
+    for element in visitors.iterate(where):
+        if (
+            isinstance(element, BinaryExpression)
+            and element.operator is operators.eq
+            and isinstance(element.left, Column)
+            and isinstance(element.right, BindParameter)
+        ):
+            value = element.right.value
+            if value is None:
+                value = (orm_context.parameters or {}).get(element.right.key)
+            if value is not None:
+                yield element.left.key, value
+
+
+def _sort_key(sort_column: Any) -> Callable[[Any], tuple]:
+    """Key that orders tasks the way SQLite orders ``sort_column``.
+
+    NULLs sort first ascending (and so last descending), as in SQLite.
+    Compact enum columns sort by ordinal, matching their stored integers.
+    """
+    name = sort_column.key
+    ordinals = getattr(sort_column.type, "_ordinals", None)
+    if ordinals is not None:
+        return lambda task: (
+            getattr(task, name) is not None,
+            ordinals.get(getattr(task, name), -1),
+        )
+
+    def key(task: Any) -> tuple:
+        value = getattr(task, name)
+        return (value is not None, value if value is not None else 0)
+
+    return key
+
+
+# Optional workspace sharding; None when all workspaces share one file
+shard_router: Optional[ShardRouter] = (
+    ShardRouter(
+        settings.data_dir / "shards",
+        settings.shard_mode,
+        buckets=settings.shard_buckets,
+        pragmas=settings.sqlite_pragmas,
+    )
+    if settings.shard_mode != "off"
+    else None
+)
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a database session for the current route.
+
+    Read-only requests get a session on the read pool; mutating requests get
+    the single writer connection. With sharding enabled, the session routes
+    each task to its workspace's shard instead.
+    """
+    if shard_router is not None:
+        session_factory = shard_router.session_factory
+    elif threadpool_driver is not None:
+        if request.method in READ_ONLY_METHODS:
+            session_factory = threadpool_driver.read_session
+        else:
+            session_factory = threadpool_driver.write_session
+    elif request.method in READ_ONLY_METHODS:
+        session_factory = read_session_factory
+    else:
+        session_factory = write_session_factory
+
+    async with session_factory() as session:
         try:
             yield session
         finally:
             await session.close()
 
 
+def database_connections(session: Session) -> list[Connection]:
+    """Connections to every database file: one per shard, or the database."""
+    if isinstance(session, RoutedShardSession):
+        return [
+            session.connection(bind_arguments={"shard_id": shard_id})
+            for shard_id in session.router.shard_ids
+        ]
+    return [session.connection()]
+
+
+def pool_statistics() -> dict[str, dict[str, Any]]:
+    """Return connection pool statistics for the read and write engines."""
+
+    def describe(target: Union[AsyncEngine, Engine]) -> dict[str, Any]:
+        pool = target.pool
+        stats: dict[str, Any] = {"pool_class": type(pool).__name__}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            stats[name] = method() if callable(method) else None
+        return stats
+
+    if threadpool_driver is not None:
+        return {
+            "read": describe(threadpool_driver.read_engine),
+            "write": describe(threadpool_driver.write_engine),
+        }
+    return {"read": describe(read_engine), "write": describe(write_engine)}
+
+
 async def create_tables() -> None:
     """Create all database tables."""
     from tick_task.models import Base
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    if shard_router is not None:
+        await shard_router.create_tables()
+    if threadpool_driver is not None:
+        await asyncio.to_thread(
+            Base.metadata.create_all, threadpool_driver.write_engine
+        )
 
 
 async def drop_tables() -> None:
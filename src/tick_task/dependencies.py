@@ -0,0 +1,271 @@
+"""Task dependencies ("blocked by").
+
+Edges live in ``task_dependencies`` (:class:`~tick_task.models.TaskDependency`):
+``task_id`` is blocked by ``blocker_id``.
+
+- Each task counts its unfinished blockers in ``open_blockers``, so the
+  tasks that are ready to start (open, nothing blocking them) are an indexed
+  filter (``GET /tasks?ready=true``) rather than a graph walk.
+- Adding an unfinished blocker to a ``todo`` task makes it ``blocked``, and a
+  ``blocked`` task whose last blocker is finished (done or archived) goes back
+  to ``todo``. Finishing or reopening a task adjusts its dependents from the
+  session's ``before_flush`` hook, so they change in the same transaction.
+- Cycles are refused as edges are added, without walking the whole graph.
+  Tasks with dependencies hold a position in a topological order of the
+  graph (``topo_order``, the algorithm of Pearce and Kelly). An edge that
+  agrees with the order is accepted without any search; otherwise only the
+  tasks positioned between its two ends are visited, then reordered.
+
+With sharding, dependencies link tasks of the same shard. The memory
+storage engine does not support them.
+"""
+
+from collections import Counter
+
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.selectable import ScalarSelect
+
+from tick_task.models import CLOSED_STATUSES, Task, TaskDependency
+
+edges_table = TaskDependency.__table__
+tasks_table = Task.__table__
+
+
+class DependencyCycle(Exception):
+    """Raised when a dependency would make a task (indirectly) block itself."""
+
+
+def task_connection(session: Session, task: Task) -> Connection:
+    """The connection to the database (shard) that holds ``task``."""
+    return session.connection(
+        bind_arguments={"mapper": inspect(task).mapper, "instance": task}
+    )
+
+
+def _adjust(task: Task, delta: int) -> None:
+    """Add ``delta`` unfinished blockers to ``task`` and update its status."""
+    task.open_blockers += delta
+    if task.open_blockers > 0 and task.status == "todo":
+        task.status = "blocked"
+    elif task.open_blockers == 0 and task.status == "blocked":
+        task.status = "todo"
+
+
+def _position(task_param: str) -> ScalarSelect:
+    return (
+        select(tasks_table.c.topo_order)
+        .where(tasks_table.c.id == bindparam(task_param))
+        .scalar_subquery()
+    )
+
+
+# Topological positions of the two ends of a new edge
+_ORDERS = select(_position("blocker_id"), _position("task_id"))
+# Separate subqueries, so SQLite reads each end off the index
+_BOUNDS = select(
+    select(func.min(tasks_table.c.topo_order)).scalar_subquery(),
+    select(func.max(tasks_table.c.topo_order)).scalar_subquery(),
+)
+_SET_ORDER = (
+    update(tasks_table)
+    .where(tasks_table.c.id == bindparam("moved_id"))
+    .values(topo_order=bindparam("position"))
+)
+
+
+def _set_orders(connection: Connection, positions: dict[str, int]) -> None:
+    if not positions:
+        return
+    connection.execute(
+        _SET_ORDER,
+        [{"moved_id": task_id, "position": at} for task_id, at in positions.items()],
+    )
+
+
+def _region(
+    connection: Connection,
+    start: str,
+    position: int,
+    forward: bool,
+    bound: int,
+) -> dict[str, int]:
+    """Positions of the tasks reachable from ``start`` within ``bound``.
+
+    Follows edges to dependents (``forward``) through tasks positioned up to
+    ``bound``, or to blockers through tasks positioned after it. One
+    recursive query, however many tasks the region holds.
+    """
+    if forward:
+        source, target = edges_table.c.blocker_id, edges_table.c.task_id
+        within = tasks_table.c.topo_order <= bound
+    else:
+        source, target = edges_table.c.task_id, edges_table.c.blocker_id
+        within = tasks_table.c.topo_order > bound
+    region = select(
+        literal(start, tasks_table.c.id.type).label("id"),
+        literal(position).label("position"),
+    ).cte("region", recursive=True)
+    region = region.union(
+        select(tasks_table.c.id, tasks_table.c.topo_order)
+        .join(edges_table, target == tasks_table.c.id)
+        .join(region, source == region.c.id)
+        .where(within)
+    )
+    return dict(connection.execute(select(region.c.id, region.c.position)).all())
+
+
+def _place(connection: Connection, blocker_id: str, task_id: str) -> None:
+    """Order ``blocker_id`` before ``task_id``, reordering tasks if needed.
+
+    Raises:
+        DependencyCycle: If ``blocker_id`` is already blocked by ``task_id``.
+    """
+    first, second = connection.execute(
+        _ORDERS, {"blocker_id": blocker_id, "task_id": task_id}
+    ).one()
+    if first is None or second is None:
+        # A task without dependencies can go first (blocker) or last.
+        bounds = connection.execute(_BOUNDS).one()
+        lowest, highest = bounds[0] or 0, bounds[1] or 0
+        if first is None and second is None:
+            _set_orders(connection, {blocker_id: highest + 1, task_id: highest + 2})
+        elif first is None:
+            _set_orders(connection, {blocker_id: lowest - 1})
+        else:
+            _set_orders(connection, {task_id: highest + 1})
+        return
+    if first < second:
+        return
+
+    # Affected region: what the task blocks, positioned up to the blocker,
+    # and what blocks the blocker, positioned after the task
+    forward = _region(connection, task_id, second, True, first)
+    if blocker_id in forward:
+        raise DependencyCycle(blocker_id)
+    backward = _region(connection, blocker_id, first, False, second)
+
+    # Reuse the region's positions: everything behind the blocker first
+    moved = sorted(backward, key=backward.__getitem__) + sorted(
+        forward, key=forward.__getitem__
+    )
+    positions = sorted([*backward.values(), *forward.values()])
+    _set_orders(
+        connection,
+        {
+            node: position
+            for node, position in zip(moved, positions)
+            if position != backward.get(node, forward.get(node))
+        },
+    )
+
+
+def add_dependency(session: Session, task: Task, blocker: Task) -> bool:
+    """Record that ``task`` is blocked by ``blocker``.
+
+    Returns False if it already was.
+
+    Raises:
+        DependencyCycle: If ``blocker`` is ``task`` or is blocked by it,
+            directly or through other tasks.
+    """
+    if task.id == blocker.id:
+        raise DependencyCycle(task.id)
+    connection = task_connection(session, task)
+    existing = connection.execute(
+        select(edges_table.c.task_id).where(
+            edges_table.c.task_id == task.id, edges_table.c.blocker_id == blocker.id
+        )
+    ).first()
+    if existing is not None:
+        return False
+    _place(connection, blocker.id, task.id)
+    connection.execute(
+        insert(edges_table).values(task_id=task.id, blocker_id=blocker.id)
+    )
+    # The orders were written behind the ORM's back
+    session.expire(task, ["topo_order"])
+    session.expire(blocker, ["topo_order"])
+    if blocker.status not in CLOSED_STATUSES:
+        _adjust(task, 1)
+    return True
+
+
+def remove_dependency(session: Session, task: Task, blocker: Task) -> bool:
+    """Record that ``task`` is no longer blocked by ``blocker``.
+
+    Returns False if it was not. Positions are left alone: the order stays
+    valid without the edge.
+    """
+    removed = task_connection(session, task).execute(
+        delete(edges_table).where(
+            edges_table.c.task_id == task.id, edges_table.c.blocker_id == blocker.id
+        )
+    )
+    if removed.rowcount == 0:
+        return False
+    if blocker.status not in CLOSED_STATUSES:
+        _adjust(task, -1)
+    return True
+
+
+def dependencies_of(session: Session, task: Task) -> tuple[list[str], list[str]]:
+    """Ids of the tasks blocking ``task`` and of the tasks it blocks."""
+    connection = task_connection(session, task)
+    blockers = connection.execute(
+        select(edges_table.c.blocker_id)
+        .where(edges_table.c.task_id == task.id)
+        .order_by(edges_table.c.blocker_id)
+    ).scalars()
+    dependents = connection.execute(
+        select(edges_table.c.task_id)
+        .where(edges_table.c.blocker_id == task.id)
+        .order_by(edges_table.c.task_id)
+    ).scalars()
+    return list(blockers), list(dependents)
+
+
+def update_dependents(session: Session) -> None:
+    """Unblock or re-block the dependents of tasks finished or reopened.
+
+    Called from the ``before_flush`` hook, so the dependents are flushed
+    (and committed) with the tasks that changed.
+    """
+    changes = {}
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        history = inspect(task).attrs.status.history
+        if not history.deleted:
+            continue
+        closed = task.status in CLOSED_STATUSES
+        if closed != (history.deleted[0] in CLOSED_STATUSES):
+            changes[task.id] = -1 if closed else 1
+    if not changes:
+        return
+
+    with session.no_autoflush:
+        edges = session.execute(
+            select(TaskDependency.task_id, TaskDependency.blocker_id).where(
+                TaskDependency.blocker_id.in_(changes)
+            )
+        )
+        deltas: Counter = Counter()
+        for task_id, blocker_id in edges:
+            deltas[task_id] += changes[blocker_id]
+        if not deltas:
+            return
+        dependents = session.execute(select(Task).where(Task.id.in_(deltas)))
+        for dependent in dependents.scalars():
+            if deltas[dependent.id]:
+                _adjust(dependent, deltas[dependent.id])
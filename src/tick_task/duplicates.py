@@ -0,0 +1,211 @@
+"""Near-duplicate task detection.
+
+Titles are normalized (case, punctuation, spacing), cut into character
+shingles and summarized by a MinHash signature of ``BANDS * ROWS`` values.
+The signature is split into ``BANDS`` bands of ``ROWS`` values, and each
+band is hashed into one bucket id. The ``title_buckets`` table
+(:class:`~tick_task.models.TitleBucket`) maps bucket ids to tasks, and is
+kept current by the session's ``after_flush`` hook.
+
+Two titles whose shingle sets have a Jaccard similarity ``s`` share at
+least one bucket with probability ``1 - (1 - s**ROWS) ** BANDS``: about 98%
+at 0.7 and 24% at 0.3. Finding candidates is one lookup of ``BANDS`` keys
+on the table's primary key, whatever the number of tasks; candidates are
+then confirmed by their exact similarity.
+
+Only open tasks (not done or archived) in the same workspace count as
+duplicates. Changing ``BANDS``, ``ROWS`` or ``SHINGLE`` changes every
+bucket id, and so needs the table refilled.
+"""
+
+import hashlib
+import random
+import re
+import struct
+from functools import lru_cache
+from typing import Optional, Sequence
+
+from sqlalchemy import bindparam, delete, insert, inspect, select
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+
+from tick_task.dependencies import task_connection
+from tick_task.models import CLOSED_STATUSES, Task, TitleBucket
+
+buckets_table = TitleBucket.__table__
+tasks_table = Task.__table__
+
+SHINGLE = 3
+BANDS = 10
+ROWS = 3
+
+# Universal hashing modulo a Mersenne prime, one (a, b) pair per signature
+# value; seeded, since bucket ids are stored
+_PRIME = (1 << 61) - 1
+_rng = random.Random(48)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(BANDS * ROWS)
+]
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Write and clear the title buckets of one task
+_INSERT = insert(buckets_table)
+_DELETE = delete(buckets_table).where(buckets_table.c.task_id == bindparam("id"))
+
+# Open tasks sharing at least one of the buckets, in or out of a workspace
+_CANDIDATES = select(tasks_table.c.id, tasks_table.c.title).where(
+    tasks_table.c.id.in_(
+        select(buckets_table.c.task_id).where(
+            buckets_table.c.bucket.in_(bindparam("buckets", expanding=True))
+        )
+    ),
+    tasks_table.c.status.not_in(CLOSED_STATUSES),
+)
+_CANDIDATES_IN_WORKSPACE = _CANDIDATES.where(
+    tasks_table.c.workspace == bindparam("workspace")
+)
+_CANDIDATES_WITHOUT_WORKSPACE = _CANDIDATES.where(tasks_table.c.workspace.is_(None))
+
+
+def normalize(title: str) -> str:
+    """``title`` lowercased, with runs of punctuation and spaces as one space."""
+    return _SEPARATORS.sub(" ", title.lower()).strip()
+
+
+def shingles(title: str) -> frozenset[str]:
+    """The character ``SHINGLE``-grams of the normalized title."""
+    text = normalize(title)
+    if len(text) <= SHINGLE:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i : i + SHINGLE] for i in range(len(text) - SHINGLE + 1))
+
+
+@lru_cache(maxsize=65_536)
+def _permuted(shingle: str) -> tuple[int, ...]:
+    """A shingle's value under every permutation.
+
+    Cached: titles share a small vocabulary of shingles, so a signature is
+    mostly an elementwise minimum of cached tuples.
+    """
+    digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "big") % _PRIME
+    return tuple((a * value + b) % _PRIME for a, b in _PERMUTATIONS)
+
+
+def bucket_ids(title: str) -> list[int]:
+    """The ``BANDS`` bucket ids of a title; empty if it has no shingles."""
+    values = [_permuted(shingle) for shingle in shingles(title)]
+    if not values:
+        return []
+    signature = list(map(min, *values)) if len(values) > 1 else list(values[0])
+    ids = []
+    for band in range(BANDS):
+        values = signature[band * ROWS : (band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            struct.pack(f">B{ROWS}Q", band, *values), digest_size=8
+        ).digest()
+        # Signed, to fit SQLite's 64-bit INTEGER
+        ids.append(int.from_bytes(digest, "big", signed=True))
+    return ids
+
+
+def similarity(first: frozenset[str], second: frozenset[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def update_title_buckets(session: Session) -> None:
+    """Index the titles of new and retitled tasks.
+
+    Called from the ``after_flush`` hook, once the tasks are written.
+    """
+    stale: dict[Connection, list[dict]] = {}
+    rows: dict[Connection, list[dict]] = {}
+    for task in session.new:
+        if isinstance(task, Task):
+            rows.setdefault(task_connection(session, task), []).extend(
+                {"bucket": bucket, "task_id": task.id}
+                for bucket in set(bucket_ids(task.title))
+            )
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        if not inspect(task).attrs.title.history.has_changes():
+            continue
+        connection = task_connection(session, task)
+        stale.setdefault(connection, []).append({"id": task.id})
+        rows.setdefault(connection, []).extend(
+            {"bucket": bucket, "task_id": task.id}
+            for bucket in set(bucket_ids(task.title))
+        )
+
+    for connection, ids in stale.items():
+        connection.execute(_DELETE, ids)
+    for connection, batch in rows.items():
+        if batch:
+            connection.execute(_INSERT, batch)
+
+
+def index_titles(connection: Connection, rows: Sequence[Row]) -> None:
+    """Index the titles of existing tasks (a data migration chunk)."""
+    batch = [
+        {"bucket": bucket, "task_id": row.id}
+        for row in rows
+        for bucket in set(bucket_ids(row.title))
+    ]
+    if batch:
+        connection.execute(_INSERT, batch)
+
+
+def _candidates(
+    connection: Connection, buckets: list[int], workspace: Optional[str]
+) -> list[Row]:
+    """Open tasks of ``workspace`` sharing at least one of ``buckets``."""
+    if workspace is None:
+        return connection.execute(
+            _CANDIDATES_WITHOUT_WORKSPACE, {"buckets": buckets}
+        ).all()
+    return connection.execute(
+        _CANDIDATES_IN_WORKSPACE, {"buckets": buckets, "workspace": workspace}
+    ).all()
+
+
+def find_duplicates(session: Session, tasks: list[Task], threshold: float) -> list[str]:
+    """Ids of open tasks whose title is near one of ``tasks``' titles.
+
+    ``tasks`` are new, unsaved tasks. Earlier tasks of the list count as
+    well, so a batch repeating itself is caught. Ids are ordered by task,
+    then by decreasing similarity.
+    """
+    found: dict[str, None] = {}
+    earlier: dict[int, list[Task]] = {}
+    for task in tasks:
+        buckets = bucket_ids(task.title)
+        if not buckets:
+            continue
+        own = shingles(task.title)
+        scored = [
+            (similarity(own, shingles(row.title)), row.id)
+            for row in _candidates(
+                task_connection(session, task), buckets, task.workspace
+            )
+        ]
+        batch = {
+            other.id: other
+            for bucket in buckets
+            for other in earlier.get(bucket, ())
+            if other.workspace == task.workspace
+        }
+        scored.extend(
+            (similarity(own, shingles(other.title)), other.id)
+            for other in batch.values()
+        )
+        for score, task_id in sorted(scored, reverse=True):
+            if score >= threshold:
+                found[task_id] = None
+        for bucket in buckets:
+            earlier.setdefault(bucket, []).append(task)
+    return list(found)
@@ -0,0 +1,191 @@
+"""Subtask hierarchy.
+
+Tasks point at their parent with ``parent_id``. The closure table
+(:class:`~tick_task.models.TaskClosure`) holds every ancestor/descendant
+pair with the number of levels between them, each task being its own
+ancestor at depth 0. The session's ``after_flush`` hook keeps it current in
+the same transaction as the tasks:
+
+- A new task gets its self row plus its parent's ancestor rows, one level
+  deeper.
+- Moving a task (changing ``parent_id``) deletes the rows linking its
+  subtree to its old ancestors, then pairs each new ancestor with each task
+  of the subtree: two statements, however deep or large the subtree.
+
+A subtree, its progress and a task's ancestors are then each one range of
+the closure table's indexes. Tasks written with Core statements rather than
+the ORM are not added. With sharding, a task and its parent are in the same
+shard.
+"""
+
+from sqlalchemy import (
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    inspect,
+    select,
+    true,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.horizontal_shard import set_shard_id
+from sqlalchemy.orm import Session
+
+from tick_task.dependencies import task_connection
+from tick_task.models import Task, TaskClosure
+
+closure_table = TaskClosure.__table__
+tasks_table = Task.__table__
+
+
+class HierarchyCycle(Exception):
+    """Raised when a task would become its own ancestor."""
+
+
+# The two sides of the closure self-join below
+_ancestors = closure_table.alias("ancestors")
+_subtree = closure_table.alias("subtree")
+
+# Pair every ancestor of the parent with every task of the moved subtree
+_ATTACH = insert(closure_table).from_select(
+    ["ancestor_id", "descendant_id", "depth"],
+    select(
+        _ancestors.c.ancestor_id,
+        _subtree.c.descendant_id,
+        _ancestors.c.depth + _subtree.c.depth + 1,
+    )
+    .select_from(_ancestors.join(_subtree, true()))
+    .where(
+        _ancestors.c.descendant_id == bindparam("parent_id"),
+        _subtree.c.ancestor_id == bindparam("task_id"),
+    ),
+)
+
+# Unlink the subtree from the task's ancestors (not from the task itself)
+_DETACH = delete(closure_table).where(
+    closure_table.c.descendant_id.in_(
+        select(_subtree.c.descendant_id).where(
+            _subtree.c.ancestor_id == bindparam("task_id")
+        )
+    ),
+    closure_table.c.ancestor_id.in_(
+        select(_ancestors.c.ancestor_id).where(
+            _ancestors.c.descendant_id == bindparam("task_id"),
+            _ancestors.c.depth > 0,
+        )
+    ),
+)
+
+
+_PROGRESS = (
+    select(
+        func.sum(case((tasks_table.c.status == "done", 1), else_=0)),
+        func.count(),
+    )
+    .select_from(
+        closure_table.join(
+            tasks_table, tasks_table.c.id == closure_table.c.descendant_id
+        )
+    )
+    .where(
+        closure_table.c.ancestor_id == bindparam("task_id"),
+        closure_table.c.depth > 0,
+        tasks_table.c.status != "archived",
+    )
+)
+
+
+def in_subtree(connection: Connection, root_id: str, task_id: str) -> bool:
+    """Whether ``task_id`` is ``root_id`` or one of its descendants."""
+    found = connection.execute(
+        select(closure_table.c.depth).where(
+            closure_table.c.ancestor_id == root_id,
+            closure_table.c.descendant_id == task_id,
+        )
+    ).first()
+    return found is not None
+
+
+def has_subtasks(session: Session, task: Task) -> bool:
+    """Whether any task has ``task`` as its parent."""
+    found = (
+        task_connection(session, task)
+        .execute(select(tasks_table.c.id).where(tasks_table.c.parent_id == task.id))
+        .first()
+    )
+    return found is not None
+
+
+def _parents_first(tasks: list[Task]) -> list[Task]:
+    """``tasks`` ordered so that a parent comes before its children."""
+    remaining = {task.id: task for task in tasks}
+    ordered = []
+    for task in tasks:
+        chain = []
+        while task is not None and task.id in remaining:
+            chain.append(remaining.pop(task.id))
+            task = remaining.get(task.parent_id)
+        ordered.extend(reversed(chain))
+    return ordered
+
+
+def update_closure(session: Session) -> None:
+    """Add new tasks to the closure table and move re-parented subtrees.
+
+    Called from the ``after_flush`` hook: the tasks are written, and the
+    session still lists what was new and changed.
+
+    Raises:
+        HierarchyCycle: If a task was moved under its own subtree.
+    """
+    added = _parents_first([task for task in session.new if isinstance(task, Task)])
+    for task in added:
+        connection = task_connection(session, task)
+        connection.execute(
+            insert(closure_table),
+            {"ancestor_id": task.id, "descendant_id": task.id, "depth": 0},
+        )
+        if task.parent_id is not None:
+            connection.execute(
+                _ATTACH, {"parent_id": task.parent_id, "task_id": task.id}
+            )
+
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        if not inspect(task).attrs.parent_id.history.has_changes():
+            continue
+        connection = task_connection(session, task)
+        if task.parent_id is not None and in_subtree(
+            connection, task.id, task.parent_id
+        ):
+            raise HierarchyCycle(task.id)
+        connection.execute(_DETACH, {"task_id": task.id})
+        if task.parent_id is not None:
+            connection.execute(
+                _ATTACH, {"parent_id": task.parent_id, "task_id": task.id}
+            )
+
+
+def subtree(session: Session, task: Task) -> list[Task]:
+    """The descendants of ``task``, level by level, oldest first."""
+    statement = (
+        select(Task)
+        .join(closure_table, closure_table.c.descendant_id == Task.id)
+        .where(closure_table.c.ancestor_id == task.id, closure_table.c.depth > 0)
+        .order_by(closure_table.c.depth, Task.created_at)
+    )
+    # A sharded session would otherwise ask every shard
+    token = inspect(task).identity_token
+    if token is not None:
+        statement = statement.options(set_shard_id(token))
+    return list(session.execute(statement).scalars())
+
+
+def subtree_progress(session: Session, task: Task) -> tuple[int, int]:
+    """Done and total (not archived) descendants of ``task``."""
+    done, total = (
+        task_connection(session, task).execute(_PROGRESS, {"task_id": task.id}).one()
+    )
+    return done or 0, total
@@ -0,0 +1,325 @@
+"""Task history: an append-only log of changes, with snapshots and undo.
+
+Every ORM write to a task appends a row to ``task_events``
+(:class:`~tick_task.models.TaskEvent`) holding the fields it changed as
+``{field: [old, new]}``, in the same transaction as the task. The changes
+are collected by the session's first ``before_flush`` hook, before the
+other hooks adjust tags and statuses, so a status a task reaches through a
+dependency cascade is not recorded as a change of its own. They are written
+by an ``after_flush`` hook, once new tasks exist for the events to
+reference.
+
+The :class:`HistoryCompactor` keeps each task's log short: all but the last
+``keep`` events of a task are folded into its ``task_snapshots`` row
+(:class:`~tick_task.models.TaskSnapshot`), the task's fields as of the last
+folded event, and deleted. Storage per task and the cost of reconstructing
+any kept state are bounded by ``keep`` however often a task is edited.
+
+Undo reverts the latest change not already undone and is itself recorded,
+as an ``undo`` event. Only kept events can be undone. A task moved to
+another shard starts a new history there.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from tick_task.config import settings
+from tick_task.database import shard_router, threadpool_driver, write_session_factory
+from tick_task.dependencies import task_connection
+from tick_task.models import Task, TaskEvent, TaskSnapshot
+
+logger = logging.getLogger(__name__)
+
+events_table = TaskEvent.__table__
+snapshots_table = TaskSnapshot.__table__
+
+# Fields recorded in events: those a client can set, plus completed_at
+FIELDS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_at",
+    "tags",
+    "context",
+    "workspace",
+    "recurrence",
+    "parent_id",
+    "completed_at",
+)
+DATETIME_FIELDS = ("due_at", "completed_at")
+
+# session.info keys: events collected before the flush, undos in progress
+_PENDING = "tick_task.history.pending"
+_UNDOING = "tick_task.history.undoing"
+
+# One event per change, and the latest state of each task
+_INSERT_EVENT = insert(events_table)
+_upsert = insert(snapshots_table)
+_UPSERT_SNAPSHOT = _upsert.on_conflict_do_update(
+    index_elements=[snapshots_table.c.task_id],
+    set_={
+        "event_id": _upsert.excluded.event_id,
+        "at": _upsert.excluded.at,
+        "state": _upsert.excluded.state,
+    },
+)
+
+
+class CannotUndo(Exception):
+    """Raised when a task has no change that can be undone."""
+
+
+def _encode(value: Any) -> Any:
+    """A field value as stored in JSON."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return value
+
+
+def _decode(field: str, value: Any) -> Any:
+    """A field value as stored in JSON, back as the task attribute."""
+    if field in DATETIME_FIELDS and value is not None:
+        return datetime.fromisoformat(value)
+    return value
+
+
+def record_task_events(session: Session) -> None:
+    """Collect the changes of every task the session is about to flush.
+
+    Called from the first ``before_flush`` hook, while the previous value
+    of every field can still be read.
+    """
+    undoing = session.info.pop(_UNDOING, {})
+    now = datetime.utcnow()
+    pending = []
+
+    def add(task: Task, kind: str, changes: dict, undoes: Optional[int]) -> None:
+        row = dict(task_id=task.id, at=now, kind=kind, changes=changes, undoes=undoes)
+        pending.append((task, row))
+
+    for task in session.new:
+        if isinstance(task, Task):
+            add(
+                task,
+                "created",
+                {field: [None, _encode(getattr(task, field))] for field in FIELDS},
+                None,
+            )
+
+    for task in session.dirty:
+        if not isinstance(task, Task):
+            continue
+        attrs = inspect(task).attrs
+        changes = {}
+        for field in FIELDS:
+            change = attrs[field].history
+            if not change.has_changes():
+                continue
+            old = change.deleted[0] if change.deleted else None
+            new = getattr(task, field)
+            if old != new:
+                changes[field] = [_encode(old), _encode(new)]
+        if changes:
+            undoes = undoing.get(task.id)
+            add(task, "updated" if undoes is None else "undo", changes, undoes)
+
+    session.info[_PENDING] = pending
+
+
+def write_task_events(session: Session) -> None:
+    """Append the collected events; called from the ``after_flush`` hook."""
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    rows: dict[Connection, list[dict]] = {}
+    for task, row in pending:
+        rows.setdefault(task_connection(session, task), []).append(row)
+    for connection, batch in rows.items():
+        connection.execute(_INSERT_EVENT, batch)
+
+
+def fold(state: dict[str, Any], events: list[Row]) -> dict[str, Any]:
+    """``state`` with the new values of ``events`` applied, oldest first."""
+    state = dict(state)
+    for event in events:
+        for field, (_, new) in event.changes.items():
+            state[field] = new
+    return state
+
+
+def task_history(
+    connection: Connection, task_id: str
+) -> tuple[Optional[Row], list[Row]]:
+    """A task's snapshot (or None) and the events after it, oldest first."""
+    snapshot = connection.execute(
+        select(snapshots_table).where(snapshots_table.c.task_id == task_id)
+    ).first()
+    events = connection.execute(
+        select(events_table)
+        .where(events_table.c.task_id == task_id)
+        .order_by(events_table.c.id)
+    ).all()
+    return snapshot, events
+
+
+def state_at(
+    snapshot: Optional[Row], events: list[Row], event_id: int
+) -> Optional[dict[str, Any]]:
+    """The task's fields right after ``event_id``; None if it is not kept."""
+    if snapshot is not None and event_id == snapshot.event_id:
+        return dict(snapshot.state)
+    if not any(event.id == event_id for event in events):
+        return None
+    base = snapshot.state if snapshot is not None else {}
+    return fold(base, [event for event in events if event.id <= event_id])
+
+
+def undo_last_change(session: Session, task: Task) -> int:
+    """Revert the latest change to ``task`` not already undone.
+
+    Sets the task's fields back; the flush records an ``undo`` event.
+    Returns the id of the event undone.
+
+    Raises:
+        CannotUndo: If no kept change is left to undo, or the change
+            completed a recurring task (its next occurrence exists).
+    """
+    events = task_connection(session, task).execute(
+        select(events_table)
+        .where(events_table.c.task_id == task.id)
+        .order_by(events_table.c.id.desc())
+    )
+    undone = set()
+    for event in events:
+        if event.kind == "undo":
+            undone.add(event.undoes)
+        elif event.kind == "updated" and event.id not in undone:
+            break
+    else:
+        raise CannotUndo("Nothing to undo")
+    events.close()
+
+    old_rule, new_rule = event.changes.get("recurrence", (None, None))
+    if old_rule and not new_rule:
+        raise CannotUndo("Cannot undo completing a recurring task")
+    for field, (old, _) in event.changes.items():
+        setattr(task, field, _decode(field, old))
+    session.info.setdefault(_UNDOING, {})[task.id] = event.id
+    return event.id
+
+
+def compact_history(connection: Connection, keep: int, limit: int = 500) -> int:
+    """Fold all but the last ``keep`` events of up to ``limit`` tasks.
+
+    Returns the number of events folded into snapshots and deleted.
+    """
+    over = (
+        select(events_table.c.task_id)
+        .group_by(events_table.c.task_id)
+        .having(func.count() > keep)
+        .limit(limit)
+    )
+    folded = 0
+    for task_id in connection.execute(over).scalars().all():
+        snapshot, events = task_history(connection, task_id)
+        folding = events[: len(events) - keep]
+        last = folding[-1]
+        base = snapshot.state if snapshot is not None else {}
+        connection.execute(
+            _UPSERT_SNAPSHOT,
+            {
+                "task_id": task_id,
+                "event_id": last.id,
+                "at": last.at,
+                "state": fold(base, folding),
+            },
+        )
+        connection.execute(
+            delete(events_table).where(
+                events_table.c.task_id == task_id, events_table.c.id <= last.id
+            )
+        )
+        folded += len(folding)
+    return folded
+
+
+async def compact_all(keep: int, limit: int = 500) -> int:
+    """Compact the history in every database file; return events folded."""
+
+    async def compact(session: AsyncSession) -> int:
+        total = 0
+        while True:
+            folded = await session.run_sync(
+                lambda sync: compact_history(sync.connection(), keep, limit)
+            )
+            await session.commit()
+            total += folded
+            if not folded:
+                return total
+
+    if shard_router is not None:
+        total = 0
+        for shard_id in shard_router.shard_ids:
+            await shard_router.ensure_tables(shard_id)
+            async with AsyncSession(shard_router.engine(shard_id)) as session:
+                total += await compact(session)
+        return total
+    if threadpool_driver is not None:
+        session_factory = threadpool_driver.write_session
+    else:
+        session_factory = write_session_factory
+    async with session_factory() as session:
+        return await compact(session)
+
+
+class HistoryCompactor:
+    """Folds old task events into snapshots on a schedule."""
+
+    def __init__(self, keep: int = 100) -> None:
+        self.keep = keep
+        self.last_folded: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def run(self) -> int:
+        """Compact every database now; return the number of events folded."""
+        self.last_folded = await compact_all(self.keep)
+        if self.last_folded:
+            logger.info("History compaction folded %d events", self.last_folded)
+        return self.last_folded
+
+    def start(self, interval_seconds: float) -> None:
+        """Compact every ``interval_seconds`` until :meth:`stop`."""
+
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.run()
+                except Exception:
+                    logger.exception("History compaction failed")
+
+        self._task = asyncio.create_task(loop())
+
+    async def stop(self) -> None:
+        """Cancel the schedule started with :meth:`start`."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+history_compactor = HistoryCompactor(keep=settings.history_keep_events)
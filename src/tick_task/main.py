@@ -1,14 +1,49 @@
 """Main FastAPI application."""
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
 from fastapi.responses import RedirectResponse
 
+from tick_task.admin import router as admin_router
+from tick_task.analytics import router as analytics_router
 from tick_task.api import router as api_router
+from tick_task.backup import backup_manager
+from tick_task.compression import CompressedPayloadCache, CompressionMiddleware
 from tick_task.config import settings
 from tick_task.database import create_tables
+from tick_task.history import history_compactor
+from tick_task.memory_store import memory_store
+from tick_task.reminders import reminder_scheduler, upcoming_reminders
+from tick_task.static import FrontendAssets
+from tick_task.storage_layout import check_storage_layouts
+from tick_task.views import router as views_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run background services for the lifetime of the application."""
+    if memory_store is None:
+        # Refuse to read a database through the other layout's column types
+        await check_storage_layouts()
+    else:
+        await memory_store.open()
+    if settings.backup_interval_minutes:
+        backup_manager.start(settings.backup_interval_minutes * 60)
+    if reminder_scheduler is not None:
+        await reminder_scheduler.start(upcoming_reminders)
+    if memory_store is None and settings.history_compact_interval_minutes:
+        history_compactor.start(settings.history_compact_interval_minutes * 60)
+    yield
+    await history_compactor.stop()
+    if reminder_scheduler is not None:
+        await reminder_scheduler.stop()
+    await backup_manager.stop()
+    if memory_store is not None:
+        await memory_store.close()
 
 
 def create_application() -> FastAPI:
@@ -20,6 +55,7 @@ def create_application() -> FastAPI:
         version="0.5.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        lifespan=lifespan,
     )
 
     # Configure CORS
@@ -31,14 +67,30 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # Root route - redirect to API docs
-    @app.get("/", include_in_schema=False)
-    async def root():
-        """Redirect root to API documentation."""
-        return RedirectResponse(url="/docs")
+    # Compress large responses (e.g. 1000-task list pages)
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            cache=CompressedPayloadCache(max_bytes=settings.compression_cache_bytes),
+        )
 
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
+    app.include_router(admin_router, prefix="/api/v1")
+    app.include_router(analytics_router, prefix="/api/v1")
+    app.include_router(views_router, prefix="/api/v1")
+
+    # Serve the built frontend if present, otherwise point root at the docs
+    frontend_dist = settings.frontend_dist
+    if frontend_dist is not None and (frontend_dist / "index.html").is_file():
+        app.mount("/", FrontendAssets(frontend_dist), name="frontend")
+    else:
+
+        @app.get("/", include_in_schema=False)
+        async def root():
+            """Redirect root to API documentation."""
+            return RedirectResponse(url="/docs")
 
     return app
 
@@ -0,0 +1,551 @@
+"""Memory-first task storage with an append-only durability log.
+
+When the whole task set fits in RAM, :class:`MemoryStore` serves every read
+from in-memory indexes and only writes to disk to stay durable:
+
+- tasks live in a dict by id, with secondary indexes by status, ``due_at``
+  and ``updated_at`` (the last two as sorted lists for range scans and
+  ordered, limited listing)
+- every change appends the task's full record to a JSON-lines log; appends
+  that arrive within ``fsync_interval`` share one ``write`` + ``fsync``
+  (group commit), and a write is acknowledged only once it is on disk
+- a snapshot of all tasks is written periodically (and when the log grows
+  past ``snapshot_log_records``); the log is rotated first, so recovery
+  loads the newest snapshot and replays the log segments written since
+
+Records are last-write-wins, so replaying a record that is already
+reflected in the snapshot is harmless. A torn final line (crash mid-write)
+is ignored on recovery.
+"""
+
+import asyncio
+import bisect
+import gc
+import heapq
+import json
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from tick_task.config import settings
+from tick_task.models import CLOSED_STATUSES, TASK_PRIORITIES, Task
+
+logger = logging.getLogger(__name__)
+
+# Records hold tag names; tag ids only mean something to a SQLite vocabulary
+COLUMNS = tuple(key for key in Task.__mapper__.column_attrs.keys() if key != "tag_ids")
+DATETIME_COLUMNS = frozenset(("due_at", "created_at", "updated_at", "completed_at"))
+PRIORITY_RANK = {priority: rank for rank, priority in enumerate(TASK_PRIORITIES)}
+
+_new_task = Task.__mapper__.class_manager.new_instance
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Return ``value`` as a naive UTC datetime, the form SQLite stores."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def task_to_record(task: Task) -> dict:
+    """Serialize a task to a JSON-compatible dict."""
+    record = {}
+    for key in COLUMNS:
+        value = getattr(task, key)
+        if key in DATETIME_COLUMNS and value is not None:
+            value = value.isoformat()
+        record[key] = value
+    return record
+
+
+def record_to_task(record: dict) -> Task:
+    """Rebuild a task from :func:`task_to_record` output.
+
+    Like the ORM's own row loading, values go straight into the instance
+    dict, skipping ``Task.__init__`` and attribute change tracking, which
+    would otherwise dominate recovery time.
+    """
+    for key in DATETIME_COLUMNS:
+        if record.get(key) is not None:
+            record[key] = datetime.fromisoformat(record[key])
+    task = _new_task()
+    task.__dict__.update(record)
+    return task
+
+
+def read_records(path: Path) -> Iterator[dict]:
+    """Yield the records of a JSON-lines file, stopping at a torn last line."""
+    with path.open("rb") as handle:
+        for line in handle:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning("Ignoring incomplete record at the end of %s", path)
+                return
+
+
+class SortedIndex:
+    """``(key, id)`` pairs kept sorted for range scans; ``None`` keys apart."""
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[Any, str]] = []
+        self.missing: set[str] = set()
+
+    def add(self, key: Any, task_id: str) -> None:
+        if key is None:
+            self.missing.add(task_id)
+        else:
+            bisect.insort(self.entries, (key, task_id))
+
+    def remove(self, key: Any, task_id: str) -> None:
+        if key is None:
+            self.missing.discard(task_id)
+            return
+        index = bisect.bisect_left(self.entries, (key, task_id))
+        if index < len(self.entries) and self.entries[index] == (key, task_id):
+            del self.entries[index]
+
+    def ids(self, descending: bool) -> Iterator[str]:
+        """All ids in SQLite order: ``NULL`` first ascending, last descending."""
+        if descending:
+            yield from (task_id for _, task_id in reversed(self.entries))
+            yield from self.missing
+        else:
+            yield from self.missing
+            yield from (task_id for _, task_id in self.entries)
+
+    def range_ids(self, after: Any = None, before: Any = None) -> Iterator[str]:
+        """Ids with ``after < key < before`` (either bound optional)."""
+        start = 0
+        if after is not None:
+            start = bisect.bisect_right(self.entries, (after, "\U0010ffff"))
+        stop = len(self.entries)
+        if before is not None:
+            stop = bisect.bisect_left(self.entries, (before, ""))
+        for index in range(start, stop):
+            yield self.entries[index][1]
+
+
+class MemoryStore:
+    """Tasks held in indexed memory structures, made durable by a log."""
+
+    def __init__(
+        self,
+        directory: Path,
+        fsync_interval: float = 0.002,
+        snapshot_interval: float = 600.0,
+        snapshot_log_records: int = 100_000,
+    ) -> None:
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_log_records = snapshot_log_records
+
+        self.tasks: dict[str, Task] = {}
+        self.by_status: dict[str, set[str]] = {}
+        self.by_due_at = SortedIndex()
+        self.by_updated_at = SortedIndex()
+        self.children: dict[str, set[str]] = {}
+        self._indexed: dict[str, tuple[str, Any, Any, Optional[str]]] = {}
+
+        self._segment = 0
+        self._log: Optional[IO[bytes]] = None
+        self._log_records = 0
+        self._pending: list[bytes] = []
+        self._waiters: list[asyncio.Future] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._schedule_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    # Indexes
+
+    def _index(self, task: Task) -> None:
+        if task.due_at is not None and task.due_at.tzinfo is not None:
+            task.due_at = naive_utc(task.due_at)
+        keys = (task.status, task.due_at, task.updated_at, task.parent_id)
+        previous = self._indexed.get(task.id)
+        if previous == keys:
+            return
+        if previous is not None:
+            self.by_status[previous[0]].discard(task.id)
+            self.by_due_at.remove(previous[1], task.id)
+            self.by_updated_at.remove(previous[2], task.id)
+            if previous[3] is not None:
+                self.children[previous[3]].discard(task.id)
+        self.by_status.setdefault(task.status, set()).add(task.id)
+        self.by_due_at.add(task.due_at, task.id)
+        self.by_updated_at.add(task.updated_at, task.id)
+        if task.parent_id is not None:
+            self.children.setdefault(task.parent_id, set()).add(task.id)
+        self._indexed[task.id] = keys
+
+    def _load(self, task: Task) -> None:
+        self.tasks[task.id] = task
+        self._index(task)
+
+    # Recovery
+
+    def _segments(self, prefix: str) -> list[tuple[int, Path]]:
+        segments = []
+        for path in self.directory.glob(f"{prefix}-*.jsonl"):
+            try:
+                segments.append((int(path.stem.split("-")[1]), path))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def recover(self) -> int:
+        """Load the newest snapshot and replay newer log segments.
+
+        Returns the number of tasks in memory afterwards. Indexes are built
+        once at the end, with one sort per sorted index.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        snapshots = self._segments("snapshot")
+        start = 0
+        paths = []
+        if snapshots:
+            start, snapshot = snapshots[-1]
+            paths.append(snapshot)
+        for segment, path in self._segments("log"):
+            if segment >= start:
+                paths.append(path)
+                self._segment = max(self._segment, segment)
+        self._segment = max(self._segment, start)
+
+        # Loading allocates millions of long-lived objects; cyclic GC passes
+        # over them would only find nothing to free
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for path in paths:
+                for record in read_records(path):
+                    self.tasks[record["id"]] = record_to_task(record)
+            self._rebuild_indexes()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return len(self.tasks)
+
+    def _rebuild_indexes(self) -> None:
+        self.by_status = {}
+        self.by_due_at = SortedIndex()
+        self.by_updated_at = SortedIndex()
+        self.children = {}
+        self._indexed = {}
+        # Read instance state directly; instrumented attribute access is the
+        # dominant cost at a million tasks
+        for task_id, task in self.tasks.items():
+            state = task.__dict__
+            status, due_at, updated_at, parent_id = (
+                state["status"],
+                state["due_at"],
+                state["updated_at"],
+                state.get("parent_id"),
+            )
+            self.by_status.setdefault(status, set()).add(task_id)
+            if parent_id is not None:
+                self.children.setdefault(parent_id, set()).add(task_id)
+            if due_at is None:
+                self.by_due_at.missing.add(task_id)
+            else:
+                self.by_due_at.entries.append((due_at, task_id))
+            self.by_updated_at.entries.append((updated_at, task_id))
+            self._indexed[task_id] = (status, due_at, updated_at, parent_id)
+        self.by_due_at.entries.sort()
+        self.by_updated_at.entries.sort()
+
+    async def open(self) -> None:
+        """Recover state and start accepting writes and taking snapshots."""
+        count = await asyncio.to_thread(self.recover)
+        self._open_segment(self._segment + 1)
+        logger.info("Memory store recovered %d tasks", count)
+        if self.snapshot_interval:
+            self._schedule_task = asyncio.create_task(self._snapshot_periodically())
+
+    def _open_segment(self, segment: int) -> None:
+        if self._log is not None:
+            self._log.close()
+        self._segment = segment
+        self._log = open(self.directory / f"log-{segment:08d}.jsonl", "ab")
+        self._log_records = 0
+
+    async def close(self) -> None:
+        """Flush pending writes, take a final snapshot and stop."""
+        if self._schedule_task is not None:
+            self._schedule_task.cancel()
+            self._schedule_task = None
+        await self.flush()
+        if self._log is not None:
+            await self.snapshot()
+            self._log.close()
+            self._log = None
+
+    # Reads
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """Return the task with ``task_id``, or None."""
+        return self.tasks.get(task_id)
+
+    def list_tasks(
+        self,
+        *,
+        status: Optional[Iterable[str]] = None,
+        context: Optional[str] = None,
+        workspace: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+        min_priority: Optional[str] = None,
+        due_before: Optional[datetime] = None,
+        due_after: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+        ready: Optional[bool] = None,
+        parent: Optional[str] = None,
+        sort: str = "updated_at",
+        descending: bool = True,
+        limit: int = 100,
+    ) -> list[Task]:
+        """Filter, sort and limit tasks the way ``GET /tasks`` does in SQL."""
+        due_before, due_after = naive_utc(due_before), naive_utc(due_after)
+        updated_since = naive_utc(updated_since)
+        statuses = set(status) if status else None
+        wanted_tags = set(tags) if tags else None
+        min_rank = PRIORITY_RANK.get(min_priority, 0) if min_priority else None
+
+        def matches(task: Task) -> bool:
+            return (
+                (statuses is None or task.status in statuses)
+                and (context is None or task.context == context)
+                and (workspace is None or task.workspace == workspace)
+                and (wanted_tags is None or not wanted_tags.isdisjoint(task.tags))
+                and (min_rank is None or PRIORITY_RANK[task.priority] >= min_rank)
+                and (
+                    due_before is None
+                    or (task.due_at is not None and task.due_at < due_before)
+                )
+                and (
+                    due_after is None
+                    or (task.due_at is not None and task.due_at > due_after)
+                )
+                and (updated_since is None or task.updated_at > updated_since)
+                and (
+                    ready is None
+                    or (
+                        task.status not in CLOSED_STATUSES
+                        and (not task.open_blockers) == ready
+                    )
+                )
+                and (parent is None or task.parent_id == parent)
+            )
+
+        # Walk a sorted index when it matches the sort: stops after `limit`
+        if sort in ("updated_at", "due_at") and parent is None:
+            index = self.by_updated_at if sort == "updated_at" else self.by_due_at
+            found = []
+            for task_id in index.ids(descending):
+                task = self.tasks[task_id]
+                if matches(task):
+                    found.append(task)
+                    if len(found) == limit:
+                        break
+            return found
+
+        if parent is not None:
+            candidates = (
+                self.tasks[task_id] for task_id in self.children.get(parent, ())
+            )
+        else:
+            candidates = self._candidates(
+                statuses, due_before, due_after, updated_since
+            )
+        tasks = (task for task in candidates if matches(task))
+        key = self._sort_key(sort)
+        if descending:
+            return heapq.nlargest(limit, tasks, key=key)
+        return heapq.nsmallest(limit, tasks, key=key)
+
+    def _candidates(
+        self,
+        statuses: Optional[set[str]],
+        due_before: Optional[datetime],
+        due_after: Optional[datetime],
+        updated_since: Optional[datetime],
+    ) -> Iterable[Task]:
+        """The smallest index-backed superset of the filtered tasks."""
+        if statuses is not None:
+            return (
+                self.tasks[task_id]
+                for status in statuses
+                for task_id in self.by_status.get(status, ())
+            )
+        if updated_since is not None:
+            return (
+                self.tasks[task_id]
+                for task_id in self.by_updated_at.range_ids(after=updated_since)
+            )
+        if due_before is not None or due_after is not None:
+            return (
+                self.tasks[task_id]
+                for task_id in self.by_due_at.range_ids(due_after, due_before)
+            )
+        return self.tasks.values()
+
+    @staticmethod
+    def _sort_key(sort: str) -> Any:
+        if sort not in COLUMNS:
+            sort = "updated_at"
+
+        def key(task: Task) -> tuple:
+            value = getattr(task, sort)
+            return (value is not None, value if value is not None else 0, task.id)
+
+        return key
+
+    def subtree(self, task_id: str) -> list[Task]:
+        """The descendants of ``task_id``, level by level, oldest first."""
+        found: list[Task] = []
+        level = [task_id]
+        while level:
+            tasks = sorted(
+                (
+                    self.tasks[child_id]
+                    for parent_id in level
+                    for child_id in self.children.get(parent_id, ())
+                ),
+                key=lambda task: task.created_at,
+            )
+            found.extend(tasks)
+            level = [task.id for task in tasks]
+        return found
+
+    def tag_counts(self) -> Counter:
+        """Number of tasks using each tag."""
+        return Counter(tag for task in self.tasks.values() for tag in set(task.tags))
+
+    # Writes
+
+    async def save(self, task: Task) -> Task:
+        """Store a new or changed task and return once it is durable."""
+        self._load(task)
+        await self._append(json.dumps(task_to_record(task)).encode("utf-8") + b"\n")
+        return task
+
+    async def rename_tag(self, name: str, new_name: str) -> int:
+        """Replace tag ``name`` with ``new_name`` everywhere; return tasks changed.
+
+        Tasks hold tag names here, so unlike the SQLite vocabulary this
+        rewrites (and logs) every task carrying the tag.
+        """
+        changed = []
+        for task in self.tasks.values():
+            if name in task.tags:
+                task.tags = list(
+                    dict.fromkeys(new_name if tag == name else tag for tag in task.tags)
+                )
+                changed.append(task)
+        await asyncio.gather(*(self.save(task) for task in changed))
+        return len(changed)
+
+    async def _append(self, line: bytes) -> None:
+        if self._log is None:
+            raise RuntimeError("Memory store is not open")
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending.append(line)
+        self._waiters.append(waiter)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+        await waiter
+
+    async def _flush_soon(self) -> None:
+        # Let concurrent writers join this batch before the fsync
+        await asyncio.sleep(self.fsync_interval)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write and fsync every pending record, then wake their writers."""
+        async with self._write_lock:
+            lines, waiters = self._pending, self._waiters
+            self._pending, self._waiters = [], []
+            if not lines:
+                return
+            try:
+                await asyncio.to_thread(self._write, self._log, b"".join(lines))
+            except BaseException as exc:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                raise
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+            self._log_records += len(lines)
+        if (
+            self._log_records >= self.snapshot_log_records
+            and self._snapshot_task is None
+        ):
+            self._snapshot_task = asyncio.create_task(self._snapshot_in_background())
+
+    @staticmethod
+    def _write(handle: IO[bytes], data: bytes) -> None:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+    # Snapshots
+
+    async def snapshot(self) -> Path:
+        """Write all tasks to a new snapshot and drop the logs it covers."""
+        async with self._write_lock:
+            # Records written from here on go to the new segment
+            segment = self._segment + 1
+            self._open_segment(segment)
+            tasks = list(self.tasks.values())
+        # Serialized off the event loop: a task changed meanwhile may be
+        # captured in its newer state, which the new segment also records
+        path = await asyncio.to_thread(self._write_snapshot, segment, tasks)
+        for old_segment, old_path in self._segments("log") + self._segments("snapshot"):
+            if old_segment < segment:
+                old_path.unlink(missing_ok=True)
+        return path
+
+    def _write_snapshot(self, segment: int, tasks: list[Task]) -> Path:
+        path = self.directory / f"snapshot-{segment:08d}.jsonl"
+        partial = path.with_suffix(".partial")
+        with partial.open("wb") as handle:
+            for task in tasks:
+                handle.write(json.dumps(task_to_record(task)).encode("utf-8") + b"\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        partial.replace(path)
+        return path
+
+    async def _snapshot_in_background(self) -> None:
+        try:
+            await self.snapshot()
+        except Exception:
+            logger.exception("Memory store snapshot failed")
+        finally:
+            self._snapshot_task = None
+
+    async def _snapshot_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if self._log_records:
+                await self._snapshot_in_background()
+
+
+# The memory-first engine, when enabled; None keeps tasks in SQLite
+memory_store: Optional[MemoryStore] = (
+    MemoryStore(
+        settings.data_dir / "memory",
+        fsync_interval=settings.memory_fsync_interval_ms / 1000,
+        snapshot_interval=settings.memory_snapshot_interval_minutes * 60,
+        snapshot_log_records=settings.memory_snapshot_log_records,
+    )
+    if settings.storage_engine == "memory"
+    else None
+)
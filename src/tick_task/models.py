@@ -5,18 +5,61 @@ from typing import Optional
 from uuid import uuid4
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
     Enum,
+    Float,
+    ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    event,
+    exists,
     func,
+    select,
+    type_coerce,
 )
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    column_property,
+    mapped_column,
+)
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import TypeEngine
+
+from tick_task.column_types import EpochMicros, SmallIntEnum, UUIDBlob
+from tick_task.config import settings
+
+TASK_STATUSES = ("todo", "doing", "blocked", "done", "archived")
+TASK_PRIORITIES = ("low", "medium", "high", "urgent")
+TASK_CONTEXTS = ("personal", "professional", "mixed")
+
+# Statuses of finished work: not open, not in progress, not blocking anyone
+CLOSED_STATUSES = ("done", "archived")
+
+# Column types for the configured storage layout. The compact layout stores
+# ids as 16-byte BLOBs, timestamps as epoch microseconds and enums as small
+# ints; Python-side values are the same in both layouts.
+if settings.compact_storage:
+    ID_TYPE: TypeEngine = UUIDBlob()
+    TIMESTAMP_TYPE: TypeEngine = EpochMicros()
+else:
+    ID_TYPE = String(36)
+    TIMESTAMP_TYPE = DateTime()
+
+
+def enum_type(values: tuple[str, ...], name: str) -> TypeEngine:
+    """Return the enum column type for the configured storage layout."""
+    if settings.compact_storage:
+        return SmallIntEnum(values)
+    return Enum(*values, name=name)
 
 
 class Base(AsyncAttrs, DeclarativeBase):
@@ -29,10 +72,15 @@ class Task(Base):
     """Task database model."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        {"sqlite_with_rowid": False}
+        if settings.compact_storage and settings.compact_without_rowid
+        else {}
+    )
 
     # Primary key with both Python and database defaults
     id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid4())
+        ID_TYPE, primary_key=True, default=lambda: str(uuid4())
     )
 
     def __init__(self, **kwargs):
@@ -48,6 +96,8 @@ class Task(Base):
             kwargs['context'] = "personal"
         if 'tags' not in kwargs:
             kwargs['tags'] = []
+        if 'open_blockers' not in kwargs:
+            kwargs['open_blockers'] = 0
         if 'created_at' not in kwargs:
             kwargs['created_at'] = datetime.utcnow()
         if 'updated_at' not in kwargs:
@@ -64,69 +114,398 @@ class Task(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Status and priority enums with Python defaults
+    # Rollups (tick_task.rollups) need the previous value of the fields
+    # they are keyed by, so those are loaded before being overwritten
     status: Mapped[str] = mapped_column(
-        Enum(
-            "todo",
-            "doing",
-            "blocked",
-            "done",
-            "archived",
-            name="task_status",
-        ),
+        enum_type(TASK_STATUSES, name="task_status"),
         nullable=False,
         default="todo",
+        index=True,
+        active_history=True,
     )
 
     priority: Mapped[str] = mapped_column(
-        Enum(
-            "low",
-            "medium",
-            "high",
-            "urgent",
-            name="task_priority",
-        ),
+        enum_type(TASK_PRIORITIES, name="task_priority"),
         nullable=False,
         default="medium",
+        index=True,
     )
 
     # Dates
-    due_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-
-    # Tags stored as JSON array with Python default
-    tags: Mapped[list[str]] = mapped_column(
-        JSON, nullable=False, default=list
+    due_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP_TYPE, nullable=True, index=True, active_history=True
     )
 
+    # RFC 5545 recurrence rule (see tick_task.recurrence); only the open
+    # occurrence of a series holds it
+    recurrence: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+
+    # Ids of interned tags (see Tag) as a JSON array; ``tags`` below
+    # presents them as names
+    tag_ids: Mapped[list[int]] = mapped_column(JSON, nullable=False, default=list)
+
     # Context and workspace with Python default
     context: Mapped[str] = mapped_column(
-        Enum(
-            "personal",
-            "professional",
-            "mixed",
-            name="task_context",
-        ),
+        enum_type(TASK_CONTEXTS, name="task_context"),
         nullable=False,
         default="personal",
+        index=True,
+        active_history=True,
     )
 
     workspace: Mapped[Optional[str]] = mapped_column(
-        String(100), nullable=True
+        String(100), nullable=True, active_history=True
+    )
+
+    # Subtask hierarchy (see TaskClosure and tick_task.hierarchy)
+    parent_id: Mapped[Optional[str]] = mapped_column(
+        ID_TYPE, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True, index=True
     )
 
     # Timestamps (UTC)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default=datetime.utcnow
+        TIMESTAMP_TYPE, nullable=False, default=datetime.utcnow, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
+        TIMESTAMP_TYPE,
         nullable=False,
         default=datetime.utcnow,
         onupdate=datetime.utcnow,
+        index=True,
     )
     completed_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime, nullable=True
+        TIMESTAMP_TYPE, nullable=True
+    )
+
+    # Dependency graph (see TaskDependency and tick_task.dependencies):
+    # unfinished blockers, and a position in a topological order of the
+    # graph, set once the task has a dependency
+    open_blockers: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0", index=True
+    )
+    topo_order: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, index=True
     )
 
     def __repr__(self) -> str:
         """String representation of Task."""
         return f"<Task(id={self.id!r}, title={self.title!r}, status={self.status!r})>"
+
+
+class Tag(Base):
+    """Interned tag name, referenced by id from ``Task.tag_ids``.
+
+    A merged tag keeps its row (so tasks that still reference it, and new
+    uses of its name, resolve to the surviving tag) and points at that tag
+    through ``merged_into``; chains are never longer than one hop.
+    """
+
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    usage_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    merged_into: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("tags.id"), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        """String representation of Tag."""
+        return f"<Tag(id={self.id!r}, name={self.name!r})>"
+
+
+class TaskDependency(Base):
+    """Edge of the dependency graph: ``task_id`` is blocked by ``blocker_id``."""
+
+    __tablename__ = "task_dependencies"
+
+    task_id: Mapped[str] = mapped_column(
+        ID_TYPE, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    blocker_id: Mapped[str] = mapped_column(
+        ID_TYPE,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class TaskClosure(Base):
+    """Ancestor/descendant pair of the subtask hierarchy, ``depth`` levels apart.
+
+    Every task is its own ancestor at depth 0, so a subtree is the rows of
+    one ``ancestor_id`` and a task's ancestors the rows of one
+    ``descendant_id``.
+    """
+
+    __tablename__ = "task_closure"
+
+    ancestor_id: Mapped[str] = mapped_column(
+        ID_TYPE, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id: Mapped[str] = mapped_column(
+        ID_TYPE,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class TaskEvent(Base):
+    """One change to a task, as ``{field: [old, new]}`` (see tick_task.history).
+
+    Appended in the transaction that changed the task. ``kind`` is
+    ``created`` (old values all null), ``updated`` or ``undo``, the latter
+    naming the event it reverted in ``undoes``.
+    """
+
+    __tablename__ = "task_events"
+    __table_args__ = (Index("ix_task_events_task_id_id", "task_id", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    task_id: Mapped[str] = mapped_column(
+        ID_TYPE, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    at: Mapped[datetime] = mapped_column(TIMESTAMP_TYPE, nullable=False)
+    kind: Mapped[str] = mapped_column(String(10), nullable=False)
+    changes: Mapped[dict] = mapped_column(JSON, nullable=False)
+    undoes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+
+class TaskSnapshot(Base):
+    """A task's fields as of ``event_id``, folding the events up to it."""
+
+    __tablename__ = "task_snapshots"
+
+    task_id: Mapped[str] = mapped_column(
+        ID_TYPE, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    event_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    at: Mapped[datetime] = mapped_column(TIMESTAMP_TYPE, nullable=False)
+    state: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+
+class TitleBucket(Base):
+    """One MinHash band bucket of a task's title (see tick_task.duplicates).
+
+    Tasks sharing a bucket are candidate near-duplicates.
+    """
+
+    __tablename__ = "title_buckets"
+
+    bucket: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[str] = mapped_column(
+        ID_TYPE,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
+
+
+class SavedView(Base):
+    """A named set of task list filters (see tick_task.views)."""
+
+    __tablename__ = "saved_views"
+
+    id: Mapped[str] = mapped_column(
+        ID_TYPE, primary_key=True, default=lambda: str(uuid4())
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    filters: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP_TYPE, nullable=False, default=datetime.utcnow
+    )
+
+
+class TransitionRollup(Base):
+    """Daily count of tasks making one status transition.
+
+    ``from_status`` is empty for newly created tasks and ``workspace`` is
+    empty for tasks without one (key columns cannot be NULL). Days are UTC
+    ISO dates. See :mod:`tick_task.rollups`.
+    """
+
+    __tablename__ = "analytics_transitions"
+
+    day: Mapped[str] = mapped_column(String(10), primary_key=True)
+    context: Mapped[str] = mapped_column(String(20), primary_key=True)
+    workspace: Mapped[str] = mapped_column(String(100), primary_key=True)
+    from_status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    to_status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Summed created_at -> completed_at seconds of transitions into done
+    cycle_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class StatusRollup(Base):
+    """Current number of tasks per context, workspace, status and due day.
+
+    ``due_day`` is the UTC ISO date of ``due_at``, empty when there is none.
+    """
+
+    __tablename__ = "analytics_status"
+
+    context: Mapped[str] = mapped_column(String(20), primary_key=True)
+    workspace: Mapped[str] = mapped_column(String(100), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    due_day: Mapped[str] = mapped_column(String(10), primary_key=True)
+    tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+def tag_names(tag_ids: ColumnElement) -> ColumnElement:
+    """SQL expression turning a JSON array of tag ids into their names.
+
+    Merged tags resolve to the name of the tag they were merged into.
+    """
+    reference = func.json_each(tag_ids).table_valued("value").alias("tag_ref")
+    tag = Tag.__table__.alias("tag")
+    canonical = Tag.__table__.alias("canonical_tag")
+    name = func.coalesce(canonical.c.name, tag.c.name)
+    return type_coerce(
+        select(func.json_group_array(name.distinct()))
+        .select_from(
+            reference.join(tag, tag.c.id == reference.c.value).outerjoin(
+                canonical, canonical.c.id == tag.c.merged_into
+            )
+        )
+        .scalar_subquery(),
+        JSON,
+    )
+
+
+def tagged_with(tag_ids: ColumnElement, names: list[str]) -> ColumnElement:
+    """SQL condition: a JSON array of tag ids holds a tag named one of ``names``.
+
+    Merged tags match under the name of the tag they were merged into.
+    """
+    reference = func.json_each(tag_ids).table_valued("value").alias("tag_ref")
+    tag = Tag.__table__.alias("tag")
+    canonical = Tag.__table__.alias("canonical_tag")
+    return exists(
+        select(1)
+        .select_from(
+            reference.join(tag, tag.c.id == reference.c.value).outerjoin(
+                canonical, canonical.c.id == tag.c.merged_into
+            )
+        )
+        .where(func.coalesce(canonical.c.name, tag.c.name).in_(names))
+    )
+
+
+# Tag names are loaded with the task; writes are interned into tag_ids by
+# the before_flush hook below, so the assigned value is kept across flushes
+Task.tags = column_property(tag_names(Task.__table__.c.tag_ids), expire_on_flush=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _record_task_events(
+    session: Session, flush_context: object, instances: object
+) -> None:
+    from tick_task.history import record_task_events
+
+    # First: interning tags resets their history, and the changes recorded
+    # are those asked for, not the status cascades of the hooks below
+    record_task_events(session)
+
+
+@event.listens_for(Session, "before_flush")
+def _intern_task_tags(
+    session: Session, flush_context: object, instances: object
+) -> None:
+    from tick_task.tags import intern_task_tags
+
+    intern_task_tags(session)
+
+
+@event.listens_for(Session, "before_flush")
+def _update_dependents(
+    session: Session, flush_context: object, instances: object
+) -> None:
+    from tick_task.dependencies import update_dependents
+
+    # Before the rollups hook, which records the status changes made here
+    update_dependents(session)
+
+
+@event.listens_for(Session, "before_flush")
+def _record_task_changes(
+    session: Session, flush_context: object, instances: object
+) -> None:
+    from tick_task.rollups import record_task_changes
+
+    record_task_changes(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_closure(session: Session, flush_context: object) -> None:
+    from tick_task.hierarchy import update_closure
+
+    # After the flush: closure rows reference the tasks it inserts
+    update_closure(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _write_task_events(session: Session, flush_context: object) -> None:
+    from tick_task.history import write_task_events
+
+    write_task_events(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_title_buckets(session: Session, flush_context: object) -> None:
+    from tick_task.duplicates import update_title_buckets
+
+    update_title_buckets(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_task_writes(session: Session, flush_context: object) -> None:
+    from tick_task.views import note_task_writes
+
+    note_task_writes(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_change_marker(session: Session) -> None:
+    from tick_task.views import bump_after_commit
+
+    bump_after_commit(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_task_writes(session: Session) -> None:
+    from tick_task.views import forget_task_writes
+
+    forget_task_writes(session)
+
+
+# Canonical ids of the tags a task row references, for the triggers below
+_CANONICAL_IDS = """
+    SELECT coalesce(s.merged_into, s.id) AS tag_id FROM json_each({row}.tag_ids) AS j
+    JOIN tags AS s ON s.id = j.value
+"""
+
+
+def _usage_update(row: str, sign: str) -> str:
+    """``UPDATE tags`` adding (``+``) or removing (``-``) one task's tags."""
+    # IN counts each tag once per task, even if two ids merged into it
+    return f"""
+    UPDATE tags SET usage_count = usage_count {sign} 1
+    WHERE id IN ({_CANONICAL_IDS.format(row=row)});
+    """
+
+
+# Usage counts are maintained by SQLite itself, whatever path writes a task
+TAG_USAGE_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS tasks_tag_usage_insert AFTER INSERT ON tasks"
+    f" BEGIN {_usage_update('NEW', '+')} END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_tag_usage_update"
+    " AFTER UPDATE OF tag_ids ON tasks WHEN OLD.tag_ids IS NOT NEW.tag_ids"
+    f" BEGIN {_usage_update('OLD', '-')} {_usage_update('NEW', '+')} END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_tag_usage_delete AFTER DELETE ON tasks"
+    f" BEGIN {_usage_update('OLD', '-')} END",
+)
+
+for _trigger in TAG_USAGE_TRIGGERS:
+    event.listen(Task.__table__, "after_create", DDL(_trigger))
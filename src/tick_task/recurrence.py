@@ -0,0 +1,98 @@
+"""Recurring tasks: recurrence rules and lazy materialization.
+
+A recurring task carries an RFC 5545 recurrence rule such as
+``FREQ=WEEKLY;BYDAY=MO`` in ``Task.recurrence``. Only the current occurrence
+of a series exists as a row: when it is completed, :func:`next_occurrence`
+builds the following one, which takes the rule over, and the completed task
+keeps none (so reopening and completing it again does not fork the series).
+A daily task therefore costs one row however long it runs.
+
+Occurrences are anchored on the due date of the current one (its creation
+time if it has none). Occurrences that went by while it was open are skipped:
+the next one is the first after both its due date and its completion. A
+``COUNT`` is reduced by the occurrences used up; ``UNTIL`` ends the series as
+usual.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from dateutil.rrule import rrule, rrulestr
+
+from tick_task.models import Task
+
+_COUNT = re.compile(r"COUNT=\d+")
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def parse_rule(rule: str, start: datetime) -> rrule:
+    """Parse a normalized rule into occurrences starting at ``start``."""
+    # Task times are naive UTC, so an UNTIL in UTC ("...Z") is read as naive
+    return rrulestr(rule, dtstart=_naive_utc(start), ignoretz=True)
+
+
+def normalize_rule(rule: str) -> str:
+    """Validate a recurrence rule and return it in its stored form.
+
+    Accepts one ``RRULE`` value, with or without the ``RRULE:`` prefix.
+    The start of the series is always the task's due date, so ``DTSTART``
+    and other properties are rejected.
+
+    Raises:
+        ValueError: If the rule is not a valid recurrence rule.
+    """
+    value = rule.strip().upper().removeprefix("RRULE:")
+    if not value or any(char.isspace() for char in value) or ":" in value:
+        raise ValueError("Recurrence must be a single RRULE, e.g. FREQ=DAILY")
+    try:
+        parse_rule(value, datetime(2000, 1, 1))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid recurrence rule: {exc}") from None
+    return value
+
+
+def next_occurrence(task: Task, now: Optional[datetime] = None) -> Optional[Task]:
+    """Build the occurrence that follows a completed recurring task.
+
+    Moves the rule from ``task`` to the returned task, which is not yet
+    saved. Returns ``None`` if ``task`` does not recur or its series has
+    ended, in which case the rule is simply dropped.
+    """
+    if not task.recurrence:
+        return None
+    anchor = _naive_utc(task.due_at or task.created_at)
+    done = _naive_utc(task.completed_at or now or datetime.utcnow())
+    after = max(anchor, done)
+    rule = parse_rule(task.recurrence, anchor)
+
+    # Only occurrences between the anchor and the next one are visited
+    used = 0
+    for occurrence in rule:
+        used += 1
+        if occurrence > after:
+            break
+    else:
+        task.recurrence = None
+        return None
+
+    recurrence = task.recurrence
+    if rule._count:
+        recurrence = _COUNT.sub(f"COUNT={rule._count - used + 1}", recurrence)
+    task.recurrence = None
+    return Task(
+        title=task.title,
+        description=task.description,
+        priority=task.priority,
+        due_at=occurrence,
+        tags=list(task.tags),
+        context=task.context,
+        workspace=task.workspace,
+        parent_id=task.parent_id,
+        recurrence=recurrence,
+    )
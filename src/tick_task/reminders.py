@@ -0,0 +1,381 @@
+"""Due-date reminders.
+
+:class:`ReminderScheduler` fires a reminder when the clock passes the
+``due_at`` of an open task. Upcoming due times are held in memory in two
+tiers, so nothing is ever rescanned:
+
+- a min-heap of the reminders due before the end of the next timer-wheel
+  bucket; one timer task sleeps until the earliest of them
+- a timer wheel of ``bucket_seconds``-wide buckets for everything later:
+  scheduling far ahead is a dict insert, and a bucket is poured into the
+  heap when it comes up
+
+The task endpoints keep both current through :meth:`ReminderScheduler.track`;
+a changed or cancelled reminder leaves a stale heap entry that is skipped
+when it surfaces.
+
+Delivery is at least once across restarts. After each pass the scheduler
+persists a cursor, the time up to which every reminder has been handed to
+all subscribers. On start it reloads the open tasks due after the cursor, so
+reminders that fell due while the service was down fire at startup, and a
+pass interrupted by a crash is repeated. A due time set at or before the
+cursor (in the past) does not fire.
+
+Subscribers are in-app callbacks (:meth:`ReminderScheduler.subscribe`) and
+listeners such as the Server-Sent Events stream at ``GET /api/v1/reminders``
+(:meth:`ReminderScheduler.listen`), which can resume after a recent event.
+"""
+
+import asyncio
+import heapq
+import inspect
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tick_task.config import settings
+from tick_task.database import read_session_factory, shard_router
+from tick_task.memory_store import memory_store
+from tick_task.models import CLOSED_STATUSES, Task
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+
+# Longest sleep between passes, so a changed system clock is noticed
+MAX_SLEEP_SECONDS = 60.0
+
+# Idle time after which the event stream sends a comment line, so proxies
+# and clients keep the connection open
+KEEPALIVE_SECONDS = 15.0
+
+
+@dataclass(frozen=True)
+class Reminder:
+    """A task falling due."""
+
+    task_id: str
+    title: str
+    due_at: datetime
+
+    def to_json(self) -> str:
+        """Serialize the reminder for the event stream."""
+        return json.dumps(
+            {
+                "task_id": self.task_id,
+                "title": self.title,
+                "due_at": self.due_at.isoformat(),
+            }
+        )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class ReminderScheduler:
+    """Fires reminders for due tasks from a heap and a timer wheel."""
+
+    def __init__(
+        self,
+        cursor_path: Path,
+        bucket_seconds: float = 3600.0,
+        replay_size: int = 256,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self.cursor_path = cursor_path
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self.cursor = clock()
+        self.delivered = 0
+        # task id -> its pending reminder; the source of truth for both tiers
+        self._pending: dict[str, Reminder] = {}
+        self._heap: list[tuple[datetime, str]] = []
+        self._wheel: dict[int, dict[str, Reminder]] = {}
+        # Buckets up to this one have been poured into the heap
+        self._poured = self._bucket(self.cursor) + 1
+        self._callbacks: list[Callable[[Reminder], Any]] = []
+        self._listeners: set[asyncio.Queue] = set()
+        self._recent: deque[tuple[int, Reminder]] = deque(maxlen=replay_size)
+        self._sequence = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _bucket(self, when: datetime) -> int:
+        return int((when - EPOCH).total_seconds() // self.bucket_seconds)
+
+    def _bucket_start(self, bucket: int) -> datetime:
+        return EPOCH + timedelta(seconds=bucket * self.bucket_seconds)
+
+    def _place(self, reminder: Reminder) -> None:
+        bucket = self._bucket(reminder.due_at)
+        if bucket <= self._poured:
+            entry = (reminder.due_at, reminder.task_id)
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] == entry and self._wakeup is not None:
+                # Earlier than what the timer is sleeping towards
+                self._wakeup.set()
+        else:
+            self._wheel.setdefault(bucket, {})[reminder.task_id] = reminder
+
+    def schedule(self, task_id: str, title: str, due_at: datetime) -> None:
+        """Fire a reminder for ``task_id`` at ``due_at``, replacing any other."""
+        self.cancel(task_id)
+        due_at = _naive_utc(due_at)
+        if due_at <= self.cursor:
+            return
+        reminder = Reminder(task_id, title, due_at)
+        self._pending[task_id] = reminder
+        self._place(reminder)
+
+    def cancel(self, task_id: str) -> None:
+        """Drop the pending reminder of ``task_id``, if any."""
+        reminder = self._pending.pop(task_id, None)
+        if reminder is not None:
+            bucket = self._wheel.get(self._bucket(reminder.due_at))
+            if bucket is not None:
+                bucket.pop(task_id, None)
+            # A heap entry stays behind and is skipped when popped
+
+    def track(self, task: Task) -> None:
+        """Bring the reminder of a created or updated task up to date."""
+        if task.due_at is not None and task.status not in CLOSED_STATUSES:
+            pending = self._pending.get(task.id)
+            due_at = _naive_utc(task.due_at)
+            if pending is None or (pending.due_at, pending.title) != (
+                due_at,
+                task.title,
+            ):
+                self.schedule(task.id, task.title, due_at)
+        else:
+            self.cancel(task.id)
+
+    def load(self, reminders: Iterable[Reminder]) -> None:
+        """Replace the pending reminders, e.g. with those read at startup."""
+        self._pending = {}
+        self._heap = []
+        self._wheel = {}
+        for reminder in reminders:
+            if reminder.due_at > self.cursor:
+                self._pending[reminder.task_id] = reminder
+                self._place(reminder)
+
+    def due(self, now: datetime) -> list[Reminder]:
+        """Remove and return the reminders due at or before ``now``, in order."""
+        # Pour the buckets that now fall before the end of the next one
+        target = self._bucket(now) + 1
+        while self._poured < target:
+            self._poured += 1
+            for reminder in self._wheel.pop(self._poured, {}).values():
+                heapq.heappush(self._heap, (reminder.due_at, reminder.task_id))
+
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, task_id = heapq.heappop(self._heap)
+            reminder = self._pending.get(task_id)
+            if reminder is not None and reminder.due_at == due_at:
+                del self._pending[task_id]
+                fired.append(reminder)
+        return fired
+
+    def next_wakeup(self) -> datetime:
+        """When the next reminder is due or the next bucket must be poured."""
+        while self._heap:
+            due_at, task_id = self._heap[0]
+            reminder = self._pending.get(task_id)
+            if reminder is not None and reminder.due_at == due_at:
+                break
+            heapq.heappop(self._heap)
+        pour_at = self._bucket_start(self._poured)
+        return min(self._heap[0][0], pour_at) if self._heap else pour_at
+
+    def subscribe(self, callback: Callable[[Reminder], Any]) -> Callable[[], None]:
+        """Call ``callback`` (plain or async) with every reminder.
+
+        Returns a function that removes the subscription.
+        """
+        self._callbacks.append(callback)
+        return lambda: self._callbacks.remove(callback)
+
+    def listen(self, last_event_id: Optional[int] = None) -> asyncio.Queue:
+        """Return a queue that receives ``(event id, reminder)`` as they fire.
+
+        With ``last_event_id``, recent reminders fired after that event are
+        queued first. Pass the queue to :meth:`unlisten` when done.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        if last_event_id is not None:
+            for event in self._recent:
+                if event[0] > last_event_id:
+                    queue.put_nowait(event)
+        self._listeners.add(queue)
+        return queue
+
+    def unlisten(self, queue: asyncio.Queue) -> None:
+        """Stop delivering to a queue returned by :meth:`listen`."""
+        self._listeners.discard(queue)
+
+    async def deliver(self, reminders: list[Reminder]) -> None:
+        """Hand reminders to every subscriber."""
+        for reminder in reminders:
+            self._sequence += 1
+            event = (self._sequence, reminder)
+            self._recent.append(event)
+            for queue in self._listeners:
+                queue.put_nowait(event)
+            for callback in list(self._callbacks):
+                try:
+                    result = callback(reminder)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception:
+                    logger.exception("Reminder callback failed for %s", reminder)
+            self.delivered += 1
+
+    async def run_once(self) -> None:
+        """Fire everything due now, then advance and persist the cursor."""
+        now = self.clock()
+        fired = self.due(now)
+        if fired:
+            await self.deliver(fired)
+        self.cursor = max(self.cursor, now)
+        await asyncio.to_thread(self._save_cursor)
+
+    def read_cursor(self) -> None:
+        """Restore the cursor persisted by the previous run, if any."""
+        try:
+            data = json.loads(self.cursor_path.read_text())
+            self.cursor = datetime.fromisoformat(data["cursor"])
+        except FileNotFoundError:
+            self.cursor = self.clock()
+        except (ValueError, KeyError):
+            logger.warning("Ignoring unreadable reminder cursor %s", self.cursor_path)
+            self.cursor = self.clock()
+        self._poured = self._bucket(self.cursor) + 1
+
+    def _save_cursor(self) -> None:
+        temporary = self.cursor_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"cursor": self.cursor.isoformat()}))
+        os.replace(temporary, self.cursor_path)
+
+    async def start(
+        self, loader: Callable[[datetime], Awaitable[list[Reminder]]]
+    ) -> None:
+        """Load upcoming reminders with ``loader(cursor)`` and start firing."""
+        self._wakeup = asyncio.Event()
+        self.read_cursor()
+        self.load(await loader(self.cursor))
+        logger.info(
+            "Reminders: %d pending after %s", len(self), self.cursor.isoformat()
+        )
+
+        async def loop() -> None:
+            while True:
+                try:
+                    await self.run_once()
+                except Exception:
+                    logger.exception("Reminder pass failed")
+                self._wakeup.clear()
+                delay = (self.next_wakeup() - self.clock()).total_seconds()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=min(max(delay, 0.0), MAX_SLEEP_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+        self._task = asyncio.create_task(loop())
+
+    async def stop(self) -> None:
+        """Cancel the timer started with :meth:`start`."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+async def event_stream(
+    scheduler: ReminderScheduler,
+    last_event_id: Optional[int] = None,
+    keepalive_seconds: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[bytes]:
+    """Server-Sent Events for reminders, with keep-alive comments when idle."""
+    queue = scheduler.listen(last_event_id)
+    try:
+        while True:
+            try:
+                event_id, reminder = await asyncio.wait_for(
+                    queue.get(), keepalive_seconds
+                )
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            yield (
+                f"id: {event_id}\nevent: reminder\ndata: {reminder.to_json()}\n\n"
+            ).encode("utf-8")
+    finally:
+        scheduler.unlisten(queue)
+
+
+def _upcoming(since: datetime) -> Any:
+    return (
+        select(Task.id, Task.title, Task.due_at)
+        .where(Task.due_at > since, Task.status.not_in(CLOSED_STATUSES))
+        .order_by(Task.due_at)
+    )
+
+
+async def reminders_in(session: AsyncSession, since: datetime) -> list[Reminder]:
+    """Reminders for the open tasks of one database due after ``since``."""
+    result = await session.execute(_upcoming(since))
+    return [Reminder(*row) for row in result]
+
+
+async def upcoming_reminders(since: datetime) -> list[Reminder]:
+    """Reminders for every open task due after ``since``, from the storage engine."""
+    if memory_store is not None:
+        tasks = (
+            memory_store.tasks[task_id]
+            for task_id in memory_store.by_due_at.range_ids(after=since)
+        )
+        return [
+            Reminder(task.id, task.title, task.due_at)
+            for task in tasks
+            if task.status not in CLOSED_STATUSES
+        ]
+    if shard_router is not None:
+        reminders = []
+        for shard_id in shard_router.shard_ids:
+            await shard_router.ensure_tables(shard_id)
+            async with AsyncSession(shard_router.engine(shard_id)) as session:
+                reminders.extend(await reminders_in(session, since))
+        return reminders
+    async with read_session_factory() as session:
+        return await reminders_in(session, since)
+
+
+reminder_scheduler: Optional[ReminderScheduler] = (
+    ReminderScheduler(
+        settings.data_dir / "reminders.json",
+        bucket_seconds=settings.reminder_bucket_seconds,
+    )
+    if settings.reminders_enabled
+    else None
+)
@@ -0,0 +1,61 @@
+"""Response classes and serialization helpers for FIN-tasks."""
+
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from tick_task.schemas import Task as TaskSchema
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Validates a sequence of ORM rows into response models in a single
+# pydantic-core call instead of one ``model_validate`` per row.
+TASK_LIST_ADAPTER: TypeAdapter[list[TaskSchema]] = TypeAdapter(list[TaskSchema])
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response that dumps pydantic models straight to bytes.
+
+    Endpoints that return this response bypass FastAPI's ``response_model``
+    handling, which would otherwise validate the model a second time and
+    round-trip it through ``jsonable_encoder`` and ``json.dumps``. The
+    ``response_model`` declared on the route is still used for OpenAPI.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+def task_response(task: Any, status_code: int = 200) -> ModelJSONResponse:
+    """Validate an ORM task once and wrap it in a :class:`ModelJSONResponse`."""
+    return ModelJSONResponse(
+        TaskSchema.model_validate(task, from_attributes=True),
+        status_code=status_code,
+    )
+
+
+async def iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    """Adapt an in-memory iterable for consumers that expect an async one."""
+    for item in items:
+        yield item
+
+
+async def ndjson_task_lines(
+    rows: AsyncIterable[Any], trailer: Callable[[int], dict]
+) -> AsyncIterator[bytes]:
+    """Yield one JSON line per task row, then ``trailer(count)`` as the last line.
+
+    Rows are consumed as the cursor produces them, so memory use does not
+    grow with the page size.
+    """
+    serializer = TaskSchema.__pydantic_serializer__
+    count = 0
+    async for row in rows:
+        task = TaskSchema.model_validate(row, from_attributes=True)
+        yield serializer.to_json(task) + b"\n"
+        count += 1
+    yield json.dumps(trailer(count)).encode("utf-8") + b"\n"
@@ -0,0 +1,330 @@
+"""Daily analytics rollups, maintained with every task write.
+
+Dashboards read two small tables instead of scanning ``tasks``:
+
+- ``analytics_transitions`` (:class:`~tick_task.models.TransitionRollup`):
+  per UTC day, context, workspace and status transition, how many tasks
+  made it, plus the summed cycle time (``created_at`` to ``completed_at``)
+  of transitions into ``done``; creations have an empty ``from_status``
+- ``analytics_status`` (:class:`~tick_task.models.StatusRollup`): how many
+  tasks currently sit in each context, workspace, status and due day, which
+  gives work in progress and overdue counts for any day
+
+:func:`record_task_changes` runs from the session's ``before_flush`` hook, so
+the rollups are written by the same transaction (and, with sharding, on the
+same shard) as the tasks they describe. It sees ORM writes only; rows
+changed with Core statements are not counted.
+
+The memory storage engine keeps no tables; :func:`activity_from_tasks` and
+:func:`status_from_tasks` compute the same figures from its tasks instead.
+"""
+
+import itertools
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import Table, case, func, inspect, select
+from sqlalchemy.dialects.sqlite import Insert, insert
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+
+from tick_task.models import CLOSED_STATUSES, StatusRollup, Task, TransitionRollup
+
+transitions_table = TransitionRollup.__table__
+status_table = StatusRollup.__table__
+
+KEY_FIELDS = ("status", "context", "workspace", "due_at")
+FIELDS = KEY_FIELDS + ("created_at", "updated_at", "completed_at")
+
+STATUS_KEY = ("context", "workspace", "status", "due_day")
+TRANSITION_KEY = ("day", "context", "workspace", "from_status", "to_status")
+
+# Per day: tasks created, tasks completed, summed cycle seconds
+Activity = dict[str, list]
+
+
+def _accumulate(table: Table, *columns: str) -> Insert:
+    """An upsert adding ``columns`` of new rows to those of existing ones.
+
+    Built once, at import: the rollup upserts run with every task write, and
+    constructing a statement costs more than executing it. The other
+    per-write statements (history, hierarchy, duplicates, dependencies) are
+    module constants for the same reason.
+    """
+    upsert = insert(table)
+    return upsert.on_conflict_do_update(
+        index_elements=list(table.primary_key),
+        set_={name: table.c[name] + upsert.excluded[name] for name in columns},
+    )
+
+
+_add_status = _accumulate(status_table, "tasks")
+_add_transitions = _accumulate(transitions_table, "tasks", "cycle_seconds")
+
+
+def _day(value: Optional[datetime]) -> str:
+    return value.date().isoformat() if value is not None else ""
+
+
+def _before(task: Task) -> dict[str, Any]:
+    """The rollup key fields of a task as last written to the database."""
+    state = inspect(task)
+    values = {}
+    for key in KEY_FIELDS:
+        # Old values are loaded on change (active_history on these columns)
+        history = state.attrs[key].history
+        values[key] = history.deleted[0] if history.deleted else getattr(task, key)
+    return values
+
+
+def _after(task: Task) -> dict[str, Any]:
+    """A task's fields as this flush will write them."""
+    values = {key: getattr(task, key) for key in FIELDS}
+    state = inspect(task)
+    if not state.pending and not state.attrs.updated_at.history.has_changes():
+        # updated_at is about to be set by its onupdate default
+        values["updated_at"] = datetime.utcnow()
+    return values
+
+
+def _status_key(values: dict[str, Any]) -> tuple:
+    return (
+        values["context"],
+        values["workspace"] or "",
+        values["status"],
+        _day(values["due_at"]),
+    )
+
+
+def _transition(
+    before: Optional[dict[str, Any]], after: dict[str, Any]
+) -> Optional[tuple[tuple, float]]:
+    """The transitions row key and cycle seconds for a change, if any."""
+    from_status = before["status"] if before is not None else ""
+    if from_status == after["status"]:
+        return None
+    day = _day(after["created_at"] if before is None else after["updated_at"])
+    cycle = 0.0
+    if after["status"] == "done" and after["completed_at"] and after["created_at"]:
+        cycle = (after["completed_at"] - after["created_at"]).total_seconds()
+    key = (
+        day,
+        after["context"],
+        after["workspace"] or "",
+        from_status,
+        after["status"],
+    )
+    return key, cycle
+
+
+class RollupDeltas:
+    """Changes to apply to the rollup tables of one database."""
+
+    def __init__(self) -> None:
+        self.status: Counter = Counter()
+        self.transitions: dict[tuple, list] = {}
+
+    def move(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Count a task leaving ``before`` and entering ``after``."""
+        old = _status_key(before) if before is not None else None
+        new = _status_key(after) if after is not None else None
+        if old != new:
+            if old is not None:
+                self.status[old] -= 1
+            if new is not None:
+                self.status[new] += 1
+
+    def transition(self, key: tuple, cycle: float) -> None:
+        """Count one task making the transition ``key``."""
+        totals = self.transitions.setdefault(key, [0, 0.0])
+        totals[0] += 1
+        totals[1] += cycle
+
+    def apply(self, connection: Connection) -> None:
+        """Add the deltas to the rollup tables."""
+        status_rows = [
+            dict(zip(STATUS_KEY, key), tasks=delta)
+            for key, delta in self.status.items()
+            if delta
+        ]
+        if status_rows:
+            connection.execute(_add_status, status_rows)
+        if self.transitions:
+            connection.execute(
+                _add_transitions,
+                [
+                    dict(zip(TRANSITION_KEY, key), tasks=tasks, cycle_seconds=cycle)
+                    for key, (tasks, cycle) in self.transitions.items()
+                ],
+            )
+
+
+def record_task_changes(session: Session) -> None:
+    """Update the rollups for every task the session is about to flush.
+
+    Called from the ``before_flush`` hook, while each task's previous values
+    can still be read. A task moved between shards is flushed as a delete
+    plus an insert; the insert is not counted as a creation.
+    """
+    deltas: dict[Connection, RollupDeltas] = {}
+
+    def deltas_for(task: Task) -> RollupDeltas:
+        connection = session.connection(
+            bind_arguments={"mapper": inspect(task).mapper, "instance": task}
+        )
+        return deltas.setdefault(connection, RollupDeltas())
+
+    deleted = {task.id: task for task in session.deleted if isinstance(task, Task)}
+    for task in deleted.values():
+        deltas_for(task).move(_before(task), None)
+
+    for task in itertools.chain(session.new, session.dirty):
+        if not isinstance(task, Task):
+            continue
+        if inspect(task).pending:
+            moved = deleted.get(task.id)
+            before = _before(moved) if moved is not None else None
+            counted_before = None
+        elif session.is_modified(task):
+            before = counted_before = _before(task)
+        else:
+            continue
+        after = _after(task)
+        task_deltas = deltas_for(task)
+        task_deltas.move(counted_before, after)
+        change = _transition(before, after)
+        if change is not None:
+            task_deltas.transition(*change)
+
+    for connection, changes in deltas.items():
+        changes.apply(connection)
+
+
+def backfill_tasks(connection: Connection, rows: Sequence[Row]) -> None:
+    """Add existing tasks to the rollups, reconstructing a plausible history.
+
+    Only the current state of a task is known, so each is recorded as
+    created as ``todo`` on its creation day, then moved to its current
+    status on its completion day (``done``) or last update (any other).
+    """
+    changes = RollupDeltas()
+    for row in rows:
+        values = dict(row._mapping)
+        changes.move(None, values)
+        created = dict(values, status="todo")
+        changes.transition(*_transition(None, created))
+        if values["status"] != "todo":
+            reached = values["completed_at"] if values["status"] == "done" else None
+            change = _transition(
+                created, dict(values, updated_at=reached or values["updated_at"])
+            )
+            changes.transition(*change)
+    changes.apply(connection)
+
+
+def activity(
+    connection: Connection,
+    since: date,
+    until: date,
+    context: Optional[str] = None,
+    workspace: Optional[str] = None,
+) -> Activity:
+    """Tasks created and completed, and cycle seconds, per day in a range."""
+    table = transitions_table
+    query = (
+        select(
+            table.c.day,
+            func.sum(case((table.c.from_status == "", table.c.tasks), else_=0)),
+            func.sum(case((table.c.to_status == "done", table.c.tasks), else_=0)),
+            func.sum(table.c.cycle_seconds),
+        )
+        .where(table.c.day.between(since.isoformat(), until.isoformat()))
+        .group_by(table.c.day)
+    )
+    if context is not None:
+        query = query.where(table.c.context == context)
+    if workspace is not None:
+        query = query.where(table.c.workspace == workspace)
+    return {day: list(totals) for day, *totals in connection.execute(query)}
+
+
+def status_counts(
+    connection: Connection, today: date, workspace: Optional[str] = None
+) -> tuple[Counter, Counter]:
+    """Tasks per ``(context, status)``, and overdue open tasks per context.
+
+    A task is overdue once its due day is before ``today``.
+    """
+    table = status_table
+    counts = select(table.c.context, table.c.status, func.sum(table.c.tasks))
+    overdue = select(table.c.context, func.sum(table.c.tasks)).where(
+        table.c.status.not_in(CLOSED_STATUSES),
+        table.c.due_day != "",
+        table.c.due_day < today.isoformat(),
+    )
+    if workspace is not None:
+        counts = counts.where(table.c.workspace == workspace)
+        overdue = overdue.where(table.c.workspace == workspace)
+    by_status = Counter(
+        {
+            (context, status): tasks
+            for context, status, tasks in connection.execute(
+                counts.group_by(table.c.context, table.c.status)
+            )
+            if tasks
+        }
+    )
+    by_context = Counter(
+        dict(connection.execute(overdue.group_by(table.c.context)).all())
+    )
+    return by_status, by_context
+
+
+def activity_from_tasks(
+    tasks: Iterable[Task],
+    since: date,
+    until: date,
+    context: Optional[str] = None,
+    workspace: Optional[str] = None,
+) -> Activity:
+    """:func:`activity` computed from tasks (the memory engine).
+
+    Completions are taken from ``completed_at`` of tasks that are done now.
+    """
+    first, last = since.isoformat(), until.isoformat()
+    totals: Activity = {}
+    for task in tasks:
+        if context is not None and task.context != context:
+            continue
+        if workspace is not None and task.workspace != workspace:
+            continue
+        created = _day(task.created_at)
+        if first <= created <= last:
+            totals.setdefault(created, [0, 0, 0.0])[0] += 1
+        if task.status == "done" and task.completed_at is not None:
+            completed = _day(task.completed_at)
+            if first <= completed <= last:
+                day = totals.setdefault(completed, [0, 0, 0.0])
+                day[1] += 1
+                day[2] += (task.completed_at - task.created_at).total_seconds()
+    return totals
+
+
+def status_from_tasks(
+    tasks: Iterable[Task], today: date, workspace: Optional[str] = None
+) -> tuple[Counter, Counter]:
+    """:func:`status_counts` computed from tasks (the memory engine)."""
+    by_status: Counter = Counter()
+    overdue: Counter = Counter()
+    for task in tasks:
+        if workspace is not None and task.workspace != workspace:
+            continue
+        by_status[task.context, task.status] += 1
+        if (
+            task.status not in CLOSED_STATUSES
+            and task.due_at is not None
+            and task.due_at.date() < today
+        ):
+            overdue[task.context] += 1
+    return by_status, overdue
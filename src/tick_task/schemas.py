@@ -1,10 +1,36 @@
 """Pydantic schemas for API validation."""
 
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Annotated, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    StringConstraints,
+    TypeAdapter,
+    field_validator,
+)
+
+from tick_task.recurrence import normalize_rule
+
+# Enumerations are checked by pydantic-core as literals (a set lookup)
+# rather than by matching a regex; they mirror tick_task.models.TASK_*.
+TaskStatus = Literal["todo", "doing", "blocked", "done", "archived"]
+TaskPriority = Literal["low", "medium", "high", "urgent"]
+TaskContext = Literal["personal", "professional", "mixed"]
+
+# Tags are stripped, lowercased and length-checked inside pydantic-core
+Tag = Annotated[
+    str,
+    StringConstraints(
+        strip_whitespace=True, to_lower=True, min_length=1, max_length=50
+    ),
+]
+
+# Largest number of tasks accepted by POST /tasks/batch
+MAX_BATCH_SIZE = 1000
 
 
 class TaskBase(BaseModel):
@@ -14,39 +40,19 @@ class TaskBase(BaseModel):
     description: Optional[str] = Field(
         None, max_length=2000, description="Task description"
     )
-    status: str = Field(
-        "todo",
-        description="Task status",
-        pattern=r"^(todo|doing|blocked|done|archived)$",
-    )
-    priority: str = Field(
-        "medium", description="Task priority", pattern=r"^(low|medium|high|urgent)$"
-    )
+    status: TaskStatus = Field("todo", description="Task status")
+    priority: TaskPriority = Field("medium", description="Task priority")
     due_at: Optional[datetime] = Field(
         None, description="Due date and time in ISO format"
     )
-    tags: list[str] = Field(default_factory=list, description="List of tags")
-    context: str = Field(
-        "personal",
-        description="Task context",
-        pattern=r"^(personal|professional|mixed)$",
-    )
+    tags: list[Tag] = Field(default_factory=list, description="List of tags")
+    context: TaskContext = Field("personal", description="Task context")
     workspace: Optional[str] = Field(None, max_length=100, description="Workspace name")
-
-    @field_validator("tags", mode="before")
-    @classmethod
-    def validate_tag(cls, v):
-        """Validate individual tag constraints."""
-        if isinstance(v, list):
-            validated_tags = []
-            for tag in v:
-                if len(tag) > 50:
-                    raise ValueError("Tag must be 50 characters or less")
-                if not tag.strip():
-                    raise ValueError("Tag cannot be empty or whitespace-only")
-                validated_tags.append(tag.strip().lower())
-            return validated_tags
-        return v
+    recurrence: Optional[str] = Field(
+        None,
+        max_length=500,
+        description="Recurrence rule (RFC 5545 RRULE), e.g. FREQ=WEEKLY;BYDAY=MO",
+    )
 
     @field_validator("title")
     @classmethod
@@ -72,7 +78,14 @@ class TaskBase(BaseModel):
 class TaskCreate(TaskBase):
     """Schema for creating a new task."""
 
-    pass
+    parent_id: Optional[UUID] = Field(None, description="Parent task (for a subtask)")
+
+    # Checked on input only; stored rules are already normalized
+    @field_validator("recurrence")
+    @classmethod
+    def validate_recurrence(cls, v):
+        """Validate and normalize the recurrence rule."""
+        return normalize_rule(v) if v is not None else v
 
 
 class TaskUpdate(BaseModel):
@@ -80,26 +93,14 @@ class TaskUpdate(BaseModel):
 
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=2000)
-    status: Optional[str] = Field(None, pattern=r"^(todo|doing|blocked|done|archived)$")
-    priority: Optional[str] = Field(None, pattern=r"^(low|medium|high|urgent)$")
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
     due_at: Optional[datetime] = None
-    tags: Optional[list[str]] = None
-    context: Optional[str] = Field(None, pattern=r"^(personal|professional|mixed)$")
+    tags: Optional[list[Tag]] = None
+    context: Optional[TaskContext] = None
     workspace: Optional[str] = Field(None, max_length=100)
-
-    @field_validator("tags", mode="before")
-    @classmethod
-    def validate_tag(cls, v):
-        """Validate individual tag constraints."""
-        if isinstance(v, list) and v is not None:
-            for tag in v:
-                if len(tag) > 50:
-                    raise ValueError("Tag must be 50 characters or less")
-                if not tag.strip():
-                    raise ValueError("Tag cannot be empty or whitespace-only")
-                tag = tag.strip().lower()
-            return v
-        return v
+    recurrence: Optional[str] = Field(None, max_length=500)
+    parent_id: Optional[UUID] = None
 
     @field_validator("title")
     @classmethod
@@ -109,6 +110,12 @@ class TaskUpdate(BaseModel):
             raise ValueError("Title cannot be empty or whitespace-only")
         return v.strip() if v is not None else v
 
+    @field_validator("recurrence")
+    @classmethod
+    def validate_recurrence(cls, v):
+        """Validate and normalize the recurrence rule."""
+        return normalize_rule(v) if v is not None else v
+
     model_config = ConfigDict(
         json_encoders={
             datetime: lambda v: v.isoformat(),
@@ -123,6 +130,8 @@ class Task(TaskBase):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     completed_at: Optional[datetime] = Field(None, description="Completion timestamp")
+    open_blockers: int = Field(0, description="Unfinished tasks blocking this one")
+    parent_id: Optional[str] = Field(None, description="Parent task UUID")
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -132,6 +141,24 @@ class Task(TaskBase):
     )
 
 
+class SubtreeProgress(BaseModel):
+    """Schema for the completion of a task's subtasks."""
+
+    done: int = Field(..., description="Done subtasks, at any depth")
+    total: int = Field(..., description="Subtasks at any depth, except archived")
+
+
+class TaskTree(Task):
+    """Schema for a task with its subtree (``GET /tasks/{id}?include=``)."""
+
+    subtree: Optional[list[Task]] = Field(
+        None, description="Subtasks at any depth, level by level"
+    )
+    progress: Optional[SubtreeProgress] = Field(
+        None, description="Completion of the subtasks"
+    )
+
+
 class TaskList(BaseModel):
     """Schema for task list responses with pagination."""
 
@@ -145,6 +172,140 @@ class TaskList(BaseModel):
     )
 
 
+class TaskBatchResponse(BaseModel):
+    """Schema for the tasks created by a batch request."""
+
+    tasks: list[Task] = Field(..., description="Created tasks, in request order")
+
+
+# Validates a raw JSON batch body straight from bytes in one pydantic-core
+# call; built once at import, like the response adapters
+TASK_BATCH_ADAPTER: TypeAdapter[list[TaskCreate]] = TypeAdapter(
+    Annotated[list[TaskCreate], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+)
+
+
+class DependencyCreate(BaseModel):
+    """Schema for adding a blocker to a task."""
+
+    blocker_id: UUID = Field(..., description="Task that must be finished first")
+
+
+class TaskDependencies(BaseModel):
+    """Schema for the dependencies of a task."""
+
+    blockers: list[str] = Field(..., description="Ids of the tasks blocking it")
+    dependents: list[str] = Field(..., description="Ids of the tasks it blocks")
+
+
+class TaskEvent(BaseModel):
+    """Schema for one recorded change to a task."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int = Field(..., description="Event id, increasing in time")
+    at: datetime = Field(..., description="When the change was made (UTC)")
+    kind: Literal["created", "updated", "undo"]
+    changes: dict[str, list] = Field(
+        ..., description="Changed fields, as [old, new] pairs"
+    )
+    undoes: Optional[int] = Field(None, description="Event reverted by an undo")
+
+
+class TaskHistorySnapshot(BaseModel):
+    """Schema for a task's fields as of its oldest kept event."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    event_id: int = Field(..., description="Last event folded into the snapshot")
+    at: datetime
+    state: dict = Field(..., description="Field values after that event")
+
+
+class TaskHistory(BaseModel):
+    """Schema for the recorded history of a task."""
+
+    snapshot: Optional[TaskHistorySnapshot] = Field(
+        None, description="Compacted older history, if any"
+    )
+    events: list[TaskEvent] = Field(..., description="Kept events, oldest first")
+    state: Optional[dict] = Field(
+        None, description="Field values after the `as_of` event"
+    )
+
+
+class TagSummary(BaseModel):
+    """Schema for a tag and how many tasks use it."""
+
+    name: str = Field(..., description="Tag name")
+    usage_count: int = Field(..., description="Tasks carrying the tag")
+
+
+class TagList(BaseModel):
+    """Schema for tag list responses."""
+
+    tags: list[TagSummary] = Field(..., description="Tags, most used first")
+
+
+class TagRename(BaseModel):
+    """Schema for renaming (or, onto an existing name, merging) a tag."""
+
+    name: Tag = Field(..., description="Current tag name")
+    new_name: Tag = Field(..., description="New name; an existing tag is merged into")
+
+
+# Columns a task list can be sorted by
+TaskSort = Literal["created_at", "updated_at", "due_at", "priority", "status", "title"]
+
+
+class ViewFilters(BaseModel):
+    """Schema for the filters of a saved view, as taken by ``GET /tasks``."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    status: Optional[list[TaskStatus]] = Field(None, description="Any of these")
+    context: Optional[TaskContext] = None
+    workspace: Optional[str] = Field(None, max_length=100)
+    tags: Optional[list[Tag]] = Field(None, description="Any of these")
+    priority: Optional[TaskPriority] = Field(None, description="Minimum priority")
+    due_before: Optional[datetime] = None
+    due_after: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+    ready: Optional[bool] = Field(
+        None, description="Open tasks without (true) or with (false) blockers"
+    )
+    parent: Optional[UUID] = Field(None, description="Subtasks of this task")
+    sort: TaskSort = "updated_at"
+    order: Literal["asc", "desc"] = "desc"
+    limit: int = Field(100, ge=1, le=1000, description="Tasks on the page")
+
+
+class ViewCreate(BaseModel):
+    """Schema for saving a view."""
+
+    name: Annotated[
+        str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)
+    ] = Field(..., description="View name")
+    filters: ViewFilters = Field(default_factory=ViewFilters)
+
+
+class View(BaseModel):
+    """Schema for a saved view."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str = Field(..., description="View UUID")
+    name: str
+    filters: ViewFilters
+    created_at: datetime
+
+
+class ViewList(BaseModel):
+    """Schema for saved view list responses."""
+
+    views: list[View] = Field(..., description="Saved views, by name")
+
+
 class HealthResponse(BaseModel):
     """Schema for health check responses."""
 
@@ -170,3 +331,146 @@ class ErrorResponse(BaseModel):
             datetime: lambda v: v.isoformat(),
         }
     )
+
+
+class PoolStatus(BaseModel):
+    """Schema for a single connection pool's statistics."""
+
+    pool_class: str = Field(..., description="SQLAlchemy pool implementation")
+    size: Optional[int] = Field(None, description="Configured pool size")
+    checkedin: Optional[int] = Field(None, description="Idle connections in the pool")
+    checkedout: Optional[int] = Field(None, description="Connections in use")
+    overflow: Optional[int] = Field(None, description="Overflow connections in use")
+
+
+class PoolStatistics(BaseModel):
+    """Schema for read and write connection pool statistics."""
+
+    read: PoolStatus = Field(..., description="Read-only connection pool")
+    write: PoolStatus = Field(..., description="Single-connection writer pool")
+
+
+class BackupFile(BaseModel):
+    """Schema for one database file copied into a snapshot."""
+
+    name: str = Field(..., description="Path of the copy inside the snapshot")
+    pages: int = Field(..., description="Database pages copied")
+    bytes: int = Field(..., description="Size of the copy in bytes")
+    restarts: int = Field(..., description="Times the copy restarted after writes")
+
+
+class BackupReport(BaseModel):
+    """Schema for the outcome of a backup run."""
+
+    snapshot: str = Field(..., description="Snapshot directory name")
+    started_at: datetime = Field(..., description="When the backup started (UTC)")
+    duration_seconds: float = Field(..., description="Copy and verification time")
+    bytes: int = Field(..., description="Total bytes copied")
+    throughput_bytes_per_second: float = Field(..., description="Copy rate")
+    files: list[BackupFile] = Field(..., description="Files in the snapshot")
+
+
+class BackupStatus(BaseModel):
+    """Schema for the backup subsystem's state."""
+
+    running: bool = Field(..., description="Whether a backup is in progress")
+    snapshots: list[str] = Field(..., description="Retained snapshots, oldest first")
+    last_backup: Optional[BackupReport] = Field(
+        None, description="Most recent successful backup in this process"
+    )
+    last_error: Optional[str] = Field(None, description="Error of the last failed run")
+
+
+class StorageObject(BaseModel):
+    """Schema for the on-disk size of one table or index."""
+
+    name: str = Field(..., description="Table or index name")
+    type: str = Field(..., description="'table' or 'index'")
+    table: str = Field(..., description="Table the object belongs to")
+    pages: int = Field(..., description="Database pages used")
+    bytes: int = Field(..., description="Bytes used by those pages")
+    unused_bytes: int = Field(..., description="Free bytes inside those pages")
+
+
+class CacheStatistics(BaseModel):
+    """Schema for page cache counters summed over the pooled connections."""
+
+    connections: int = Field(..., description="Connections the counters cover")
+    hits: int = Field(..., description="Page cache hits")
+    misses: int = Field(..., description="Page cache misses (pages read from disk)")
+    writes: int = Field(..., description="Dirty pages written out")
+    used_bytes: int = Field(..., description="Memory held by the page caches")
+    hit_ratio: Optional[float] = Field(None, description="hits / (hits + misses)")
+
+
+class StorageStatistics(BaseModel):
+    """Schema for database storage statistics."""
+
+    database: Optional[str] = Field(None, description="Database file path")
+    page_size: int = Field(..., description="Bytes per database page")
+    page_count: int = Field(..., description="Pages in the database file")
+    database_bytes: int = Field(..., description="Size of the database file")
+    freelist_pages: int = Field(..., description="Unused pages awaiting reuse")
+    freelist_bytes: int = Field(..., description="Size of the unused pages")
+    wal_bytes: Optional[int] = Field(None, description="Size of the WAL file")
+    objects: Optional[list[StorageObject]] = Field(
+        None, description="Per-table and per-index sizes (None without dbstat)"
+    )
+    objects_collected_at: datetime = Field(
+        ..., description="When the per-object sizes were scanned (UTC)"
+    )
+    cache: Optional[CacheStatistics] = Field(
+        None, description="Page cache counters (None where unavailable)"
+    )
+    last_analyze_at: Optional[datetime] = Field(
+        None, description="When ANALYZE last ran through the admin API (UTC)"
+    )
+    rows_by_status: dict[str, int] = Field(..., description="Task counts by status")
+    duration_ms: float = Field(..., description="Time taken to collect these figures")
+
+
+class AnalyzeReport(BaseModel):
+    """Schema for the outcome of an ANALYZE run."""
+
+    ran_at: datetime = Field(..., description="When ANALYZE ran (UTC)")
+    duration_seconds: float = Field(..., description="How long it took")
+
+
+class DailyActivity(BaseModel):
+    """Schema for one day of task throughput."""
+
+    day: date = Field(..., description="UTC day")
+    created: int = Field(..., description="Tasks created")
+    completed: int = Field(..., description="Tasks moved to done")
+    cycle_time_hours: Optional[float] = Field(
+        None, description="Mean hours from creation to completion of those tasks"
+    )
+
+
+class ActivityReport(BaseModel):
+    """Schema for task throughput over a range of days."""
+
+    since: date = Field(..., description="First day (UTC)")
+    until: date = Field(..., description="Last day (UTC)")
+    created: int = Field(..., description="Tasks created in the range")
+    completed: int = Field(..., description="Tasks completed in the range")
+    cycle_time_hours: Optional[float] = Field(
+        None, description="Mean cycle time of the tasks completed in the range"
+    )
+    days: list[DailyActivity] = Field(..., description="Every day of the range")
+
+
+class ContextStatus(BaseModel):
+    """Schema for the current state of one context's tasks."""
+
+    context: TaskContext = Field(..., description="Task context")
+    statuses: dict[str, int] = Field(..., description="Task counts by status")
+    wip: int = Field(..., description="Tasks in progress (doing)")
+    overdue: int = Field(..., description="Open tasks due before today")
+
+
+class StatusReport(BaseModel):
+    """Schema for current task counts per context."""
+
+    today: date = Field(..., description="UTC day that overdue is measured against")
+    contexts: list[ContextStatus] = Field(..., description="One entry per context")
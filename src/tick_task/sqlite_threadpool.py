@@ -0,0 +1,188 @@
+"""Thread-pool SQLite driver mode.
+
+With aiosqlite every DBAPI call (``cursor()``, ``execute()``, each
+``fetchmany()``, ``commit()``) is a separate round trip to the connection's
+worker thread. :class:`ThreadPoolSession` instead runs each whole session
+operation as one job on a shared thread pool of plain ``sqlite3``
+connections: ``execute`` covers the query *and* the full fetch, ``commit``
+covers the flush and the commit, and :meth:`ThreadPoolSession.run_sync`
+runs an entire unit of work in a single hop.
+
+The session implements the subset of :class:`AsyncSession` the API uses, so
+routes work unchanged with either driver.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Mapping, Optional, TypeVar
+
+from sqlalchemy import Engine
+from sqlalchemy.engine import Result
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# Buffer the whole result inside the job, so no fetch hops back later
+_BUFFERED = {"prebuffer_rows": True}
+
+
+async def _iterate(result: Result) -> AsyncIterator[Any]:
+    for row in result:
+        yield row
+
+
+class ThreadPoolSession:
+    """An ``AsyncSession`` look-alike whose operations run on a thread pool.
+
+    Each awaited method is exactly one job on ``executor``; methods that do
+    no I/O (``add``, ``expunge``) run inline. Before its first job the session
+    takes one of ``slots`` (one per pooled connection) and keeps it until it
+    is closed, so a worker thread never blocks waiting for a connection that
+    another session holds between jobs.
+    """
+
+    def __init__(
+        self, bind: Engine, executor: ThreadPoolExecutor, slots: asyncio.Semaphore
+    ) -> None:
+        self.sync_session = Session(bind=bind, expire_on_commit=False)
+        self.bind = bind
+        self._executor = executor
+        self._slots = slots
+        self._holding_slot = False
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if not self._holding_slot:
+            await self._slots.acquire()
+            self._holding_slot = True
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn(sync_session, ...)`` as a single job."""
+        return await self._run(fn, self.sync_session, *args, **kwargs)
+
+    async def execute(
+        self,
+        statement: Any,
+        params: Any = None,
+        *,
+        execution_options: Mapping[str, Any] = {},
+        **kwargs: Any,
+    ) -> Result:
+        """Execute ``statement`` and fetch all of its rows in one job."""
+        return await self._run(
+            self.sync_session.execute,
+            statement,
+            params,
+            execution_options={**execution_options, **_BUFFERED},
+            **kwargs,
+        )
+
+    async def scalar(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        result = await self.execute(statement, params, **kwargs)
+        return result.scalar()
+
+    async def scalars(self, statement: Any, params: Any = None, **kwargs: Any) -> Any:
+        result = await self.execute(statement, params, **kwargs)
+        return result.scalars()
+
+    async def stream(
+        self, statement: Any, params: Any = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        """Fetch the rows in one job and iterate them without further hops."""
+        return _iterate(await self.execute(statement, params, **kwargs))
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await self._run(self.sync_session.get, entity, ident, **kwargs)
+
+    async def refresh(self, instance: Any, **kwargs: Any) -> None:
+        await self._run(self.sync_session.refresh, instance, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        await self._run(self.sync_session.delete, instance)
+
+    async def flush(self, objects: Any = None) -> None:
+        await self._run(self.sync_session.flush, objects)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        if not self._holding_slot:
+            return
+        try:
+            await self._run(self.sync_session.close)
+        finally:
+            self._holding_slot = False
+            self._slots.release()
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Any) -> None:
+        self.sync_session.add_all(instances)
+
+    def expunge(self, instance: Any) -> None:
+        self.sync_session.expunge(instance)
+
+    def in_transaction(self) -> bool:
+        return self.sync_session.in_transaction()
+
+    async def __aenter__(self) -> "ThreadPoolSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+
+class ThreadPoolDriver:
+    """Sync ``sqlite3`` engines plus the thread pool that runs their jobs.
+
+    Mirrors the aiosqlite setup: a single-connection writer and a pool of
+    ``query_only`` readers, with one worker thread per connection. Engines
+    come from :func:`tick_task.database.create_sync_database_engine`.
+    """
+
+    _read_slots: Optional[asyncio.Semaphore] = None
+    _write_slots: Optional[asyncio.Semaphore] = None
+
+    def __init__(
+        self, write_engine: Engine, read_engine: Engine, read_pool_size: int = 4
+    ) -> None:
+        self.write_engine = write_engine
+        self.read_engine = read_engine
+        self.read_pool_size = read_pool_size
+        # A shared engine (in-memory database) has one connection for both roles
+        self.shared = write_engine is read_engine
+        self.executor = ThreadPoolExecutor(
+            max_workers=read_pool_size + 1, thread_name_prefix="tick-task-sqlite"
+        )
+
+    def _slots(self) -> tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        # Created on first use so they belong to the running event loop
+        if self._read_slots is None or self._write_slots is None:
+            self._read_slots = asyncio.Semaphore(self.read_pool_size)
+            self._write_slots = (
+                self._read_slots if self.shared else asyncio.Semaphore(1)
+            )
+        return self._read_slots, self._write_slots
+
+    def read_session(self) -> ThreadPoolSession:
+        """A session on the read-only connections."""
+        return ThreadPoolSession(self.read_engine, self.executor, self._slots()[0])
+
+    def write_session(self) -> ThreadPoolSession:
+        """A session on the writer connection."""
+        return ThreadPoolSession(self.write_engine, self.executor, self._slots()[1])
+
+    def dispose(self) -> None:
+        """Close every connection and stop the worker threads."""
+        self.executor.shutdown(wait=True)
+        self.read_engine.dispose()
+        self.write_engine.dispose()
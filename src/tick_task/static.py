@@ -0,0 +1,181 @@
+"""In-memory static file serving for the built frontend."""
+
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from tick_task.compression import negotiate_encoding
+
+# Precompressed sibling suffixes in server preference order.
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Vite emits content-hashed files such as ``assets/index-4f2a9c1b.js``.
+HASHED_ASSET_PATTERN = re.compile(r"^assets/.+[.-][A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+
+# Entity tags in an If-None-Match list: quoted, optionally weak, or "*"
+ENTITY_TAG_PATTERN = re.compile(r'\*|(?:W/)?"[^"]*"')
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+mimetypes.add_type("text/javascript", ".js")
+mimetypes.add_type("text/javascript", ".mjs")
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+@dataclass
+class StaticAsset:
+    """A frontend file held in memory with its precompressed variants."""
+
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        """The entity tag of the body sent with ``encoding`` (None: as is).
+
+        Each encoding is a different representation, so it gets its own tag:
+        a cache revalidating one must not be told it may reuse another.
+        """
+        if encoding is None:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header lists ``etag``.
+
+    Entries are compared exactly after dropping a ``W/`` prefix (the weak
+    comparison the header calls for); ``*`` matches any tag.
+    """
+    for candidate in ENTITY_TAG_PATTERN.findall(if_none_match):
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def load_assets(root: Path) -> dict[str, StaticAsset]:
+    """Read every file under ``root`` into memory, keyed by relative path.
+
+    ``.gz``/``.br`` files that sit next to an original are attached to it as
+    precompressed variants instead of being served on their own.
+    """
+    assets: dict[str, StaticAsset] = {}
+    files = sorted(path for path in root.rglob("*") if path.is_file())
+    sibling_suffixes = tuple(PRECOMPRESSED_SUFFIXES.values())
+
+    for path in files:
+        if path.name.endswith(sibling_suffixes):
+            continue
+        relative = path.relative_to(root).as_posix()
+        body = path.read_bytes()
+        media_type, _ = mimetypes.guess_type(path.name)
+        if media_type is None:
+            media_type = "application/octet-stream"
+        elif media_type.startswith("text/") or media_type.endswith("javascript"):
+            media_type = f"{media_type}; charset=utf-8"
+
+        encoded = {}
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            sibling = path.with_name(path.name + suffix)
+            if sibling.is_file():
+                encoded[encoding] = sibling.read_bytes()
+
+        assets[relative] = StaticAsset(
+            body=body,
+            media_type=media_type,
+            etag='"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"',
+            cache_control=(
+                IMMUTABLE_CACHE_CONTROL
+                if HASHED_ASSET_PATTERN.match(relative)
+                else REVALIDATE_CACHE_CONTROL
+            ),
+            encoded=encoded,
+        )
+    return assets
+
+
+class FrontendAssets:
+    """ASGI app serving a built single-page frontend from memory.
+
+    Hashed assets are sent with an immutable ``Cache-Control``; everything
+    else (notably ``index.html``) must be revalidated and answers matching
+    ``If-None-Match`` requests with ``304 Not Modified``. Unknown paths
+    requested by a browser fall back to ``index.html`` for client-side
+    routing.
+    """
+
+    def __init__(self, directory: Path, index: str = "index.html") -> None:
+        self.directory = directory
+        self.index = index
+        self.assets = load_assets(directory)
+
+    def _lookup(self, path: str, headers: Headers) -> Optional[StaticAsset]:
+        relative = path.lstrip("/") or self.index
+        asset = self.assets.get(relative)
+        if asset is None and not relative.endswith("/"):
+            asset = self.assets.get(f"{relative}/{self.index}")
+        if asset is None and "text/html" in headers.get("accept", ""):
+            asset = self.assets.get(self.index)
+        return asset
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        assert scope["type"] == "http"
+
+        if scope["method"] not in ("GET", "HEAD"):
+            response: Response = PlainTextResponse(
+                "Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"}
+            )
+            await response(scope, receive, send)
+            return
+
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+
+        headers = Headers(scope=scope)
+        asset = self._lookup(path, headers)
+        if asset is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            headers.get("accept-encoding", ""), list(asset.encoded)
+        )
+        etag = asset.etag_for(encoding)
+        response_headers = {
+            "Cache-Control": asset.cache_control,
+            "ETag": etag,
+        }
+        if asset.encoded:
+            response_headers["Vary"] = "Accept-Encoding"
+
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            response = Response(status_code=304, headers=response_headers)
+            await response(scope, receive, send)
+            return
+
+        body = asset.body
+        if encoding is not None:
+            body = asset.encoded[encoding]
+            response_headers["Content-Encoding"] = encoding
+
+        response = Response(
+            body if scope["method"] == "GET" else b"",
+            media_type=asset.media_type,
+            headers=response_headers,
+        )
+        if scope["method"] == "HEAD":
+            response.headers["Content-Length"] = str(len(body))
+        await response(scope, receive, send)
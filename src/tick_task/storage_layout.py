@@ -0,0 +1,268 @@
+"""Converting databases between the text and compact storage layouts.
+
+Migration ``002`` converts ``tasks`` only if ``TICK_TASK_COMPACT_STORAGE``
+is set when it first runs, so a database already past it keeps the layout
+it was created in. :func:`convert` rebuilds every table with task ids,
+timestamps or enums in the layout the settings ask for, in one transaction,
+and :func:`check_layout` refuses a database whose layout differs from them:
+the column types would misread every row.
+
+Usage (with the application stopped, after ``alembic upgrade head``)::
+
+    TICK_TASK_COMPACT_STORAGE=true python -m tick_task.storage_layout
+    python -m tick_task.storage_layout --check
+"""
+
+import argparse
+import sys
+from typing import Optional
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.types import TypeEngine
+
+from tick_task.backup import BackupError, database_files
+from tick_task.column_types import EpochMicros, SmallIntEnum, UUIDBlob
+from tick_task.config import settings
+from tick_task.database import (
+    create_sync_database_engine,
+    engine,
+    is_memory_database,
+    shard_router,
+)
+from tick_task.models import ID_TYPE, TIMESTAMP_TYPE, Base
+
+BATCH_SIZE = 5000
+
+
+class StorageLayoutError(Exception):
+    """Raised when a database is not, or cannot be put, in a storage layout."""
+
+
+def _layout_type(column: sa.Column, compact: bool) -> Optional[TypeEngine]:
+    """``column``'s type in the given layout, or ``None`` if it has no layout."""
+    if column.type is ID_TYPE:
+        return UUIDBlob() if compact else sa.String(36)
+    if column.type is TIMESTAMP_TYPE:
+        return EpochMicros() if compact else sa.DateTime()
+    if isinstance(column.type, SmallIntEnum):
+        values = column.type.values
+    elif isinstance(column.type, sa.Enum):
+        values = tuple(column.type.enums)
+    else:
+        return None
+    return SmallIntEnum(values) if compact else sa.Enum(*values, name=column.name)
+
+
+def layout_tables(compact: bool, without_rowid: bool = False) -> sa.MetaData:
+    """The application's tables with the column types of one layout."""
+    metadata = sa.MetaData()
+    for table in Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for column in copy.columns:
+            layout_type = _layout_type(table.c[column.name], compact)
+            if layout_type is not None:
+                column.type = layout_type
+    tasks = metadata.tables["tasks"]
+    tasks.dialect_options["sqlite"]["with_rowid"] = not (compact and without_rowid)
+    return metadata
+
+
+# Tables whose on-disk representation depends on the layout
+LAYOUT_TABLES = tuple(
+    table.name
+    for table in Base.metadata.sorted_tables
+    if any(_layout_type(column, False) is not None for column in table.columns)
+)
+
+
+def database_layout(connection: Connection) -> Optional[str]:
+    """``"compact"`` or ``"text"``, or ``None`` for a database without tasks."""
+    inspector = sa.inspect(connection)
+    if not inspector.has_table("tasks"):
+        return None
+    columns = {column["name"]: column for column in inspector.get_columns("tasks")}
+    return "compact" if isinstance(columns["id"]["type"], sa.LargeBinary) else "text"
+
+
+def configured_layout() -> str:
+    """The layout ``TICK_TASK_COMPACT_STORAGE`` asks for."""
+    return "compact" if settings.compact_storage else "text"
+
+
+def check_layout(connection: Connection) -> None:
+    """Raise :class:`StorageLayoutError` unless the database is as configured."""
+    layout = database_layout(connection)
+    if layout is not None and layout != configured_layout():
+        raise StorageLayoutError(
+            f"The database uses the {layout} storage layout but "
+            f"TICK_TASK_COMPACT_STORAGE={str(settings.compact_storage).lower()} "
+            f"asks for the {configured_layout()} one. Stop the application and "
+            "run `python -m tick_task.storage_layout` to convert it, or change "
+            "the setting back."
+        )
+
+
+async def check_storage_layouts() -> None:
+    """Check the main database and every shard before serving requests."""
+    engines = []
+    # Connecting would create a missing file; a new database has no layout yet
+    if (
+        not is_memory_database(settings.database_url)
+        and settings.database_path.is_file()
+    ):
+        engines.append(engine)
+    if shard_router is not None:
+        engines.extend(shard_router.engines.values())
+    for database_engine in engines:
+        async with database_engine.connect() as connection:
+            await connection.run_sync(check_layout)
+
+
+def _without_rowid(connection: Connection) -> bool:
+    sql = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'"
+    ).scalar()
+    return sql.rstrip().upper().endswith("WITHOUT ROWID")
+
+
+def _rebuild(
+    connection: Connection, source: sa.Table, target: sa.Table, batch_size: int
+) -> int:
+    """Recreate ``target`` from the rows of the same table in ``source``'s types.
+
+    The table's indexes and triggers are dropped and recreated from their
+    stored SQL, so they come back exactly as they were (the tag usage
+    triggers must not fire for the copied rows).
+    """
+    name = target.name
+    on_disk = {column["name"] for column in sa.inspect(connection).get_columns(name)}
+    if on_disk != set(target.columns.keys()):
+        raise StorageLayoutError(
+            f"Table {name} does not match this version; "
+            "run `alembic upgrade head` first"
+        )
+    schema = connection.exec_driver_sql(
+        "SELECT type, name, sql FROM sqlite_master"
+        " WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (name,),
+    ).all()
+    for kind, object_name, _ in schema:
+        connection.exec_driver_sql(f'DROP {kind.upper()} "{object_name}"')
+
+    old_name = f"_{name}_old_layout"
+    connection.exec_driver_sql(f'ALTER TABLE "{name}" RENAME TO "{old_name}"')
+    connection.execute(CreateTable(target))
+    old = sa.table(old_name, *[sa.column(c.name, c.type) for c in source.columns])
+    rows = connection.execution_options(stream_results=True).execute(sa.select(old))
+    copied = 0
+    for batch in rows.partitions(batch_size):
+        connection.execute(sa.insert(target), [dict(row._mapping) for row in batch])
+        copied += len(batch)
+    connection.exec_driver_sql(f'DROP TABLE "{old_name}"')
+
+    for _, _, sql in schema:
+        connection.exec_driver_sql(sql)
+    return copied
+
+
+def convert(
+    connection: Connection,
+    compact: bool,
+    without_rowid: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> dict[str, int]:
+    """Rebuild the layout tables in the given layout; rows copied per table.
+
+    Runs inside the caller's transaction, which must have foreign keys and
+    the renaming of references turned off (see :func:`convert_database`).
+    Returns an empty dict when the database is already in that layout.
+    """
+    layout = database_layout(connection)
+    if layout is None:
+        return {}
+    without_rowid = compact and without_rowid
+    if layout == ("compact" if compact else "text") and (
+        not compact or _without_rowid(connection) == without_rowid
+    ):
+        return {}
+
+    inspector = sa.inspect(connection)
+    source = layout_tables(layout == "compact")
+    target = layout_tables(compact, without_rowid)
+    copied = {
+        name: _rebuild(connection, source.tables[name], target.tables[name], batch_size)
+        for name in LAYOUT_TABLES
+        if inspector.has_table(name)
+    }
+    broken = connection.exec_driver_sql("PRAGMA foreign_key_check").all()
+    if broken:
+        raise StorageLayoutError(f"Conversion broke {len(broken)} foreign keys")
+    return copied
+
+
+def convert_database(
+    database_url: str,
+    compact: bool,
+    without_rowid: bool = False,
+    batch_size: int = BATCH_SIZE,
+) -> dict[str, int]:
+    """Convert the database at ``database_url`` atomically, then VACUUM it."""
+    database_engine = create_sync_database_engine(
+        database_url, isolation_level="AUTOCOMMIT"
+    )
+    try:
+        with database_engine.connect() as connection:
+            # Other tables must keep referencing "tasks" while it is rebuilt
+            connection.exec_driver_sql("PRAGMA foreign_keys = OFF")
+            connection.exec_driver_sql("PRAGMA legacy_alter_table = ON")
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            try:
+                copied = convert(connection, compact, without_rowid, batch_size)
+            except BaseException:
+                connection.exec_driver_sql("ROLLBACK")
+                raise
+            connection.exec_driver_sql("COMMIT")
+            if copied:
+                connection.exec_driver_sql("VACUUM")
+            return copied
+    finally:
+        database_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert the databases to the storage layout that "
+        "TICK_TASK_COMPACT_STORAGE and TICK_TASK_COMPACT_WITHOUT_ROWID ask for"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="only report each database's layout"
+    )
+    args = parser.parse_args()
+
+    try:
+        files = database_files()
+    except BackupError as error:
+        parser.error(str(error))
+    mismatched = False
+    for name, path in files.items():
+        url = f"sqlite:///{path}"
+        if args.check:
+            check_engine = create_sync_database_engine(url)
+            with check_engine.connect() as connection:
+                layout = database_layout(connection)
+            check_engine.dispose()
+            mismatched |= layout not in (None, configured_layout())
+            print(f"{name}: {layout or 'empty'}")
+            continue
+        copied = convert_database(
+            url, settings.compact_storage, settings.compact_without_rowid
+        )
+        summary = ", ".join(f"{table} {rows}" for table, rows in copied.items())
+        print(f"{name}: {summary or 'already ' + configured_layout()}")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Database storage statistics for ``GET /api/v1/admin/storage``.
+
+Everything reported here is cheap to read except the per-table and
+per-index sizes, which come from the ``dbstat`` virtual table and visit
+every page of the database. That scan is cached for
+``storage_stats_object_ttl_seconds``, so the endpoint can be polled every
+minute; file sizes, the freelist, page cache counters and row counts are
+always current.
+
+Page cache hits and misses are per-connection counters that SQLite only
+exposes through the C function ``sqlite3_db_status``, which Python's
+``sqlite3`` module does not wrap. :class:`ConnectionTracker` remembers the
+raw connections of the main engines' pools and :func:`cache_status` calls
+the function through ``ctypes`` on each of them. Finding the ``sqlite3*``
+handle relies on the private layout of CPython's connection object, and a
+wrong guess reads a wild pointer rather than failing cleanly, so the
+counters are off unless ``storage_stats_cache_counters`` is set, and even
+then only read on the CPython versions in :data:`CACHE_COUNTER_VERSIONS`.
+Otherwise the cache figures are simply omitted.
+"""
+
+import ctypes
+import functools
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Optional, Union
+
+import sqlalchemy as sa
+from sqlalchemy import Engine, event, func, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from tick_task.config import settings
+from tick_task.database import read_engine, threadpool_driver, write_engine
+from tick_task.models import Task
+
+# sqlite3_db_status() operation codes, from sqlite3.h
+SQLITE_DBSTATUS_CACHE_USED = 1
+SQLITE_DBSTATUS_CACHE_HIT = 7
+SQLITE_DBSTATUS_CACHE_MISS = 8
+SQLITE_DBSTATUS_CACHE_WRITE = 9
+
+# CPython releases whose connection object layout _sqlite_handle matches
+CACHE_COUNTER_VERSIONS = ((3, 9), (3, 13))
+
+maintenance_metadata = sa.MetaData()
+
+# When maintenance commands last ran; SQLite itself does not record it
+maintenance_table = sa.Table(
+    "storage_maintenance",
+    maintenance_metadata,
+    sa.Column("operation", sa.String(50), primary_key=True),
+    sa.Column("ran_at", sa.DateTime(), nullable=False),
+    sa.Column("duration_seconds", sa.Float(), nullable=False),
+)
+
+
+def raw_sqlite_connection(dbapi_connection: Any) -> Optional[sqlite3.Connection]:
+    """The ``sqlite3.Connection`` behind a pooled DBAPI connection, if any."""
+    connection = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+    # aiosqlite keeps the sqlite3 connection next to its worker thread
+    connection = getattr(connection, "_connection", connection)
+    return connection if isinstance(connection, sqlite3.Connection) else None
+
+
+@functools.lru_cache(maxsize=None)
+def _db_status_function() -> Optional[Callable[..., int]]:
+    # Resolve the symbol through the _sqlite3 extension itself, so the call
+    # goes to the same SQLite library that opened the connections
+    if sys.implementation.name != "cpython":
+        return None
+    try:
+        import _sqlite3
+
+        db_status = ctypes.CDLL(_sqlite3.__file__).sqlite3_db_status
+    except (ImportError, OSError, AttributeError):
+        return None
+    db_status.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.c_int,
+    ]
+    db_status.restype = ctypes.c_int
+    return db_status
+
+
+def _sqlite_handle(connection: sqlite3.Connection) -> Optional[int]:
+    # CPython's connection object starts with its sqlite3* pointer, right
+    # after the object header; it is NULL once the connection is closed
+    return ctypes.c_void_p.from_address(id(connection) + object.__basicsize__).value
+
+
+def cache_counters_enabled() -> bool:
+    """Whether page cache counters are turned on and safe to read here."""
+    oldest, newest = CACHE_COUNTER_VERSIONS
+    return (
+        settings.storage_stats_cache_counters
+        and sys.implementation.name == "cpython"
+        and oldest <= sys.version_info[:2] <= newest
+    )
+
+
+def cache_status(connection: sqlite3.Connection) -> Optional[dict[str, int]]:
+    """Page cache counters of one connection, or ``None`` if unavailable."""
+    if not cache_counters_enabled():
+        return None
+    db_status = _db_status_function()
+    if db_status is None:
+        return None
+    handle = _sqlite_handle(connection)
+    if not handle:
+        return None
+    current, highwater = ctypes.c_int(), ctypes.c_int()
+    values = {}
+    for key, op in (
+        ("hits", SQLITE_DBSTATUS_CACHE_HIT),
+        ("misses", SQLITE_DBSTATUS_CACHE_MISS),
+        ("writes", SQLITE_DBSTATUS_CACHE_WRITE),
+        ("used_bytes", SQLITE_DBSTATUS_CACHE_USED),
+    ):
+        if db_status(handle, op, ctypes.byref(current), ctypes.byref(highwater), 0):
+            return None
+        values[key] = current.value
+    return values
+
+
+class ConnectionTracker:
+    """Remembers the raw sqlite3 connections open in some engines' pools."""
+
+    def __init__(self) -> None:
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def track(self, engine: Union[Engine, AsyncEngine]) -> None:
+        """Follow connections that ``engine`` opens from now on."""
+        target = getattr(engine, "sync_engine", engine)
+        event.listen(target, "connect", self._opened)
+        event.listen(target, "close", self._closed)
+        event.listen(target, "close_detached", self._closed)
+
+    def _opened(self, dbapi_connection: Any, connection_record: Any = None) -> None:
+        connection = raw_sqlite_connection(dbapi_connection)
+        if connection is not None:
+            with self._lock:
+                self._connections[id(dbapi_connection)] = connection
+
+    def _closed(self, dbapi_connection: Any, connection_record: Any = None) -> None:
+        with self._lock:
+            self._connections.pop(id(dbapi_connection), None)
+
+    def cache_status(self) -> Optional[dict[str, Any]]:
+        """Page cache counters summed over every tracked connection."""
+        if not cache_counters_enabled():
+            return None
+        with self._lock:
+            connections = list(self._connections.values())
+        keys = ("connections", "hits", "misses", "writes", "used_bytes")
+        totals: dict[str, Any] = dict.fromkeys(keys, 0)
+        for connection in connections:
+            status = cache_status(connection)
+            if status is None:
+                continue
+            totals["connections"] += 1
+            for key, value in status.items():
+                totals[key] += value
+        if not totals["connections"]:
+            return None
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_ratio"] = totals["hits"] / lookups if lookups else None
+        return totals
+
+
+def _pragma(connection: Connection, name: str) -> Any:
+    return connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def _database_file(connection: Connection) -> Optional[str]:
+    for _, name, path in connection.exec_driver_sql("PRAGMA database_list"):
+        if name == "main":
+            return path or None
+    return None
+
+
+def storage_objects(connection: Connection) -> Optional[list[dict[str, Any]]]:
+    """Pages and bytes of every table and index, largest first.
+
+    Returns ``None`` when SQLite was built without the ``dbstat`` table.
+    """
+    try:
+        rows = connection.exec_driver_sql(
+            "SELECT s.name, coalesce(m.type, 'table'), coalesce(m.tbl_name, s.name),"
+            " count(*), sum(s.pgsize), sum(s.unused)"
+            " FROM dbstat AS s LEFT JOIN sqlite_master AS m ON m.name = s.name"
+            " GROUP BY s.name ORDER BY sum(s.pgsize) DESC, s.name"
+        ).all()
+    except OperationalError:
+        return None
+    return [
+        {
+            "name": name,
+            "type": kind,
+            "table": table,
+            "pages": pages,
+            "bytes": size,
+            "unused_bytes": unused,
+        }
+        for name, kind, table, pages, size, unused in rows
+    ]
+
+
+def last_maintenance(connection: Connection, operation: str) -> Optional[datetime]:
+    """When ``operation`` last ran, as recorded by :func:`record_maintenance`."""
+    if not sa.inspect(connection).has_table(maintenance_table.name):
+        return None
+    return connection.execute(
+        select(maintenance_table.c.ran_at).where(
+            maintenance_table.c.operation == operation
+        )
+    ).scalar()
+
+
+def record_maintenance(
+    connection: Connection, operation: str, ran_at: datetime, duration: float
+) -> None:
+    """Store the time of a maintenance run for :func:`last_maintenance`."""
+    maintenance_metadata.create_all(connection)
+    values = {"ran_at": ran_at, "duration_seconds": duration}
+    updated = connection.execute(
+        maintenance_table.update()
+        .where(maintenance_table.c.operation == operation)
+        .values(**values)
+    )
+    if not updated.rowcount:
+        connection.execute(
+            maintenance_table.insert().values(operation=operation, **values)
+        )
+
+
+def analyze(connection: Connection) -> dict[str, Any]:
+    """Run ``ANALYZE`` and record when it ran."""
+    ran_at = datetime.utcnow()
+    began = time.perf_counter()
+    connection.exec_driver_sql("ANALYZE")
+    duration = time.perf_counter() - began
+    record_maintenance(connection, "analyze", ran_at, duration)
+    return {"ran_at": ran_at, "duration_seconds": duration}
+
+
+class StorageStatistics:
+    """Collects storage statistics, caching the expensive ``dbstat`` scan."""
+
+    def __init__(self, object_ttl: float = 300.0) -> None:
+        self.object_ttl = object_ttl
+        self.tracker = ConnectionTracker()
+        self._objects: dict[Optional[str], tuple[float, datetime, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _cached_objects(
+        self, connection: Connection, database: Optional[str]
+    ) -> tuple[Optional[list[dict[str, Any]]], datetime]:
+        with self._lock:
+            cached = self._objects.get(database)
+        if cached is not None and time.monotonic() - cached[0] < self.object_ttl:
+            return cached[2], cached[1]
+        collected_at = datetime.utcnow()
+        objects = storage_objects(connection)
+        with self._lock:
+            self._objects[database] = (time.monotonic(), collected_at, objects)
+        return objects, collected_at
+
+    def invalidate(self) -> None:
+        """Forget the cached ``dbstat`` scan."""
+        with self._lock:
+            self._objects.clear()
+
+    def collect(
+        self, connection: Connection, count_rows: bool = True
+    ) -> dict[str, Any]:
+        """Statistics for the database behind ``connection``.
+
+        ``count_rows=False`` leaves ``rows_by_status`` empty for callers that
+        keep tasks elsewhere (the memory store).
+        """
+        began = time.perf_counter()
+        database = _database_file(connection)
+        page_size = _pragma(connection, "page_size")
+        page_count = _pragma(connection, "page_count")
+        freelist = _pragma(connection, "freelist_count")
+        wal_bytes = None
+        if database is not None:
+            try:
+                wal_bytes = os.path.getsize(f"{database}-wal")
+            except OSError:
+                wal_bytes = 0
+
+        objects, objects_collected_at = self._cached_objects(connection, database)
+        rows_by_status = {}
+        if count_rows:
+            rows_by_status = dict(
+                connection.execute(
+                    select(Task.status, func.count()).group_by(Task.status)
+                ).all()
+            )
+
+        return {
+            "database": database,
+            "page_size": page_size,
+            "page_count": page_count,
+            "database_bytes": page_size * page_count,
+            "freelist_pages": freelist,
+            "freelist_bytes": page_size * freelist,
+            "wal_bytes": wal_bytes,
+            "objects": objects,
+            "objects_collected_at": objects_collected_at,
+            "cache": self.tracker.cache_status(),
+            "last_analyze_at": last_maintenance(connection, "analyze"),
+            "rows_by_status": rows_by_status,
+            "duration_ms": (time.perf_counter() - began) * 1000,
+        }
+
+
+storage_statistics = StorageStatistics(settings.storage_stats_object_ttl_seconds)
+
+
+# Cache counters cover the main database's read and write pools
+for _engine in {id(e): e for e in (write_engine, read_engine)}.values():
+    storage_statistics.tracker.track(_engine)
+if threadpool_driver is not None:
+    storage_statistics.tracker.track(threadpool_driver.write_engine)
+    if not threadpool_driver.shared:
+        storage_statistics.tracker.track(threadpool_driver.read_engine)
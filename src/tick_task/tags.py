@@ -0,0 +1,264 @@
+"""Interned tag vocabulary.
+
+Tag names are stored once, in the ``tags`` table, and tasks reference them
+by integer id (``Task.tag_ids``); ``Task.tags`` still reads and writes plain
+names:
+
+- on flush, :func:`intern_task_tags` maps the names of new and retagged
+  tasks to ids, creating missing tags, with one lookup per flush
+- on load, the ``Task.tags`` column property turns the ids back into names
+- ``usage_count`` is kept current by triggers on ``tasks``
+  (:data:`tick_task.models.TAG_USAGE_TRIGGERS`), however a row is written
+
+Because rows only hold ids, :func:`rename_tag` is a single-row update, and
+renaming onto an existing name merges the two tags by pointing one at the
+other (``merged_into``), without touching any task.
+
+Autocomplete is served from memory by :class:`TagIndex` (``tag_index``),
+which the task endpoints keep current as they write.
+"""
+
+import bisect
+import heapq
+import itertools
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from sqlalchemy import func, insert, inspect, select, text, update
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from tick_task.models import Tag, Task
+
+tags_table = Tag.__table__
+
+
+def resolve_tags(connection: Connection, names: Iterable[str]) -> dict[str, tuple]:
+    """Map each of ``names`` to ``(canonical id, canonical name)``.
+
+    Names that are not in the vocabulary yet are inserted.
+    """
+    wanted = list(dict.fromkeys(names))
+    if not wanted:
+        return {}
+    canonical = tags_table.alias("canonical_tag")
+    rows = connection.execute(
+        select(
+            tags_table.c.name,
+            func.coalesce(canonical.c.id, tags_table.c.id),
+            func.coalesce(canonical.c.name, tags_table.c.name),
+        )
+        .select_from(
+            tags_table.outerjoin(canonical, canonical.c.id == tags_table.c.merged_into)
+        )
+        .where(tags_table.c.name.in_(wanted))
+    ).all()
+    resolved = {name: (tag_id, tag_name) for name, tag_id, tag_name in rows}
+    for name in wanted:
+        if name not in resolved:
+            result = connection.execute(
+                insert(tags_table).values(name=name, usage_count=0)
+            )
+            resolved[name] = (result.inserted_primary_key[0], name)
+    return resolved
+
+
+def intern_tags(
+    connection: Connection, names: Sequence[str]
+) -> tuple[list[int], list[str]]:
+    """Canonical tag ids and names for ``names``, without duplicates."""
+    return _canonical(names, resolve_tags(connection, names))
+
+
+def _canonical(
+    names: Sequence[str], resolved: dict[str, tuple]
+) -> tuple[list[int], list[str]]:
+    ids: dict[int, str] = {}
+    for name in names:
+        tag_id, tag_name = resolved[name]
+        ids.setdefault(tag_id, tag_name)
+    return list(ids), list(ids.values())
+
+
+def intern_task_tags(session: Session) -> None:
+    """Set ``tag_ids`` for every new or retagged task about to be flushed.
+
+    Called from the ``before_flush`` hook. Tasks are grouped by the
+    connection they will be written to (one per shard), so each vocabulary
+    is consulted once per flush.
+    """
+    tasks_by_connection: dict[Connection, list[Task]] = {}
+    for instance in itertools.chain(session.new, session.dirty):
+        if not isinstance(instance, Task):
+            continue
+        state = inspect(instance)
+        if not state.pending and not state.attrs.tags.history.has_changes():
+            continue
+        connection = session.connection(
+            bind_arguments={"mapper": state.mapper, "instance": instance}
+        )
+        tasks_by_connection.setdefault(connection, []).append(instance)
+
+    for connection, tasks in tasks_by_connection.items():
+        resolved = resolve_tags(
+            connection, (name for task in tasks for name in task.tags or ())
+        )
+        for task in tasks:
+            task.tag_ids, names = _canonical(task.tags or (), resolved)
+            # What a reload would return: merged names resolved, no repeats
+            set_committed_value(task, "tags", names)
+
+
+def find_tag(connection: Connection, name: str) -> Optional[Row]:
+    """The tag called ``name``, merged or not."""
+    return connection.execute(
+        select(tags_table).where(tags_table.c.name == name)
+    ).first()
+
+
+def _set(connection: Connection, tag_id: int, **values: Any) -> None:
+    connection.execute(
+        update(tags_table).where(tags_table.c.id == tag_id).values(**values)
+    )
+
+
+# Tasks referencing both tags, directly or through merged names
+_SHARED_TASKS = text("""
+    SELECT count(*) FROM tasks WHERE (
+        SELECT count(DISTINCT coalesce(s.merged_into, s.id))
+        FROM json_each(tasks.tag_ids) AS j JOIN tags AS s ON s.id = j.value
+        WHERE coalesce(s.merged_into, s.id) IN (:first, :second)
+    ) = 2
+    """)
+
+
+def rename_tag(connection: Connection, name: str, new_name: str) -> Optional[Row]:
+    """Rename the tag ``name``; return the resulting tag, or None if absent.
+
+    If ``new_name`` already belongs to another tag, the two are merged: the
+    renamed tag (and anything merged into it) now resolves to that tag,
+    whose usage count absorbs the renamed tag's. Only tag rows change, never
+    tasks; counting the tasks that carried both tags is the one scan.
+    """
+    tag = find_tag(connection, name)
+    if tag is None or tag.merged_into is not None:
+        return None
+    existing = find_tag(connection, new_name)
+
+    if existing is None:
+        _set(connection, tag.id, name=new_name)
+    elif existing.id == tag.id:
+        pass
+    elif existing.merged_into == tag.id:
+        # new_name is an old name of this tag: swap the two names, so the
+        # previous name keeps resolving here
+        _set(connection, existing.id, name=f"\0{existing.id}")
+        _set(connection, tag.id, name=new_name)
+        _set(connection, existing.id, name=name)
+    else:
+        target = existing.merged_into or existing.id
+        shared = connection.execute(
+            _SHARED_TASKS, {"first": tag.id, "second": target}
+        ).scalar()
+        # Keep aliases one hop from the tag they resolve to
+        connection.execute(
+            update(tags_table)
+            .where(tags_table.c.merged_into == tag.id)
+            .values(merged_into=target)
+        )
+        _set(connection, tag.id, merged_into=target, usage_count=0)
+        connection.execute(
+            update(tags_table)
+            .where(tags_table.c.id == target)
+            .values(usage_count=tags_table.c.usage_count + tag.usage_count - shared)
+        )
+        return connection.execute(
+            select(tags_table).where(tags_table.c.id == target)
+        ).first()
+
+    return find_tag(connection, new_name)
+
+
+def list_tags(connection: Connection, limit: Optional[int] = None) -> list[Row]:
+    """Tags that have not been merged away, most used first."""
+    query = (
+        select(tags_table)
+        .where(tags_table.c.merged_into.is_(None))
+        .order_by(tags_table.c.usage_count.desc(), tags_table.c.name)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return connection.execute(query).all()
+
+
+class TagIndex:
+    """Tag names in sorted order with their usage counts, for prefix lookups.
+
+    Built from the vocabulary on first use and then adjusted by every task
+    write this process makes, so a lookup is a binary search plus a scan of
+    the matching names. Tags no task uses are left out.
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.counts: dict[str, int] = {}
+        self.loaded = False
+        # Bumped by every change, so a load can tell it raced with a write
+        self.generation = 0
+
+    def load(self, counts: Mapping[str, int]) -> None:
+        """Replace the contents with ``counts`` (name to usage)."""
+        self.counts = {name: count for name, count in counts.items() if count > 0}
+        self.names = sorted(self.counts)
+        self.loaded = True
+
+    def reset(self) -> None:
+        """Forget everything; the next lookup loads again."""
+        self.names = []
+        self.counts = {}
+        self.loaded = False
+        self.generation += 1
+
+    def _add(self, name: str, delta: int) -> None:
+        count = self.counts.get(name, 0) + delta
+        if count > 0:
+            if name not in self.counts:
+                bisect.insort(self.names, name)
+            self.counts[name] = count
+        elif name in self.counts:
+            del self.counts[name]
+            del self.names[bisect.bisect_left(self.names, name)]
+
+    def adjust(self, removed: Iterable[str] = (), added: Iterable[str] = ()) -> None:
+        """Record one task's tags changing from ``removed`` to ``added``."""
+        self.generation += 1
+        if not self.loaded:
+            return
+        removed, added = set(removed), set(added)
+        for name in removed - added:
+            self._add(name, -1)
+        for name in added - removed:
+            self._add(name, 1)
+
+    def rename(self, name: str, new_name: str, count: int) -> None:
+        """Record a rename (or merge) that left ``new_name`` with ``count`` uses."""
+        self.generation += 1
+        if not self.loaded:
+            return
+        self._add(name, -self.counts.get(name, 0))
+        self._add(new_name, count - self.counts.get(new_name, 0))
+
+    def suggest(self, prefix: str = "", limit: int = 10) -> list[tuple[str, int]]:
+        """Up to ``limit`` ``(name, usage)`` pairs starting with ``prefix``.
+
+        The most used come first, then by name.
+        """
+        start = bisect.bisect_left(self.names, prefix)
+        stop = bisect.bisect_left(self.names, prefix + "\U0010ffff", lo=start)
+        counts = self.counts
+        matches = self.names[start:stop]
+        best = heapq.nsmallest(limit, matches, key=lambda name: (-counts[name], name))
+        return [(name, counts[name]) for name in best]
+
+
+tag_index = TagIndex()
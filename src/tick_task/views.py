@@ -0,0 +1,360 @@
+"""Saved view API routes for tick-task.
+
+A saved view (:class:`~tick_task.models.SavedView`) is a named set of the
+filters ``GET /tasks`` takes, stored on the server so every client opens
+the same list without rebuilding it. The :class:`ViewCache` keeps, per
+view, its plan (the statement built from its filters, once) and its
+rendered first page, tagged with the change marker read before the page
+was queried.
+
+The marker is bumped by every commit that wrote a task and by every tag
+rename, so a cached page is served until a write could have changed it;
+opening a view between writes costs no query at all. Only writes made by
+this process bump the marker, as with the tag index. Saved views are kept
+in the database only.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from itertools import chain
+from typing import Any, NamedTuple, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from tick_task.config import settings
+from tick_task.database import get_db, shard_router
+from tick_task.memory_store import memory_store
+from tick_task.models import CLOSED_STATUSES, SavedView, Task, tagged_with
+from tick_task.responses import TASK_LIST_ADAPTER, ModelJSONResponse
+from tick_task.schemas import ErrorResponse, TaskList
+from tick_task.schemas import View as ViewSchema
+from tick_task.schemas import ViewCreate, ViewFilters, ViewList
+
+router = APIRouter(prefix="/views", tags=["views"])
+
+PRIORITY_ORDER = {"low": 0, "medium": 1, "high": 2, "urgent": 3}
+
+# session.info key: the session flushed task writes not yet committed
+_WROTE_TASKS = "tick_task.views.wrote_tasks"
+
+
+def task_statement(
+    status: Optional[list[str]] = None,
+    context: Optional[str] = None,
+    workspace: Optional[str] = None,
+    tags: Optional[list[str]] = None,
+    priority: Optional[str] = None,
+    due_before: Optional[datetime] = None,
+    due_after: Optional[datetime] = None,
+    updated_since: Optional[datetime] = None,
+    ready: Optional[bool] = None,
+    parent: Optional[UUID] = None,
+    sort: str = "updated_at",
+    order: str = "desc",
+) -> tuple[Select, Any]:
+    """The ordered task query for a set of filters, and its sort column."""
+    query = select(Task)
+
+    # Apply filters
+    if status:
+        query = query.where(Task.status.in_(status))
+
+    if context:
+        query = query.where(Task.context == context)
+
+    if workspace:
+        query = query.where(Task.workspace == workspace)
+
+    if tags:
+        # Any of the tags, matched through the vocabulary of the task's shard
+        query = query.where(tagged_with(Task.__table__.c.tag_ids, tags))
+
+    if priority:
+        # Map priority to numeric values for comparison
+        min_priority_value = PRIORITY_ORDER.get(priority, 0)
+        priority_conditions = [
+            Task.priority == p
+            for p in PRIORITY_ORDER
+            if PRIORITY_ORDER[p] >= min_priority_value
+        ]
+        query = query.where(or_(*priority_conditions))
+
+    if due_before:
+        query = query.where(Task.due_at < due_before)
+
+    if due_after:
+        query = query.where(Task.due_at > due_after)
+
+    if updated_since:
+        query = query.where(Task.updated_at > updated_since)
+
+    if ready is not None:
+        query = query.where(
+            Task.status.not_in(CLOSED_STATUSES),
+            Task.open_blockers == 0 if ready else Task.open_blockers > 0,
+        )
+
+    if parent:
+        query = query.where(Task.parent_id == str(parent))
+
+    # Apply sorting
+    sort_column = getattr(Task, sort, Task.updated_at)
+    if order == "desc":
+        query = query.order_by(sort_column.desc())
+    else:
+        query = query.order_by(sort_column.asc())
+    return query, sort_column
+
+
+def pagination(count: int, limit: int) -> dict:
+    """Build pagination metadata for a page of ``count`` tasks."""
+    return {
+        "has_more": count == limit,
+        "next_cursor": f"offset_{count}" if count == limit else None,
+        "total_count": count,
+    }
+
+
+class ViewPlan(NamedTuple):
+    """The query of a saved view, built once from its filters."""
+
+    statement: Select
+    sort_column: Any
+    descending: bool
+    limit: int
+    workspace: Optional[str]
+
+    @classmethod
+    def build(cls, filters: ViewFilters) -> "ViewPlan":
+        """Plan the first page of ``filters``."""
+        statement, sort_column = task_statement(**filters.model_dump(exclude={"limit"}))
+        return cls(
+            statement.limit(filters.limit),
+            sort_column,
+            filters.order == "desc",
+            filters.limit,
+            filters.workspace,
+        )
+
+
+class ViewCache:
+    """Bounded LRU caches of view plans and rendered first pages.
+
+    A page is only served while :attr:`marker` is the value it was read
+    under.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.marker = 0
+        self._plans: OrderedDict[str, ViewPlan] = OrderedDict()
+        self._pages: OrderedDict[str, tuple[int, bytes]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self) -> None:
+        """Record a write: every cached page is stale from now on."""
+        self.marker += 1
+
+    @staticmethod
+    def _put(entries: OrderedDict, key: str, value: Any, max_entries: int) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > max_entries:
+            entries.popitem(last=False)
+
+    def plan(self, view_id: str) -> Optional[ViewPlan]:
+        """The cached plan of ``view_id``, if any."""
+        plan = self._plans.get(view_id)
+        if plan is not None:
+            self._plans.move_to_end(view_id)
+        return plan
+
+    def store_plan(self, view_id: str, plan: ViewPlan) -> None:
+        """Keep ``plan`` for ``view_id``."""
+        if self.max_entries > 0:
+            self._put(self._plans, view_id, plan, self.max_entries)
+
+    def page(self, view_id: str) -> Optional[bytes]:
+        """The first page of ``view_id`` if cached under the current marker."""
+        entry = self._pages.get(view_id)
+        if entry is None or entry[0] != self.marker:
+            self.misses += 1
+            return None
+        self._pages.move_to_end(view_id)
+        self.hits += 1
+        return entry[1]
+
+    def store_page(self, view_id: str, marker: int, body: bytes) -> None:
+        """Keep a first page read under ``marker``, unless a write came since."""
+        if self.max_entries > 0 and marker == self.marker:
+            self._put(self._pages, view_id, (marker, body), self.max_entries)
+
+    def forget(self, view_id: str) -> None:
+        """Drop the plan and page of a deleted view."""
+        self._plans.pop(view_id, None)
+        self._pages.pop(view_id, None)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        self._plans.clear()
+        self._pages.clear()
+
+
+view_cache = ViewCache(max_entries=settings.view_cache_entries)
+
+
+def note_task_writes(session: Session) -> None:
+    """Remember that the session wrote tasks; called from ``after_flush``."""
+    if any(
+        isinstance(instance, Task)
+        for instance in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info[_WROTE_TASKS] = True
+
+
+def bump_after_commit(session: Session) -> None:
+    """Bump the change marker once task writes are committed."""
+    if session.info.pop(_WROTE_TASKS, False):
+        view_cache.bump()
+
+
+def forget_task_writes(session: Session) -> None:
+    """Forget task writes that were rolled back."""
+    session.info.pop(_WROTE_TASKS, None)
+
+
+def _require_database() -> None:
+    if memory_store is not None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Saved views are not supported by the memory storage engine",
+        )
+
+
+async def _get_view(db: AsyncSession, view_id: UUID) -> SavedView:
+    view = await db.get(SavedView, str(view_id))
+    if view is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="View not found",
+        )
+    return view
+
+
+@router.post(
+    "",
+    response_model=ViewSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Save view",
+    description="Store a named set of task list filters",
+    responses={
+        501: {"model": ErrorResponse, "description": "Memory storage engine"},
+    },
+)
+async def create_view(
+    view_data: ViewCreate, db: AsyncSession = Depends(get_db)
+) -> ViewSchema:
+    """Save a view."""
+    _require_database()
+    view = SavedView(
+        name=view_data.name, filters=view_data.filters.model_dump(mode="json")
+    )
+    db.add(view)
+    await db.commit()
+    return ViewSchema.model_validate(view)
+
+
+@router.get(
+    "",
+    response_model=ViewList,
+    summary="List views",
+    description="Saved views, by name",
+)
+async def list_views(db: AsyncSession = Depends(get_db)) -> ViewList:
+    """List the saved views."""
+    _require_database()
+    views = await db.execute(select(SavedView).order_by(SavedView.name))
+    return ViewList(views=[ViewSchema.model_validate(view) for view in views.scalars()])
+
+
+@router.get(
+    "/{view_id}",
+    response_model=ViewSchema,
+    summary="Get view",
+    responses={404: {"model": ErrorResponse, "description": "View not found"}},
+)
+async def get_view(view_id: UUID, db: AsyncSession = Depends(get_db)) -> ViewSchema:
+    """Get a saved view."""
+    _require_database()
+    return ViewSchema.model_validate(await _get_view(db, view_id))
+
+
+@router.delete(
+    "/{view_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete view",
+    responses={404: {"model": ErrorResponse, "description": "View not found"}},
+)
+async def delete_view(view_id: UUID, db: AsyncSession = Depends(get_db)) -> Response:
+    """Delete a saved view."""
+    _require_database()
+    view = await _get_view(db, view_id)
+    await db.delete(view)
+    await db.commit()
+    view_cache.forget(view.id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/{view_id}/tasks",
+    response_model=TaskList,
+    summary="Open view",
+    description=(
+        "The first page of tasks matching a saved view, served from cache "
+        "until a task is written"
+    ),
+    responses={404: {"model": ErrorResponse, "description": "View not found"}},
+)
+async def view_tasks(view_id: UUID, db: AsyncSession = Depends(get_db)) -> Response:
+    """List the first page of a saved view."""
+    _require_database()
+    key = str(view_id)
+    body = view_cache.page(key)
+    if body is not None:
+        return Response(body, media_type="application/json")
+
+    # Read before querying: a write landing meanwhile leaves the page unkept
+    marker = view_cache.marker
+    plan = view_cache.plan(key)
+    if plan is None:
+        view = await _get_view(db, view_id)
+        plan = ViewPlan.build(ViewFilters.model_validate(view.filters))
+        view_cache.store_plan(key, plan)
+
+    if shard_router is not None:
+        task_list = await shard_router.gather(
+            plan.statement,
+            plan.limit,
+            plan.sort_column,
+            descending=plan.descending,
+            shard_ids=(
+                [shard_router.shard_for(plan.workspace)] if plan.workspace else None
+            ),
+        )
+    else:
+        task_list = (await db.execute(plan.statement)).scalars().all()
+
+    response = ModelJSONResponse(
+        TaskList.model_construct(
+            tasks=TASK_LIST_ADAPTER.validate_python(task_list, from_attributes=True),
+            pagination=pagination(len(task_list), plan.limit),
+        )
+    )
+    view_cache.store_page(key, marker, response.body)
+    return response
@@ -6,18 +6,16 @@ from typing import AsyncGenerator, Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from sqlalchemy import text
-
 from tick_task.config import settings
 from tick_task.database import get_db
-from tick_task.models import Base
 from tick_task.main import app
-from tick_task.models import Task
+from tick_task.models import Base, Task
+from tick_task.tags import tag_index
 
 
 @pytest.fixture(scope="session")
@@ -28,6 +26,14 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_tag_index() -> Generator[None, None, None]:
+    """Start every test with an unloaded tag index."""
+    tag_index.reset()
+    yield
+    tag_index.reset()
+
+
 @pytest.fixture(scope="session")
 async def test_engine():
     """Create test database engine with in-memory SQLite."""
@@ -61,7 +67,16 @@ async def db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
 
     async with async_session() as session:
         # Clear any existing data
+        await session.execute(text("DELETE FROM task_dependencies"))
+        await session.execute(text("DELETE FROM task_closure"))
+        await session.execute(text("DELETE FROM task_events"))
+        await session.execute(text("DELETE FROM task_snapshots"))
+        await session.execute(text("DELETE FROM title_buckets"))
+        await session.execute(text("DELETE FROM saved_views"))
         await session.execute(text("DELETE FROM tasks"))
+        await session.execute(text("DELETE FROM tags"))
+        await session.execute(text("DELETE FROM analytics_transitions"))
+        await session.execute(text("DELETE FROM analytics_status"))
 
         yield session
 
@@ -0,0 +1,191 @@
+"""Tests for administrative endpoints."""
+
+import sqlite3
+
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine
+
+from tick_task import admin, backup, storage_stats
+from tick_task.backup import BackupManager
+from tick_task.config import Settings
+from tick_task.storage_stats import (
+    ConnectionTracker,
+    StorageStatistics,
+    _db_status_function,
+)
+
+
+class TestPoolStatisticsEndpoint:
+    """Test cases for the connection pool statistics endpoint."""
+
+    def test_pool_statistics(self, client):
+        """Test that read and write pool statistics are reported."""
+        response = client.get("/api/v1/admin/pools")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        assert set(data) == {"read", "write"}
+        for pool in data.values():
+            assert "pool_class" in pool
+            assert "checkedout" in pool
+
+
+class TestBackupEndpoints:
+    """Test cases for the backup endpoints."""
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        """Backup manager writing into a temporary directory."""
+        source = tmp_path / "tick-task.db"
+        connection = sqlite3.connect(source)
+        connection.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY)")
+        connection.close()
+
+        manager = BackupManager(tmp_path / "backups", keep=2, step_sleep=0)
+        monkeypatch.setattr(admin, "backup_manager", manager)
+        monkeypatch.setattr(backup, "database_files", lambda: {"tick-task.db": source})
+        return manager
+
+    def test_create_backup(self, client, manager):
+        """Test that a backup is taken and reported."""
+        response = client.post("/api/v1/admin/backups")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()
+        assert data["files"][0]["name"] == "tick-task.db"
+        assert data["bytes"] > 0
+        assert data["throughput_bytes_per_second"] > 0
+
+    def test_backup_status(self, client, manager):
+        """Test that retained snapshots and the last run are listed."""
+        created = client.post("/api/v1/admin/backups").json()
+
+        response = client.get("/api/v1/admin/backups")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["snapshots"] == [created["snapshot"]]
+        assert data["last_backup"]["snapshot"] == created["snapshot"]
+        assert data["running"] is False
+
+    def test_backup_conflict(self, client, manager, monkeypatch):
+        """Test that a backup that cannot run returns 409."""
+        monkeypatch.setattr(backup, "database_files", lambda: {})
+
+        response = client.post("/api/v1/admin/backups")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+
+class TestStorageStatisticsEndpoint:
+    """Test cases for the storage statistics endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_statistics(self, monkeypatch):
+        """Statistics collector without a cached dbstat scan."""
+        monkeypatch.setattr(admin, "storage_statistics", StorageStatistics())
+
+    def test_storage_statistics(self, client):
+        """Test that sizes, objects and row counts are reported."""
+        client.post("/api/v1/tasks", json={"title": "Open task"})
+        client.post("/api/v1/tasks", json={"title": "Done task", "status": "done"})
+
+        response = client.get("/api/v1/admin/storage")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["database_bytes"] == data["page_size"] * data["page_count"]
+        assert data["freelist_pages"] >= 0
+        assert data["rows_by_status"] == {"todo": 1, "done": 1}
+        objects = {item["name"]: item for item in data["objects"]}
+        assert objects["tasks"]["type"] == "table"
+        assert objects["tasks"]["pages"] >= 1
+        assert any(
+            item["type"] == "index" and item["table"] == "tasks"
+            for item in objects.values()
+        )
+
+    def test_object_sizes_are_cached(self, client):
+        """Test that the dbstat scan is reused between polls."""
+        first = client.get("/api/v1/admin/storage").json()
+        second = client.get("/api/v1/admin/storage").json()
+
+        assert second["objects_collected_at"] == first["objects_collected_at"]
+
+    def test_analyze(self, client):
+        """Test that ANALYZE runs and its time is reported afterwards."""
+        assert client.get("/api/v1/admin/storage").json()["last_analyze_at"] is None
+
+        response = client.post("/api/v1/admin/storage/analyze")
+
+        assert response.status_code == status.HTTP_200_OK
+        ran_at = response.json()["ran_at"]
+        data = client.get("/api/v1/admin/storage").json()
+        assert data["last_analyze_at"] == ran_at
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    """Tracker following an engine that has run a few statements."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    tracker = ConnectionTracker()
+    tracker.track(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE TABLE items (value TEXT)")
+        connection.exec_driver_sql("INSERT INTO items VALUES ('a')")
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT * FROM items").all()
+    yield tracker
+    engine.dispose()
+
+
+class TestConnectionTracker:
+    """Test cases for page cache counters of pooled connections."""
+
+    @pytest.fixture(autouse=True)
+    def cache_counters(self, monkeypatch):
+        """Turn the opt-in page cache counters on."""
+        monkeypatch.setattr(
+            storage_stats.settings, "storage_stats_cache_counters", True
+        )
+
+    def test_cache_status(self, tracker):
+        """Test that hits and misses are summed over tracked connections."""
+        cache = tracker.cache_status()
+
+        if not storage_stats.cache_counters_enabled() or _db_status_function() is None:
+            pytest.skip("sqlite3_db_status is not reachable here")
+        assert cache["connections"] == 1
+        assert cache["hits"] > 0
+        assert cache["used_bytes"] > 0
+        assert 0 <= cache["hit_ratio"] <= 1
+
+    def test_closed_connections_are_forgotten(self, tmp_path):
+        """Test that disposed connections no longer contribute."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+        tracker = ConnectionTracker()
+        tracker.track(engine)
+        with engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1").all()
+
+        engine.dispose()
+
+        assert tracker.cache_status() is None
+
+    def test_off_by_default(self, tracker, monkeypatch):
+        """Test that the counters are not read unless asked for."""
+        assert Settings().storage_stats_cache_counters is False
+        monkeypatch.setattr(
+            storage_stats.settings, "storage_stats_cache_counters", False
+        )
+
+        assert tracker.cache_status() is None
+
+    def test_unverified_python_version(self, tracker, monkeypatch):
+        """Test that other CPython releases do not read the connection layout."""
+        monkeypatch.setattr(storage_stats, "CACHE_COUNTER_VERSIONS", ((2, 0), (2, 7)))
+        monkeypatch.setattr(storage_stats, "_sqlite_handle", pytest.fail)
+
+        assert tracker.cache_status() is None
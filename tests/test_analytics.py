@@ -0,0 +1,325 @@
+"""Tests for analytics rollups and the analytics endpoints."""
+
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import httpx
+import pytest
+import sqlalchemy as sa
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from tick_task import analytics
+from tick_task.data_migrations import DataMigration
+from tick_task.database import ShardRouter, get_db
+from tick_task.main import app
+from tick_task.memory_store import MemoryStore
+from tick_task.models import Base, StatusRollup, Task, TransitionRollup
+from tick_task.rollups import activity, backfill_tasks, status_counts
+
+DAY = datetime(2026, 3, 2, 9, 0)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File database with the application schema."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'analytics.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def rollup_rows(engine, model) -> list:
+    with engine.connect() as connection:
+        table = model.__table__
+        return [
+            tuple(row)
+            for row in connection.execute(
+                sa.select(table).where(table.c.tasks != 0).order_by(*table.primary_key)
+            )
+        ]
+
+
+class TestRollupMaintenance:
+    """Test cases for rollups written alongside task changes."""
+
+    def test_creation(self, engine):
+        """Test that a new task is counted as created and in its status."""
+        with Session(engine) as session:
+            session.add(Task(title="A", created_at=DAY, updated_at=DAY, workspace="w"))
+            session.commit()
+
+        assert rollup_rows(engine, TransitionRollup) == [
+            ("2026-03-02", "personal", "w", "", "todo", 1, 0.0)
+        ]
+        assert rollup_rows(engine, StatusRollup) == [("personal", "w", "todo", "", 1)]
+
+    def test_status_changes_and_cycle_time(self, engine):
+        """Test that transitions land on the day of the change, with cycle time."""
+        with Session(engine) as session:
+            task = Task(title="A", created_at=DAY, updated_at=DAY)
+            session.add(task)
+            session.commit()
+            later = DAY + timedelta(days=1, hours=3)
+            task.status = "done"
+            task.completed_at = later
+            task.updated_at = later
+            session.commit()
+
+        assert rollup_rows(engine, TransitionRollup) == [
+            ("2026-03-02", "personal", "", "", "todo", 1, 0.0),
+            ("2026-03-03", "personal", "", "todo", "done", 1, 27 * 3600.0),
+        ]
+        assert rollup_rows(engine, StatusRollup) == [("personal", "", "done", "", 1)]
+
+    def test_non_status_changes_move_counts(self, engine):
+        """Test that context and due date changes move the current counts."""
+        with Session(engine) as session:
+            task = Task(title="A", created_at=DAY, updated_at=DAY)
+            session.add(task)
+            session.commit()
+            task.context = "professional"
+            task.due_at = DAY
+            task.title = "B"
+            session.commit()
+
+        assert rollup_rows(engine, StatusRollup) == [
+            ("professional", "", "todo", "2026-03-02", 1)
+        ]
+        assert len(rollup_rows(engine, TransitionRollup)) == 1
+
+    def test_delete(self, engine):
+        """Test that deleting a task removes it from the current counts."""
+        with Session(engine) as session:
+            task = Task(title="A")
+            session.add(task)
+            session.commit()
+            session.delete(task)
+            session.commit()
+
+        assert rollup_rows(engine, StatusRollup) == []
+
+    def test_rolled_back_changes_are_not_counted(self, engine):
+        """Test that rollups share the transaction of the task write."""
+        with Session(engine) as session:
+            session.add(Task(title="A"))
+            session.flush()
+            session.rollback()
+
+        assert rollup_rows(engine, StatusRollup) == []
+        assert rollup_rows(engine, TransitionRollup) == []
+
+    def test_queries(self, engine):
+        """Test the activity and status queries over the rollups."""
+        with Session(engine) as session:
+            session.add_all(
+                [
+                    Task(title="A", created_at=DAY, updated_at=DAY, due_at=DAY),
+                    Task(title="B", created_at=DAY, updated_at=DAY, status="doing"),
+                    Task(
+                        title="C",
+                        created_at=DAY - timedelta(hours=2),
+                        updated_at=DAY,
+                        completed_at=DAY,
+                        status="done",
+                        context="professional",
+                    ),
+                ]
+            )
+            session.commit()
+
+        with engine.connect() as connection:
+            days = activity(connection, date(2026, 3, 1), date(2026, 3, 3))
+            work = activity(
+                connection, date(2026, 3, 2), date(2026, 3, 2), "professional"
+            )
+            by_status, overdue = status_counts(connection, date(2026, 3, 3))
+
+        assert days == {"2026-03-02": [3, 1, 7200.0]}
+        assert work == {"2026-03-02": [1, 1, 7200.0]}
+        assert by_status == {
+            ("personal", "todo"): 1,
+            ("personal", "doing"): 1,
+            ("professional", "done"): 1,
+        }
+        assert overdue == {"personal": 1}
+
+    def test_backfill(self, engine):
+        """Test that existing tasks are added with a reconstructed history."""
+        with engine.begin() as connection:
+            connection.execute(
+                Task.__table__.insert(),
+                [
+                    {
+                        "id": str(uuid4()),
+                        "title": "A",
+                        "status": "done",
+                        "priority": "low",
+                        "context": "personal",
+                        "tag_ids": [],
+                        "created_at": DAY,
+                        "updated_at": DAY + timedelta(days=2),
+                        "completed_at": DAY + timedelta(days=1),
+                    },
+                    {
+                        "id": str(uuid4()),
+                        "title": "B",
+                        "status": "doing",
+                        "priority": "low",
+                        "context": "personal",
+                        "tag_ids": [],
+                        "created_at": DAY,
+                        "updated_at": DAY + timedelta(days=2),
+                        "completed_at": None,
+                    },
+                ],
+            )
+        DataMigration(
+            "rollups", Task.__table__, Task.__table__.c.id, backfill_tasks, duty_cycle=1
+        ).run(engine)
+
+        assert rollup_rows(engine, TransitionRollup) == [
+            ("2026-03-02", "personal", "", "", "todo", 2, 0.0),
+            ("2026-03-03", "personal", "", "todo", "done", 1, 86400.0),
+            ("2026-03-04", "personal", "", "todo", "doing", 1, 0.0),
+        ]
+        assert rollup_rows(engine, StatusRollup) == [
+            ("personal", "", "doing", "", 1),
+            ("personal", "", "done", "", 1),
+        ]
+
+
+class TestAnalyticsApi:
+    """Test cases for the analytics endpoints."""
+
+    def test_activity(self, client):
+        """Test daily throughput after creating and completing tasks."""
+        task = client.post("/api/v1/tasks", json={"title": "A"}).json()
+        client.post("/api/v1/tasks", json={"title": "B", "context": "professional"})
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+
+        response = client.get("/api/v1/analytics/activity")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        today = datetime.utcnow().date()
+        assert data["until"] == today.isoformat()
+        assert len(data["days"]) == 30
+        assert data["days"][-1]["created"] == 2
+        assert data["days"][-1]["completed"] == 1
+        assert data["created"] == 2
+        assert data["cycle_time_hours"] >= 0
+        personal = client.get(
+            "/api/v1/analytics/activity", params={"context": "professional"}
+        ).json()
+        assert (personal["created"], personal["completed"]) == (1, 0)
+        assert personal["cycle_time_hours"] is None
+
+    def test_activity_invalid_range(self, client):
+        """Test that an inverted or oversized range is rejected."""
+        inverted = client.get(
+            "/api/v1/analytics/activity",
+            params={"since": "2026-03-02", "until": "2026-03-01"},
+        )
+        too_long = client.get(
+            "/api/v1/analytics/activity",
+            params={"since": "2020-01-01", "until": "2026-03-01"},
+        )
+
+        assert inverted.status_code == status.HTTP_400_BAD_REQUEST
+        assert too_long.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_status(self, client):
+        """Test WIP and overdue counts per context."""
+        client.post("/api/v1/tasks", json={"title": "A", "status": "doing"})
+        client.post(
+            "/api/v1/tasks", json={"title": "B", "due_at": "2020-01-01T00:00:00"}
+        )
+        client.post(
+            "/api/v1/tasks",
+            json={"title": "C", "status": "done", "due_at": "2020-01-01T00:00:00"},
+        )
+
+        response = client.get("/api/v1/analytics/status")
+
+        assert response.status_code == status.HTTP_200_OK
+        contexts = {entry["context"]: entry for entry in response.json()["contexts"]}
+        assert contexts["personal"] == {
+            "context": "personal",
+            "statuses": {"doing": 1, "done": 1, "todo": 1},
+            "wip": 1,
+            "overdue": 1,
+        }
+        assert contexts["mixed"]["statuses"] == {}
+
+    @pytest.fixture
+    async def sharded_client(self, tmp_path):
+        """Test client whose sessions route through a shard router."""
+        router = ShardRouter(tmp_path / "shards")
+
+        async def override_get_db():
+            async with router.session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        with TestClient(app) as test_client:
+            yield test_client
+        app.dependency_overrides.clear()
+        await router.dispose()
+
+    def test_moves_between_shards_are_not_creations(self, sharded_client):
+        """Test that relocating a task keeps activity and moves its count."""
+        task = sharded_client.post(
+            "/api/v1/tasks", json={"title": "A", "workspace": "work"}
+        ).json()
+        sharded_client.put(
+            f"/api/v1/tasks/{task['id']}", json={"workspace": "home", "status": "doing"}
+        )
+
+        activity_report = sharded_client.get("/api/v1/analytics/activity").json()
+        home = sharded_client.get(
+            "/api/v1/analytics/status", params={"workspace": "home"}
+        ).json()
+        work = sharded_client.get(
+            "/api/v1/analytics/status", params={"workspace": "work"}
+        ).json()
+
+        assert (activity_report["created"], activity_report["completed"]) == (1, 0)
+        assert home["contexts"][0]["statuses"] == {"doing": 1}
+        assert home["contexts"][0]["wip"] == 1
+        assert work["contexts"][0]["statuses"] == {}
+
+
+class TestMemoryAnalytics:
+    """Test cases for the analytics endpoints with the memory store."""
+
+    async def test_activity_and_status(self, tmp_path, monkeypatch):
+        """Test that figures are computed from the tasks in memory."""
+        store = MemoryStore(tmp_path / "memory", fsync_interval=0, snapshot_interval=0)
+        await store.open()
+        monkeypatch.setattr(analytics, "memory_store", store)
+        now = datetime.utcnow()
+        await store.save(Task(title="A", status="doing"))
+        await store.save(
+            Task(
+                title="B",
+                status="done",
+                created_at=now - timedelta(hours=4),
+                completed_at=now,
+            )
+        )
+        await store.save(Task(title="C", due_at=now - timedelta(days=3)))
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            activity_report = (await c.get("/api/v1/analytics/activity")).json()
+            status_report = (await c.get("/api/v1/analytics/status")).json()
+        await store.close()
+
+        assert activity_report["created"] == 3
+        assert activity_report["completed"] == 1
+        assert activity_report["cycle_time_hours"] == pytest.approx(4.0)
+        personal = status_report["contexts"][0]
+        assert personal["statuses"] == {"doing": 1, "done": 1, "todo": 1}
+        assert (personal["wip"], personal["overdue"]) == (1, 1)
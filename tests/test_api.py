@@ -1,10 +1,15 @@
 """Tests for API endpoints."""
 
+import json
 from datetime import datetime
 
 import pytest
 from fastapi import status
+from fastapi.testclient import TestClient
 
+from tick_task import api
+from tick_task.database import ShardRouter, get_db
+from tick_task.main import app
 from tick_task.schemas import TaskCreate, TaskUpdate
 
 
@@ -124,6 +129,49 @@ class TestCreateTaskEndpoint:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestCreateTasksBatchEndpoint:
+    """Test cases for POST /api/v1/tasks/batch endpoint."""
+
+    def test_create_tasks_batch(self, client):
+        """Test that every task in the batch is created, in order."""
+        batch = [
+            {"title": "First", "tags": [" Home "]},
+            {"title": "Second", "status": "done", "priority": "high"},
+        ]
+
+        response = client.post("/api/v1/tasks/batch", json=batch)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        tasks = response.json()["tasks"]
+        assert [task["title"] for task in tasks] == ["First", "Second"]
+        assert tasks[0]["tags"] == ["home"]
+        assert tasks[1]["completed_at"] is not None
+        assert tasks[0]["created_at"] is not None
+
+        listed = client.get("/api/v1/tasks").json()["tasks"]
+        assert {task["id"] for task in listed} == {task["id"] for task in tasks}
+
+    def test_create_tasks_batch_validation_error(self, client):
+        """Test that one invalid task rejects the whole batch."""
+        batch = [{"title": "Valid"}, {"title": "Invalid", "status": "invalid"}]
+
+        response = client.post("/api/v1/tasks/batch", json=batch)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"][0]["loc"] == ["body", 1, "status"]
+        assert client.get("/api/v1/tasks").json()["tasks"] == []
+
+    def test_create_tasks_batch_rejects_malformed_json(self, client):
+        """Test that a body that is not a JSON array is rejected."""
+        response = client.post(
+            "/api/v1/tasks/batch",
+            content=b"not json",
+            headers={"Content-Type": "application/json"},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 class TestGetTaskEndpoint:
     """Test cases for get task endpoint."""
 
@@ -352,6 +400,29 @@ class TestListTasksEndpoint:
         assert "medium" in priorities
         assert "high" in priorities
 
+    def test_list_tasks_filter_by_tags(self, client):
+        """Test that tasks carrying any of the listed tags are returned."""
+        for title, tags in (("A", ["work"]), ("B", ["home", "urgent"]), ("C", [])):
+            client.post("/api/v1/tasks", json={"title": title, "tags": tags})
+
+        def titles(tags: str) -> list[str]:
+            response = client.get("/api/v1/tasks", params={"tags": tags})
+            assert response.status_code == status.HTTP_200_OK
+            return sorted(task["title"] for task in response.json()["tasks"])
+
+        assert titles("work") == ["A"]
+        assert titles(" Work , urgent") == ["A", "B"]
+        assert titles("missing") == []
+
+    def test_list_tasks_filter_by_merged_tag(self, client):
+        """Test that a merged tag matches under the name it was merged into."""
+        client.post("/api/v1/tasks", json={"title": "A", "tags": ["job"]})
+        client.post("/api/v1/tags/rename", json={"name": "job", "new_name": "work"})
+
+        response = client.get("/api/v1/tasks", params={"tags": "work"})
+
+        assert [task["title"] for task in response.json()["tasks"]] == ["A"]
+
     def test_list_tasks_pagination(self, client):
         """Test task list pagination."""
         # Create multiple tasks
@@ -397,3 +468,221 @@ class TestListTasksEndpoint:
         data = response.json()
 
         assert len(data["tasks"]) == 0
+
+
+class TestListTasksStreaming:
+    """Test cases for NDJSON streaming of task lists."""
+
+    NDJSON_HEADERS = {"Accept": "application/x-ndjson"}
+
+    def test_stream_tasks_one_per_line(self, client):
+        """Test that tasks are streamed one JSON object per line."""
+        for i in range(3):
+            client.post("/api/v1/tasks", json={"title": f"Task {i}"})
+
+        response = client.get("/api/v1/tasks", headers=self.NDJSON_HEADERS)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert len(lines) == 4
+        assert {line["title"] for line in lines[:3]} == {"Task 0", "Task 1", "Task 2"}
+        assert lines[-1] == {
+            "pagination": {"has_more": False, "next_cursor": None, "total_count": 3}
+        }
+
+    def test_stream_matches_json_page(self, client, sample_task):
+        """Test that streamed tasks match the regular JSON representation."""
+        page = client.get("/api/v1/tasks").json()
+
+        response = client.get("/api/v1/tasks", headers=self.NDJSON_HEADERS)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert lines[:-1] == page["tasks"]
+        assert lines[-1]["pagination"] == page["pagination"]
+
+    def test_stream_respects_filters_and_limit(self, client):
+        """Test that filters and limit apply to streamed pages."""
+        for i in range(4):
+            client.post("/api/v1/tasks", json={"title": f"Task {i}", "status": "doing"})
+        client.post("/api/v1/tasks", json={"title": "Other", "status": "todo"})
+
+        response = client.get(
+            "/api/v1/tasks?status=doing&limit=2", headers=self.NDJSON_HEADERS
+        )
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert [line["status"] for line in lines[:-1]] == ["doing", "doing"]
+        assert lines[-1]["pagination"]["has_more"] is True
+
+
+class TestShardedEndpoints:
+    """Test cases for the API with workspace sharding enabled."""
+
+    @pytest.fixture
+    async def sharded_client(self, tmp_path, monkeypatch):
+        """Test client whose sessions route through a shard router."""
+        router = ShardRouter(tmp_path / "shards")
+        monkeypatch.setattr(api, "shard_router", router)
+
+        async def override_get_db():
+            async with router.session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        with TestClient(app) as test_client:
+            yield test_client
+        app.dependency_overrides.clear()
+        await router.dispose()
+
+    def test_list_merges_workspaces(self, sharded_client):
+        """Test that listing across workspaces merges shards by sort key."""
+        for i, workspace in enumerate(["work", "home", None, "work"]):
+            sharded_client.post(
+                "/api/v1/tasks", json={"title": f"Task {i}", "workspace": workspace}
+            )
+
+        response = sharded_client.get(
+            "/api/v1/tasks", params={"sort": "title", "order": "asc", "limit": 3}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [task["title"] for task in data["tasks"]] == [
+            "Task 0",
+            "Task 1",
+            "Task 2",
+        ]
+        assert data["pagination"]["has_more"] is True
+
+    def test_list_single_workspace(self, sharded_client):
+        """Test that the workspace filter reads only that workspace."""
+        sharded_client.post("/api/v1/tasks", json={"title": "A", "workspace": "work"})
+        sharded_client.post("/api/v1/tasks", json={"title": "B", "workspace": "home"})
+
+        response = sharded_client.get("/api/v1/tasks", params={"workspace": "work"})
+
+        assert [task["title"] for task in response.json()["tasks"]] == ["A"]
+
+    def test_update_moves_task_between_workspaces(self, sharded_client):
+        """Test that changing the workspace keeps the task reachable by id."""
+        task = sharded_client.post(
+            "/api/v1/tasks", json={"title": "A", "workspace": "work"}
+        ).json()
+
+        response = sharded_client.put(
+            f"/api/v1/tasks/{task['id']}", json={"workspace": "home"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["workspace"] == "home"
+        fetched = sharded_client.get(f"/api/v1/tasks/{task['id']}").json()
+        assert fetched["workspace"] == "home"
+        work = sharded_client.get("/api/v1/tasks", params={"workspace": "work"})
+        assert work.json()["tasks"] == []
+
+    def test_rename_tag_across_workspaces(self, sharded_client):
+        """Test that tags are listed and renamed in every shard's vocabulary."""
+        for workspace in ["work", "home", "work"]:
+            sharded_client.post(
+                "/api/v1/tasks",
+                json={"title": "A", "tags": ["wrk"], "workspace": workspace},
+            )
+
+        response = sharded_client.post(
+            "/api/v1/tags/rename", json={"name": "wrk", "new_name": "work"}
+        )
+
+        assert response.json() == {"name": "work", "usage_count": 3}
+        listed = sharded_client.get("/api/v1/tags").json()
+        assert listed["tags"] == [{"name": "work", "usage_count": 3}]
+        tasks = sharded_client.get("/api/v1/tasks").json()["tasks"]
+        assert {tuple(task["tags"]) for task in tasks} == {("work",)}
+
+
+class TestTagEndpoints:
+    """Test cases for the tag vocabulary endpoints."""
+
+    def test_list_tags(self, client):
+        """Test that tags are listed with usage counts, most used first."""
+        client.post("/api/v1/tasks", json={"title": "A", "tags": ["b", "a"]})
+        client.post("/api/v1/tasks", json={"title": "B", "tags": ["B"]})
+
+        response = client.get("/api/v1/tags")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tags"] == [
+            {"name": "b", "usage_count": 2},
+            {"name": "a", "usage_count": 1},
+        ]
+        limited = client.get("/api/v1/tags", params={"limit": 1}).json()
+        assert [tag["name"] for tag in limited["tags"]] == ["b"]
+
+    def test_rename_tag(self, client):
+        """Test that a renamed tag is returned with its new name."""
+        task = client.post("/api/v1/tasks", json={"title": "A", "tags": ["wrk"]}).json()
+
+        response = client.post(
+            "/api/v1/tags/rename", json={"name": "wrk", "new_name": "Work"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"name": "work", "usage_count": 1}
+        fetched = client.get(f"/api/v1/tasks/{task['id']}").json()
+        assert fetched["tags"] == ["work"]
+
+    def test_rename_tag_merges(self, client):
+        """Test that renaming onto an existing tag merges the two."""
+        client.post("/api/v1/tasks", json={"title": "A", "tags": ["job"]})
+        client.post("/api/v1/tasks", json={"title": "B", "tags": ["work", "job"]})
+
+        response = client.post(
+            "/api/v1/tags/rename", json={"name": "job", "new_name": "work"}
+        )
+
+        assert response.json() == {"name": "work", "usage_count": 2}
+        listed = client.get("/api/v1/tags").json()["tags"]
+        assert listed == [{"name": "work", "usage_count": 2}]
+
+    def test_autocomplete_by_prefix(self, client):
+        """Test that prefix lookups follow creates, updates and batches."""
+        client.post("/api/v1/tasks", json={"title": "A", "tags": ["work"]})
+        assert client.get("/api/v1/tags", params={"prefix": "wo"}).json() == {
+            "tags": [{"name": "work", "usage_count": 1}]
+        }
+
+        task = client.post(
+            "/api/v1/tasks", json={"title": "B", "tags": ["workout"]}
+        ).json()
+        client.post(
+            "/api/v1/tasks/batch",
+            json=[{"title": "C", "tags": ["world"]}, {"title": "D", "tags": ["work"]}],
+        )
+        client.put(f"/api/v1/tasks/{task['id']}", json={"tags": ["home"]})
+
+        response = client.get("/api/v1/tags", params={"prefix": " WO", "limit": 10})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tags"] == [
+            {"name": "work", "usage_count": 2},
+            {"name": "world", "usage_count": 1},
+        ]
+
+    def test_autocomplete_after_rename(self, client):
+        """Test that the index follows renames."""
+        client.post("/api/v1/tasks", json={"title": "A", "tags": ["wrk"]})
+        client.get("/api/v1/tags", params={"prefix": "w"})
+
+        client.post("/api/v1/tags/rename", json={"name": "wrk", "new_name": "work"})
+
+        response = client.get("/api/v1/tags", params={"prefix": "w"})
+        assert response.json()["tags"] == [{"name": "work", "usage_count": 1}]
+
+    def test_rename_missing_tag(self, client):
+        """Test that renaming an unknown tag returns 404."""
+        response = client.post(
+            "/api/v1/tags/rename", json={"name": "nope", "new_name": "work"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,165 @@
+"""Tests for online database backups."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from tick_task import backup
+from tick_task.backup import (
+    BackupError,
+    BackupManager,
+    apply_retention,
+    backup_file,
+    create_snapshot,
+    list_snapshots,
+    verify_file,
+)
+from tick_task.config import Settings
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    """A WAL-mode database file with a few thousand rows."""
+    path = tmp_path / "tick-task.db"
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT)")
+    connection.executemany(
+        "INSERT INTO tasks (title) VALUES (?)",
+        [(f"Task {i}" * 20,) for i in range(5000)],
+    )
+    connection.commit()
+    connection.close()
+    return path
+
+
+def count_rows(path) -> int:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    finally:
+        connection.close()
+
+
+class TestBackupFile:
+    """Test cases for copying a single database file."""
+
+    def test_copy_in_steps(self, source_db, tmp_path):
+        """Test that a stepped backup produces a complete copy."""
+        destination = tmp_path / "copy.db"
+
+        result = backup_file(source_db, destination, pages_per_step=8, step_sleep=0)
+
+        assert count_rows(destination) == 5000
+        assert result.pages > 8
+        assert result.bytes == destination.stat().st_size
+        verify_file(destination)
+
+    def test_writers_are_not_blocked(self, source_db, tmp_path):
+        """Test that writes succeed while a backup is in progress."""
+        writes = []
+
+        def write_during_backup() -> None:
+            connection = sqlite3.connect(source_db, timeout=0.5)
+            for i in range(10):
+                connection.execute(
+                    "INSERT INTO tasks (title) VALUES (?)", (f"New {i}",)
+                )
+                connection.commit()
+                writes.append(i)
+            connection.close()
+
+        writer = threading.Thread(target=write_during_backup)
+        writer.start()
+        backup_file(source_db, tmp_path / "copy.db", pages_per_step=4, step_sleep=0.001)
+        writer.join()
+
+        assert len(writes) == 10
+        assert count_rows(tmp_path / "copy.db") >= 5000
+        verify_file(tmp_path / "copy.db")
+
+    def test_verify_rejects_corrupt_file(self, tmp_path):
+        """Test that a damaged copy fails verification."""
+        path = tmp_path / "broken.db"
+        path.write_bytes(b"SQLite format 3\x00" + b"\xff" * 4096)
+
+        with pytest.raises((BackupError, sqlite3.DatabaseError)):
+            verify_file(path)
+
+
+class TestSnapshots:
+    """Test cases for snapshot creation and retention."""
+
+    def test_create_snapshot(self, source_db, tmp_path):
+        """Test that a snapshot is published with every file."""
+        directory = tmp_path / "backups"
+
+        result = create_snapshot({"tick-task.db": source_db}, directory)
+
+        assert list_snapshots(directory) == [result.snapshot]
+        assert count_rows(result.snapshot / "tick-task.db") == 5000
+        assert result.throughput_bytes_per_second > 0
+        assert not list(directory.glob("*.partial"))
+
+    def test_failed_snapshot_is_not_published(self, tmp_path):
+        """Test that a failing copy leaves no snapshot behind."""
+        directory = tmp_path / "backups"
+
+        with pytest.raises(sqlite3.OperationalError):
+            create_snapshot({"missing.db": tmp_path / "missing.db"}, directory)
+
+        assert list(directory.iterdir()) == []
+
+    def test_retention(self, tmp_path):
+        """Test that only the newest snapshots are kept."""
+        for name in ("20260101T000000Z", "20260102T000000Z", "20260103T000000Z"):
+            (tmp_path / name).mkdir()
+
+        expired = apply_retention(tmp_path, keep=2)
+
+        assert [path.name for path in expired] == ["20260101T000000Z"]
+        assert [path.name for path in list_snapshots(tmp_path)] == [
+            "20260102T000000Z",
+            "20260103T000000Z",
+        ]
+
+
+class TestBackupManager:
+    """Test cases for the backup manager."""
+
+    async def test_run_records_result(self, source_db, tmp_path):
+        """Test that a run is recorded as the last result."""
+        manager = BackupManager(tmp_path / "backups", keep=1, step_sleep=0)
+
+        await manager.run({"tick-task.db": source_db})
+        result = await manager.run({"tick-task.db": source_db})
+
+        assert manager.last_result is result
+        assert list_snapshots(tmp_path / "backups") == [result.snapshot]
+
+    async def test_memory_database_is_rejected(self, tmp_path, monkeypatch):
+        """Test that in-memory databases cannot be backed up."""
+        monkeypatch.setattr(
+            backup.settings, "database_url", "sqlite+aiosqlite:///:memory:"
+        )
+        manager = BackupManager(tmp_path / "backups")
+
+        with pytest.raises(BackupError):
+            await manager.run()
+
+    async def test_default_database_url(self, source_db, tmp_path, monkeypatch):
+        """Test that the default relative database URL finds the file."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            backup.settings,
+            "database_url",
+            Settings.model_fields["database_url"].default,
+        )
+        monkeypatch.setattr(backup.settings, "shard_mode", "off")
+        manager = BackupManager(tmp_path / "backups", step_sleep=0)
+
+        result = await manager.run()
+
+        assert list(backup.database_files()) == ["tick-task.db"]
+        assert count_rows(result.snapshot / "tick-task.db") == 5000
@@ -0,0 +1,123 @@
+"""Tests for compact storage column types."""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select, text
+from sqlalchemy.exc import StatementError
+
+from tick_task.column_types import EpochMicros, SmallIntEnum, UUIDBlob
+
+STATUSES = ("todo", "doing", "blocked", "done", "archived")
+
+
+@pytest.fixture
+def compact_table():
+    """Create an in-memory table using every compact column type."""
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    table = Table(
+        "compact",
+        metadata,
+        Column("id", UUIDBlob(), primary_key=True),
+        Column("at", EpochMicros(), nullable=True),
+        Column("status", SmallIntEnum(STATUSES), nullable=True),
+    )
+    metadata.create_all(engine)
+    yield engine, table
+    engine.dispose()
+
+
+class TestUUIDBlob:
+    """Test cases for UUIDBlob."""
+
+    def test_round_trip(self, compact_table):
+        """Test that UUID strings round-trip through 16-byte blobs."""
+        engine, table = compact_table
+        task_id = str(uuid4())
+
+        with engine.begin() as conn:
+            conn.execute(insert(table).values(id=task_id))
+            stored = conn.execute(text("SELECT id FROM compact")).scalar()
+            loaded = conn.execute(select(table.c.id)).scalar()
+
+        assert len(stored) == 16
+        assert loaded == task_id
+
+    def test_lookup_by_string(self, compact_table):
+        """Test that filtering by the string form matches the blob."""
+        engine, table = compact_table
+        task_id = str(uuid4())
+
+        with engine.begin() as conn:
+            conn.execute(insert(table).values(id=task_id))
+            found = conn.execute(
+                select(table.c.id).where(table.c.id == task_id)
+            ).scalar()
+
+        assert found == task_id
+
+
+class TestEpochMicros:
+    """Test cases for EpochMicros."""
+
+    def test_round_trip_naive(self, compact_table):
+        """Test that naive UTC datetimes keep microsecond precision."""
+        engine, table = compact_table
+        moment = datetime(2024, 12, 31, 23, 59, 59, 123456)
+
+        with engine.begin() as conn:
+            conn.execute(insert(table).values(id=uuid4(), at=moment))
+            stored = conn.execute(text("SELECT at FROM compact")).scalar()
+            loaded = conn.execute(select(table.c.at)).scalar()
+
+        assert stored == 1735689599123456
+        assert loaded == moment
+
+    def test_aware_datetime_converted_to_utc(self, compact_table):
+        """Test that aware datetimes are normalized to naive UTC."""
+        engine, table = compact_table
+        moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        with engine.begin() as conn:
+            conn.execute(insert(table).values(id=uuid4(), at=moment))
+            loaded = conn.execute(select(table.c.at)).scalar()
+
+        assert loaded == datetime(2024, 1, 1)
+
+    def test_range_comparison(self, compact_table):
+        """Test that comparisons bind datetimes as integers."""
+        engine, table = compact_table
+
+        with engine.begin() as conn:
+            conn.execute(insert(table).values(id=uuid4(), at=datetime(2024, 6, 1)))
+            count = conn.execute(
+                select(table.c.id).where(table.c.at < datetime(2025, 1, 1))
+            ).all()
+
+        assert len(count) == 1
+
+
+class TestSmallIntEnum:
+    """Test cases for SmallIntEnum."""
+
+    def test_round_trip(self, compact_table):
+        """Test that enum names are stored as ordinals."""
+        engine, table = compact_table
+
+        with engine.begin() as conn:
+            conn.execute(insert(table).values(id=uuid4(), status="done"))
+            stored = conn.execute(text("SELECT status FROM compact")).scalar()
+            loaded = conn.execute(select(table.c.status)).scalar()
+
+        assert stored == STATUSES.index("done")
+        assert loaded == "done"
+
+    def test_unknown_value_rejected(self, compact_table):
+        """Test that values outside the enum are rejected."""
+        engine, table = compact_table
+
+        with engine.begin() as conn:
+            with pytest.raises(StatementError):
+                conn.execute(insert(table).values(id=uuid4(), status="invalid"))
@@ -0,0 +1,192 @@
+"""Tests for response compression middleware."""
+
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from tick_task.compression import (
+    COMPRESSORS,
+    CompressedPayloadCache,
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+
+LARGE_BODY = "task " * 1000
+
+
+def make_app(minimum_size: int = 500) -> tuple[FastAPI, CompressedPayloadCache]:
+    """Build a small app wrapped in the compression middleware."""
+    app = FastAPI()
+    cache = CompressedPayloadCache(max_bytes=64 * 1024)
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size, cache=cache)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            iter([LARGE_BODY.encode(), LARGE_BODY.encode()]), media_type="text/plain"
+        )
+
+    return app, cache
+
+
+class TestNegotiateEncoding:
+    """Test cases for Accept-Encoding negotiation."""
+
+    def test_prefers_server_order_on_ties(self):
+        """Test that equal quality values fall back to server preference."""
+        assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+
+    def test_respects_client_quality(self):
+        """Test that client quality values take precedence."""
+        assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+
+    def test_excludes_zero_quality(self):
+        """Test that q=0 disables an encoding."""
+        assert negotiate_encoding("gzip;q=0", ["gzip"]) is None
+
+    def test_wildcard(self):
+        """Test that a wildcard accepts any available encoding."""
+        assert negotiate_encoding("*", ["gzip"]) == "gzip"
+
+    def test_identity_only(self):
+        """Test that no encoding is picked for identity-only clients."""
+        assert negotiate_encoding("identity", ["gzip"]) is None
+
+
+class TestCompressionMiddleware:
+    """Test cases for the compression middleware."""
+
+    def test_large_response_is_gzipped(self):
+        """Test that large responses are compressed."""
+        app, _ = make_app()
+        client = TestClient(app)
+
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.text == LARGE_BODY
+
+    def test_small_response_is_not_compressed(self):
+        """Test that responses below the threshold are sent as-is."""
+        app, _ = make_app()
+        client = TestClient(app)
+
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "ok"
+
+    def test_precompressed_content_type_is_skipped(self):
+        """Test that already-compressed media types are passed through."""
+        app, _ = make_app()
+        client = TestClient(app)
+
+        response = client.get("/image", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_response_is_not_buffered(self):
+        """Test that streaming responses are passed through uncompressed."""
+        app, _ = make_app()
+        client = TestClient(app)
+
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == LARGE_BODY * 2
+
+    def test_no_accept_encoding(self):
+        """Test that clients without Accept-Encoding get identity bodies."""
+        app, _ = make_app()
+        client = TestClient(app)
+
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_compressed_payload_is_reused(self):
+        """Test that repeated payloads hit the compressed payload cache."""
+        app, cache = make_app()
+        client = TestClient(app)
+
+        client.get("/large", headers={"Accept-Encoding": "gzip"})
+        client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert cache.misses == 1
+        assert cache.hits == 1
+        assert len(cache) == 1
+
+
+class TestCompressedPayloadCache:
+    """Test cases for the compressed payload cache."""
+
+    def test_round_trip(self):
+        """Test that cached payloads decompress to the original body."""
+        cache = CompressedPayloadCache()
+        body = LARGE_BODY.encode()
+
+        assert gzip.decompress(cache.get_or_compress(body, "gzip")) == body
+
+    def test_lru_eviction(self):
+        """Test that the cache is bounded by the total compressed size."""
+        bodies = [f"body {i}".encode() for i in range(3)]
+        entry_size = len(COMPRESSORS["gzip"](bodies[0]))
+        cache = CompressedPayloadCache(max_bytes=2 * entry_size)
+
+        for body in bodies:
+            cache.get_or_compress(body, "gzip")
+        cache.get_or_compress(bodies[0], "gzip")
+
+        assert len(cache) == 2
+        assert cache.size == 2 * entry_size
+        assert (cache.hits, cache.misses) == (0, 4)
+
+    def test_oversized_payload_not_cached(self):
+        """Test that a payload larger than the whole budget is not kept."""
+        cache = CompressedPayloadCache(max_bytes=16)
+        body = LARGE_BODY.encode()
+
+        assert gzip.decompress(cache.get_or_compress(body, "gzip")) == body
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_disabled_cache(self):
+        """Test that a zero-sized cache still compresses."""
+        cache = CompressedPayloadCache(max_bytes=0)
+
+        cache.get_or_compress(b"payload", "gzip")
+
+        assert len(cache) == 0
+
+
+class TestApplicationCompression:
+    """Test compression on the real application."""
+
+    def test_task_list_is_compressed(self, client):
+        """Test that large task list pages are compressed."""
+        for i in range(20):
+            client.post(
+                "/api/v1/tasks",
+                json={"title": f"Task {i}", "description": "details " * 20},
+            )
+
+        response = client.get("/api/v1/tasks", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["tasks"]) == 20
@@ -1,5 +1,7 @@
 """Tests for configuration loading and validation."""
 
+from pathlib import Path
+
 import pytest
 from pydantic import ValidationError
 
@@ -37,6 +39,14 @@ class TestSettingsValidation:
         assert settings.database_url == "sqlite:///custom.db"
         assert settings.debug is True
 
+    def test_settings_database_path(self):
+        """Test that the database path is read from the URL."""
+        relative = Settings(database_url="sqlite+aiosqlite:///./tick-task.db")
+        absolute = Settings(database_url="sqlite+aiosqlite:////srv/tasks.db")
+
+        assert relative.database_path == Path("tick-task.db")
+        assert absolute.database_path == Path("/srv/tasks.db")
+
 
 class TestGlobalSettings:
     """Test cases for the global settings instance."""
@@ -53,3 +63,33 @@ class TestGlobalSettings:
     def test_global_settings_database_url_is_sqlite(self):
         """Test that global settings uses SQLite."""
         assert "sqlite" in settings.database_url
+
+
+class TestSQLiteProfileSettings:
+    """Test cases for SQLite performance profile settings."""
+
+    def test_default_profile_is_balanced(self):
+        """Test that the balanced preset is used by default."""
+        test_settings = Settings()
+
+        assert test_settings.sqlite_profile == "balanced"
+        assert test_settings.sqlite_pragmas["journal_mode"] == "WAL"
+        assert test_settings.sqlite_pragmas["synchronous"] == "NORMAL"
+
+    def test_profile_selection(self):
+        """Test selecting a named preset."""
+        test_settings = Settings(sqlite_profile="durable")
+
+        assert test_settings.sqlite_pragmas["synchronous"] == "FULL"
+
+    def test_override_wins_over_profile(self):
+        """Test that individual overrides replace preset values."""
+        test_settings = Settings(sqlite_profile="throughput", sqlite_synchronous="NORMAL")
+
+        assert test_settings.sqlite_pragmas["synchronous"] == "NORMAL"
+        assert test_settings.sqlite_pragmas["temp_store"] == "MEMORY"
+
+    def test_unknown_profile_rejected(self):
+        """Test that unknown presets fail validation."""
+        with pytest.raises(ValidationError):
+            Settings(sqlite_profile="reckless")
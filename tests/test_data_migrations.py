@@ -0,0 +1,135 @@
+"""Tests for chunked, resumable data migrations."""
+
+import pytest
+import sqlalchemy as sa
+
+from tick_task.data_migrations import DataMigration, migration_progress
+
+metadata = sa.MetaData()
+items = sa.Table(
+    "items",
+    metadata,
+    sa.Column("id", sa.Integer, primary_key=True),
+    sa.Column("title", sa.String(50)),
+    sa.Column("title_length", sa.Integer, nullable=True),
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File database with 25 rows to backfill."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            items.insert(), [{"id": i, "title": "x" * i} for i in range(1, 26)]
+        )
+    yield engine
+    engine.dispose()
+
+
+def fill_title_length(connection, rows):
+    connection.execute(
+        items.update().where(items.c.id == sa.bindparam("item_id")),
+        [{"item_id": row.id, "title_length": len(row.title)} for row in rows],
+    )
+
+
+def make_migration(**kwargs) -> DataMigration:
+    kwargs.setdefault("chunk_size", 10)
+    kwargs.setdefault("duty_cycle", 1.0)
+    return DataMigration(
+        "fill_title_length", items, items.c.id, fill_title_length, **kwargs
+    )
+
+
+def lengths(engine) -> dict:
+    with engine.connect() as connection:
+        return dict(
+            connection.execute(sa.select(items.c.id, items.c.title_length)).all()
+        )
+
+
+class TestDataMigration:
+    """Test cases for running data migrations in chunks."""
+
+    def test_processes_all_rows_in_chunks(self, engine):
+        """Test that every row is processed, one chunk per transaction."""
+        chunk_sizes = []
+
+        def process(connection, rows):
+            chunk_sizes.append(len(rows))
+            fill_title_length(connection, rows)
+
+        report = DataMigration(
+            "sizes", items, items.c.id, process, chunk_size=10, duty_cycle=1.0
+        ).run(engine)
+
+        assert chunk_sizes == [10, 10, 5]
+        assert report.rows == 25
+        assert report.completed
+        assert lengths(engine) == {i: i for i in range(1, 26)}
+
+    def test_resumes_after_interruption(self, engine):
+        """Test that a later run continues after the last committed chunk."""
+        first = make_migration().run(engine, max_chunks=2)
+        assert first.rows == 20
+        assert not first.completed
+        assert lengths(engine)[21] is None
+
+        second = make_migration().run(engine)
+
+        assert second.resumed
+        assert second.rows == 5
+        assert second.completed
+        assert lengths(engine) == {i: i for i in range(1, 26)}
+
+    def test_failed_chunk_is_rolled_back(self, engine):
+        """Test that a failing chunk leaves no partial progress."""
+
+        def process(connection, rows):
+            fill_title_length(connection, rows)
+            if rows[0].id > 10:
+                raise RuntimeError("boom")
+
+        migration = DataMigration(
+            "failing", items, items.c.id, process, chunk_size=10, duty_cycle=1.0
+        )
+        with pytest.raises(RuntimeError):
+            migration.run(engine)
+
+        assert lengths(engine)[11] is None
+        (progress,) = migration_progress(engine)
+        assert progress["last_key"] == 10
+        assert progress["rows_processed"] == 10
+
+    def test_completed_migration_is_skipped(self, engine):
+        """Test that rerunning a finished migration does nothing."""
+        make_migration().run(engine)
+
+        report = make_migration().run(engine)
+
+        assert report.rows == 0
+        assert report.completed
+        assert migration_progress(engine)[0]["completed_at"] is not None
+
+    def test_where_clause_limits_rows(self, engine):
+        """Test that only rows matching the filter are processed."""
+        report = make_migration(where=items.c.id > 20).run(engine)
+
+        assert report.rows == 5
+        assert lengths(engine)[20] is None
+
+    def test_duty_cycle_throttles(self, engine):
+        """Test that the migration idles in proportion to its work."""
+        pauses = []
+
+        make_migration(duty_cycle=0.25, sleep=pauses.append).run(engine)
+
+        assert len(pauses) == 3
+        assert all(pause >= 0 for pause in pauses)
+
+    def test_invalid_duty_cycle(self):
+        """Test that duty cycles outside (0, 1] are rejected."""
+        with pytest.raises(ValueError):
+            make_migration(duty_cycle=0)
@@ -1,10 +1,21 @@
 """Tests for database configuration and connections."""
 
+from datetime import datetime
+
 import pytest
-from sqlalchemy import text
+from fastapi import Request
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from tick_task.database import get_db
+from tick_task import database
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import (
+    ShardRouter,
+    apply_sqlite_pragmas,
+    create_database_engine,
+    get_db,
+)
 from tick_task.models import Base, Task
 
 
@@ -98,3 +109,229 @@ class TestDatabaseOperations:
         # Verify it's gone
         result = await db_session.get(Task, task.id)
         assert result is None
+
+
+class TestSQLitePragmas:
+    """Test cases for SQLite connection tuning."""
+
+    async def test_balanced_profile_applied(self, tmp_path):
+        """Test that profile pragmas are applied to new connections."""
+        engine = create_database_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}",
+            SQLITE_PROFILES["balanced"],
+        )
+
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            foreign_keys = (await conn.execute(text("PRAGMA foreign_keys"))).scalar()
+            temp_store = (await conn.execute(text("PRAGMA temp_store"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+
+        await engine.dispose()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert foreign_keys == 1
+        assert temp_store == 2  # MEMORY
+        assert busy_timeout == 5000
+
+    async def test_engine_without_pragmas(self, tmp_path):
+        """Test that engines without pragmas keep SQLite defaults."""
+        engine = create_database_engine(f"sqlite+aiosqlite:///{tmp_path / 'plain.db'}")
+
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+
+        await engine.dispose()
+
+        assert journal_mode == "delete"
+
+    def test_invalid_pragma_value_rejected(self):
+        """Test that pragma values are validated before being interpolated."""
+        import sqlite3
+
+        connection = sqlite3.connect(":memory:")
+        try:
+            with pytest.raises(ValueError):
+                apply_sqlite_pragmas(connection, {"journal_mode": "WAL; DROP TABLE x"})
+        finally:
+            connection.close()
+
+
+class TestSessionRouting:
+    """Test cases for routing sessions to the read or write engine."""
+
+    @staticmethod
+    def make_request(method: str) -> Request:
+        return Request({"type": "http", "method": method, "headers": []})
+
+    async def test_read_only_request_uses_read_engine(self):
+        """Test that GET requests get a read pool session."""
+        sessions = get_db(self.make_request("GET"))
+        session = await sessions.__anext__()
+
+        assert session.bind is database.read_engine
+        await sessions.aclose()
+
+    async def test_mutating_request_uses_write_engine(self):
+        """Test that mutating requests get the writer session."""
+        for method in ("POST", "PUT", "DELETE"):
+            sessions = get_db(self.make_request(method))
+            session = await sessions.__anext__()
+
+            assert session.bind is database.write_engine
+            await sessions.aclose()
+
+    def test_memory_database_detection(self):
+        """Test detection of in-memory SQLite URLs."""
+        assert database.is_memory_database("sqlite+aiosqlite:///:memory:")
+        assert database.is_memory_database("sqlite://")
+        assert not database.is_memory_database("sqlite+aiosqlite:///./tick-task.db")
+
+    def test_pool_statistics(self):
+        """Test that both pools are described."""
+        stats = database.pool_statistics()
+
+        assert stats["write"]["size"] in (1, None)
+        assert set(stats) == {"read", "write"}
+
+    async def test_read_connections_are_query_only(self, tmp_path):
+        """Test that query_only connections reject writes."""
+        url = f"sqlite+aiosqlite:///{tmp_path / 'ro.db'}"
+        writer = create_database_engine(url, SQLITE_PROFILES["balanced"])
+        reader = create_database_engine(
+            url, {**SQLITE_PROFILES["balanced"], "query_only": True}
+        )
+        async with writer.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with reader.connect() as conn:
+            with pytest.raises(OperationalError):
+                await conn.execute(text("DELETE FROM tasks"))
+
+        await reader.dispose()
+        await writer.dispose()
+
+
+@pytest.fixture
+async def shard_router(tmp_path):
+    """Workspace shard router over a temporary directory."""
+    router = ShardRouter(tmp_path / "shards")
+    yield router
+    await router.dispose()
+
+
+async def shard_titles(router: ShardRouter, workspace) -> list[str]:
+    """Titles stored in the shard file of ``workspace``."""
+    async with router.engine(router.shard_for(workspace)).connect() as conn:
+        result = await conn.execute(text("SELECT title FROM tasks ORDER BY title"))
+        return [row[0] for row in result]
+
+
+class TestShardRouter:
+    """Test cases for workspace-sharded storage."""
+
+    def test_shard_ids(self, tmp_path):
+        """Test that shard ids are stable, readable and file-safe."""
+        router = ShardRouter(tmp_path)
+
+        assert router.shard_for(None) == "default"
+        assert router.shard_for("Home / Garden").startswith("ws-home-garden-")
+        assert router.shard_for("home garden") != router.shard_for("Home / Garden")
+        assert router.shard_for("Work") == router.shard_for("Work")
+
+    def test_hash_mode_buckets(self, tmp_path):
+        """Test that hash mode spreads workspaces over a fixed set of files."""
+        router = ShardRouter(tmp_path, mode="hash", buckets=4)
+        shards = {router.shard_for(f"workspace-{i}") for i in range(100)}
+
+        assert shards == {f"bucket-{i:03d}" for i in range(4)}
+
+    async def test_tasks_are_written_to_their_workspace_file(self, shard_router):
+        """Test that each workspace's tasks land in their own database file."""
+        async with shard_router.session_factory() as session:
+            session.add_all(
+                [
+                    Task(title="Plan sprint", workspace="work"),
+                    Task(title="Water plants", workspace="home"),
+                    Task(title="Inbox"),
+                ]
+            )
+            await session.commit()
+
+        assert await shard_titles(shard_router, "work") == ["Plan sprint"]
+        assert await shard_titles(shard_router, "home") == ["Water plants"]
+        assert await shard_titles(shard_router, None) == ["Inbox"]
+
+    async def test_existing_shards_are_discovered(self, shard_router):
+        """Test that a new router picks up shard files written earlier."""
+        async with shard_router.session_factory() as session:
+            session.add(Task(title="Plan sprint", workspace="work"))
+            await session.commit()
+
+        router = ShardRouter(shard_router.directory)
+        assert shard_router.shard_for("work") in router.shard_ids
+        await router.dispose()
+
+    async def test_get_finds_task_in_any_shard(self, shard_router):
+        """Test primary key lookups without a cached location."""
+        async with shard_router.session_factory() as session:
+            task = Task(title="Plan sprint", workspace="work")
+            session.add(task)
+            await session.commit()
+        shard_router.forget(task.id)
+
+        async with shard_router.session_factory() as session:
+            found = await session.get(Task, task.id)
+
+        assert found.title == "Plan sprint"
+
+    async def test_relocate_moves_task_to_new_workspace(self, shard_router):
+        """Test that changing a task's workspace moves its row."""
+        async with shard_router.session_factory() as session:
+            task = Task(title="Plan sprint", workspace="work")
+            session.add(task)
+            await session.commit()
+
+        async with shard_router.session_factory() as session:
+            task = await session.get(Task, task.id)
+            task.workspace = "home"
+            moved = await shard_router.relocate(session, task)
+            await session.commit()
+
+        assert moved.id == task.id
+        assert await shard_titles(shard_router, "work") == []
+        assert await shard_titles(shard_router, "home") == ["Plan sprint"]
+
+    async def test_gather_merges_by_sort_key(self, shard_router):
+        """Test that scatter-gathered pages are merged in global order."""
+        async with shard_router.session_factory() as session:
+            for i, workspace in enumerate(["a", "b", "c", None] * 3):
+                session.add(Task(title=f"Task {i:02d}", workspace=workspace))
+            await session.commit()
+
+        tasks = await shard_router.gather(
+            select(Task).order_by(Task.title.desc()), 5, Task.title, descending=True
+        )
+
+        assert [task.title for task in tasks] == [
+            "Task 11",
+            "Task 10",
+            "Task 09",
+            "Task 08",
+            "Task 07",
+        ]
+
+    async def test_gather_orders_nulls_like_sqlite(self, shard_router):
+        """Test that NULL sort values come first ascending, as in SQLite."""
+        async with shard_router.session_factory() as session:
+            session.add(Task(title="No due date", workspace="a"))
+            session.add(Task(title="Due", workspace="b", due_at=datetime(2025, 1, 1)))
+            await session.commit()
+
+        tasks = await shard_router.gather(
+            select(Task).order_by(Task.due_at.asc()), 10, Task.due_at, descending=False
+        )
+
+        assert [task.title for task in tasks] == ["No due date", "Due"]
@@ -0,0 +1,241 @@
+"""Tests for task dependencies."""
+
+import random
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from tick_task.database import ShardRouter
+from tick_task.dependencies import (
+    DependencyCycle,
+    add_dependency,
+    dependencies_of,
+    remove_dependency,
+)
+from tick_task.models import Task, TaskDependency
+
+
+async def make_tasks(session, count: int, **fields) -> list[Task]:
+    """Commit ``count`` tasks titled by their index."""
+    tasks = [Task(title=str(index), **fields) for index in range(count)]
+    session.add_all(tasks)
+    await session.commit()
+    return tasks
+
+
+async def depend(session, task: Task, blocker: Task) -> bool:
+    """Add a dependency and commit it."""
+    added = await session.run_sync(add_dependency, task, blocker)
+    await session.commit()
+    return added
+
+
+async def assert_topological(session) -> None:
+    """Check that every blocker is positioned before the task it blocks."""
+    orders = dict((await session.execute(select(Task.id, Task.topo_order))).all())
+    edges = (await session.execute(select(TaskDependency))).scalars().all()
+    for edge in edges:
+        assert orders[edge.blocker_id] < orders[edge.task_id]
+
+
+class TestCycleDetection:
+    """Test cases for refusing dependency cycles."""
+
+    async def test_self_dependency(self, db_session):
+        """Test that a task cannot block itself."""
+        (task,) = await make_tasks(db_session, 1)
+
+        with pytest.raises(DependencyCycle):
+            await db_session.run_sync(add_dependency, task, task)
+
+    async def test_direct_and_indirect_cycles(self, db_session):
+        """Test that closing a loop of any length is refused."""
+        a, b, c = await make_tasks(db_session, 3)
+        await depend(db_session, b, a)
+        await depend(db_session, c, b)
+
+        with pytest.raises(DependencyCycle):
+            await db_session.run_sync(add_dependency, a, b)
+        with pytest.raises(DependencyCycle):
+            await db_session.run_sync(add_dependency, a, c)
+
+        assert await db_session.run_sync(dependencies_of, a) == ([], [b.id])
+
+    async def test_duplicate_edge(self, db_session):
+        """Test that adding an existing dependency changes nothing."""
+        a, b = await make_tasks(db_session, 2)
+
+        assert await depend(db_session, b, a)
+        assert not await depend(db_session, b, a)
+        assert b.open_blockers == 1
+
+    async def test_reorders_against_the_order(self, db_session):
+        """Test that edges added against the current order reorder the tasks."""
+        a, b, c, d = await make_tasks(db_session, 4)
+        await depend(db_session, b, a)
+        await depend(db_session, d, c)
+        # c and d were placed after b; both must now move before a
+        await depend(db_session, a, d)
+
+        await assert_topological(db_session)
+        with pytest.raises(DependencyCycle):
+            await db_session.run_sync(add_dependency, c, b)
+
+    async def test_random_graph_stays_ordered(self, db_session):
+        """Test that random insertions keep a valid order and refuse cycles."""
+        rng = random.Random(3)
+        tasks = await make_tasks(db_session, 12)
+        dependents = {task.id: set() for task in tasks}
+
+        def reaches(start: str, goal: str) -> bool:
+            pending, seen = [start], {start}
+            while pending:
+                node = pending.pop()
+                if node == goal:
+                    return True
+                pending.extend(dependents[node] - seen)
+                seen |= dependents[node]
+            return False
+
+        for _ in range(60):
+            task, blocker = rng.sample(tasks, 2)
+            if reaches(task.id, blocker.id):
+                with pytest.raises(DependencyCycle):
+                    await depend(db_session, task, blocker)
+            else:
+                await depend(db_session, task, blocker)
+                dependents[blocker.id].add(task.id)
+            await assert_topological(db_session)
+
+
+class TestBlockedStatus:
+    """Test cases for keeping blocked tasks and counts current."""
+
+    async def test_cascade_on_finish_and_reopen(self, db_session):
+        """Test that dependents unblock when blockers finish and re-block."""
+        first, second, task = await make_tasks(db_session, 3)
+        await depend(db_session, task, first)
+        await depend(db_session, task, second)
+        assert (task.status, task.open_blockers) == ("blocked", 2)
+
+        first.status = "done"
+        await db_session.commit()
+        assert (task.status, task.open_blockers) == ("blocked", 1)
+
+        second.status = "archived"
+        await db_session.commit()
+        assert (task.status, task.open_blockers) == ("todo", 0)
+
+        first.status = "doing"
+        await db_session.commit()
+        assert (task.status, task.open_blockers) == ("blocked", 1)
+
+    async def test_started_task_keeps_its_status(self, db_session):
+        """Test that only todo tasks are moved to blocked."""
+        blocker, task = await make_tasks(db_session, 2)
+        task.status = "doing"
+        await depend(db_session, task, blocker)
+
+        assert (task.status, task.open_blockers) == ("doing", 1)
+
+    async def test_finished_blocker(self, db_session):
+        """Test that a finished blocker does not block."""
+        (task,) = await make_tasks(db_session, 1)
+        (blocker,) = await make_tasks(db_session, 1, status="done")
+        await depend(db_session, task, blocker)
+
+        assert (task.status, task.open_blockers) == ("todo", 0)
+
+    async def test_remove_dependency(self, db_session):
+        """Test that removing the last blocker unblocks the task."""
+        blocker, task = await make_tasks(db_session, 2)
+        await depend(db_session, task, blocker)
+
+        assert await db_session.run_sync(remove_dependency, task, blocker)
+        assert not await db_session.run_sync(remove_dependency, task, blocker)
+        assert (task.status, task.open_blockers) == ("todo", 0)
+
+    async def test_sharded_session(self, tmp_path):
+        """Test that blockers finishing unblock dependents within a shard."""
+        router = ShardRouter(tmp_path / "shards")
+        async with router.session_factory() as session:
+            blocker, task = await make_tasks(session, 2, workspace="work")
+            await depend(session, task, blocker)
+            blocker.status = "done"
+            await session.commit()
+
+            assert (task.status, task.open_blockers) == ("todo", 0)
+        await router.dispose()
+
+
+class TestDependencyEndpoints:
+    """Test cases for the dependency endpoints and the ready filter."""
+
+    def create(self, client, title: str) -> dict:
+        """Create a task through the API."""
+        return client.post("/api/v1/tasks", json={"title": title}).json()
+
+    def test_add_list_and_remove(self, client):
+        """Test the dependency lifecycle through the API."""
+        blocker, task = self.create(client, "Design"), self.create(client, "Build")
+
+        added = client.post(
+            f"/api/v1/tasks/{task['id']}/dependencies",
+            json={"blocker_id": blocker["id"]},
+        )
+        assert added.status_code == status.HTTP_201_CREATED
+        assert (added.json()["status"], added.json()["open_blockers"]) == (
+            "blocked",
+            1,
+        )
+        listed = client.get(f"/api/v1/tasks/{blocker['id']}/dependencies").json()
+        assert listed == {"blockers": [], "dependents": [task["id"]]}
+
+        removed = client.delete(
+            f"/api/v1/tasks/{task['id']}/dependencies/{blocker['id']}"
+        )
+        assert removed.json()["status"] == "todo"
+        missing = client.delete(
+            f"/api/v1/tasks/{task['id']}/dependencies/{blocker['id']}"
+        )
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cycle_and_missing_blocker(self, client):
+        """Test that cycles conflict and unknown blockers are not found."""
+        a, b = self.create(client, "A"), self.create(client, "B")
+        client.post(
+            f"/api/v1/tasks/{b['id']}/dependencies", json={"blocker_id": a["id"]}
+        )
+
+        cycle = client.post(
+            f"/api/v1/tasks/{a['id']}/dependencies", json={"blocker_id": b["id"]}
+        )
+        missing = client.post(
+            f"/api/v1/tasks/{a['id']}/dependencies",
+            json={"blocker_id": "00000000-0000-4000-8000-000000000000"},
+        )
+
+        assert cycle.status_code == status.HTTP_409_CONFLICT
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_ready_filter(self, client):
+        """Test that ready tasks are open with no unfinished blockers."""
+        blocker, task = self.create(client, "Design"), self.create(client, "Build")
+        done = self.create(client, "Shipped")
+        client.put(f"/api/v1/tasks/{done['id']}", json={"status": "done"})
+        client.post(
+            f"/api/v1/tasks/{task['id']}/dependencies",
+            json={"blocker_id": blocker["id"]},
+        )
+
+        def titles(ready: bool) -> list[str]:
+            tasks = client.get("/api/v1/tasks", params={"ready": ready}).json()
+            return sorted(task["title"] for task in tasks["tasks"])
+
+        assert titles(True) == ["Design"]
+        assert titles(False) == ["Build"]
+
+        client.put(f"/api/v1/tasks/{blocker['id']}", json={"status": "done"})
+
+        assert titles(True) == ["Build"]
@@ -0,0 +1,166 @@
+"""Tests for near-duplicate task detection."""
+
+from fastapi import status
+from sqlalchemy import select
+
+from tick_task.duplicates import (
+    BANDS,
+    bucket_ids,
+    find_duplicates,
+    normalize,
+    shingles,
+    similarity,
+)
+from tick_task.models import Task, TitleBucket
+
+
+async def buckets_of(session, task: Task) -> set[int]:
+    """The bucket ids stored for ``task``."""
+    result = await session.execute(
+        select(TitleBucket.bucket).where(TitleBucket.task_id == task.id)
+    )
+    return set(result.scalars())
+
+
+class TestSignatures:
+    """Test cases for normalizing, shingling and bucketing titles."""
+
+    def test_normalize(self):
+        """Test that case, punctuation and spacing are ignored."""
+        assert normalize("  Call MOM -- about_dinner!! ") == "call mom about dinner"
+
+    def test_shingles(self):
+        """Test character trigrams, short titles and empty ones."""
+        assert shingles("Milk") == {"mil", "ilk"}
+        assert shingles("TV") == {"tv"}
+        assert shingles("?!") == frozenset()
+
+    def test_similar_titles_share_buckets(self):
+        """Test that near titles collide in some band and distant ones do not."""
+        first = bucket_ids("Call mom about dinner on Sunday")
+        second = bucket_ids("call Mum about dinner on sunday!")
+        other = bucket_ids("Renew the car insurance")
+
+        assert len(first) == BANDS
+        assert bucket_ids("Call mom about dinner on Sunday") == first
+        assert set(first) & set(second)
+        assert not set(first) & set(other)
+        assert bucket_ids("...") == []
+
+    def test_similarity(self):
+        """Test the Jaccard similarity of shingle sets."""
+        assert similarity(shingles("abcd"), shingles("abcd")) == 1.0
+        assert similarity(shingles("abcd"), shingles("abce")) == 1 / 3
+        assert similarity(frozenset(), shingles("abcd")) == 0.0
+
+
+class TestTitleBuckets:
+    """Test cases for keeping title_buckets current."""
+
+    async def test_created_and_retitled(self, db_session):
+        """Test that buckets follow the title and are dropped with the task."""
+        task = Task(title="Buy milk")
+        db_session.add(task)
+        await db_session.commit()
+        assert await buckets_of(db_session, task) == set(bucket_ids("Buy milk"))
+
+        task.priority = "high"
+        await db_session.commit()
+        assert await buckets_of(db_session, task) == set(bucket_ids("Buy milk"))
+
+        task.title = "Renew the car insurance"
+        await db_session.commit()
+        assert await buckets_of(db_session, task) == set(
+            bucket_ids("Renew the car insurance")
+        )
+
+    async def test_find_duplicates(self, db_session):
+        """Test that only open tasks of the same workspace are found."""
+        open_task = Task(title="Buy milk and eggs")
+        done = Task(title="Buy milk and eggs", status="done")
+        elsewhere = Task(title="Buy milk and eggs", workspace="work")
+        unrelated = Task(title="Renew the car insurance")
+        db_session.add_all([open_task, done, elsewhere, unrelated])
+        await db_session.commit()
+
+        found = await db_session.run_sync(
+            find_duplicates, [Task(title="buy milk and eggs!")], 0.7
+        )
+
+        assert found == [open_task.id]
+
+    async def test_within_the_batch(self, db_session):
+        """Test that a batch repeating a title is caught before it is saved."""
+        first = Task(title="Prepare the quarterly review")
+        second = Task(title="Prepare quarterly review")
+        third = Task(title="Prepare the quarterly review", workspace="work")
+
+        found = await db_session.run_sync(find_duplicates, [first, second, third], 0.7)
+
+        assert found == [first.id]
+
+
+class TestDuplicateEndpoints:
+    """Test cases for the duplicates flag of the create endpoints."""
+
+    def test_warn(self, client):
+        """Test that duplicates are listed in a header by default."""
+        original = client.post("/api/v1/tasks", json={"title": "Buy milk"}).json()
+
+        response = client.post("/api/v1/tasks", json={"title": "buy milk!"})
+        fresh = client.post("/api/v1/tasks", json={"title": "Call the plumber"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.headers["X-Possible-Duplicates"] == original["id"]
+        assert "X-Possible-Duplicates" not in fresh.headers
+
+    def test_reject(self, client):
+        """Test that rejecting refuses the task and saves nothing."""
+        original = client.post("/api/v1/tasks", json={"title": "Buy milk"}).json()
+
+        response = client.post(
+            "/api/v1/tasks",
+            params={"duplicates": "reject"},
+            json={"title": "Buy  milk"},
+        )
+        listed = client.get("/api/v1/tasks").json()
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.headers["X-Possible-Duplicates"] == original["id"]
+        assert original["id"] in response.json()["detail"]
+        assert len(listed["tasks"]) == 1
+
+    def test_ignore(self, client):
+        """Test that ignoring skips the check."""
+        client.post("/api/v1/tasks", json={"title": "Buy milk"})
+
+        response = client.post(
+            "/api/v1/tasks", params={"duplicates": "ignore"}, json={"title": "Buy milk"}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert "X-Possible-Duplicates" not in response.headers
+
+    def test_batch(self, client):
+        """Test that a batch is checked against stored tasks and itself."""
+        stored = client.post("/api/v1/tasks", json={"title": "Buy milk"}).json()
+        batch = [
+            {"title": "Buy milk."},
+            {"title": "Water the plants"},
+            {"title": "Water"},
+        ]
+        batch.append({"title": "water the plants!"})
+
+        warned = client.post("/api/v1/tasks/batch", json=batch)
+        rejected = client.post(
+            "/api/v1/tasks/batch",
+            params={"duplicates": "reject"},
+            json=[{"title": "Renew the car insurance"}, {"title": "Buy milk"}],
+        )
+
+        created = warned.json()["tasks"]
+        ids = warned.headers["X-Possible-Duplicates"].split(", ")
+        assert ids == [stored["id"], created[1]["id"]]
+        assert rejected.status_code == status.HTTP_409_CONFLICT
+        titles = [task["title"] for task in client.get("/api/v1/tasks").json()["tasks"]]
+        assert "Renew the car insurance" not in titles
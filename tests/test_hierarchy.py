@@ -0,0 +1,194 @@
+"""Tests for the subtask hierarchy."""
+
+import pytest
+from fastapi import status
+from sqlalchemy import select
+
+from tick_task.database import ShardRouter
+from tick_task.hierarchy import HierarchyCycle, subtree, subtree_progress
+from tick_task.models import Task, TaskClosure
+
+
+async def closure(session) -> set[tuple[str, str, int]]:
+    """Every closure row, by task title."""
+    titles = dict((await session.execute(select(Task.id, Task.title))).all())
+    rows = (await session.execute(select(TaskClosure))).scalars().all()
+    return {
+        (titles[row.ancestor_id], titles[row.descendant_id], row.depth) for row in rows
+    }
+
+
+async def make_tree(session) -> dict[str, Task]:
+    """Commit root > (a > (a1, a2), b), by title."""
+    root = Task(title="root")
+    a = Task(title="a", parent_id=root.id)
+    b = Task(title="b", parent_id=root.id)
+    a1 = Task(title="a1", parent_id=a.id, status="done")
+    a2 = Task(title="a2", parent_id=a.id)
+    # Children before parents: the closure is still built parents first
+    session.add_all([a1, a2, b, a, root])
+    await session.commit()
+    return {task.title: task for task in (root, a, b, a1, a2)}
+
+
+class TestClosureTable:
+    """Test cases for keeping the closure table current."""
+
+    async def test_new_tasks(self, db_session):
+        """Test that new tasks get their self row and ancestor rows."""
+        await make_tree(db_session)
+
+        rows = await closure(db_session)
+
+        assert {row for row in rows if row[2] == 0} == {
+            (title, title, 0) for title in ("root", "a", "b", "a1", "a2")
+        }
+        assert {row for row in rows if row[1] == "a2"} == {
+            ("a2", "a2", 0),
+            ("a", "a2", 1),
+            ("root", "a2", 2),
+        }
+        assert len(rows) == 11
+
+    async def test_subtree_and_progress(self, db_session):
+        """Test the subtree order and the rolled-up progress."""
+        tasks = await make_tree(db_session)
+        tasks["a2"].status = "archived"
+        await db_session.commit()
+
+        found = await db_session.run_sync(subtree, tasks["root"])
+
+        assert [task.title for task in found[:2]] == ["a", "b"]
+        assert {task.title for task in found[2:]} == {"a1", "a2"}
+        assert await db_session.run_sync(subtree_progress, tasks["root"]) == (1, 3)
+        assert await db_session.run_sync(subtree_progress, tasks["b"]) == (0, 0)
+
+    async def test_move_subtree(self, db_session):
+        """Test that moving a task moves its whole subtree."""
+        tasks = await make_tree(db_session)
+
+        tasks["a"].parent_id = tasks["b"].id
+        await db_session.commit()
+        rows = await closure(db_session)
+
+        assert {row for row in rows if row[1] == "a1"} == {
+            ("a1", "a1", 0),
+            ("a", "a1", 1),
+            ("b", "a1", 2),
+            ("root", "a1", 3),
+        }
+
+        tasks["a"].parent_id = None
+        await db_session.commit()
+        rows = await closure(db_session)
+
+        assert {row for row in rows if row[1] == "a1"} == {
+            ("a1", "a1", 0),
+            ("a", "a1", 1),
+        }
+        assert await db_session.run_sync(subtree_progress, tasks["root"]) == (0, 1)
+
+    async def test_cycle_refused(self, db_session):
+        """Test that a task cannot move under its own subtree."""
+        tasks = await make_tree(db_session)
+
+        tasks["a"].parent_id = tasks["a2"].id
+        with pytest.raises(HierarchyCycle):
+            await db_session.flush()
+
+    async def test_sharded_session(self, tmp_path):
+        """Test subtrees within a shard."""
+        router = ShardRouter(tmp_path / "shards")
+        async with router.session_factory() as session:
+            parent = Task(title="parent", workspace="work")
+            child = Task(title="child", workspace="work", parent_id=parent.id)
+            session.add_all([parent, child])
+            await session.commit()
+
+            found = await session.run_sync(subtree, parent)
+
+            assert [task.title for task in found] == ["child"]
+        await router.dispose()
+
+
+class TestHierarchyEndpoints:
+    """Test cases for subtasks through the API."""
+
+    def create(self, client, title: str, parent: dict = None, **fields) -> dict:
+        """Create a task through the API."""
+        if parent is not None:
+            fields["parent_id"] = parent["id"]
+        return client.post("/api/v1/tasks", json={"title": title, **fields}).json()
+
+    def test_include_subtree_and_progress(self, client):
+        """Test that get_task returns the subtree and progress on request."""
+        root = self.create(client, "Launch")
+        design = self.create(client, "Design", root, status="done")
+        self.create(client, "Mockups", design, status="done")
+        self.create(client, "Build", root)
+
+        plain = client.get(f"/api/v1/tasks/{root['id']}").json()
+        tree = client.get(
+            f"/api/v1/tasks/{root['id']}", params={"include": "subtree"}
+        ).json()
+        progress = client.get(
+            f"/api/v1/tasks/{root['id']}", params={"include": "progress"}
+        ).json()
+        unknown = client.get(
+            f"/api/v1/tasks/{root['id']}", params={"include": "comments"}
+        )
+
+        assert "subtree" not in plain
+        assert [task["title"] for task in tree["subtree"]] == [
+            "Design",
+            "Build",
+            "Mockups",
+        ]
+        assert tree["progress"] == {"done": 2, "total": 3}
+        assert (progress["subtree"], progress["progress"]) == (
+            None,
+            {"done": 2, "total": 3},
+        )
+        assert unknown.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_parent_filter_and_move(self, client):
+        """Test listing direct subtasks and moving a subtask."""
+        first, second = self.create(client, "First"), self.create(client, "Second")
+        child = self.create(client, "Child", first)
+
+        def children(parent: dict) -> list[str]:
+            tasks = client.get("/api/v1/tasks", params={"parent": parent["id"]})
+            return [task["title"] for task in tasks.json()["tasks"]]
+
+        assert child["parent_id"] == first["id"]
+        assert children(first) == ["Child"]
+
+        moved = client.put(
+            f"/api/v1/tasks/{child['id']}", json={"parent_id": second["id"]}
+        )
+
+        assert moved.json()["parent_id"] == second["id"]
+        assert (children(first), children(second)) == ([], ["Child"])
+
+    def test_invalid_parents(self, client):
+        """Test that missing parents and cycles are refused."""
+        root = self.create(client, "Root")
+        child = self.create(client, "Child", root)
+
+        missing = client.post(
+            "/api/v1/tasks",
+            json={
+                "title": "Orphan",
+                "parent_id": "00000000-0000-4000-8000-000000000000",
+            },
+        )
+        own_child = client.put(
+            f"/api/v1/tasks/{root['id']}", json={"parent_id": child["id"]}
+        )
+        itself = client.put(
+            f"/api/v1/tasks/{root['id']}", json={"parent_id": root["id"]}
+        )
+
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+        assert own_child.status_code == status.HTTP_409_CONFLICT
+        assert itself.status_code == status.HTTP_409_CONFLICT
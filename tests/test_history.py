@@ -0,0 +1,234 @@
+"""Tests for task history, compaction and undo."""
+
+import pytest
+from fastapi import status
+
+from tick_task.database import ShardRouter
+from tick_task.dependencies import task_connection
+from tick_task.history import (
+    CannotUndo,
+    compact_history,
+    state_at,
+    task_history,
+    undo_last_change,
+)
+from tick_task.models import Task
+
+
+async def events_of(session, task: Task) -> list:
+    """The kept events of ``task``, oldest first."""
+    _, events = await session.run_sync(
+        lambda sync: task_history(task_connection(sync, task), task.id)
+    )
+    return events
+
+
+async def undo(session, task: Task) -> int:
+    """Undo the latest change to ``task`` and commit."""
+    undone = await session.run_sync(undo_last_change, task)
+    await session.commit()
+    return undone
+
+
+class TestEventLog:
+    """Test cases for recording changes."""
+
+    async def test_created_and_updated(self, db_session):
+        """Test that writes append their field changes."""
+        task = Task(title="Draft", tags=["work"])
+        db_session.add(task)
+        await db_session.commit()
+        task.title = "Final"
+        task.tags = ["work", "review"]
+        await db_session.commit()
+
+        created, updated = await events_of(db_session, task)
+
+        assert created.kind == "created"
+        assert created.changes["title"] == [None, "Draft"]
+        assert updated.kind == "updated"
+        assert updated.changes == {
+            "title": ["Draft", "Final"],
+            "tags": [["work"], ["work", "review"]],
+        }
+
+    async def test_unchanged_fields_are_not_recorded(self, db_session):
+        """Test that touching only updated_at or same values records nothing."""
+        task = Task(title="Same")
+        db_session.add(task)
+        await db_session.commit()
+        task.title = "Same"
+        task.updated_at = task.updated_at.replace(year=2030)
+        await db_session.commit()
+
+        assert [event.kind for event in await events_of(db_session, task)] == [
+            "created"
+        ]
+
+
+class TestUndo:
+    """Test cases for undoing changes."""
+
+    async def test_steps_back_through_history(self, db_session):
+        """Test that repeated undos revert one change each, newest first."""
+        task = Task(title="One")
+        db_session.add(task)
+        await db_session.commit()
+        task.title = "Two"
+        await db_session.commit()
+        task.status = "done"
+        task.completed_at = task.updated_at
+        await db_session.commit()
+
+        await undo(db_session, task)
+        assert (task.title, task.status, task.completed_at) == ("Two", "todo", None)
+
+        await undo(db_session, task)
+        assert task.title == "One"
+
+        with pytest.raises(CannotUndo):
+            await db_session.run_sync(undo_last_change, task)
+        kinds = [event.kind for event in await events_of(db_session, task)]
+        assert kinds == ["created", "updated", "updated", "undo", "undo"]
+
+    async def test_undo_after_new_change(self, db_session):
+        """Test that a change after an undo is the next one undone."""
+        task = Task(title="A")
+        db_session.add(task)
+        await db_session.commit()
+        for title in ("B", "C"):
+            task.title = title
+            await db_session.commit()
+
+        await undo(db_session, task)
+        task.priority = "high"
+        await db_session.commit()
+        await undo(db_session, task)
+
+        assert (task.title, task.priority) == ("B", "medium")
+        await undo(db_session, task)
+        assert task.title == "A"
+
+
+class TestCompaction:
+    """Test cases for folding old events into snapshots."""
+
+    async def test_folds_all_but_the_latest(self, db_session):
+        """Test that compaction bounds the log and keeps states rebuildable."""
+        task = Task(title="v0")
+        db_session.add(task)
+        await db_session.commit()
+        for version in range(1, 11):
+            task.title = f"v{version}"
+            await db_session.commit()
+        before = await events_of(db_session, task)
+
+        folded = await db_session.run_sync(
+            lambda sync: compact_history(sync.connection(), keep=3)
+        )
+        await db_session.commit()
+        snapshot, events = await db_session.run_sync(
+            lambda sync: task_history(sync.connection(), task.id)
+        )
+
+        assert folded == 8
+        assert [event.id for event in events] == [event.id for event in before[-3:]]
+        assert snapshot.event_id == before[-4].id
+        assert snapshot.state["title"] == "v7"
+        assert state_at(snapshot, events, before[-1].id)["title"] == "v10"
+        assert state_at(snapshot, events, before[-2].id)["title"] == "v9"
+        assert state_at(snapshot, events, before[0].id) is None
+        again = await db_session.run_sync(
+            lambda sync: compact_history(sync.connection(), keep=3)
+        )
+        assert again == 0
+
+        await undo(db_session, task)
+        assert task.title == "v9"
+
+    async def test_undo_stops_at_the_snapshot(self, db_session):
+        """Test that folded changes can no longer be undone."""
+        task = Task(title="v0")
+        db_session.add(task)
+        await db_session.commit()
+        task.title = "v1"
+        await db_session.commit()
+        await db_session.run_sync(
+            lambda sync: compact_history(sync.connection(), keep=1)
+        )
+        await db_session.commit()
+
+        await undo(db_session, task)
+        with pytest.raises(CannotUndo):
+            await db_session.run_sync(undo_last_change, task)
+
+    async def test_sharded_session(self, tmp_path):
+        """Test that events are written to the task's shard."""
+        router = ShardRouter(tmp_path / "shards")
+        async with router.session_factory() as session:
+            task = Task(title="Shard", workspace="work")
+            session.add(task)
+            await session.commit()
+            task.title = "Sharded"
+            await session.commit()
+
+            assert [event.kind for event in await events_of(session, task)] == [
+                "created",
+                "updated",
+            ]
+        await router.dispose()
+
+
+class TestHistoryEndpoints:
+    """Test cases for the history and undo endpoints."""
+
+    def test_history_and_undo(self, client):
+        """Test reading the history, rebuilding a state and undoing."""
+        task = client.post("/api/v1/tasks", json={"title": "Plan"}).json()
+        client.put(f"/api/v1/tasks/{task['id']}", json={"title": "Plan trip"})
+        client.delete(f"/api/v1/tasks/{task['id']}")
+
+        history = client.get(f"/api/v1/tasks/{task['id']}/history").json()
+        kinds = [event["kind"] for event in history["events"]]
+        first = history["events"][0]["id"]
+        rebuilt = client.get(
+            f"/api/v1/tasks/{task['id']}/history", params={"as_of": first}
+        ).json()
+
+        assert kinds == ["created", "updated", "updated"]
+        assert history["snapshot"] is None
+        assert history["events"][2]["changes"]["status"] == ["todo", "archived"]
+        assert rebuilt["state"]["title"] == "Plan"
+
+        restored = client.post(f"/api/v1/tasks/{task['id']}/undo")
+        assert restored.json()["status"] == "todo"
+        renamed = client.post(f"/api/v1/tasks/{task['id']}/undo")
+        assert renamed.json()["title"] == "Plan"
+        nothing = client.post(f"/api/v1/tasks/{task['id']}/undo")
+        assert nothing.status_code == status.HTTP_409_CONFLICT
+
+    def test_recurring_completion_is_not_undone(self, client):
+        """Test that completing a recurring task cannot be undone."""
+        task = client.post(
+            "/api/v1/tasks",
+            json={
+                "title": "Water plants",
+                "due_at": "2026-03-02T09:00:00Z",
+                "recurrence": "FREQ=WEEKLY",
+            },
+        ).json()
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+
+        response = client.post(f"/api/v1/tasks/{task['id']}/undo")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_unknown_event(self, client):
+        """Test that rebuilding at an unknown event is not found."""
+        task = client.post("/api/v1/tasks", json={"title": "Plan"}).json()
+
+        response = client.get(
+            f"/api/v1/tasks/{task['id']}/history", params={"as_of": 999_999}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
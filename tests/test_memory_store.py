@@ -0,0 +1,311 @@
+"""Tests for the memory-first storage engine."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import status
+
+from tick_task import api
+from tick_task.main import app
+from tick_task.memory_store import MemoryStore
+from tick_task.models import Task
+
+
+@pytest.fixture
+async def store(tmp_path):
+    """Open memory store over a temporary directory."""
+    store = MemoryStore(tmp_path / "memory", fsync_interval=0, snapshot_interval=0)
+    await store.open()
+    yield store
+    await store.close()
+
+
+async def reopen(store: MemoryStore) -> MemoryStore:
+    """Simulate a restart: a fresh store recovering from the same directory."""
+    recovered = MemoryStore(store.directory, snapshot_interval=0)
+    await recovered.open()
+    return recovered
+
+
+class TestMemoryStore:
+    """Test cases for reads and writes against the memory store."""
+
+    async def test_save_and_get(self, store):
+        """Test that saved tasks are returned by id."""
+        task = await store.save(Task(title="In memory"))
+
+        assert store.get(task.id) is task
+        assert store.get("missing") is None
+
+    async def test_list_sorted_by_updated_at(self, store):
+        """Test that the default listing walks the updated_at index."""
+        start = datetime(2025, 1, 1)
+        for i in range(5):
+            await store.save(Task(title=f"Task {i}", updated_at=start + timedelta(i)))
+
+        tasks = store.list_tasks(limit=3)
+
+        assert [task.title for task in tasks] == ["Task 4", "Task 3", "Task 2"]
+
+    async def test_list_filters(self, store):
+        """Test status, context, priority and date filters."""
+        await store.save(Task(title="A", status="todo", priority="low"))
+        await store.save(Task(title="B", status="doing", priority="urgent"))
+        await store.save(
+            Task(title="C", status="done", context="professional", priority="high")
+        )
+        await store.save(Task(title="D", due_at=datetime(2025, 6, 1), tags=["work"]))
+
+        def titles(**filters):
+            return sorted(task.title for task in store.list_tasks(**filters))
+
+        assert titles(status=["todo", "doing"]) == ["A", "B", "D"]
+        assert titles(context="professional") == ["C"]
+        assert titles(min_priority="high") == ["B", "C"]
+        assert titles(due_before=datetime(2025, 7, 1)) == ["D"]
+        assert titles(due_after=datetime(2025, 7, 1)) == []
+        assert titles(tags=["work", "home"]) == ["D"]
+
+    async def test_sort_by_due_at_puts_nulls_like_sqlite(self, store):
+        """Test NULL due dates come first ascending and last descending."""
+        await store.save(Task(title="None"))
+        await store.save(Task(title="Late", due_at=datetime(2025, 2, 1)))
+        await store.save(Task(title="Early", due_at=datetime(2025, 1, 1)))
+
+        ascending = store.list_tasks(sort="due_at", descending=False)
+        descending = store.list_tasks(sort="due_at", descending=True)
+
+        assert [task.title for task in ascending] == ["None", "Early", "Late"]
+        assert [task.title for task in descending] == ["Late", "Early", "None"]
+
+    async def test_aware_datetimes_are_normalized(self, store):
+        """Test that timezone-aware values compare with stored naive UTC."""
+        due = datetime(2025, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+        await store.save(Task(title="Aware", due_at=due))
+
+        tasks = store.list_tasks(due_before=datetime(2025, 1, 1, 11))
+
+        assert [task.due_at for task in tasks] == [datetime(2025, 1, 1, 10)]
+
+    async def test_indexes_follow_updates(self, store):
+        """Test that changing a task moves it between index entries."""
+        task = await store.save(Task(title="Moving", status="todo"))
+        task.status = "done"
+        await store.save(task)
+
+        assert store.list_tasks(status=["todo"]) == []
+        assert store.list_tasks(status=["done"]) == [task]
+
+    async def test_concurrent_writes_share_fsync(self, tmp_path, monkeypatch):
+        """Test that writes arriving together are flushed in one batch."""
+        store = MemoryStore(tmp_path, fsync_interval=0.01, snapshot_interval=0)
+        await store.open()
+        batches = []
+        write = store._write
+        monkeypatch.setattr(
+            store,
+            "_write",
+            lambda handle, data: (batches.append(data), write(handle, data)),
+        )
+
+        await asyncio.gather(*(store.save(Task(title=f"T{i}")) for i in range(10)))
+
+        assert len(batches) == 1
+        assert batches[0].count(b"\n") == 10
+        await store.close()
+
+    async def test_rename_tag(self, store):
+        """Test that renaming rewrites the tasks carrying the tag."""
+        first = await store.save(Task(title="A", tags=["job", "work"]))
+        await store.save(Task(title="B", tags=["job"]))
+        await store.save(Task(title="C", tags=["home"]))
+
+        changed = await store.rename_tag("job", "work")
+
+        assert changed == 2
+        assert first.tags == ["work"]
+        assert store.tag_counts() == {"work": 2, "home": 1}
+        recovered = await reopen(store)
+        assert recovered.tag_counts() == {"work": 2, "home": 1}
+        await recovered.close()
+
+
+class TestMemoryStoreRecovery:
+    """Test cases for durability and recovery."""
+
+    async def test_recover_from_log(self, store):
+        """Test that a restart replays the log."""
+        task = await store.save(Task(title="Durable"))
+        task.status = "doing"
+        await store.save(task)
+
+        recovered = await reopen(store)
+
+        assert recovered.get(task.id).status == "doing"
+        assert recovered.list_tasks(status=["doing"])[0].title == "Durable"
+        await recovered.close()
+
+    async def test_recover_from_snapshot_and_log(self, store):
+        """Test that recovery combines the snapshot with later log records."""
+        first = await store.save(Task(title="Before snapshot"))
+        await store.snapshot()
+        second = await store.save(Task(title="After snapshot"))
+
+        assert len(list(store.directory.glob("snapshot-*.jsonl"))) == 1
+        assert len(list(store.directory.glob("log-*.jsonl"))) == 1
+
+        recovered = await reopen(store)
+
+        assert recovered.get(first.id).title == "Before snapshot"
+        assert recovered.get(second.id).title == "After snapshot"
+        await recovered.close()
+
+    async def test_torn_last_record_is_ignored(self, store):
+        """Test that an incomplete final log line does not block recovery."""
+        task = await store.save(Task(title="Complete"))
+        (log,) = store.directory.glob("log-*.jsonl")
+        with log.open("ab") as handle:
+            handle.write(b'{"id": "torn", "title": "Trunc')
+
+        recovered = await reopen(store)
+
+        assert list(recovered.tasks) == [task.id]
+        await recovered.close()
+
+
+class TestMemoryStoreEndpoints:
+    """Test cases for the API with the memory store enabled."""
+
+    @pytest.fixture
+    async def client(self, store, monkeypatch):
+        """HTTP client whose task routes use the memory store."""
+        monkeypatch.setattr(api, "memory_store", store)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+    async def test_task_lifecycle(self, client, store):
+        """Test create, update, list and archive against the memory store."""
+        created = await client.post("/api/v1/tasks", json={"title": "Memory"})
+        assert created.status_code == status.HTTP_201_CREATED
+        task_id = created.json()["id"]
+
+        updated = await client.put(f"/api/v1/tasks/{task_id}", json={"status": "done"})
+        assert updated.json()["completed_at"] is not None
+
+        listed = await client.get("/api/v1/tasks", params={"status": "done"})
+        assert [task["id"] for task in listed.json()["tasks"]] == [task_id]
+
+        archived = await client.delete(f"/api/v1/tasks/{task_id}")
+        assert archived.json()["status"] == "archived"
+        assert store.get(task_id).status == "archived"
+
+        streamed = await client.get(
+            "/api/v1/tasks", headers={"Accept": "application/x-ndjson"}
+        )
+        lines = [json.loads(line) for line in streamed.text.splitlines()]
+        assert lines[0]["id"] == task_id
+
+    async def test_recurring_task(self, client, store):
+        """Test that completing a recurring task saves its next occurrence."""
+        created = await client.post(
+            "/api/v1/tasks",
+            json={
+                "title": "Daily",
+                "due_at": "2026-03-02T09:00:00Z",
+                "recurrence": "FREQ=DAILY",
+            },
+        )
+        task_id = created.json()["id"]
+
+        await client.put(f"/api/v1/tasks/{task_id}", json={"status": "done"})
+
+        following = store.list_tasks(status=["todo"])
+        assert [task.recurrence for task in following] == ["FREQ=DAILY"]
+        recovered = await reopen(store)
+        assert recovered.get(following[0].id).recurrence == "FREQ=DAILY"
+        assert recovered.get(task_id).recurrence is None
+        await recovered.close()
+
+    async def test_missing_task(self, client):
+        """Test that unknown ids return 404."""
+        response = await client.get(
+            "/api/v1/tasks/00000000-0000-0000-0000-000000000000"
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    async def test_dependencies_not_supported(self, client, store):
+        """Test that dependencies are refused but the ready filter works."""
+        created = await client.post("/api/v1/tasks", json={"title": "Alone"})
+        task_id = created.json()["id"]
+
+        response = await client.post(
+            f"/api/v1/tasks/{task_id}/dependencies", json={"blocker_id": task_id}
+        )
+        ready = await client.get("/api/v1/tasks", params={"ready": True})
+
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert [task["id"] for task in ready.json()["tasks"]] == [task_id]
+
+    async def test_history_not_supported(self, client):
+        """Test that task history and undo are refused."""
+        created = await client.post("/api/v1/tasks", json={"title": "Alone"})
+        task_id = created.json()["id"]
+
+        history = await client.get(f"/api/v1/tasks/{task_id}/history")
+        undo = await client.post(f"/api/v1/tasks/{task_id}/undo")
+
+        assert history.status_code == status.HTTP_501_NOT_IMPLEMENTED
+        assert undo.status_code == status.HTTP_501_NOT_IMPLEMENTED
+
+    async def test_duplicate_checks(self, client):
+        """Test that duplicates are not looked for, and rejecting is refused."""
+        await client.post("/api/v1/tasks", json={"title": "Buy milk"})
+
+        warned = await client.post("/api/v1/tasks", json={"title": "Buy milk"})
+        rejected = await client.post(
+            "/api/v1/tasks",
+            params={"duplicates": "reject"},
+            json={"title": "Buy milk"},
+        )
+
+        assert warned.status_code == status.HTTP_201_CREATED
+        assert "x-possible-duplicates" not in warned.headers
+        assert rejected.status_code == status.HTTP_501_NOT_IMPLEMENTED
+
+    async def test_subtasks(self, client, store):
+        """Test subtree, progress and the parent filter from the children index."""
+        root = (await client.post("/api/v1/tasks", json={"title": "Root"})).json()
+        child = (
+            await client.post(
+                "/api/v1/tasks", json={"title": "Child", "parent_id": root["id"]}
+            )
+        ).json()
+        await client.post(
+            "/api/v1/tasks",
+            json={"title": "Leaf", "parent_id": child["id"], "status": "done"},
+        )
+
+        tree = await client.get(
+            f"/api/v1/tasks/{root['id']}", params={"include": "subtree"}
+        )
+        listed = await client.get("/api/v1/tasks", params={"parent": root["id"]})
+        cycle = await client.put(
+            f"/api/v1/tasks/{root['id']}", json={"parent_id": child["id"]}
+        )
+
+        assert [task["title"] for task in tree.json()["subtree"]] == ["Child", "Leaf"]
+        assert tree.json()["progress"] == {"done": 1, "total": 2}
+        assert [task["title"] for task in listed.json()["tasks"]] == ["Child"]
+        assert cycle.status_code == status.HTTP_409_CONFLICT
+        assert store.get(root["id"]).parent_id is None
+        recovered = await reopen(store)
+        assert [task.title for task in recovered.subtree(root["id"])] == [
+            "Child",
+            "Leaf",
+        ]
+        await recovered.close()
@@ -0,0 +1,100 @@
+"""Tests for the Alembic migrations."""
+
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+from alembic import command
+from alembic.config import Config
+from tick_task.config import settings
+
+ROOT = Path(__file__).resolve().parent.parent
+TAG_USAGE_TRIGGERS = {
+    "tasks_tag_usage_insert",
+    "tasks_tag_usage_update",
+    "tasks_tag_usage_delete",
+}
+
+
+@pytest.fixture
+def alembic_config(tmp_path):
+    """Alembic configuration for a fresh file database."""
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{tmp_path / 'tasks.db'}")
+    return config
+
+
+def triggers(config: Config) -> set[str]:
+    engine = sa.create_engine(config.get_main_option("sqlalchemy.url"))
+    with engine.connect() as connection:
+        names = connection.execute(
+            sa.text("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        ).scalars()
+        found = set(names)
+    engine.dispose()
+    return found
+
+
+def usage_count(config: Config, name: str) -> int:
+    engine = sa.create_engine(config.get_main_option("sqlalchemy.url"))
+    with engine.begin() as connection:
+        count = connection.execute(
+            sa.text("SELECT usage_count FROM tags WHERE name = :name"),
+            {"name": name},
+        ).scalar_one()
+    engine.dispose()
+    return count
+
+
+class TestMigrations:
+    """Test cases for upgrading and downgrading the schema."""
+
+    def test_upgrade_keeps_tag_usage_triggers(self, alembic_config):
+        """Test that table rebuilds do not drop the tag usage triggers."""
+        command.upgrade(alembic_config, "head")
+
+        assert TAG_USAGE_TRIGGERS <= triggers(alembic_config)
+
+    def test_tag_usage_counted_after_upgrade(self, alembic_config):
+        """Test that writes to a migrated database keep tag counts current."""
+        command.upgrade(alembic_config, "head")
+        engine = sa.create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+        with engine.begin() as connection:
+            connection.execute(sa.text("INSERT INTO tags (name) VALUES ('work')"))
+            connection.execute(
+                sa.text(
+                    "INSERT INTO tasks (id, title, status, priority, context,"
+                    " created_at, updated_at, tag_ids, open_blockers)"
+                    " VALUES ('00000000-0000-4000-8000-000000000001', 'Task',"
+                    " 'todo', 'medium', 'personal', '2026-01-01 00:00:00',"
+                    " '2026-01-01 00:00:00',"
+                    " (SELECT json_array(id) FROM tags WHERE name = 'work'), 0)"
+                )
+            )
+        engine.dispose()
+
+        assert usage_count(alembic_config, "work") == 1
+
+    def test_downgrade_keeps_tag_usage_triggers(self, alembic_config):
+        """Test that downgrading past the hierarchy keeps the triggers."""
+        command.upgrade(alembic_config, "head")
+        command.downgrade(alembic_config, "006")
+
+        assert TAG_USAGE_TRIGGERS <= triggers(alembic_config)
+
+    def test_upgrade_keeps_without_rowid_layout(self, alembic_config, monkeypatch):
+        """Test that the compact WITHOUT ROWID layout survives the rebuilds."""
+        monkeypatch.setattr(settings, "compact_storage", True)
+        monkeypatch.setattr(settings, "compact_without_rowid", True)
+        command.upgrade(alembic_config, "head")
+
+        engine = sa.create_engine(alembic_config.get_main_option("sqlalchemy.url"))
+        with engine.connect() as connection:
+            sql = connection.execute(
+                sa.text("SELECT sql FROM sqlite_master WHERE name = 'tasks'")
+            ).scalar_one()
+        engine.dispose()
+        assert sql.rstrip().endswith("WITHOUT ROWID")
+        assert TAG_USAGE_TRIGGERS <= triggers(alembic_config)
@@ -0,0 +1,180 @@
+"""Tests for recurring tasks."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from tick_task.models import Task
+from tick_task.recurrence import next_occurrence, normalize_rule
+
+MONDAY = datetime(2026, 3, 2, 9, 0)
+
+
+class TestNormalizeRule:
+    """Test cases for recurrence rule validation."""
+
+    def test_normalizes_case_and_prefix(self):
+        """Test that rules are stored uppercased without the RRULE: prefix."""
+        assert normalize_rule(" rrule:freq=weekly;byday=mo ") == "FREQ=WEEKLY;BYDAY=MO"
+
+    @pytest.mark.parametrize(
+        "rule",
+        [
+            "",
+            "FREQ=SOMETIMES",
+            "INTERVAL=2",
+            "DTSTART:20260101T000000\nRRULE:FREQ=DAILY",
+            "FREQ=DAILY;BYDAY=XX",
+        ],
+    )
+    def test_rejects_invalid_rules(self, rule):
+        """Test that anything but a single valid RRULE is rejected."""
+        with pytest.raises(ValueError):
+            normalize_rule(rule)
+
+
+class TestNextOccurrence:
+    """Test cases for materializing the next occurrence."""
+
+    def test_moves_rule_to_next_occurrence(self):
+        """Test that the next occurrence copies the task and takes the rule."""
+        task = Task(
+            title="Review",
+            priority="high",
+            tags=["work"],
+            workspace="w",
+            due_at=MONDAY,
+            recurrence="FREQ=WEEKLY",
+            status="done",
+            completed_at=MONDAY - timedelta(hours=1),
+        )
+
+        following = next_occurrence(task)
+
+        assert following.due_at == MONDAY + timedelta(weeks=1)
+        assert following.status == "todo"
+        assert (following.title, following.priority) == ("Review", "high")
+        assert (following.tags, following.workspace) == (["work"], "w")
+        assert following.recurrence == "FREQ=WEEKLY"
+        assert task.recurrence is None
+
+    def test_skips_occurrences_missed_while_open(self):
+        """Test that a late completion schedules the first future occurrence."""
+        task = Task(
+            title="Water plants",
+            due_at=MONDAY,
+            recurrence="FREQ=DAILY",
+            completed_at=MONDAY + timedelta(days=3, hours=2),
+        )
+
+        assert next_occurrence(task).due_at == MONDAY + timedelta(days=4)
+
+    def test_count_is_used_up(self):
+        """Test that COUNT shrinks by the occurrences consumed and then ends."""
+        task = Task(
+            title="Dose",
+            due_at=MONDAY,
+            recurrence="FREQ=DAILY;COUNT=4",
+            completed_at=MONDAY + timedelta(days=1, hours=1),
+        )
+
+        following = next_occurrence(task)
+
+        assert following.due_at == MONDAY + timedelta(days=2)
+        assert following.recurrence == "FREQ=DAILY;COUNT=2"
+        following.completed_at = following.due_at
+        last = next_occurrence(following)
+        assert last.recurrence == "FREQ=DAILY;COUNT=1"
+        last.completed_at = last.due_at
+        assert next_occurrence(last) is None
+        assert last.recurrence is None
+
+    def test_until_ends_series(self):
+        """Test that no occurrence is created past UNTIL."""
+        task = Task(
+            title="Sprint",
+            due_at=MONDAY,
+            recurrence="FREQ=WEEKLY;UNTIL=20260305T000000Z",
+            completed_at=MONDAY,
+        )
+
+        assert next_occurrence(task) is None
+
+    def test_without_due_date(self):
+        """Test that a task without a due date recurs from its creation."""
+        task = Task(
+            title="Stretch",
+            created_at=MONDAY,
+            recurrence="FREQ=DAILY",
+            completed_at=MONDAY + timedelta(hours=2),
+        )
+
+        assert next_occurrence(task).due_at == MONDAY + timedelta(days=1)
+
+    def test_not_recurring(self):
+        """Test that ordinary tasks have no next occurrence."""
+        assert next_occurrence(Task(title="Once", completed_at=MONDAY)) is None
+
+
+class TestRecurringTaskEndpoints:
+    """Test cases for recurring tasks through the API."""
+
+    def test_completing_creates_next_occurrence(self, client):
+        """Test that only the open occurrence of a series exists as a row."""
+        due = (datetime.utcnow() + timedelta(hours=1)).replace(microsecond=0)
+        task = client.post(
+            "/api/v1/tasks",
+            json={
+                "title": "Standup",
+                "due_at": due.isoformat(),
+                "recurrence": "RRULE:freq=daily",
+                "tags": ["work"],
+            },
+        ).json()
+        assert task["recurrence"] == "FREQ=DAILY"
+
+        done = client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+        # Reopening and completing again does not fork the series
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "todo"})
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+
+        assert done.json()["recurrence"] is None
+        tasks = client.get("/api/v1/tasks").json()["tasks"]
+        assert len(tasks) == 2
+        following = next(t for t in tasks if t["id"] != task["id"])
+        assert following["status"] == "todo"
+        assert following["recurrence"] == "FREQ=DAILY"
+        assert following["tags"] == ["work"]
+        assert following["due_at"].startswith((due + timedelta(days=1)).isoformat())
+        assert client.get("/api/v1/tags").json()["tags"][0]["usage_count"] == 2
+
+    def test_created_done_creates_next_occurrence(self, client):
+        """Test that a recurring task created as done also rolls over."""
+        client.post(
+            "/api/v1/tasks",
+            json={"title": "Log", "status": "done", "recurrence": "FREQ=WEEKLY"},
+        )
+
+        tasks = client.get("/api/v1/tasks", params={"status": "todo"}).json()["tasks"]
+
+        assert [task["recurrence"] for task in tasks] == ["FREQ=WEEKLY"]
+
+    def test_invalid_rule(self, client):
+        """Test that an invalid rule is a validation error."""
+        response = client.post(
+            "/api/v1/tasks", json={"title": "A", "recurrence": "FREQ=FORTNIGHTLY"}
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_clear_rule(self, client):
+        """Test that setting the rule to null stops a task recurring."""
+        task = client.post(
+            "/api/v1/tasks", json={"title": "A", "recurrence": "FREQ=DAILY"}
+        ).json()
+
+        client.put(f"/api/v1/tasks/{task['id']}", json={"recurrence": None})
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+
+        assert len(client.get("/api/v1/tasks").json()["tasks"]) == 1
@@ -0,0 +1,272 @@
+"""Tests for the due-date reminder scheduler."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import status
+
+from tick_task import api, reminders
+from tick_task.memory_store import MemoryStore
+from tick_task.models import Task
+from tick_task.reminders import (
+    Reminder,
+    ReminderScheduler,
+    event_stream,
+    reminders_in,
+    upcoming_reminders,
+)
+
+NOW = datetime(2026, 3, 2, 9, 0)
+
+
+class FakeClock:
+    """Clock that only moves when told to."""
+
+    def __init__(self, now: datetime = NOW) -> None:
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Settable clock starting at ``NOW``."""
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(tmp_path, clock):
+    """Scheduler with one-minute wheel buckets and a fake clock."""
+    return ReminderScheduler(
+        tmp_path / "reminders.json", bucket_seconds=60, clock=clock
+    )
+
+
+class TestReminderScheduler:
+    """Test cases for scheduling and firing reminders."""
+
+    def test_fires_in_due_order_across_heap_and_wheel(self, scheduler):
+        """Test that near and far reminders fire in order once due."""
+        scheduler.schedule("far", "Far", NOW + timedelta(days=2))
+        scheduler.schedule("near", "Near", NOW + timedelta(seconds=10))
+        scheduler.schedule("later", "Later", NOW + timedelta(hours=1))
+
+        assert scheduler.due(NOW) == []
+        assert [r.task_id for r in scheduler.due(NOW + timedelta(minutes=1))] == [
+            "near"
+        ]
+        assert [r.task_id for r in scheduler.due(NOW + timedelta(days=3))] == [
+            "later",
+            "far",
+        ]
+        assert len(scheduler) == 0
+
+    def test_next_wakeup(self, scheduler):
+        """Test that the timer sleeps until the next reminder or bucket."""
+        scheduler.schedule("near", "Near", NOW + timedelta(seconds=10))
+        scheduler.schedule("far", "Far", NOW + timedelta(days=1))
+
+        assert scheduler.next_wakeup() == NOW + timedelta(seconds=10)
+        scheduler.due(NOW + timedelta(seconds=10))
+        # The next bucket has to be poured at its start
+        assert scheduler.next_wakeup() == NOW + timedelta(minutes=1)
+
+    def test_reschedule_and_cancel(self, scheduler):
+        """Test that moved and cancelled reminders do not fire."""
+        scheduler.schedule("a", "A", NOW + timedelta(seconds=5))
+        scheduler.schedule("b", "B", NOW + timedelta(days=1))
+        scheduler.schedule("a", "A", NOW + timedelta(seconds=20))
+        scheduler.cancel("b")
+
+        fired = scheduler.due(NOW + timedelta(days=2))
+
+        assert fired == [Reminder("a", "A", NOW + timedelta(seconds=20))]
+
+    def test_track(self, scheduler):
+        """Test that open tasks with a due date are tracked and others dropped."""
+        task = Task(title="Report", due_at=NOW + timedelta(hours=1))
+        scheduler.track(task)
+        assert len(scheduler) == 1
+
+        task.status = "done"
+        scheduler.track(task)
+        assert len(scheduler) == 0
+
+        scheduler.track(Task(title="Someday"))
+        assert len(scheduler) == 0
+
+    def test_past_due_times_do_not_fire(self, scheduler):
+        """Test that a due time at or before the cursor is ignored."""
+        scheduler.schedule("old", "Old", NOW - timedelta(minutes=5))
+
+        assert len(scheduler) == 0
+
+    async def test_delivers_to_callbacks_and_listeners(self, scheduler, clock):
+        """Test that every subscriber gets each reminder, despite failures."""
+        received = []
+
+        async def record(reminder: Reminder) -> None:
+            received.append(reminder.task_id)
+
+        def fail(reminder: Reminder) -> None:
+            raise RuntimeError("boom")
+
+        scheduler.subscribe(fail)
+        unsubscribe = scheduler.subscribe(record)
+        queue = scheduler.listen()
+        scheduler.schedule("a", "A", NOW + timedelta(seconds=1))
+
+        clock.now = NOW + timedelta(seconds=2)
+        await scheduler.run_once()
+        unsubscribe()
+
+        assert received == ["a"]
+        assert queue.get_nowait() == (1, Reminder("a", "A", NOW + timedelta(seconds=1)))
+        assert scheduler.delivered == 1
+
+    async def test_listen_replays_after_last_event_id(self, scheduler, clock):
+        """Test that a reconnecting listener gets the events it missed."""
+        for name in ("a", "b", "c"):
+            scheduler.schedule(name, name.upper(), NOW + timedelta(seconds=1))
+        clock.now = NOW + timedelta(seconds=1)
+        await scheduler.run_once()
+
+        queue = scheduler.listen(last_event_id=1)
+
+        assert [queue.get_nowait()[0] for _ in range(queue.qsize())] == [2, 3]
+
+    async def test_at_least_once_across_restarts(self, tmp_path, scheduler, clock):
+        """Test that reminders after the persisted cursor fire again on restart."""
+        tasks = [
+            Reminder("a", "A", NOW + timedelta(seconds=1)),
+            Reminder("b", "B", NOW + timedelta(seconds=3)),
+        ]
+
+        async def loader(since: datetime) -> list[Reminder]:
+            return [reminder for reminder in tasks if reminder.due_at > since]
+
+        scheduler.load(tasks)
+        clock.now = NOW + timedelta(seconds=2)
+        await scheduler.run_once()
+        # "b" fell due but the process died before the pass that fires it
+        clock.now = NOW + timedelta(seconds=4)
+
+        restarted = ReminderScheduler(
+            tmp_path / "reminders.json", bucket_seconds=60, clock=clock
+        )
+        fired = []
+        restarted.subscribe(fired.append)
+        await restarted.start(loader)
+        await asyncio.sleep(0)
+        await restarted.stop()
+
+        assert json.loads((tmp_path / "reminders.json").read_text()) == {
+            "cursor": clock.now.isoformat()
+        }
+        assert [reminder.task_id for reminder in fired] == ["b"]
+
+    async def test_timer_fires_when_due(self, tmp_path):
+        """Test that the running timer fires a reminder scheduled after start."""
+        scheduler = ReminderScheduler(tmp_path / "reminders.json")
+        fired = asyncio.Event()
+        scheduler.subscribe(lambda reminder: fired.set())
+
+        async def nothing(since: datetime) -> list[Reminder]:
+            return []
+
+        await scheduler.start(nothing)
+        scheduler.schedule(
+            "soon", "Soon", datetime.utcnow() + timedelta(milliseconds=50)
+        )
+        await asyncio.wait_for(fired.wait(), timeout=2)
+        await scheduler.stop()
+
+
+class TestEventStream:
+    """Test cases for the Server-Sent Events encoding."""
+
+    async def test_events_and_keepalive(self, scheduler, clock):
+        """Test that idle periods send comments and reminders send events."""
+        stream = event_stream(scheduler, keepalive_seconds=0.01)
+
+        assert await stream.__anext__() == b": keep-alive\n\n"
+        scheduler.schedule("a", "A", NOW + timedelta(seconds=1))
+        clock.now = NOW + timedelta(seconds=1)
+        await scheduler.run_once()
+        event = await stream.__anext__()
+        await stream.aclose()
+
+        lines = event.decode().splitlines()
+        assert lines[:2] == ["id: 1", "event: reminder"]
+        assert json.loads(lines[2].removeprefix("data: ")) == {
+            "task_id": "a",
+            "title": "A",
+            "due_at": (NOW + timedelta(seconds=1)).isoformat(),
+        }
+        assert not scheduler._listeners
+
+
+class TestUpcomingReminders:
+    """Test cases for loading reminders from storage."""
+
+    async def test_from_database(self, db_session):
+        """Test that open tasks due after the cursor are loaded."""
+        db_session.add_all(
+            [
+                Task(title="Due", due_at=NOW + timedelta(hours=1)),
+                Task(title="Done", due_at=NOW + timedelta(hours=1), status="done"),
+                Task(title="Past", due_at=NOW - timedelta(hours=1)),
+                Task(title="Undated"),
+            ]
+        )
+        await db_session.commit()
+
+        loaded = await reminders_in(db_session, NOW)
+
+        assert [reminder.title for reminder in loaded] == ["Due"]
+
+    async def test_from_memory_store(self, tmp_path, monkeypatch):
+        """Test that the memory engine's due-date index is used."""
+        store = MemoryStore(tmp_path / "memory", fsync_interval=0, snapshot_interval=0)
+        await store.open()
+        monkeypatch.setattr(reminders, "memory_store", store)
+        await store.save(Task(title="Due", due_at=NOW + timedelta(hours=1)))
+        await store.save(Task(title="Past", due_at=NOW - timedelta(hours=1)))
+        await store.save(Task(title="Archived", due_at=NOW, status="archived"))
+
+        loaded = await upcoming_reminders(NOW - timedelta(minutes=1))
+        await store.close()
+
+        assert [reminder.title for reminder in loaded] == ["Due"]
+
+
+class TestReminderEndpoints:
+    """Test cases for reminders kept current by the task endpoints."""
+
+    @pytest.fixture
+    def scheduler(self, tmp_path, monkeypatch):
+        """Scheduler the task endpoints report to."""
+        scheduler = ReminderScheduler(tmp_path / "reminders.json")
+        monkeypatch.setattr(api, "reminder_scheduler", scheduler)
+        return scheduler
+
+    def test_task_writes_update_reminders(self, client, scheduler):
+        """Test that create, update and archive schedule and cancel reminders."""
+        due = (datetime.utcnow() + timedelta(hours=2)).isoformat()
+        task = client.post("/api/v1/tasks", json={"title": "A", "due_at": due}).json()
+        other = client.post("/api/v1/tasks", json={"title": "B", "due_at": due}).json()
+        assert len(scheduler) == 2
+
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+        client.delete(f"/api/v1/tasks/{other['id']}")
+
+        assert len(scheduler) == 0
+
+    def test_stream_disabled(self, client):
+        """Test that the stream is not found when reminders are disabled."""
+        response = client.get("/api/v1/reminders")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
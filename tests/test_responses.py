@@ -0,0 +1,66 @@
+"""Tests for response serialization helpers."""
+
+import json
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from tick_task.models import Task
+from tick_task.responses import TASK_LIST_ADAPTER, ModelJSONResponse, task_response
+from tick_task.schemas import Task as TaskSchema
+from tick_task.schemas import TaskList
+
+
+def make_task() -> Task:
+    """Build a transient task with timezone-aware and naive datetimes."""
+    return Task(
+        title="Serialize me",
+        due_at=datetime(2024, 12, 31, 23, 59, 59, tzinfo=timezone.utc),
+        created_at=datetime(2024, 1, 1, 8, 0, 0, 123456),
+        tags=["a", "b"],
+    )
+
+
+class TestModelJSONResponse:
+    """Test cases for ModelJSONResponse."""
+
+    def test_matches_fastapi_encoding(self):
+        """Test that output matches FastAPI's default model encoding."""
+        model = TaskSchema.model_validate(make_task())
+
+        body = ModelJSONResponse(model).body
+
+        assert json.loads(body) == jsonable_encoder(model)
+
+    def test_datetime_iso_format(self):
+        """Test that datetimes keep their ISO 8601 format."""
+        body = json.loads(task_response(make_task()).body)
+
+        assert body["due_at"] == "2024-12-31T23:59:59+00:00"
+        assert body["created_at"] == "2024-01-01T08:00:00.123456"
+
+    def test_plain_content_falls_back_to_json(self):
+        """Test that non-model content is rendered as regular JSON."""
+        response = ModelJSONResponse({"ok": True})
+
+        assert json.loads(response.body) == {"ok": True}
+
+    def test_task_response_status_code(self):
+        """Test that task_response forwards the status code."""
+        assert task_response(make_task(), status_code=201).status_code == 201
+
+
+class TestTaskListAdapter:
+    """Test cases for the task list adapter."""
+
+    def test_validates_orm_rows(self):
+        """Test that ORM rows are validated into response models."""
+        tasks = TASK_LIST_ADAPTER.validate_python(
+            [make_task(), make_task()], from_attributes=True
+        )
+
+        page = TaskList.model_construct(tasks=tasks, pagination={"has_more": False})
+        body = json.loads(ModelJSONResponse(page).body)
+
+        assert len(body["tasks"]) == 2
+        assert body["tasks"][0]["title"] == "Serialize me"
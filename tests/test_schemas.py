@@ -1,16 +1,23 @@
 """Tests for Pydantic schemas."""
 
 from datetime import datetime
+from typing import get_args
 
 import pytest
 from pydantic import ValidationError
 
+from tick_task.models import TASK_CONTEXTS, TASK_PRIORITIES, TASK_STATUSES
 from tick_task.schemas import (
+    MAX_BATCH_SIZE,
+    TASK_BATCH_ADAPTER,
     ErrorResponse,
     HealthResponse,
     Task,
+    TaskContext,
     TaskCreate,
     TaskList,
+    TaskPriority,
+    TaskStatus,
     TaskUpdate,
 )
 
@@ -139,17 +146,17 @@ class TestTaskCreateSchema:
         # Empty tag
         with pytest.raises(ValidationError) as exc_info:
             TaskCreate(title="Test", tags=[""])
-        assert "Tag cannot be empty" in str(exc_info.value)
+        assert exc_info.value.errors()[0]["type"] == "string_too_short"
 
         # Whitespace-only tag
         with pytest.raises(ValidationError) as exc_info:
             TaskCreate(title="Test", tags=["   "])
-        assert "Tag cannot be empty" in str(exc_info.value)
+        assert exc_info.value.errors()[0]["type"] == "string_too_short"
 
         # Tag too long
         with pytest.raises(ValidationError) as exc_info:
             TaskCreate(title="Test", tags=["x" * 51])
-        assert "Tag must be 50 characters" in str(exc_info.value)
+        assert exc_info.value.errors()[0]["type"] == "string_too_long"
 
     def test_task_create_workspace_length_limit(self):
         """Test workspace length constraints."""
@@ -201,6 +208,44 @@ class TestTaskUpdateSchema:
         with pytest.raises(ValidationError):
             TaskUpdate(tags=[""])
 
+    def test_task_update_normalizes_tags(self):
+        """Test that TaskUpdate keeps the stripped, lowercased tags."""
+        update = TaskUpdate(tags=["  Work ", "HOME"])
+        assert update.tags == ["work", "home"]
+
+
+class TestEnumerations:
+    """Test cases for the literal enumeration types."""
+
+    def test_literals_match_model_enumerations(self):
+        """Test that schema literals list the same values as the model."""
+        assert get_args(TaskStatus) == TASK_STATUSES
+        assert get_args(TaskPriority) == TASK_PRIORITIES
+        assert get_args(TaskContext) == TASK_CONTEXTS
+
+
+class TestTaskBatchAdapter:
+    """Test cases for the batch payload adapter."""
+
+    def test_validate_json(self):
+        """Test that a raw JSON array validates into TaskCreate models."""
+        tasks = TASK_BATCH_ADAPTER.validate_json(
+            b'[{"title": "One", "tags": [" A "]}, {"title": "Two", "status": "done"}]'
+        )
+        assert [task.title for task in tasks] == ["One", "Two"]
+        assert tasks[0].tags == ["a"]
+        assert tasks[1].status == "done"
+
+    def test_batch_size_limits(self):
+        """Test that empty and oversized batches are rejected."""
+        with pytest.raises(ValidationError):
+            TASK_BATCH_ADAPTER.validate_python([])
+
+        with pytest.raises(ValidationError):
+            TASK_BATCH_ADAPTER.validate_python(
+                [{"title": "Task"}] * (MAX_BATCH_SIZE + 1)
+            )
+
 
 class TestTaskSchema:
     """Test cases for Task response schema."""
@@ -0,0 +1,135 @@
+"""Tests for the thread-pool SQLite driver mode."""
+
+import asyncio
+
+import pytest
+from fastapi import Request, status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from tick_task.config import SQLITE_PROFILES
+from tick_task.database import READ_ONLY_METHODS, create_sync_database_engine, get_db
+from tick_task.main import app
+from tick_task.models import Base, Task
+from tick_task.sqlite_threadpool import ThreadPoolDriver
+
+
+@pytest.fixture
+def driver(tmp_path):
+    """Thread-pool driver over a fresh database file."""
+    url = f"sqlite+aiosqlite:///{tmp_path / 'threadpool.db'}"
+    pragmas = SQLITE_PROFILES["balanced"]
+    write_engine = create_sync_database_engine(
+        url, pragmas, pool_size=1, max_overflow=0
+    )
+    Base.metadata.create_all(write_engine)
+    read_engine = create_sync_database_engine(
+        url, {**pragmas, "query_only": True}, pool_size=2, max_overflow=0
+    )
+    driver = ThreadPoolDriver(write_engine, read_engine, read_pool_size=2)
+    yield driver
+    driver.dispose()
+
+
+class TestThreadPoolSession:
+    """Test cases for sessions that run on the thread pool."""
+
+    async def test_unit_of_work(self, driver):
+        """Test create, commit, get and query through the session."""
+        async with driver.write_session() as session:
+            task = Task(title="Threaded")
+            session.add(task)
+            await session.commit()
+            await session.refresh(task)
+
+        async with driver.read_session() as session:
+            found = await session.get(Task, task.id)
+            titles = (await session.execute(select(Task.title))).scalars().all()
+
+        assert found.title == "Threaded"
+        assert titles == ["Threaded"]
+
+    async def test_stream_yields_rows(self, driver):
+        """Test that stream() returns an async iterable of rows."""
+        async with driver.write_session() as session:
+            session.add_all([Task(title=f"Task {i}") for i in range(3)])
+            await session.commit()
+
+        async with driver.read_session() as session:
+            rows = await session.stream(select(Task.title).order_by(Task.title))
+            titles = [row.title async for row in rows]
+
+        assert titles == ["Task 0", "Task 1", "Task 2"]
+
+    async def test_run_sync_is_one_job(self, driver):
+        """Test that run_sync runs a whole unit of work on a worker thread."""
+
+        def create_and_count(session):
+            session.add(Task(title="In one hop"))
+            session.commit()
+            return len(session.execute(select(Task)).scalars().all())
+
+        async with driver.write_session() as session:
+            assert await session.run_sync(create_and_count) == 1
+
+    async def test_concurrent_writers_do_not_deadlock(self, driver):
+        """Test that more writers than worker threads all complete."""
+
+        async def write(i: int) -> None:
+            async with driver.write_session() as session:
+                session.add(Task(title=f"Task {i}"))
+                await asyncio.sleep(0)
+                await session.commit()
+
+        await asyncio.wait_for(
+            asyncio.gather(*(write(i) for i in range(20))), timeout=10
+        )
+
+        async with driver.read_session() as session:
+            count = len((await session.execute(select(Task))).scalars().all())
+        assert count == 20
+
+    async def test_read_sessions_are_query_only(self, driver):
+        """Test that read sessions cannot write."""
+        async with driver.read_session() as session:
+            session.add(Task(title="Nope"))
+            with pytest.raises(Exception):
+                await session.commit()
+            await session.rollback()
+
+
+class TestThreadPoolEndpoints:
+    """Test cases for the API running on the thread-pool driver."""
+
+    def test_task_lifecycle(self, driver):
+        """Test the task endpoints end to end."""
+
+        async def override_get_db(request: Request):
+            if request.method in READ_ONLY_METHODS:
+                session = driver.read_session()
+            else:
+                session = driver.write_session()
+            async with session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            with TestClient(app) as client:
+                created = client.post("/api/v1/tasks", json={"title": "Hop"})
+                assert created.status_code == status.HTTP_201_CREATED
+                task_id = created.json()["id"]
+
+                updated = client.put(
+                    f"/api/v1/tasks/{task_id}", json={"status": "done"}
+                )
+                assert updated.json()["completed_at"] is not None
+
+                listed = client.get("/api/v1/tasks").json()
+                assert [task["id"] for task in listed["tasks"]] == [task_id]
+
+                streamed = client.get(
+                    "/api/v1/tasks", headers={"Accept": "application/x-ndjson"}
+                )
+                assert len(streamed.text.splitlines()) == 2
+        finally:
+            app.dependency_overrides.clear()
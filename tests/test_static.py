@@ -0,0 +1,199 @@
+"""Tests for serving the built frontend."""
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tick_task.config import settings
+from tick_task.main import create_application
+from tick_task.static import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    FrontendAssets,
+    etag_matches,
+    load_assets,
+)
+
+INDEX_HTML = "<!doctype html><html><body><div id='root'></div></body></html>"
+APP_JS = "console.log('tick-task');" * 100
+
+
+@pytest.fixture
+def dist_dir(tmp_path):
+    """Create a minimal Vite-style build output."""
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (tmp_path / "index.html").write_text(INDEX_HTML)
+    (tmp_path / "vite.svg").write_text("<svg></svg>")
+    (assets / "index-4f2a9c1b.js").write_text(APP_JS)
+    (assets / "index-4f2a9c1b.js.gz").write_bytes(gzip.compress(APP_JS.encode()))
+    return tmp_path
+
+
+@pytest.fixture
+def static_client(dist_dir):
+    """Test client for the frontend asset app alone."""
+    return TestClient(FrontendAssets(dist_dir))
+
+
+class TestLoadAssets:
+    """Test cases for loading the build output into memory."""
+
+    def test_siblings_are_attached_not_served(self, dist_dir):
+        """Test that .gz siblings become variants of the original file."""
+        assets = load_assets(dist_dir)
+
+        assert "assets/index-4f2a9c1b.js.gz" not in assets
+        assert "gzip" in assets["assets/index-4f2a9c1b.js"].encoded
+
+    def test_cache_control_by_filename(self, dist_dir):
+        """Test that only hashed assets are marked immutable."""
+        assets = load_assets(dist_dir)
+
+        assert assets["assets/index-4f2a9c1b.js"].cache_control == (
+            IMMUTABLE_CACHE_CONTROL
+        )
+        assert assets["index.html"].cache_control == REVALIDATE_CACHE_CONTROL
+        assert assets["vite.svg"].cache_control == REVALIDATE_CACHE_CONTROL
+
+
+class TestEtagMatches:
+    """Test cases for If-None-Match comparison."""
+
+    def test_matching(self):
+        """Test exact, weak, listed and wildcard matches."""
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches('"x", "abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+
+    def test_not_matching(self):
+        """Test that substrings and empty headers do not match."""
+        assert not etag_matches('"abcd"', '"abc"')
+        assert not etag_matches('"abc-gzip"', '"abc"')
+        assert not etag_matches("", '"abc"')
+
+
+class TestFrontendAssets:
+    """Test cases for the frontend asset app."""
+
+    def test_index_served_at_root(self, static_client):
+        """Test that the root path serves index.html."""
+        response = static_client.get("/")
+
+        assert response.status_code == 200
+        assert response.text == INDEX_HTML
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+    def test_index_etag_not_modified(self, static_client):
+        """Test that a matching If-None-Match returns 304."""
+        etag = static_client.get("/").headers["etag"]
+
+        response = static_client.get("/", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_if_none_match_list(self, static_client):
+        """Test that If-None-Match entries are parsed and compared exactly."""
+        etag = static_client.get("/").headers["etag"]
+
+        def status_for(if_none_match: str) -> int:
+            return static_client.get(
+                "/", headers={"If-None-Match": if_none_match}
+            ).status_code
+
+        assert status_for(f'"other", W/{etag}') == 304
+        assert status_for("*") == 304
+        assert status_for(f'"x{etag[1:]}') == 200
+        assert status_for(etag[:-2] + '"') == 200
+
+    def test_etag_per_encoding(self, static_client):
+        """Test that each encoding has its own ETag and is revalidated alone."""
+        path = "/assets/index-4f2a9c1b.js"
+        plain = static_client.get(path, headers={"Accept-Encoding": "identity"})
+        zipped = static_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert plain.headers["etag"] != zipped.headers["etag"]
+        assert zipped.headers["vary"] == "Accept-Encoding"
+
+        reused = static_client.get(
+            path,
+            headers={
+                "Accept-Encoding": "identity",
+                "If-None-Match": zipped.headers["etag"],
+            },
+        )
+        revalidated = static_client.get(
+            path,
+            headers={
+                "Accept-Encoding": "gzip",
+                "If-None-Match": zipped.headers["etag"],
+            },
+        )
+
+        assert reused.status_code == 200
+        assert reused.text == APP_JS
+        assert revalidated.status_code == 304
+        assert revalidated.headers["vary"] == "Accept-Encoding"
+
+    def test_precompressed_variant(self, static_client):
+        """Test that precompressed siblings are served when accepted."""
+        response = static_client.get(
+            "/assets/index-4f2a9c1b.js", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.text == APP_JS
+
+    def test_identity_variant(self, static_client):
+        """Test that clients without gzip get the original bytes."""
+        response = static_client.get(
+            "/assets/index-4f2a9c1b.js", headers={"Accept-Encoding": "identity"}
+        )
+
+        assert "content-encoding" not in response.headers
+        assert response.text == APP_JS
+
+    def test_spa_fallback_for_browser_navigation(self, static_client):
+        """Test that client-side routes fall back to index.html."""
+        response = static_client.get("/today", headers={"Accept": "text/html"})
+
+        assert response.status_code == 200
+        assert response.text == INDEX_HTML
+
+    def test_missing_asset_is_404(self, static_client):
+        """Test that missing non-HTML requests are not rewritten."""
+        response = static_client.get("/assets/missing.js")
+
+        assert response.status_code == 404
+
+    def test_rejects_writes(self, static_client):
+        """Test that non-GET methods are rejected."""
+        response = static_client.post("/")
+
+        assert response.status_code == 405
+
+
+class TestApplicationMount:
+    """Test cases for mounting the frontend in the application."""
+
+    def test_frontend_mounted_when_built(self, dist_dir, monkeypatch):
+        """Test that the application serves the frontend next to the API."""
+        monkeypatch.setattr(settings, "frontend_dist", dist_dir)
+        client = TestClient(create_application())
+
+        assert client.get("/").text == INDEX_HTML
+        assert client.get("/docs").status_code == 200
+
+    def test_root_redirects_without_build(self, tmp_path, monkeypatch):
+        """Test that root still redirects to docs without a build."""
+        monkeypatch.setattr(settings, "frontend_dist", tmp_path / "missing")
+        client = TestClient(create_application())
+
+        response = client.get("/", follow_redirects=False)
+
+        assert response.status_code in (302, 307)
+        assert response.headers["location"] == "/docs"
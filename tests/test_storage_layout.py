@@ -0,0 +1,213 @@
+"""Tests for converting databases between storage layouts."""
+
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from tick_task import storage_layout
+from tick_task.config import settings
+from tick_task.database import create_database_engine, get_db
+from tick_task.main import app
+from tick_task.models import TAG_USAGE_TRIGGERS
+from tick_task.storage_layout import (
+    StorageLayoutError,
+    check_layout,
+    convert_database,
+    database_layout,
+    layout_tables,
+)
+
+ROOT_ID = "6f1c2b4e-8a57-4c1e-9d3a-2b7e5f0a9c11"
+CHILD_ID = "0b9e7d2a-3c41-4f6e-8a5b-7d2c1e9f4a36"
+CREATED = datetime(2026, 3, 1, 9, 30, 15, 250000)
+
+
+def create_database(path, compact: bool, without_rowid: bool = False) -> str:
+    """A file database in one layout holding two tasks, a tag and a view."""
+    url = f"sqlite:///{path}"
+    tables = layout_tables(compact, without_rowid).tables
+    engine = sa.create_engine(url)
+    with engine.begin() as connection:
+        tables["tasks"].metadata.create_all(connection)
+        for trigger in TAG_USAGE_TRIGGERS:
+            connection.exec_driver_sql(trigger)
+        connection.execute(sa.insert(tables["tags"]), {"id": 1, "name": "work"})
+        task = {
+            "description": None,
+            "status": "todo",
+            "priority": "high",
+            "due_at": None,
+            "recurrence": None,
+            "context": "professional",
+            "workspace": None,
+            "created_at": CREATED,
+            "updated_at": CREATED,
+            "completed_at": None,
+            "open_blockers": 0,
+            "topo_order": None,
+        }
+        connection.execute(
+            sa.insert(tables["tasks"]),
+            [
+                {**task, "id": ROOT_ID, "title": "Root", "tag_ids": [1]},
+                {**task, "id": CHILD_ID, "title": "Child", "tag_ids": []},
+            ],
+        )
+        connection.execute(
+            sa.update(tables["tasks"])
+            .where(tables["tasks"].c.id == CHILD_ID)
+            .values(parent_id=ROOT_ID, status="done", completed_at=CREATED)
+        )
+        connection.execute(
+            sa.insert(tables["task_closure"]),
+            [
+                {"ancestor_id": ROOT_ID, "descendant_id": ROOT_ID, "depth": 0},
+                {"ancestor_id": CHILD_ID, "descendant_id": CHILD_ID, "depth": 0},
+                {"ancestor_id": ROOT_ID, "descendant_id": CHILD_ID, "depth": 1},
+            ],
+        )
+        connection.execute(
+            sa.insert(tables["saved_views"]),
+            {"id": CHILD_ID, "name": "Open", "filters": {}, "created_at": CREATED},
+        )
+    engine.dispose()
+    return url
+
+
+def read(url: str, compact: bool) -> dict:
+    """Layout, tasks, closure rows and schema objects of a database."""
+    tables = layout_tables(compact).tables
+    engine = sa.create_engine(url)
+    with engine.connect() as connection:
+        found = {
+            "layout": database_layout(connection),
+            "tasks": connection.execute(
+                sa.select(tables["tasks"]).order_by(tables["tasks"].c.title)
+            ).all(),
+            "closure": sorted(connection.execute(sa.select(tables["task_closure"]))),
+            "usage": connection.exec_driver_sql(
+                "SELECT usage_count FROM tags WHERE name = 'work'"
+            ).scalar_one(),
+            "schema": set(
+                connection.exec_driver_sql(
+                    "SELECT type, name FROM sqlite_master"
+                    " WHERE type IN ('index', 'trigger') AND sql IS NOT NULL"
+                ).all()
+            ),
+            "tasks_sql": connection.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE name = 'tasks'"
+            ).scalar_one(),
+        }
+    engine.dispose()
+    return found
+
+
+class TestConvert:
+    """Test cases for rebuilding a database in the other layout."""
+
+    def test_text_to_compact_and_back(self, tmp_path):
+        """Test that rows, indexes and triggers survive both conversions."""
+        url = create_database(tmp_path / "tasks.db", compact=False)
+        before = read(url, compact=False)
+
+        copied = convert_database(url, compact=True, without_rowid=True)
+        compact = read(url, compact=True)
+        convert_database(url, compact=False)
+        after = read(url, compact=False)
+
+        assert copied["tasks"] == 2
+        assert copied["task_closure"] == 3
+        assert compact["layout"] == "compact"
+        assert compact["tasks_sql"].rstrip().endswith("WITHOUT ROWID")
+        assert compact["tasks"] == before["tasks"]
+        assert compact["closure"] == before["closure"]
+        assert compact["schema"] == before["schema"]
+        assert after == before
+
+    def test_tag_usage_counted_after_conversion(self, tmp_path):
+        """Test that copying rows does not count tags again, new rows do."""
+        url = create_database(tmp_path / "tasks.db", compact=False)
+        convert_database(url, compact=True)
+        engine = sa.create_engine(url)
+        with engine.begin() as connection:
+            connection.execute(
+                sa.text("UPDATE tasks SET tag_ids = '[1]' WHERE title = 'Child'")
+            )
+        engine.dispose()
+
+        assert read(url, compact=True)["usage"] == 2
+
+    def test_already_in_layout(self, tmp_path):
+        """Test that a database already in the layout is left alone."""
+        url = create_database(tmp_path / "tasks.db", compact=True)
+
+        assert convert_database(url, compact=True) == {}
+
+    def test_outdated_schema_is_refused(self, tmp_path):
+        """Test that a database behind the migrations is not converted."""
+        url = create_database(tmp_path / "tasks.db", compact=False)
+        engine = sa.create_engine(url)
+        with engine.begin() as connection:
+            connection.exec_driver_sql("ALTER TABLE tasks DROP COLUMN recurrence")
+        engine.dispose()
+
+        with pytest.raises(StorageLayoutError, match="alembic upgrade head"):
+            convert_database(url, compact=True)
+
+        engine = sa.create_engine(url)
+        with engine.connect() as connection:
+            assert database_layout(connection) == "text"
+        engine.dispose()
+
+
+class TestCheckLayout:
+    """Test cases for refusing a database in the other layout."""
+
+    @pytest.fixture
+    def other_layout(self, tmp_path, monkeypatch):
+        """URL of a database in the layout the settings do not ask for."""
+        path = tmp_path / "tasks.db"
+        create_database(path, compact=not settings.compact_storage)
+        url = f"sqlite+aiosqlite:///{path}"
+        engine = create_database_engine(url)
+        monkeypatch.setattr(settings, "database_url", url)
+        monkeypatch.setattr(storage_layout, "engine", engine)
+        yield url
+        app.dependency_overrides.clear()
+
+    def test_check_layout(self, other_layout):
+        """Test that the mismatch names the conversion command."""
+        engine = sa.create_engine(other_layout.replace("+aiosqlite", ""))
+        with engine.connect() as connection:
+            with pytest.raises(StorageLayoutError, match="storage_layout"):
+                check_layout(connection)
+        engine.dispose()
+
+    def test_startup_refused_until_converted(self, other_layout):
+        """Test that the app only starts once the database is converted."""
+        sessions = async_sessionmaker(storage_layout.engine, class_=AsyncSession)
+
+        async def override_get_db():
+            async with sessions() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        with pytest.raises(StorageLayoutError):
+            with TestClient(app):
+                pass
+
+        convert_database(
+            other_layout, settings.compact_storage, settings.compact_without_rowid
+        )
+        with TestClient(app) as client:
+            response = client.get("/api/v1/tasks", params={"sort": "title"})
+
+        assert response.status_code == status.HTTP_200_OK
+        tasks = {task["title"]: task for task in response.json()["tasks"]}
+        assert tasks["Root"]["id"] == ROOT_ID
+        assert tasks["Child"]["parent_id"] == ROOT_ID
+        assert tasks["Root"]["tags"] == ["work"]
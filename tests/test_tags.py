@@ -0,0 +1,245 @@
+"""Tests for the interned tag vocabulary."""
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from tick_task.models import Base, Task
+from tick_task.tags import TagIndex, find_tag, intern_tags, list_tags, rename_tag
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File database with the application schema."""
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'tags.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def add_task(engine, title: str, tags: list) -> Task:
+    with Session(engine, expire_on_commit=False) as session:
+        task = Task(title=title, tags=tags)
+        session.add(task)
+        session.commit()
+        return task
+
+
+def load(engine, task_id: str) -> Task:
+    with Session(engine) as session:
+        task = session.get(Task, task_id)
+        session.expunge(task)
+        return task
+
+
+def usage(engine) -> dict:
+    with engine.connect() as connection:
+        return {tag.name: tag.usage_count for tag in list_tags(connection)}
+
+
+class TestInterning:
+    """Test cases for storing tag names as vocabulary ids."""
+
+    def test_intern_tags_creates_and_reuses_ids(self, engine):
+        """Test that names map to stable ids and repeats are dropped."""
+        with engine.begin() as connection:
+            ids, names = intern_tags(connection, ["a", "b", "a"])
+            again, _ = intern_tags(connection, ["b", "c"])
+
+        assert names == ["a", "b"]
+        assert len(set(ids)) == 2
+        assert again[0] == ids[1]
+        assert again[1] not in ids
+
+    def test_task_round_trip(self, engine):
+        """Test that tasks store ids and load names in their original order."""
+        task = add_task(engine, "A", ["work", "home", "work"])
+
+        assert task.tags == ["work", "home"]
+        loaded = load(engine, task.id)
+        assert loaded.tags == ["work", "home"]
+        assert len(loaded.tag_ids) == 2
+
+    def test_untagged_task(self, engine):
+        """Test that a task without tags loads an empty list."""
+        task = add_task(engine, "A", [])
+
+        assert load(engine, task.id).tags == []
+
+    def test_retag_updates_ids(self, engine):
+        """Test that changing tags on an existing task reinterns them."""
+        task = add_task(engine, "A", ["work"])
+        with Session(engine) as session:
+            session.get(Task, task.id).tags = ["home", "errand"]
+            session.commit()
+
+        assert load(engine, task.id).tags == ["home", "errand"]
+
+
+class TestUsageCounts:
+    """Test cases for trigger-maintained usage counts."""
+
+    def test_counts_follow_inserts_updates_and_deletes(self, engine):
+        """Test that every write path keeps usage_count current."""
+        first = add_task(engine, "A", ["work", "home"])
+        add_task(engine, "B", ["work"])
+        assert usage(engine) == {"work": 2, "home": 1}
+
+        with Session(engine) as session:
+            session.get(Task, first.id).tags = ["home"]
+            session.commit()
+        assert usage(engine) == {"work": 1, "home": 1}
+
+        with engine.begin() as connection:
+            connection.execute(sa.delete(Task.__table__))
+        assert usage(engine) == {"work": 0, "home": 0}
+
+    def test_list_tags_orders_by_usage(self, engine):
+        """Test that the most used tags come first, then by name."""
+        add_task(engine, "A", ["b", "a", "c"])
+        add_task(engine, "B", ["c"])
+
+        with engine.connect() as connection:
+            assert [tag.name for tag in list_tags(connection)] == ["c", "a", "b"]
+            assert [tag.name for tag in list_tags(connection, limit=1)] == ["c"]
+
+
+class TestRenameTag:
+    """Test cases for renaming and merging tags."""
+
+    def test_rename(self, engine):
+        """Test that renaming changes the name every task reads."""
+        task = add_task(engine, "A", ["wrk"])
+        with engine.begin() as connection:
+            renamed = rename_tag(connection, "wrk", "work")
+
+        assert renamed.name == "work"
+        assert load(engine, task.id).tags == ["work"]
+        assert usage(engine) == {"work": 1}
+
+    def test_rename_missing_tag(self, engine):
+        """Test that renaming an unknown tag returns None."""
+        with engine.begin() as connection:
+            assert rename_tag(connection, "nope", "work") is None
+
+    def test_merge_into_existing_tag(self, engine):
+        """Test that renaming onto an existing name merges the two tags."""
+        old = add_task(engine, "A", ["job"])
+        both = add_task(engine, "B", ["job", "work"])
+        add_task(engine, "C", ["work"])
+
+        with engine.begin() as connection:
+            merged = rename_tag(connection, "job", "work")
+            assert find_tag(connection, "job").merged_into == merged.id
+
+        assert merged.name == "work"
+        assert load(engine, old.id).tags == ["work"]
+        assert load(engine, both.id).tags == ["work"]
+        # The task carrying both tags counts once, and leaves once
+        assert usage(engine) == {"work": 3}
+        with engine.begin() as connection:
+            connection.execute(
+                sa.delete(Task.__table__).where(Task.__table__.c.id == both.id)
+            )
+        assert usage(engine) == {"work": 2}
+
+    def test_merged_name_resolves_for_new_tasks(self, engine):
+        """Test that tagging with a merged name uses the surviving tag."""
+        add_task(engine, "A", ["job"])
+        add_task(engine, "B", ["work"])
+        with engine.begin() as connection:
+            rename_tag(connection, "job", "work")
+
+        task = add_task(engine, "C", ["job", "work"])
+
+        assert task.tags == ["work"]
+        assert load(engine, task.id).tags == ["work"]
+        assert usage(engine) == {"work": 3}
+
+    def test_merging_a_merge_target_keeps_one_hop(self, engine):
+        """Test that aliases follow their tag into a second merge."""
+        task = add_task(engine, "A", ["a"])
+        add_task(engine, "B", ["b"])
+        add_task(engine, "C", ["c"])
+
+        with engine.begin() as connection:
+            rename_tag(connection, "a", "b")
+            rename_tag(connection, "b", "c")
+            target = find_tag(connection, "c").id
+            assert find_tag(connection, "a").merged_into == target
+            assert find_tag(connection, "b").merged_into == target
+
+        assert load(engine, task.id).tags == ["c"]
+        assert usage(engine) == {"c": 3}
+
+    def test_rename_back_to_merged_name(self, engine):
+        """Test that renaming a tag to one of its merged names swaps them."""
+        task = add_task(engine, "A", ["job"])
+        add_task(engine, "B", ["work"])
+
+        with engine.begin() as connection:
+            rename_tag(connection, "job", "work")
+            renamed = rename_tag(connection, "work", "job")
+            assert find_tag(connection, "work").merged_into == renamed.id
+
+        assert renamed.name == "job"
+        assert load(engine, task.id).tags == ["job"]
+        assert usage(engine) == {"job": 2}
+
+    def test_merged_tag_cannot_be_renamed(self, engine):
+        """Test that a merged-away name is not renamed on its own."""
+        add_task(engine, "A", ["job"])
+        add_task(engine, "B", ["work"])
+        with engine.begin() as connection:
+            rename_tag(connection, "job", "work")
+
+            assert rename_tag(connection, "job", "career") is None
+
+
+class TestTagIndex:
+    """Test cases for the in-memory autocomplete index."""
+
+    @pytest.fixture
+    def index(self) -> TagIndex:
+        index = TagIndex()
+        index.load({"work": 5, "workout": 2, "world": 2, "home": 3, "unused": 0})
+        return index
+
+    def test_suggest_by_prefix(self, index):
+        """Test that matches are ranked by usage, then name."""
+        assert index.suggest("wor") == [("work", 5), ("workout", 2), ("world", 2)]
+        assert index.suggest("work", limit=1) == [("work", 5)]
+        assert index.suggest("x") == []
+
+    def test_empty_prefix_lists_used_tags(self, index):
+        """Test that every tag in use matches the empty prefix."""
+        assert [name for name, _ in index.suggest("")] == [
+            "work",
+            "home",
+            "workout",
+            "world",
+        ]
+
+    def test_adjust(self, index):
+        """Test that task writes add and remove names incrementally."""
+        index.adjust(added=["garden", "home", "home"])
+        index.adjust(removed=["workout"], added=["work"])
+        index.adjust(removed=["workout", "world"])
+
+        assert index.suggest("g") == [("garden", 1)]
+        assert index.suggest("home") == [("home", 4)]
+        assert index.suggest("wor") == [("work", 6), ("world", 1)]
+
+    def test_rename(self, index):
+        """Test that a merge moves the surviving count onto the new name."""
+        index.rename("workout", "work", 6)
+
+        assert index.suggest("wor") == [("work", 6), ("world", 2)]
+
+    def test_unloaded_index_ignores_writes(self):
+        """Test that writes before the first load only bump the generation."""
+        index = TagIndex()
+        index.adjust(added=["work"])
+
+        assert index.generation == 1
+        assert index.suggest("") == []
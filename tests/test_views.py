@@ -0,0 +1,190 @@
+"""Tests for saved views and their cache."""
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from tick_task import api, views
+from tick_task.database import ShardRouter, get_db
+from tick_task.main import app
+from tick_task.views import ViewCache
+
+
+@pytest.fixture
+def cache(monkeypatch) -> ViewCache:
+    """Empty view cache used by the endpoints and the commit hooks."""
+    fresh = ViewCache(max_entries=8)
+    monkeypatch.setattr(views, "view_cache", fresh)
+    monkeypatch.setattr(api, "view_cache", fresh)
+    return fresh
+
+
+def save_view(client, **filters) -> str:
+    """Save a view with ``filters`` and return its id."""
+    response = client.post("/api/v1/views", json={"name": "View", "filters": filters})
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+class TestViewCache:
+    """Test cases for the change marker."""
+
+    def test_page_is_kept_until_a_write(self):
+        """Test that a page is served only under the marker it was read at."""
+        cache = ViewCache()
+        cache.store_page("view", cache.marker, b"page")
+        assert cache.page("view") == b"page"
+
+        cache.bump()
+
+        assert cache.page("view") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_page_read_across_a_write_is_not_kept(self):
+        """Test that a page whose query raced with a write is dropped."""
+        cache = ViewCache()
+        marker = cache.marker
+        cache.bump()
+
+        cache.store_page("view", marker, b"stale")
+
+        assert cache.page("view") is None
+
+    def test_bounded(self):
+        """Test that the least recently used view is evicted."""
+        cache = ViewCache(max_entries=2)
+        for view_id in ("a", "b", "c"):
+            cache.store_page(view_id, cache.marker, view_id.encode())
+
+        assert cache.page("a") is None
+        assert cache.page("c") == b"c"
+
+
+class TestViewEndpoints:
+    """Test cases for the saved view endpoints."""
+
+    def test_crud(self, client, cache):
+        """Test saving, listing, reading and deleting views."""
+        view_id = save_view(client, status=["todo"], priority="high")
+
+        listed = client.get("/api/v1/views").json()["views"]
+        fetched = client.get(f"/api/v1/views/{view_id}").json()
+        deleted = client.delete(f"/api/v1/views/{view_id}")
+        missing = client.get(f"/api/v1/views/{view_id}/tasks")
+
+        assert [view["id"] for view in listed] == [view_id]
+        assert fetched["filters"]["status"] == ["todo"]
+        assert fetched["filters"]["sort"] == "updated_at"
+        assert deleted.status_code == status.HTTP_204_NO_CONTENT
+        assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_invalid_filters(self, client, cache):
+        """Test that unknown filters and values are refused."""
+        unknown = client.post(
+            "/api/v1/views", json={"name": "View", "filters": {"colour": "red"}}
+        )
+        bad_sort = client.post(
+            "/api/v1/views", json={"name": "View", "filters": {"sort": "colour"}}
+        )
+
+        assert unknown.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert bad_sort.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_tasks_match_the_list_endpoint(self, client, cache):
+        """Test that a view lists what GET /tasks lists for its filters."""
+        for title, priority in (("Low", "low"), ("High", "high"), ("Urgent", "urgent")):
+            client.post("/api/v1/tasks", json={"title": title, "priority": priority})
+        view_id = save_view(client, priority="high", sort="title", order="asc")
+
+        opened = client.get(f"/api/v1/views/{view_id}/tasks").json()
+        listed = client.get(
+            "/api/v1/tasks",
+            params={"priority": "high", "sort": "title", "order": "asc"},
+        ).json()
+
+        assert [task["title"] for task in opened["tasks"]] == ["High", "Urgent"]
+        assert opened["tasks"] == listed["tasks"]
+
+    def test_tag_filter(self, client, cache):
+        """Test that a view keeps only tasks carrying one of its tags."""
+        client.post("/api/v1/tasks", json={"title": "Tagged", "tags": ["work"]})
+        client.post("/api/v1/tasks", json={"title": "Untagged"})
+        view_id = save_view(client, tags=["Work"])
+
+        opened = client.get(f"/api/v1/views/{view_id}/tasks").json()
+
+        assert [task["title"] for task in opened["tasks"]] == ["Tagged"]
+
+    def test_pagination_matches_the_list_endpoint(self, client, cache):
+        """Test that a full first page is paginated as GET /tasks does it."""
+        for title in ("One", "Two", "Three"):
+            client.post("/api/v1/tasks", json={"title": title})
+        view_id = save_view(client, limit=2)
+
+        opened = client.get(f"/api/v1/views/{view_id}/tasks").json()
+        listed = client.get("/api/v1/tasks", params={"limit": 2}).json()
+
+        assert opened["pagination"] == listed["pagination"]
+        assert opened["pagination"]["has_more"] is True
+
+    def test_cached_until_a_task_is_written(self, client, cache):
+        """Test that reopening is a hit and a task write invalidates it."""
+        task = client.post("/api/v1/tasks", json={"title": "Plan"}).json()
+        view_id = save_view(client, status=["todo"])
+
+        first = client.get(f"/api/v1/views/{view_id}/tasks")
+        again = client.get(f"/api/v1/views/{view_id}/tasks")
+        assert again.content == first.content
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        client.put(f"/api/v1/tasks/{task['id']}", json={"status": "done"})
+        after = client.get(f"/api/v1/views/{view_id}/tasks").json()
+
+        assert after["tasks"] == []
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_tag_rename_invalidates(self, client, cache):
+        """Test that renaming a tag, which writes no task, invalidates pages."""
+        client.post("/api/v1/tasks", json={"title": "Plan", "tags": ["trip"]})
+        view_id = save_view(client)
+        client.get(f"/api/v1/views/{view_id}/tasks")
+
+        client.post("/api/v1/tags/rename", json={"name": "trip", "new_name": "travel"})
+        page = client.get(f"/api/v1/views/{view_id}/tasks").json()
+
+        assert page["tasks"][0]["tags"] == ["travel"]
+
+    def test_memory_store_not_supported(self, client, cache, monkeypatch):
+        """Test that saved views are refused by the memory storage engine."""
+        monkeypatch.setattr(views, "memory_store", object())
+
+        response = client.post("/api/v1/views", json={"name": "View"})
+
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
+
+    async def test_sharded(self, tmp_path, monkeypatch, cache):
+        """Test that a view without a workspace merges every shard."""
+        router = ShardRouter(tmp_path / "shards")
+        monkeypatch.setattr(api, "shard_router", router)
+        monkeypatch.setattr(views, "shard_router", router)
+
+        async def override_get_db():
+            async with router.session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db] = override_get_db
+        with TestClient(app) as client:
+            for title, workspace in (("B", "work"), ("A", "home"), ("C", None)):
+                client.post(
+                    "/api/v1/tasks", json={"title": title, "workspace": workspace}
+                )
+            everywhere = save_view(client, sort="title", order="asc")
+            at_home = save_view(client, workspace="home")
+
+            merged = client.get(f"/api/v1/views/{everywhere}/tasks").json()
+            home = client.get(f"/api/v1/views/{at_home}/tasks").json()
+        app.dependency_overrides.clear()
+        await router.dispose()
+
+        assert [task["title"] for task in merged["tasks"]] == ["A", "B", "C"]
+        assert [task["title"] for task in home["tasks"]] == ["A"]